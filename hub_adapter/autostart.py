@@ -2,19 +2,23 @@
 
 import asyncio
 import logging
+import threading
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager, suppress
 from datetime import UTC, datetime, timedelta
 
+import peewee as pw
 from fastapi import HTTPException
 from flame_hub import HubAPIError
 from httpx2 import ConnectError, HTTPStatusError, ReadTimeout, RemoteProtocolError
+from psycopg2.errors import LockNotAvailable
 from starlette import status
-from starlette.concurrency import run_in_threadpool
 
 from hub_adapter.auth import _get_internal_token
 from hub_adapter.constants import ServiceTag
 from hub_adapter.core import make_request
+from hub_adapter.database import get_node_database
 from hub_adapter.dependencies import (
     compile_analysis_pod_data,
     get_core_client,
@@ -26,22 +30,123 @@ from hub_adapter.dependencies import (
     get_settings,
     get_ssl_context,
 )
-from hub_adapter.errors import KongConflictError, KongConnectError
-from hub_adapter.middleware import log_event
-from hub_adapter.routers.hub import (
-    _parse_query_params,
-    list_analysis_nodes,
+from hub_adapter.errors import (
+    AnalysisRegistrationLockedError,
+    KongConflictError,
+    KongConnectError,
+    catch_hub_errors,
 )
+from hub_adapter.hub_client import iter_pages
+from hub_adapter.leader_election import lock_key
+from hub_adapter.middleware import log_event
+from hub_adapter.routers.hub import _parse_query_params
 from hub_adapter.routers.kong import (
     create_and_connect_analysis_to_project,
     delete_analysis,
     get_analysis_keyauth,
     list_projects,
 )
+from hub_adapter.scheduler import scheduler
 from hub_adapter.schemas.podorc import PodStatus
 from hub_adapter.user_settings import load_persistent_settings
 from hub_adapter.utils import _check_data_required, parse_tags
 
+logger = logging.getLogger(__name__)
+
+# Connections holding the registration locks, i.e. the analyses that can be registered at once by one process
+ADVISORY_LOCK_CONNECTIONS = 4
+
+# Seconds to wait for another process registering the same analysis before leaving it to that process
+REGISTRATION_LOCK_TIMEOUT = 60
+
+
+class _AdvisoryLocks:
+    """Postgres advisory locks serializing the register/start sequence across workers and replicas.
+
+    A session level advisory lock has to be released on the connection that took it, and peewee hands every thread
+    its own connection, so each lock keeps one of a few single thread executors from taking it until releasing it.
+    Waiting for a lock held by another process is left to Postgres, which costs one round trip however long it takes.
+    A lock still held after REGISTRATION_LOCK_TIMEOUT raises AnalysisRegistrationLockedError, as going ahead would
+    register the analysis twice. Without a database, or when the connection fails, the registration goes ahead guarded
+    by the in-process lock only.
+    """
+
+    def __init__(self, connections: int = ADVISORY_LOCK_CONNECTIONS):
+        self._connections = connections
+        self._idle: asyncio.LifoQueue[ThreadPoolExecutor] | None = None  # reuses the connection used last
+        self._local = threading.local()
+
+    @asynccontextmanager
+    async def acquire(self, key: str):
+        if self._idle is None:
+            self._idle = asyncio.LifoQueue()
+            for _ in range(self._connections):
+                self._idle.put_nowait(ThreadPoolExecutor(max_workers=1, thread_name_prefix="registration-lock"))
+
+        executor = await self._idle.get()
+        lock_id = lock_key(f"analysis.{key}")
+
+        try:
+            locked = await asyncio.get_running_loop().run_in_executor(executor, self._lock, lock_id)
+
+        except asyncio.CancelledError:
+            # The lock may still be granted after the caller is gone, the unlock queues up behind it
+            executor.submit(self._unlock, lock_id)
+            self._idle.put_nowait(executor)
+            raise
+
+        except pw.PeeweeException as lock_err:  # only a lock timeout gets past _lock
+            self._idle.put_nowait(executor)
+            raise AnalysisRegistrationLockedError(key) from lock_err
+
+        try:
+            yield
+
+        finally:
+            if locked:  # releasing does not need to hold up the caller, the executor runs it before its next lock
+                executor.submit(self._unlock, lock_id)
+            self._idle.put_nowait(executor)
+
+    def _lock(self, lock_id: int) -> bool:
+        db = get_node_database()
+        if db is None:
+            return False
+
+        try:
+            if not getattr(self._local, "session_ready", False):
+                db.execute_sql(f"SET lock_timeout = '{REGISTRATION_LOCK_TIMEOUT}s'")
+                self._local.session_ready = True
+
+            db.execute_sql("SELECT pg_advisory_lock(%s)", (lock_id,))
+            return True
+
+        except pw.PeeweeException as db_err:
+            if isinstance(getattr(db_err, "orig", None), LockNotAvailable):
+                # Another process is still registering the analysis, the connection itself is fine
+                raise
+
+            logger.warning(f"Unable to take the registration lock, only guarding against this process: {db_err}")
+            self._discard_connection(db)
+            return False
+
+    def _unlock(self, lock_id: int) -> None:
+        db = get_node_database()
+        if db is None:
+            return
+
+        try:
+            db.execute_sql("SELECT pg_advisory_unlock(%s)", (lock_id,))
+
+        except pw.PeeweeException as db_err:
+            logger.warning(f"Unable to release the registration lock, dropping its connection instead: {db_err}")
+            self._discard_connection(db)
+
+    def _discard_connection(self, db: pw.Database) -> None:
+        """Close the connection of this thread rather than hand it back to the pool, which releases its locks."""
+        self._local.session_ready = False
+        with suppress(Exception):
+            db.manual_close()
+
 
 class _RegistrationLocks:
     """Analysis ID specific async locks, evicted as soon as the last waiter releases.
@@ -50,12 +155,15 @@ class _RegistrationLocks:
     callers in this process (the autostart loop and manual initialize requests) cannot
     race on Kong consumer creation or double-start the same analysis. The lock entry is
     short-lived since it only exists while at least one coroutine is registering that analysis.
+    Other workers and replicas are kept out by an advisory lock taken once the in-process
+    lock is held, so only one coroutine per process ever waits on the database.
     """
 
-    def __init__(self):
+    def __init__(self, advisory_locks: _AdvisoryLocks | None = None):
         self._locks: dict[str, asyncio.Lock] = {}
         self._refcounts: dict[str, int] = {}
         self._guard = asyncio.Lock()  # serializes mutations of the registry itself
+        self._advisory_locks = advisory_locks or _AdvisoryLocks()
 
     @asynccontextmanager
     async def acquire(self, key: str):
@@ -64,7 +172,7 @@ class _RegistrationLocks:
             self._refcounts[key] = self._refcounts.get(key, 0) + 1
 
         try:
-            async with lock:
+            async with lock, self._advisory_locks.acquire(key):
                 yield
 
         finally:
@@ -112,16 +220,13 @@ class GoGoAnalysis:
             )
             return None
 
-        formatted_query_params = _parse_query_params(sort="-updated_at")
+        valid_projects = await self.get_valid_projects()
+        datastore_required = _check_data_required(node_type)
 
         try:
-            analyses = await list_analysis_nodes(
-                core_client=self.core_client,
-                node_id=node_id,
-                query_params=formatted_query_params,
-            )
+            ready_to_start_analyses = await self.find_ready_analyses(node_id, valid_projects, datastore_required)
 
-        except ConnectError as e:
+        except (ConnectError, HTTPException) as e:
             log_event(
                 "autostart.analysis.hub_fetch_error",
                 event_description=f"Unable to start analyses, error connecting to Hub: {e}",
@@ -130,10 +235,6 @@ class GoGoAnalysis:
             )
             return analyses_started
 
-        valid_projects = await self.get_valid_projects()
-        datastore_required = _check_data_required(node_type)
-        ready_to_start_analyses = self.parse_analyses(analyses, valid_projects, datastore_required)
-
         for analysis in ready_to_start_analyses:
             analysis_id, project_id, node_id, _, _ = analysis
             start_resp, status_code = await self.register_and_start_analysis(
@@ -154,28 +255,40 @@ class GoGoAnalysis:
         """Register an analysis with kong (if required) and start its pod.
 
         The whole register-and-start sequence is serialized per analysis_id so concurrent
-        callers cannot race on consumer creation or double-start the same analysis.
+        callers cannot race on consumer creation or double-start the same analysis. When another
+        process holds the analysis for too long, it is left to that process and a 409 is returned.
         """
-        async with _registration_locks.acquire(str(analysis_id)):
-            datastore_required = _check_data_required(node_type)
-            if datastore_required:
-                kong_resp, status_code = await self.register_analysis(analysis_id, project_id)
-                if status_code != status.HTTP_201_CREATED:
-                    return kong_resp, status_code
-
-                kong_token = kong_resp["keyauth"].key
-
-            else:  # Aggregator nodes don't need a kong store nor if the data requirement is disabled
-                kong_token = "none_needed"
-
-            props = {
-                "analysis_id": analysis_id,
-                "project_id": project_id,
-                "node_id": node_id,
-                "kong_token": kong_token,
-            }
-            start_resp, status_code = await self.send_start_request(analysis_props=props, kong_token=kong_token)
-            return start_resp, status_code
+        try:
+            async with _registration_locks.acquire(str(analysis_id)):
+                datastore_required = _check_data_required(node_type)
+                if datastore_required:
+                    kong_resp, status_code = await self.register_analysis(analysis_id, project_id)
+                    if status_code != status.HTTP_201_CREATED:
+                        return kong_resp, status_code
+
+                    kong_token = kong_resp["keyauth"].key
+
+                else:  # Aggregator nodes don't need a kong store nor if the data requirement is disabled
+                    kong_token = "none_needed"
+
+                props = {
+                    "analysis_id": analysis_id,
+                    "project_id": project_id,
+                    "node_id": node_id,
+                    "kong_token": kong_token,
+                }
+                start_resp, status_code = await self.send_start_request(analysis_props=props, kong_token=kong_token)
+                return start_resp, status_code
+
+        except AnalysisRegistrationLockedError as e:
+            log_event(
+                "autostart.analysis.locked",
+                event_description=f"Analysis {analysis_id} is still being registered by another worker or replica, "
+                "leaving it to them",
+                level=logging.WARNING,
+                service=ServiceTag.AUTOSTART,
+            )
+            return e.detail, e.status_code
 
     async def describe_node(self) -> tuple[str | None, str] | None:
         """Get node information from cache, and if not present, get from Hub and set cache."""
@@ -252,10 +365,7 @@ class GoGoAnalysis:
                 )
 
             # Status obtained and no pod is running, the consumer already exists, so reuse its credential
-            # Synchronous Kong helper, so it must not run on the event loop
-            existing_keyauth = await run_in_threadpool(
-                get_analysis_keyauth, settings=self.settings, analysis_id=analysis_id
-            )
+            existing_keyauth = await get_analysis_keyauth(settings=self.settings, analysis_id=analysis_id)
             if existing_keyauth is not None:
                 log_event(
                     "autostart.analysis.reuse",
@@ -352,8 +462,8 @@ class GoGoAnalysis:
             service=ServiceTag.AUTOSTART,
         )
 
-        node_metadata = get_node_metadata_for_url(analysis_props["node_id"], core_client=self.core_client)
-        analysis_info = get_registry_metadata_for_url(node_metadata, core_client=self.core_client)
+        node_metadata = await get_node_metadata_for_url(analysis_props["node_id"], core_client=self.core_client)
+        analysis_info = await get_registry_metadata_for_url(node_metadata, core_client=self.core_client)
 
         analysis_id = analysis_props["analysis_id"]
         project_id = analysis_props["project_id"]
@@ -504,7 +614,33 @@ class GoGoAnalysis:
                 if proj_uuid:
                     valid_projects.add(proj_uuid)
 
-        return valid_projects
+        from hub_adapter.managers import link_health_monitor  # avoid a circular import
+
+        unreachable = valid_projects & link_health_monitor.unreachable_projects()
+        if unreachable:
+            log_event(
+                "autostart.project.unreachable",
+                event_description=f"Skipping project(s) {', '.join(sorted(unreachable))}, "
+                "none of their data stores passed the latest link check",
+                level=logging.WARNING,
+                service=ServiceTag.AUTOSTART,
+            )
+
+        return valid_projects - unreachable
+
+    @catch_hub_errors
+    async def find_ready_analyses(self, node_id: str | None, valid_projects: set, datastore_required: bool) -> set:
+        """Scan every analysis node of this node for the ones ready to start, a page at a time."""
+        node_filter = {"filter": {"nodeId": node_id}} if node_id else {}
+        ready_analyses = set()
+
+        async for page in iter_pages(
+            self.core_client.find_analysis_nodes, **_parse_query_params(sort="-updated_at"), **node_filter
+        ):
+            ready_analyses |= self.parse_analyses(page, valid_projects, datastore_required, log_summary=False)
+
+        self._log_ready(ready_analyses)
+        return ready_analyses
 
     def parse_analyses(
             self,
@@ -512,6 +648,7 @@ class GoGoAnalysis:
             valid_projects: set,
             datastore_required: bool = True,
             enforce_time_and_status_check: bool = True,
+            log_summary: bool = True,
     ) -> set:
         """Iterate through analyses and check whether they are approved, built, and have a run status."""
         ready_analyses = set()
@@ -566,13 +703,19 @@ class GoGoAnalysis:
                 )
                 ready_analyses.add(valid_entry)
 
+        if log_summary:
+            self._log_ready(ready_analyses)
+
+        return ready_analyses
+
+    @staticmethod
+    def _log_ready(ready_analyses: set) -> None:
         log_event(
             "autostart.analysis.ready",
             event_description=f"Found {len(ready_analyses)} valid analyses ready to start",
             level=logging.INFO,
             service=ServiceTag.AUTOSTART,
         )
-        return ready_analyses
 
 
 class AutostartManager:
@@ -581,6 +724,7 @@ class AutostartManager:
     def __init__(self):
         self._task: asyncio.Task | None = None
         self._enabled = False
+        self._analysis_initiator: GoGoAnalysis | None = None
 
     async def update(self) -> None:
         """Update the autostart state based on current settings."""
@@ -596,7 +740,7 @@ class AutostartManager:
                 level=logging.INFO,
                 service=ServiceTag.AUTOSTART,
             )
-            self._task = asyncio.create_task(self._run_autostart(interval))
+            self._task = self._schedule(interval)
             self._enabled = True
 
         elif not user_enabled and self._enabled:
@@ -607,20 +751,12 @@ class AutostartManager:
                 level=logging.INFO,
                 service=ServiceTag.AUTOSTART,
             )
-            if self._task and not self._task.done():
-                self._task.cancel()
-                with suppress(asyncio.CancelledError):
-                    await self._task
-
-            self._task = None
+            await self._cancel_current_task()
             self._enabled = False
 
         elif user_enabled and self._enabled:
             # Interval might have changed, restart if needed
-            if self._task and not self._task.done():
-                self._task.cancel()
-                with suppress(asyncio.CancelledError):
-                    await self._task
+            await self._cancel_current_task()
 
             log_event(
                 "autostart.restarted",
@@ -628,40 +764,43 @@ class AutostartManager:
                 level=logging.INFO,
                 service=ServiceTag.AUTOSTART,
             )
-            self._task = asyncio.create_task(self._run_autostart(interval))
-
-    async def _run_autostart(self, interval: int) -> None:
-        """Run the autostart probing loop."""
-        analysis_initiator = None
-        while True:
-            try:
-                # Let fail during initialization e.g. Hub being unreachable at startup, will be retried on next loop
-                if analysis_initiator is None:
-                    analysis_initiator = GoGoAnalysis()
+            self._task = self._schedule(interval)
+
+    def _schedule(self, interval: int) -> asyncio.Task:
+        """Run the autostart probing on the shared scheduler."""
+        return scheduler.schedule(
+            "autostart",
+            self._run_autostart,
+            interval,
+            label="autostart",
+            leader_only=True,
+            service=ServiceTag.AUTOSTART,
+        )
 
-                log_event(
-                    "autostart.poll",
-                    event_description="Checking for new analyses to start",
-                    level=logging.INFO,
-                    service=ServiceTag.AUTOSTART,
-                )
-                await analysis_initiator.auto_start_analyses()
+    async def _run_autostart(self) -> None:
+        """Check once for analyses to start."""
+        # Let fail during initialization e.g. Hub being unreachable at startup, will be retried on the next run
+        if self._analysis_initiator is None:
+            self._analysis_initiator = GoGoAnalysis()
 
-            except Exception as e:
-                log_event(
-                    "autostart.error",
-                    event_description=f"Error during autostart: {e}",
-                    level=logging.ERROR,
-                    service=ServiceTag.AUTOSTART,
-                )
-
-            await asyncio.sleep(interval)
+        log_event(
+            "autostart.poll",
+            event_description="Checking for new analyses to start",
+            level=logging.INFO,
+            service=ServiceTag.AUTOSTART,
+        )
+        await self._analysis_initiator.auto_start_analyses()
 
-    async def stop(self) -> None:
-        """Stop the autostart task."""
+    async def _cancel_current_task(self) -> None:
+        """Cancel and await the current task if one exists."""
         if self._task and not self._task.done():
             self._task.cancel()
             with suppress(asyncio.CancelledError):
                 await self._task
 
+        self._task = None
+
+    async def stop(self) -> None:
+        """Stop the autostart task."""
+        await self._cancel_current_task()
         self._enabled = False
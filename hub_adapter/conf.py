@@ -36,6 +36,18 @@ class ServiceHealthSettings(BaseModel):
     model_config = {"extra": "forbid"}
 
 
+class RequestRollupSettings(BaseModel):
+    """Settings for the background routine that rolls the API access logs up into per-minute request counts in
+    Postgres. Requires VictoriaLogs and a Postgres connection.
+    """
+
+    enabled: bool | None = False
+    interval: Annotated[int, Field(gt=0)] | None = 60
+    retention_days: Annotated[int, Field(gt=0)] | None = 30
+
+    model_config = {"extra": "forbid"}
+
+
 class UserSettings(BaseSettings):
     """Node configuration settings set by the user."""
 
@@ -43,6 +55,7 @@ class UserSettings(BaseSettings):
     autostart: AutostartSettings | None = AutostartSettings()
     kong_cleanup: KongCleanupSettings | None = KongCleanupSettings()
     service_health: ServiceHealthSettings | None = ServiceHealthSettings()
+    request_rollup: RequestRollupSettings | None = RequestRollupSettings()
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -95,6 +108,11 @@ class Settings(BaseSettings):
     hub_node_client_id: str | None = None
     hub_node_client_secret: str | None = None
 
+    # Read-through cache for the Hub list endpoints in seconds, stale entries are served while they are refreshed
+    hub_cache_ttl: Annotated[float | int, Field(ge=0)] = 15
+    hub_cache_stale_ttl: Annotated[float | int, Field(ge=0)] = 60
+    hub_cache_max_entries: Annotated[int, Field(gt=0)] = 256
+
     # RBAC
     role_claim_name: str | None = None
     admin_role: str | None = "admin"
@@ -111,11 +129,34 @@ class Settings(BaseSettings):
     postgres_max_connections: Annotated[int, Field(gt=0)] = 20
     postgres_stale_timeout: Annotated[int, Field(gt=0)] = 300
 
-    # Upstream request timeouts in seconds (both services are sync)
+    # Entities requested per page from the Kong admin list endpoints, Kong accepts up to 1000
+    kong_page_size: Annotated[int, Field(gt=0, le=1000)] = 1000
+
+    # Kong admin requests in flight at once when deleting or creating many entities for one request
+    kong_bulk_concurrency: Annotated[int, Field(gt=0)] = 10
+
+    # Seconds between refreshes of the in-process Kong inventory that tag filtered reads are served from, 0 disables it
+    kong_inventory_interval: Annotated[float | int, Field(ge=0)] = 30
+
+    # Seconds between background probes of every project-datastore link, 0 disables it
+    kong_link_health_interval: Annotated[float | int, Field(ge=0)] = 300
+
+    # Seconds a single run of a background job may take before it is cancelled
+    scheduler_job_timeout: Annotated[float | int, Field(gt=0)] = 900
+
+    # Run autostart, the Kong consumer cleanup and the service health checks on one replica only, elected through a
+    # Postgres advisory lock
+    scheduler_leader_election: bool = False
+
+    # Seconds between the attempts of the other replicas to take over a job from its leader
+    scheduler_leader_poll_interval: Annotated[float | int, Field(gt=0)] = 5
+
+    # Upstream request timeouts in seconds
     kong_request_timeout: Annotated[float | int, Field(gt=0)] = 10
     hub_request_timeout: Annotated[float | int, Field(gt=0)] = 10
 
     # Worker threads available to the synchronous endpoints (default is 40, need >38, this is a safe buffer)
+    # Hub and Kong calls are awaited on the event loop and do not hold one
     worker_thread_limit: Annotated[int, Field(gt=0)] = 100
 
     model_config = SettingsConfigDict(
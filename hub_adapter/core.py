@@ -13,6 +13,8 @@ from starlette.responses import FileResponse, Response
 from hub_adapter import post_processing, pre_processing
 from hub_adapter.constants import CONTENT_TYPE, ServiceTag
 from hub_adapter.dependencies import get_proxy_client, get_settings, make_log_hook
+from hub_adapter.response_cache import normalize_params
+from hub_adapter.single_flight import downstream_reads
 from hub_adapter.utils import (
     create_request_data,
     unzip_body_object,
@@ -73,16 +75,25 @@ async def make_request(
     if not files:
         files = {}
 
-    r = await get_proxy_client().request(
-        url=url,
-        method=method,
-        headers=headers,
-        timeout=60.0,
-        params=query,
-        json=data,
-        files=files,
-        follow_redirects=True,
-    )
+    def send():
+        return get_proxy_client().request(
+            url=url,
+            method=method,
+            headers=headers,
+            timeout=60.0,
+            params=query,
+            json=data,
+            files=files,
+            follow_redirects=True,
+        )
+
+    if method.lower() == "get" and not file_response and not files:
+        # Identical concurrent reads by the same caller share one request, each then parses the response itself
+        key = (url, normalize_params(query), Headers(headers).get("authorization"))
+        r = await downstream_reads.do(key, send)
+
+    else:
+        r = await send()
 
     if service:
         make_log_hook(service, event_name=request_name)(r)
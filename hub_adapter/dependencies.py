@@ -10,21 +10,21 @@ from functools import lru_cache
 from pathlib import Path
 from typing import Annotated
 
-import flame_hub
 import httpx2
 import truststore
 from fastapi import Body, Depends, HTTPException
 from flame_hub import HubAPIError
-from flame_hub._auth_flows import ClientAuth
 from flame_hub.models import Node
 from starlette import status
-from starlette.concurrency import run_in_threadpool
 
 from hub_adapter import node_id_pickle_path
 from hub_adapter.conf import Settings
 from hub_adapter.constants import ServiceTag
 from hub_adapter.errors import HubConnectError, catch_hub_errors
+from hub_adapter.hub_client import AsyncClientAuth, AsyncCoreClient
+from hub_adapter.kong_client import AsyncKongAdmin
 from hub_adapter.middleware import log_event
+from hub_adapter.response_cache import ResponseCache
 
 logger = logging.getLogger(__name__)
 
@@ -85,7 +85,7 @@ def get_ssl_context(
 def get_flame_hub_auth_flow(
     ssl_ctx: Annotated[ssl.SSLContext, Depends(get_ssl_context)],
     settings: Annotated[Settings, Depends(get_settings)],
-) -> ClientAuth:
+) -> AsyncClientAuth:
     """Automated method for getting a robot token from the central Hub service."""
     hub_node_client_id, hub_node_client_secret = (
         settings.hub_node_client_id,
@@ -112,15 +112,15 @@ def get_flame_hub_auth_flow(
             headers={"WWW-Authenticate": "Bearer"},
         ) from ValueError
 
-    auth = ClientAuth(
+    auth = AsyncClientAuth(
         client_id=hub_node_client_id,
         client_secret=hub_node_client_secret,
         client=_track_client(
-            httpx2.Client(
+            httpx2.AsyncClient(
                 base_url=settings.hub_auth_service_url,
                 verify=ssl_ctx,
                 timeout=settings.hub_request_timeout,
-                event_hooks={"response": [make_log_hook(ServiceTag.HUB)]},
+                event_hooks={"response": [make_log_hook(ServiceTag.HUB, is_async=True)]},
             ),
             get_flame_hub_auth_flow.cache_clear,
         ),
@@ -152,27 +152,68 @@ def make_log_hook(service: str, is_async: bool = False, event_name: str | None =
 @lru_cache(maxsize=1)
 def get_core_client(
     hub_auth: Annotated[
-        ClientAuth,
+        AsyncClientAuth,
         Depends(get_flame_hub_auth_flow),
     ],
     ssl_ctx: Annotated[ssl.SSLContext, Depends(get_ssl_context)],
     settings: Annotated[Settings, Depends(get_settings)],
-) -> flame_hub.CoreClient:
-    """Return the shared Hub client."""
-    return flame_hub.CoreClient(
+) -> AsyncCoreClient:
+    """Return the shared Hub client, whose resource methods are awaited on the event loop."""
+    return AsyncCoreClient(
         client=_track_client(
-            httpx2.Client(
+            httpx2.AsyncClient(
                 base_url=settings.hub_service_url,
                 auth=hub_auth,
                 verify=ssl_ctx,
                 timeout=settings.hub_request_timeout,
-                event_hooks={"response": [make_log_hook(ServiceTag.HUB)]},
+                event_hooks={"response": [make_log_hook(ServiceTag.HUB, is_async=True)]},
             ),
             get_core_client.cache_clear,
         )
     )
 
 
+@lru_cache(maxsize=1)
+def get_kong_client(settings: Annotated[Settings, Depends(get_settings)]) -> AsyncKongAdmin:
+    """Return the shared Kong admin client, each call bounded by the configured Kong request timeout."""
+    return AsyncKongAdmin(
+        client=_track_client(
+            httpx2.AsyncClient(
+                base_url=settings.kong_admin_service_url,
+                timeout=settings.kong_request_timeout,
+                event_hooks={"response": [make_log_hook(ServiceTag.KONG, is_async=True)]},
+            ),
+            get_kong_client.cache_clear,
+        )
+    )
+
+
+@lru_cache(maxsize=1)
+def get_kong_proxy_client(settings: Annotated[Settings, Depends(get_settings)]) -> httpx2.AsyncClient:
+    """Shared async client for requests through the Kong proxy, e.g. probing the linked data stores."""
+    return _track_client(
+        httpx2.AsyncClient(
+            timeout=settings.kong_request_timeout,
+            event_hooks={"response": [make_log_hook(ServiceTag.KONG, is_async=True)]},
+        ),
+        get_kong_proxy_client.cache_clear,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_hub_cache() -> ResponseCache:
+    """Shared cache of Hub list responses, which are the same for every user since they use the node's credentials."""
+    settings = get_settings()
+    cache = ResponseCache(
+        ttl=settings.hub_cache_ttl,
+        stale_ttl=settings.hub_cache_stale_ttl,
+        max_entries=settings.hub_cache_max_entries,
+    )
+    register_closer(cache.clear)
+    register_closer(get_hub_cache.cache_clear)
+    return cache
+
+
 @lru_cache(maxsize=1)
 def get_idp_client() -> httpx2.Client:
     """Shared sync client for the IDP."""
@@ -223,8 +264,8 @@ def _write_node_cache(node_cache: dict) -> None:
 
 
 @catch_hub_errors
-def get_node_id(
-    core_client: Annotated[flame_hub.CoreClient, Depends(get_core_client)],
+async def get_node_id(
+    core_client: Annotated[AsyncCoreClient, Depends(get_core_client)],
     settings: Annotated[Settings, Depends(get_settings)],
     force_refresh: bool = False,
 ) -> str | None:
@@ -233,8 +274,6 @@ def get_node_id(
     An empty string node_id indicates no node is associated with the provided node client username.
 
     If None is returned, no filtering will be applied, which is useful for debugging.
-
-    Defined with "def" because it reads the cache file and calls the synchronous Hub client.
     """
     node_client_id = settings.hub_node_client_id
 
@@ -252,7 +291,7 @@ def get_node_id(
         logger.info("NODE_ID not set for HUB_NODE_CLIENT_ID, retrieving from Hub")
 
         try:
-            node_id_resp = core_client.find_nodes(filter={"clientId": node_client_id}, fields="id")
+            node_id_resp = await core_client.find_nodes(filter={"clientId": node_client_id}, fields="id")
 
         except httpx2.ConnectError as e:
             err = "Connection Error - Hub is currently unreachable"
@@ -285,7 +324,7 @@ def get_node_id(
 @catch_hub_errors
 async def get_node_type_cache(
     settings: Annotated[Settings, Depends(get_settings)],
-    core_client: Annotated[flame_hub.CoreClient, Depends(get_core_client)],
+    core_client: Annotated[AsyncCoreClient, Depends(get_core_client)],
 ):
     global _node_type_cache
 
@@ -293,8 +332,7 @@ async def get_node_type_cache(
         node_id = await get_node_id(core_client=core_client, settings=settings)
 
         try:
-            # Stays async because it awaits get_node_id, so the Hub call is offloaded
-            node_resp = await run_in_threadpool(core_client.get_node, node_id=node_id)
+            node_resp = await core_client.get_node(node_id=node_id)
             _node_type_cache = {"type": node_resp.type}
 
         except httpx2.ConnectError as e:
@@ -313,12 +351,12 @@ async def get_node_type_cache(
     return _node_type_cache
 
 
-def get_node_metadata_for_url(
+async def get_node_metadata_for_url(
     node_id: Annotated[uuid.UUID | str, Body(description="Node UUID")],
-    core_client: Annotated[flame_hub.CoreClient, Depends(get_core_client)],
+    core_client: Annotated[AsyncCoreClient, Depends(get_core_client)],
 ) -> Node | None:
     """Get analysis metadata for a given UUID to be used in creating analysis image URL."""
-    node_metadata: Node | None = core_client.get_node(node_id=node_id)
+    node_metadata: Node | None = await core_client.get_node(node_id=node_id)
 
     if not node_metadata.registry_project_id:
         err_msg = f"No registry project associated with node {node_id}"
@@ -336,15 +374,15 @@ def get_node_metadata_for_url(
     return node_metadata
 
 
-def get_registry_metadata_for_url(
+async def get_registry_metadata_for_url(
     node_metadata: Annotated[Node, Depends(get_node_metadata_for_url)],
-    core_client: Annotated[flame_hub.CoreClient, Depends(get_core_client)],
+    core_client: Annotated[AsyncCoreClient, Depends(get_core_client)],
 ):
     """Get registry metadata for a given UUID to be used in creating analysis image URL."""
     registry_metadata = dict()
 
     try:
-        registry_metadata = core_client.get_registry_project(
+        registry_metadata = await core_client.get_registry_project(
             node_metadata.registry_project_id,
             fields=("account_id", "account_name", "account_secret"),
         )
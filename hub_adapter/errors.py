@@ -11,9 +11,8 @@ from flame_hub import HubAPIError
 from kong_admin_client import ApiException
 from starlette import status
 from starlette.concurrency import run_in_threadpool
-from urllib3.exceptions import MaxRetryError
 
-from hub_adapter.constants import SERVICE
+from hub_adapter.constants import SERVICE, ServiceTag
 from hub_adapter.middleware import log_event
 
 
@@ -49,6 +48,18 @@ class KongConflictError(HTTPException):
     pass
 
 
+class AnalysisRegistrationLockedError(HTTPException):
+    def __init__(self, analysis_id: str):
+        super().__init__(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "message": f"Analysis {analysis_id} is being registered by another worker or replica, please retry",
+                SERVICE: ServiceTag.AUTOSTART.value,
+                "status_code": status.HTTP_409_CONFLICT,
+            },
+        )
+
+
 class BucketError(KongError):
     def __init__(self):
         message = "Bucket does not exist or is set to private"
@@ -331,7 +342,7 @@ def require_victoria_logs(f):
 def catch_hub_errors(f):
     """Custom error handling decorator for flame_hub_client.
 
-    The Hub client is synchronous, so move to a separate worker thread.
+    Synchronous functions are moved to a separate worker thread.
     The wrapper stays a coroutine either way, so internal callers can keep awaiting the decorated function.
     """
     is_async = inspect.iscoroutinefunction(f)
@@ -478,7 +489,7 @@ def catch_hub_errors(f):
 def catch_kong_errors(f):
     """Custom error handling decorator for Kong endpoints.
 
-    The Kong admin client is synchronous, so move to a separate worker thread.
+    Synchronous functions are moved to a separate worker thread.
     """
     is_async = inspect.iscoroutinefunction(f)
 
@@ -542,7 +553,7 @@ def catch_kong_errors(f):
                     headers={"WWW-Authenticate": "Bearer"} if e.status == status.HTTP_401_UNAUTHORIZED else None,
                 ) from e
 
-        except MaxRetryError as e:
+        except httpx2.TransportError as e:  # Kong unreachable or timed out
             log_event(
                 "kong.service.unavailable",
                 event_description="Kong service unavailable",
@@ -0,0 +1,311 @@
+"""Asyncio-native access to the Hub core API.
+
+flame_hub only ships synchronous clients, so every Hub call used to hold a worker thread for as long as the request
+was in flight. The public CoreClient methods merely build request parameters and hand them to a small set of
+low-level methods, so overriding those with coroutines turns every public method into an awaitable while keeping
+flame_hub's signatures, models and errors.
+"""
+
+import asyncio
+import time
+import typing as t
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+import flame_hub
+import httpx2
+from flame_hub._auth_flows import AccessToken, secs_to_nanos
+from flame_hub._base_client import (
+    DEFAULT_PAGE_PARAMS,
+    ResourceList,
+    WrappedResource,
+    _is_enveloped,
+    build_field_params,
+    build_filter_params,
+    build_include_params,
+    build_page_params,
+    build_sort_params,
+    convert_path,
+    resolve_auth,
+)
+from flame_hub._exceptions import HubAPIError, new_hub_api_error_from_response
+
+from hub_adapter.response_cache import normalize_params
+from hub_adapter.single_flight import hub_reads
+
+# CoreClient methods that discard the low-level result instead of returning it, so on this client their request
+# would be created as a coroutine and never awaited
+UNSUPPORTED_METHODS = (
+    "delete_node",
+    "sync_master_images",
+    "build_master_image",
+    "delete_project",
+    "delete_project_node",
+    "delete_analysis",
+    "send_analysis_command",
+    "delete_analysis_node",
+    "delete_analysis_node_logs",
+    "delete_analysis_bucket",
+    "delete_analysis_bucket_file",
+    "delete_registry",
+    "send_registry_command",
+    "delete_registry_project",
+    "delete_analysis_logs",
+)
+
+
+class AsyncClientAuth(httpx2.Auth):
+    """Client credentials flow for the Hub which fetches its robot token without blocking the event loop.
+
+    Mirrors flame_hub's ClientAuth, but the token request goes through an AsyncClient and concurrent requests that
+    find the token expired wait for a single refresh rather than each requesting their own.
+    """
+
+    def __init__(self, client_id: str, client_secret: str, client: httpx2.AsyncClient):
+        self._client_id = client_id
+        self._client_secret = client_secret
+        self._client = client
+        self._current_token: AccessToken | None = None
+        self._current_token_expires_at_nanos = 0
+        self._lock = asyncio.Lock()
+
+    def _token_is_valid(self) -> bool:
+        return self._current_token is not None and time.monotonic_ns() <= self._current_token_expires_at_nanos
+
+    async def _refresh_token(self) -> None:
+        request_nanos = time.monotonic_ns()
+        r = await self._client.post(
+            "token",
+            json={
+                "grant_type": "client_credentials",
+                "client_id": self._client_id,
+                "client_secret": self._client_secret,
+            },
+        )
+
+        if r.status_code != httpx2.codes.OK.value:
+            raise new_hub_api_error_from_response(r)
+
+        token = AccessToken(**r.json())
+        self._current_token = token
+        self._current_token_expires_at_nanos = request_nanos + secs_to_nanos(token.expires_in)
+
+    def sync_auth_flow(self, request: httpx2.Request) -> t.Generator[httpx2.Request, httpx2.Response, None]:
+        raise RuntimeError("AsyncClientAuth can only be used with an httpx2.AsyncClient")
+
+    async def async_auth_flow(self, request: httpx2.Request) -> t.AsyncGenerator[httpx2.Request, httpx2.Response]:
+        if not self._token_is_valid():
+            async with self._lock:
+                if not self._token_is_valid():  # another request may have refreshed it while we waited
+                    await self._refresh_token()
+
+        request.headers["Authorization"] = f"Bearer {self._current_token.access_token}"
+        yield request
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+def _unsupported(name: str):
+    def method(self, *args, **kwargs):
+        raise NotImplementedError(f"{name} is not available on the async Hub client")
+
+    method.__name__ = name
+    return method
+
+
+class AsyncCoreClient(flame_hub.CoreClient):
+    """flame_hub CoreClient whose resource methods return awaitables backed by an httpx2.AsyncClient.
+
+    Only the methods which return the result of flame_hub's low-level methods can be awaited, the others in
+    UNSUPPORTED_METHODS raise a NotImplementedError.
+    """
+
+    def __init__(self, client: httpx2.AsyncClient):
+        super().__init__(client=client)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+    async def _request(
+        self,
+        method: t.Literal["GET", "POST", "PUT", "DELETE"],
+        *path,
+        expected_code: int,
+        stream: bool = False,
+        **params,
+    ) -> httpx2.Response:
+        # Identical concurrent reads share one request, each caller then parses the fully read response itself
+        if method == "GET" and not stream and "auth" not in params:
+            key = ("/".join(convert_path(path)), expected_code, normalize_params(params))
+            return await hub_reads.do(key, lambda: self._send(method, *path, expected_code=expected_code, **params))
+
+        return await self._send(method, *path, expected_code=expected_code, stream=stream, **params)
+
+    async def _send(
+        self,
+        method: t.Literal["GET", "POST", "PUT", "DELETE"],
+        *path,
+        expected_code: int,
+        stream: bool = False,
+        **params,
+    ) -> httpx2.Response:
+        auth = params.pop("auth", httpx2.USE_CLIENT_DEFAULT)
+        request = self._client.build_request(method, "/".join(convert_path(path)), **params)
+        r = await self._client.send(request, stream=stream, auth=resolve_auth(auth))
+
+        if r.status_code != expected_code:
+            if stream:
+                await r.aread()
+
+            raise new_hub_api_error_from_response(r)
+
+        return r
+
+    async def _find_all_resources(
+        self,
+        resource_type,
+        *path,
+        include=None,
+        expected_code: int = httpx2.codes.OK.value,
+        **params,
+    ):
+        page_params = params.pop("page", None)
+        filter_params = params.pop("filter", None)
+        sort_params = params.pop("sort", None)
+        field_params = params.pop("fields", None)
+        meta_flag = params.pop("meta", False)
+
+        request_params = (
+            build_page_params(page_params)
+            | build_filter_params(filter_params)
+            | build_sort_params(sort_params)
+            | build_include_params(include)
+            | build_field_params(field_params)
+        )
+
+        r = await self._request("GET", *path, expected_code=expected_code, params=request_params, **params)
+        resource_list = ResourceList[resource_type](**r.json())
+
+        if meta_flag:
+            return resource_list.data, resource_list.meta
+
+        return resource_list.data
+
+    async def _get_all_resources(
+        self,
+        resource_type,
+        *path,
+        include=None,
+        expected_code: int = httpx2.codes.OK.value,
+        **params,
+    ):
+        return await self._find_all_resources(
+            resource_type, *path, include=include, expected_code=expected_code, **params
+        )
+
+    async def _create_resource(
+        self,
+        resource_type,
+        resource,
+        *path,
+        expected_code: int = httpx2.codes.CREATED.value,
+        **params,
+    ):
+        r = await self._request(
+            "POST", *path, expected_code=expected_code, json=resource.model_dump(mode="json"), **params
+        )
+        body = r.json()
+
+        return resource_type(**body["data"]) if _is_enveloped(body) else resource_type(**body)
+
+    async def _get_single_resource(
+        self,
+        resource_type,
+        *path,
+        include=None,
+        expected_code: int = httpx2.codes.OK.value,
+        **params,
+    ):
+        field_params = params.pop("fields", None)
+        meta_flag = params.pop("meta", False)
+        request_params = build_field_params(field_params) | build_include_params(include)
+
+        try:
+            r = await self._request("GET", *path, expected_code=expected_code, params=request_params, **params)
+
+        except HubAPIError as e:
+            if e.error_response is not None and e.error_response.status_code == httpx2.codes.NOT_FOUND.value:
+                return None
+
+            raise
+
+        body = r.json()
+        if _is_enveloped(body):
+            wrapped_resource = WrappedResource[resource_type](**body)
+            if meta_flag:
+                return wrapped_resource.data, wrapped_resource.meta
+
+            return wrapped_resource.data
+
+        if meta_flag:
+            raise ValueError(f"Single resources of type {resource_type} do not have meta data.")
+
+        return resource_type(**body)
+
+    async def _update_resource(
+        self,
+        resource_type,
+        resource,
+        *path,
+        expected_code: int = httpx2.codes.ACCEPTED.value,
+        **params,
+    ):
+        r = await self._request(
+            "POST",
+            *path,
+            expected_code=expected_code,
+            # Exclude defaults so that properties that are set to UNSET are excluded from update models.
+            json=resource.model_dump(mode="json", exclude_defaults=True),
+            **params,
+        )
+        body = r.json()
+
+        return resource_type(**body["data"]) if _is_enveloped(body) else resource_type(**body)
+
+    async def _delete_resource(self, *path, expected_code: int = httpx2.codes.ACCEPTED.value, **params) -> None:
+        await self._request("DELETE", *path, expected_code=expected_code, **params)
+
+
+for _name in UNSUPPORTED_METHODS:
+    setattr(AsyncCoreClient, _name, _unsupported(_name))
+
+
+async def iter_pages(
+    find: Callable[..., Awaitable[tuple[list, t.Any]]],
+    page_size: int = DEFAULT_PAGE_PARAMS["limit"],
+    **params,
+) -> AsyncIterator[list]:
+    """Yield every page of a Hub find_* call, fetching the next page while the caller works on the current one.
+
+    Only the page being processed and the one being prefetched are held at once, so a complete result set can be
+    scanned with bounded memory. The params are passed to every call, e.g. a filter or sort, while the page is set
+    here.
+    """
+
+    def fetch(offset: int) -> asyncio.Future:
+        return asyncio.ensure_future(find(page={"limit": page_size, "offset": offset}, meta=True, **params))
+
+    offset = 0
+    next_page = fetch(offset)
+
+    try:
+        while next_page is not None:
+            data, meta = await next_page
+            offset += page_size
+            next_page = fetch(offset) if data and offset < meta.total else None
+
+            yield data
+
+    finally:
+        if next_page is not None:  # the caller stopped early
+            next_page.cancel()
@@ -96,7 +96,7 @@ class IntegrationTestRunner:
     async def test_hub_connectivity(self):
         """Test: Verify communication with Hub."""
         logger.info("Testing Hub connectivity...")
-        analyses = self.core_client.get_analyses()
+        analyses = await self.core_client.get_analyses()
         assert analyses is not None, "Failed to fetch analyses from Hub"
         logger.info("✓ Hub communication verified")
 
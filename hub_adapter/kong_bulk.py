@@ -0,0 +1,44 @@
+"""Deleting many Kong entities for a single request.
+
+Removing a project deletes each of its link routes and analysis consumers, which can add up to hundreds of admin
+calls. They do not depend on each other, so they are sent concurrently, with a bound so Kong is not flooded.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Sequence
+
+import httpx2
+from kong_admin_client import ApiException
+from starlette import status
+
+from hub_adapter.kong_inventory import kong_inventory
+from hub_adapter.schemas.kong import KongDeleteFailure
+
+
+async def bulk_delete(
+    delete: Callable[[str], Awaitable], kind: str, entities: Sequence, limit: int
+) -> tuple[list, list[KongDeleteFailure]]:
+    """Delete every entity with at most `limit` requests in flight, returning those removed and the failures.
+
+    A failing entity does not stop the others. Entities Kong no longer knows count as removed.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def delete_one(entity) -> KongDeleteFailure | None:
+        async with semaphore:
+            try:
+                await delete(entity.id)
+
+            except ApiException as e:
+                if e.status != status.HTTP_404_NOT_FOUND:
+                    return KongDeleteFailure(id=str(entity.id), kind=kind, status=e.status, message=e.reason)
+
+            except httpx2.HTTPError as e:
+                return KongDeleteFailure(id=str(entity.id), kind=kind, message=str(e) or type(e).__name__)
+
+        kong_inventory.remove(kind, entity.id)
+        return None
+
+    failures = await asyncio.gather(*(delete_one(entity) for entity in entities))
+    removed = [entity for entity, failure in zip(entities, failures, strict=True) if failure is None]
+    return removed, [failure for failure in failures if failure is not None]
@@ -10,8 +10,10 @@ import asyncio
 import logging
 from contextlib import suppress
 from datetime import UTC, datetime, timedelta
+from time import perf_counter
 
 from fastapi import HTTPException
+from flame_hub._base_client import FilterOperator
 from kong_admin_client import ApiException
 from starlette.concurrency import run_in_threadpool
 
@@ -23,9 +25,12 @@ from hub_adapter.dependencies import (
     get_settings,
     get_ssl_context,
 )
+from hub_adapter.errors import catch_hub_errors
+from hub_adapter.hub_client import iter_pages
 from hub_adapter.middleware import log_event
-from hub_adapter.routers.hub import _parse_query_params, list_analysis_nodes
+from hub_adapter.reaper_history import compact, load_history, save_history
 from hub_adapter.routers.kong import delete_analysis, get_analyses
+from hub_adapter.scheduler import scheduler
 from hub_adapter.user_settings import load_persistent_settings
 from hub_adapter.utils import parse_tags
 
@@ -34,10 +39,26 @@ logger = logging.getLogger(__name__)
 EXECUTED_AFTER_RUNNING_GRACE = timedelta(seconds=60)
 NEVER_RAN_GRACE = timedelta(minutes=10)
 
+# Shortest wait between sweeps while consumers are still waiting to be deleted
+BACKLOG_INTERVAL = 15
+
+# Analysis IDs per Hub status lookup, keeps the filter well within URL length limits
+STATUS_LOOKUP_CHUNK_SIZE = 50
+
 # Hub execution_status values that mean the analysis is done and won't run again.
 _TERMINAL_STATUSES = {"failed", "stopped"}
 
 
+def _chunked(items: list[str], size: int) -> list[list[str]]:
+    """Split items into consecutive lists of at most size items."""
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def _snapshot(history: dict[str, dict]) -> dict[str, dict]:
+    """Copy the history, the entries are updated in place during a sweep."""
+    return {analysis_id: dict(entry) for analysis_id, entry in history.items()}
+
+
 class KongConsumerReaper:
     """Sweeps Kong analysis consumers and deletes the ones whose analysis has finished for good."""
 
@@ -46,6 +67,12 @@ class KongConsumerReaper:
         self.core_client = None
         # analysis_id -> {"seen_executing": bool, "terminal_since": datetime | None}
         self._history: dict[str, dict] = {}
+        # what was last written to the database, None until the stored history has been loaded
+        self._persisted: dict[str, dict] | None = None
+        self._failed: set[str] = set()
+        # analysis_id -> (execution_status, updated_at) as last returned by the Hub
+        self._statuses: dict[str, tuple[str | None, datetime]] = {}
+        self.last_sweep: dict | None = None
 
         self.gather_deps()  # populate self.settings and self.core_client
 
@@ -61,11 +88,44 @@ class KongConsumerReaper:
 
     async def sweep(self) -> set[str]:
         """Run one cleanup pass, returning the set of analysis_ids whose consumer was deleted."""
+        started_at = datetime.now(UTC)
+        start = perf_counter()
+        self._failed = set()
+        analysis_ids: set[str] = set()
+
+        # Peewee is synchronous, so the history is read and written in a worker thread to keep the event loop free
+        if self._persisted is None:
+            stored = await run_in_threadpool(load_history)
+            self._history = {**stored, **self._history}
+            self._persisted = _snapshot(stored)
+
+        deleted = await self._sweep(analysis_ids)
+
+        # Written once per sweep, and only the entries that changed
+        if await run_in_threadpool(save_history, self._history, self._persisted):
+            self._persisted = _snapshot(compact(self._history))
+
+        self.last_sweep = {
+            "started_at": started_at,
+            "duration_ms": round((perf_counter() - start) * 1000, 2),
+            "candidates": len(analysis_ids),
+            "deleted": len(deleted),
+            "failed": len(self._failed),
+            "pending": sum(entry["terminal_since"] is not None for entry in self._history.values()),
+        }
+        return deleted
+
+    @property
+    def backlog(self) -> bool:
+        """Whether the last sweep left consumers that are due, or will soon be due, for deletion."""
+        return bool(self.last_sweep and (self.last_sweep["failed"] or self.last_sweep["pending"]))
+
+    async def _sweep(self, analysis_ids: set[str]) -> set[str]:
+        """Decide on and delete the consumers, adding every analysis_id that has one to analysis_ids."""
         deleted: set[str] = set()
 
         try:
-            # get_analyses is a synchronous Kong helper
-            consumers = await run_in_threadpool(get_analyses, self.settings)
+            consumers = await get_analyses(self.settings)
 
         except (ApiException, HTTPException) as e:
             log_event(
@@ -76,7 +136,7 @@ class KongConsumerReaper:
             )
             return deleted
 
-        analysis_ids = {parse_tags(c.tags).get("analysis") for c in consumers["data"]}
+        analysis_ids.update(parse_tags(c.tags).get("analysis") for c in consumers["data"])
         analysis_ids.discard(None)
 
         if not analysis_ids:
@@ -85,11 +145,7 @@ class KongConsumerReaper:
 
         try:
             node_id = await get_node_id(core_client=self.core_client, settings=self.settings)
-            analysis_nodes = await list_analysis_nodes(
-                node_id=node_id,
-                query_params=_parse_query_params(),
-                core_client=self.core_client,
-            )
+            statuses = await self._fetch_statuses(node_id, analysis_ids)
 
         except HTTPException as e:
             log_event(
@@ -100,12 +156,17 @@ class KongConsumerReaper:
             )
             return deleted
 
-        statuses = {str(entry.analysis_id): entry.execution_status for entry in analysis_nodes if entry.analysis_id}
-
         now = datetime.now(UTC)
-        for analysis_id in analysis_ids:
-            if await self._process(analysis_id, statuses.get(analysis_id), now):
-                deleted.add(analysis_id)
+        semaphore = asyncio.Semaphore(get_settings().kong_bulk_concurrency)
+
+        async def process(analysis_id: str) -> bool:
+            async with semaphore:
+                return await self._process(analysis_id, statuses.get(analysis_id), now)
+
+        # After a large batch of analyses finishes, deleting their consumers one by one can outlast the interval
+        ordered_ids = list(analysis_ids)
+        results = await asyncio.gather(*(process(analysis_id) for analysis_id in ordered_ids))
+        deleted.update(analysis_id for analysis_id, removed in zip(ordered_ids, results, strict=True) if removed)
 
         # Bound memory to consumers that still exist; anything else is stale tracking.
         for stale_id in set(self._history) - analysis_ids:
@@ -113,6 +174,51 @@ class KongConsumerReaper:
 
         return deleted
 
+    @catch_hub_errors
+    async def _fetch_statuses(self, node_id: str | None, analysis_ids: set[str]) -> dict[str, str | None]:
+        """Look up the execution status of the analyses with a consumer, asking the Hub only about those.
+
+        The analysis IDs are sent in chunks as an "in" filter. For analyses already looked up in an earlier sweep,
+        the Hub is only asked for the analysis nodes updated since, the others keep their last status.
+        """
+        node_filter = {"nodeId": node_id} if node_id else {}
+        self._statuses = {
+            analysis_id: seen for analysis_id, seen in self._statuses.items() if analysis_id in analysis_ids
+        }
+
+        unseen = sorted(analysis_ids - set(self._statuses))
+        seen = sorted(self._statuses, key=lambda analysis_id: self._statuses[analysis_id][1])
+        lookups = [(chunk, None) for chunk in _chunked(unseen, STATUS_LOOKUP_CHUNK_SIZE)] + [
+            (chunk, self._statuses[chunk[0]][1]) for chunk in _chunked(seen, STATUS_LOOKUP_CHUNK_SIZE)
+        ]
+
+        results = await asyncio.gather(
+            *(self._find_analysis_nodes(node_filter, chunk, updated_since) for chunk, updated_since in lookups)
+        )
+        for entries in results:
+            for entry in entries:
+                if str(entry.analysis_id) in analysis_ids:
+                    self._statuses[str(entry.analysis_id)] = (entry.execution_status, entry.updated_at)
+
+        return {analysis_id: execution_status for analysis_id, (execution_status, _) in self._statuses.items()}
+
+    async def _find_analysis_nodes(
+        self, node_filter: dict, analysis_ids: list[str], updated_since: datetime | None
+    ) -> list:
+        """Page through the node's analysis nodes of the given analyses, optionally only those updated since.
+
+        Every page has to be read, an analysis missing from the first page would otherwise look like it never ran.
+        """
+        analysis_filter = {**node_filter, "analysisId": ",".join(analysis_ids)}
+        if updated_since is not None:
+            analysis_filter["updatedAt"] = (FilterOperator.gt, updated_since.isoformat())
+
+        entries = []
+        async for page in iter_pages(self.core_client.find_analysis_nodes, filter=analysis_filter):
+            entries.extend(entry for entry in page if entry.analysis_id)
+
+        return entries
+
     async def _process(self, analysis_id: str, execution_status: str | None, now: datetime) -> bool:
         """Apply the cleanup decision for a single analysis. Returns True if its consumer was deleted."""
         entry = self._history.setdefault(analysis_id, {"seen_executing": False, "terminal_since": None})
@@ -151,6 +257,7 @@ class KongConsumerReaper:
                 level=logging.ERROR,
                 service=ServiceTag.KONG_CLEANUP,
             )
+            self._failed.add(analysis_id)
             return False
 
         log_event(
@@ -171,11 +278,14 @@ class KongCleanupManager:
 
     def __init__(self):
         self._task: asyncio.Task | None = None
+        self._reaper: KongConsumerReaper | None = None
+        self.interval: int = 120
+        self.last_sweep: dict | None = None
 
     async def start(self) -> None:
         """Start the cleanup loop, restarting it if it's already running with a different interval."""
         settings = load_persistent_settings()
-        interval: int = settings.kong_cleanup.interval if settings.kong_cleanup else 120
+        self.interval = settings.kong_cleanup.interval if settings.kong_cleanup else 120
 
         restarting = self._task is not None
         await self._cancel_current_task()
@@ -183,36 +293,42 @@ class KongCleanupManager:
         log_event(
             "kong_cleanup.restarted" if restarting else "kong_cleanup.started",
             event_description=f"{'Restarting' if restarting else 'Starting'} Kong consumer cleanup "
-                              f"with interval {interval}s",
+                              f"with interval {self.interval}s",
             level=logging.INFO,
             service=ServiceTag.KONG_CLEANUP,
         )
-        self._task = asyncio.create_task(self._run_cleanup(interval))
-
-    async def _run_cleanup(self, interval: int) -> None:
-        """Run the cleanup sweep loop."""
-        reaper = None
-        while True:
-            try:
-                if reaper is None:
-                    reaper = KongConsumerReaper()
-                log_event(
-                    "kong_cleanup.poll",
-                    event_description="Sweeping for stale Kong analysis consumers",
-                    level=logging.DEBUG,
-                    service=ServiceTag.KONG_CLEANUP,
-                )
-                await reaper.sweep()
-
-            except Exception as e:
-                log_event(
-                    "kong_cleanup.error",
-                    event_description=f"Error during Kong consumer cleanup: {e}",
-                    level=logging.ERROR,
-                    service=ServiceTag.KONG_CLEANUP,
-                )
-
-            await asyncio.sleep(interval)
+        self._task = scheduler.schedule(
+            "kong_cleanup",
+            self._run_cleanup,
+            self.interval,
+            label="Kong consumer cleanup",
+            leader_only=True,
+            service=ServiceTag.KONG_CLEANUP,
+            on_elected=self._forget_reaper,
+        )
+
+    def _forget_reaper(self) -> None:
+        """Start over from the stored cleanup history, which another replica may have changed in the meantime."""
+        self._reaper = None
+
+    async def _run_cleanup(self) -> int:
+        """Run one cleanup sweep, returning the seconds until the next, fewer while consumers are waiting."""
+        if self._reaper is None:
+            self._reaper = KongConsumerReaper()
+        log_event(
+            "kong_cleanup.poll",
+            event_description="Sweeping for stale Kong analysis consumers",
+            level=logging.DEBUG,
+            service=ServiceTag.KONG_CLEANUP,
+        )
+        await self._reaper.sweep()
+
+        next_interval = self.interval
+        if self._reaper.backlog:
+            next_interval = min(self.interval, max(BACKLOG_INTERVAL, self.interval // 4))
+
+        self.last_sweep = {**self._reaper.last_sweep, "next_interval": next_interval}
+        return next_interval
 
     async def _cancel_current_task(self) -> None:
         """Cancel and await the current task if one exists."""
@@ -0,0 +1,142 @@
+"""Asyncio-native access to the Kong admin API.
+
+kong_admin_client is generated as a synchronous urllib3 client, so every Kong call used to hold a worker thread for
+as long as the request was in flight, with the handlers and background loops offloading to the thread pool around it.
+The few admin endpoints this API uses are small enough to call directly over an httpx2.AsyncClient, while keeping the
+method names, models and ApiException of kong_admin_client so the callers and the error handling stay the same.
+"""
+
+from typing import Any
+
+import httpx2
+from kong_admin_client import (
+    ACL,
+    ApiException,
+    Consumer,
+    CreateAclForConsumerRequest,
+    CreateConsumerRequest,
+    CreateKeyAuthForConsumerRequest,
+    CreatePluginForConsumerRequest,
+    CreateRouteRequest,
+    CreateServiceRequest,
+    KeyAuth,
+    ListConsumer200Response,
+    ListKeyAuthsForConsumer200Response,
+    ListRoute200Response,
+    ListService200Response,
+    Plugin,
+    Route,
+    Service,
+)
+
+
+class AsyncKongAdmin:
+    """The Kong admin endpoints for services, routes, consumers, plugins, ACLs and key-auth credentials.
+
+    Every call goes through the one AsyncClient, reusing its pooled connections, and is bounded by the client's
+    timeout unless given its own. Responses other than 2xx raise a kong_admin_client ApiException.
+    """
+
+    def __init__(self, client: httpx2.AsyncClient):
+        self._client = client
+
+    async def _request(self, method: str, path: str, body=None, params: dict | None = None, timeout=None) -> Any:
+        kwargs = {} if timeout is None else {"timeout": timeout}
+        r = await self._client.request(
+            method,
+            path,
+            json=None if body is None else body.to_dict(),
+            params={key: value for key, value in (params or {}).items() if value is not None},
+            **kwargs,
+        )
+
+        if not r.is_success:
+            raise ApiException(status=r.status_code, reason=r.reason_phrase, body=r.text)
+
+        return r.json() if r.content else None
+
+    # Services
+    async def list_service(
+        self, size: int | None = None, offset: str | None = None, tags: str | None = None, timeout=None
+    ) -> ListService200Response:
+        params = {"size": size, "offset": offset, "tags": tags}
+        return ListService200Response.model_validate(
+            await self._request("GET", "services", params=params, timeout=timeout)
+        )
+
+    async def get_service(self, service_id_or_name: str, timeout=None) -> Service:
+        return Service.model_validate(await self._request("GET", f"services/{service_id_or_name}", timeout=timeout))
+
+    async def create_service(self, create_service_request: CreateServiceRequest, timeout=None) -> Service:
+        return Service.model_validate(
+            await self._request("POST", "services", body=create_service_request, timeout=timeout)
+        )
+
+    async def delete_service(self, service_id_or_name: str, timeout=None) -> None:
+        await self._request("DELETE", f"services/{service_id_or_name}", timeout=timeout)
+
+    async def create_plugin_for_service(
+        self, service_id_or_name: str, create_plugin_request: CreatePluginForConsumerRequest, timeout=None
+    ) -> Plugin:
+        path = f"services/{service_id_or_name}/plugins"
+        return Plugin.model_validate(await self._request("POST", path, body=create_plugin_request, timeout=timeout))
+
+    # Routes
+    async def list_route(
+        self, size: int | None = None, offset: str | None = None, tags: str | None = None, timeout=None
+    ) -> ListRoute200Response:
+        params = {"size": size, "offset": offset, "tags": tags}
+        return ListRoute200Response.model_validate(await self._request("GET", "routes", params=params, timeout=timeout))
+
+    async def create_route_for_service(
+        self, service_id_or_name: str, create_route_request: CreateRouteRequest, timeout=None
+    ) -> Route:
+        path = f"services/{service_id_or_name}/routes"
+        return Route.model_validate(await self._request("POST", path, body=create_route_request, timeout=timeout))
+
+    async def delete_route(self, route_id_or_name: str, timeout=None) -> None:
+        await self._request("DELETE", f"routes/{route_id_or_name}", timeout=timeout)
+
+    async def create_plugin_for_route(
+        self, route_id_or_name: str, create_plugin_request: CreatePluginForConsumerRequest, timeout=None
+    ) -> Plugin:
+        path = f"routes/{route_id_or_name}/plugins"
+        return Plugin.model_validate(await self._request("POST", path, body=create_plugin_request, timeout=timeout))
+
+    # Consumers
+    async def list_consumer(
+        self, size: int | None = None, offset: str | None = None, tags: str | None = None, timeout=None
+    ) -> ListConsumer200Response:
+        params = {"size": size, "offset": offset, "tags": tags}
+        return ListConsumer200Response.model_validate(
+            await self._request("GET", "consumers", params=params, timeout=timeout)
+        )
+
+    async def create_consumer(self, create_consumer_request: CreateConsumerRequest, timeout=None) -> Consumer:
+        return Consumer.model_validate(
+            await self._request("POST", "consumers", body=create_consumer_request, timeout=timeout)
+        )
+
+    async def delete_consumer(self, consumer_username_or_id: str, timeout=None) -> None:
+        await self._request("DELETE", f"consumers/{consumer_username_or_id}", timeout=timeout)
+
+    async def create_acl_for_consumer(
+        self, consumer_username_or_id: str, create_acl_request: CreateAclForConsumerRequest, timeout=None
+    ) -> ACL:
+        path = f"consumers/{consumer_username_or_id}/acls"
+        return ACL.model_validate(await self._request("POST", path, body=create_acl_request, timeout=timeout))
+
+    async def list_key_auths_for_consumer(
+        self, consumer_username_or_id: str, timeout=None
+    ) -> ListKeyAuthsForConsumer200Response:
+        path = f"consumers/{consumer_username_or_id}/key-auth"
+        return ListKeyAuthsForConsumer200Response.model_validate(await self._request("GET", path, timeout=timeout))
+
+    async def create_key_auth_for_consumer(
+        self, consumer_username_or_id: str, create_key_auth_request: CreateKeyAuthForConsumerRequest, timeout=None
+    ) -> KeyAuth:
+        path = f"consumers/{consumer_username_or_id}/key-auth"
+        return KeyAuth.model_validate(await self._request("POST", path, body=create_key_auth_request, timeout=timeout))
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
@@ -0,0 +1,199 @@
+"""In-process snapshot of the Kong services, routes and consumers, indexed by their tags.
+
+Nearly every Kong read filters by tag (project, datastore, analysis, type), so serving those from a periodically
+refreshed snapshot removes the Kong admin round-trips from the request path. Writes made through this API update the
+snapshot straight away, changes made elsewhere show up with the next refresh.
+"""
+
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from contextlib import suppress
+from typing import Any
+
+from hub_adapter.constants import ServiceTag
+from hub_adapter.dependencies import get_kong_client, get_settings
+from hub_adapter.kong_client import AsyncKongAdmin
+from hub_adapter.kong_paging import collect_pages
+from hub_adapter.middleware import log_event
+
+SERVICES = "services"
+ROUTES = "routes"
+CONSUMERS = "consumers"
+
+
+class KongInventory:
+    """Kong entities by kind, with an index of the entity IDs carrying each tag.
+
+    Reads return None while the snapshot is missing or older than max_age, so callers fall back to asking Kong
+    rather than serving a snapshot whose refreshes keep failing. Entities are shared with the callers and must not be
+    modified in place.
+    """
+
+    def __init__(self, max_age: float = 0):
+        self.max_age = max_age
+
+        self._entities: dict[str, dict[str, Any]] = {kind: {} for kind in (SERVICES, ROUTES, CONSUMERS)}
+        self._tags: dict[str, defaultdict[str, set[str]]] = {kind: defaultdict(set) for kind in self._entities}
+        self._loaded_at: float | None = None
+        self._journal: list[tuple[str, str, Any]] | None = None  # writes made while a refresh is listing Kong
+
+    @property
+    def ready(self) -> bool:
+        """Whether the snapshot is recent enough to be read from."""
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at <= self.max_age
+
+    def services(self, *tags: str) -> list | None:
+        """Services carrying every given tag, or None if the snapshot cannot be used."""
+        return self._find(SERVICES, tags)
+
+    def routes(self, *tags: str) -> list | None:
+        """Routes carrying every given tag, or None if the snapshot cannot be used."""
+        return self._find(ROUTES, tags)
+
+    def consumers(self, *tags: str) -> list | None:
+        """Consumers carrying every given tag, or None if the snapshot cannot be used."""
+        return self._find(CONSUMERS, tags)
+
+    def _find(self, kind: str, tags: tuple[str, ...]) -> list | None:
+        if not self.ready:
+            return None
+
+        if not tags:
+            return list(self._entities[kind].values())
+
+        ids = set.intersection(*(self._tags[kind].get(tag, set()) for tag in tags))
+        return [entity for entity_id, entity in self._entities[kind].items() if entity_id in ids]
+
+    def put(self, kind: str, entity) -> None:
+        """Add or replace an entity that was just created in Kong."""
+        self._apply(kind, str(entity.id), entity)
+        if self._journal is not None:
+            self._journal.append((kind, str(entity.id), entity))
+
+    def remove(self, kind: str, entity_id) -> None:
+        """Drop an entity that was just deleted from Kong."""
+        self._apply(kind, str(entity_id), None)
+        if self._journal is not None:
+            self._journal.append((kind, str(entity_id), None))
+
+    def _apply(self, kind: str, entity_id: str, entity) -> None:
+        previous = self._entities[kind].pop(entity_id, None)
+        if previous is not None:
+            for tag in previous.tags or []:
+                self._tags[kind][tag].discard(entity_id)
+
+        if entity is not None:
+            self._entities[kind][entity_id] = entity
+            for tag in entity.tags or []:
+                self._tags[kind][tag].add(entity_id)
+
+    async def refresh(self, kong: AsyncKongAdmin, page_size: int) -> None:
+        """Replace the snapshot with the current state of Kong, listing every page of each kind concurrently.
+
+        Writes made while Kong is being listed are replayed on top, the listing may have been taken before them.
+        """
+        self._journal = []
+
+        try:
+            services, routes, consumers = await asyncio.gather(
+                collect_pages(kong.list_service, page_size),
+                collect_pages(kong.list_route, page_size),
+                collect_pages(kong.list_consumer, page_size),
+            )
+
+        except BaseException:
+            self._journal = None
+            raise
+
+        listed = {SERVICES: services, ROUTES: routes, CONSUMERS: consumers}
+
+        for kind, entities in listed.items():
+            self._entities[kind] = {}
+            self._tags[kind] = defaultdict(set)
+            for entity in entities:
+                self._apply(kind, str(entity.id), entity)
+
+        for kind, entity_id, entity in self._journal:
+            self._apply(kind, entity_id, entity)
+
+        self._journal = None
+        self._loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        """Stop serving reads until the next refresh."""
+        self._loaded_at = None
+
+
+kong_inventory = KongInventory()
+
+
+class KongInventoryManager:
+    """Manages the loop keeping the Kong inventory up to date."""
+
+    def __init__(self):
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        """Start the refresh loop, unless it is disabled by setting its interval to 0."""
+        interval = get_settings().kong_inventory_interval
+        await self._cancel_current_task()
+
+        if not interval:
+            return
+
+        # Let a couple of refreshes fail before going back to asking Kong directly
+        kong_inventory.max_age = 3 * interval
+
+        log_event(
+            "kong_inventory.started",
+            event_description=f"Refreshing the Kong inventory every {interval}s",
+            level=logging.INFO,
+            service=ServiceTag.KONG,
+        )
+        self._task = asyncio.create_task(self._run_refresh(interval))
+
+    async def _run_refresh(self, interval: float) -> None:
+        """Run the refresh loop."""
+        while True:
+            try:
+                await self._refresh()
+
+            except Exception as e:
+                log_event(
+                    "kong_inventory.error",
+                    event_description=f"Unable to refresh the Kong inventory: {e}",
+                    level=logging.ERROR,
+                    service=ServiceTag.KONG,
+                )
+
+            await asyncio.sleep(interval)
+
+    @staticmethod
+    async def _refresh() -> None:
+        settings = get_settings()
+        await kong_inventory.refresh(get_kong_client(settings), settings.kong_page_size)
+
+    async def _cancel_current_task(self) -> None:
+        """Cancel and await the current task if one exists."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            with suppress(asyncio.CancelledError, RuntimeError):
+                await self._task
+
+        self._task = None
+
+    async def stop(self) -> None:
+        """Stop the refresh loop, reads go to Kong again afterwards."""
+        was_running = self._task is not None
+        await self._cancel_current_task()
+        kong_inventory.invalidate()
+
+        if was_running:
+            log_event(
+                "kong_inventory.stopped",
+                event_description="Stopping the Kong inventory refresh",
+                level=logging.INFO,
+                service=ServiceTag.KONG,
+            )
@@ -0,0 +1,52 @@
+"""Reading complete result sets from the Kong admin list endpoints.
+
+Kong returns at most `size` entities per list call, 100 unless set, along with an offset to request the next page
+from. Anything past the first page is silently dropped by a caller that does not follow it.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from urllib.parse import parse_qs, urlsplit
+
+
+def next_offset(page) -> str | None:
+    """Offset of the page after this one, or None if it is the last."""
+    next_url = getattr(page, "next", None)
+    if not isinstance(next_url, str) or not next_url:
+        return None
+
+    offset = getattr(page, "offset", None)
+    if isinstance(offset, str) and offset:
+        return offset
+
+    # Only the URL of the next page was returned
+    return parse_qs(urlsplit(next_url).query).get("offset", [None])[0]
+
+
+async def iter_pages(list_page: Callable[..., Awaitable], page_size: int, **params) -> AsyncIterator[list]:
+    """Yield every page of an AsyncKongAdmin list method.
+
+    As soon as a page arrives, the next one is requested while the caller works on the current one.
+    """
+
+    def fetch(**offset) -> asyncio.Future:
+        return asyncio.ensure_future(list_page(size=page_size, **offset, **params))
+
+    next_page = fetch()
+
+    try:
+        while next_page is not None:
+            page = await next_page
+            offset = next_offset(page)
+            next_page = fetch(offset=offset) if offset else None
+
+            yield page.data or []
+
+    finally:
+        if next_page is not None:  # the caller stopped early
+            next_page.cancel()
+
+
+async def collect_pages(list_page: Callable[..., Awaitable], page_size: int, **params) -> list:
+    """Every entity of an AsyncKongAdmin list method."""
+    return [entity async for page in iter_pages(list_page, page_size, **params) for entity in page]
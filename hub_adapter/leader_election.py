@@ -0,0 +1,107 @@
+"""Electing the one replica that runs a background job through Postgres advisory locks.
+
+Session level advisory locks belong to the connection that took them and are released by Postgres as soon as that
+connection goes away, so a replica that dies hands the job over without anyone having to clean up after it. A replica
+stopping a job unlocks it straight away, and the connection holding the locks asks Postgres for aggressive TCP
+keepalives, so that a replica whose host vanished without closing it loses its locks within seconds rather than after
+the hours the OS default takes.
+"""
+
+import asyncio
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+
+import peewee as pw
+
+from hub_adapter.database import get_node_database
+
+logger = logging.getLogger(__name__)
+
+# Postgres drops the session of a vanished leader after about idle + interval * count seconds
+SESSION_KEEPALIVES = (
+    "SET tcp_keepalives_idle = 10",
+    "SET tcp_keepalives_interval = 5",
+    "SET tcp_keepalives_count = 3",
+)
+
+
+def lock_key(name: str) -> int:
+    """Stable signed 64-bit advisory lock key for a name, the same in every replica."""
+    digest = hashlib.blake2b(f"hub_adapter.{name}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, signed=True)
+
+
+class AdvisoryLockElector:
+    """Holds an advisory lock per job for as long as this replica is the one running it.
+
+    peewee hands every thread its own connection, so all queries go through a single dedicated thread to keep the
+    locks on the one connection that took them.
+    """
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="leader-election")
+        self._held: set[str] = set()
+        self._session_ready = False
+        self._warned = False
+
+    async def is_leader(self, name: str) -> bool:
+        """Whether this replica holds the lock of the job, trying to take it if not."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self._acquire, name)
+
+    def release(self, name: str) -> None:
+        """Unlock the job so another replica can take it over, without waiting for the unlock to go through."""
+        self._executor.submit(self._release, name)
+
+    def _acquire(self, name: str) -> bool:
+        db = get_node_database()
+        if db is None:
+            if not self._warned:
+                logger.warning("No database available for leader election, running the background jobs regardless")
+                self._warned = True
+
+            return True
+
+        try:
+            if name in self._held:
+                # The lock lives as long as the connection that took it, so checking that it is alive is enough
+                db.execute_sql("SELECT 1")
+                return True
+
+            if not self._session_ready:
+                for statement in SESSION_KEEPALIVES:
+                    db.execute_sql(statement)
+                self._session_ready = True
+
+            (acquired,) = db.execute_sql("SELECT pg_try_advisory_lock(%s)", (lock_key(name),)).fetchone()
+
+        except pw.PeeweeException as db_err:
+            logger.warning(f"Lost the database connection used for leader election: {db_err}")
+            self._held.clear()
+            self._session_ready = False
+            # Never hand a connection that may still hold the locks back to the pool
+            with suppress(Exception):
+                db.manual_close()
+
+            return False
+
+        if acquired:
+            self._held.add(name)
+
+        return bool(acquired)
+
+    def _release(self, name: str) -> None:
+        if name not in self._held:
+            return
+
+        self._held.discard(name)
+        db = get_node_database()
+        if db is None:
+            return
+
+        try:
+            db.execute_sql("SELECT pg_advisory_unlock(%s)", (lock_key(name),))
+
+        except pw.PeeweeException as db_err:
+            logger.warning(f"Unable to release the leader election lock of {name}: {db_err}")
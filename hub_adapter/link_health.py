@@ -0,0 +1,295 @@
+"""Background routine that probes every Kong project-datastore link and keeps the latest result of each.
+
+A link used to be checked only when someone asked for it, which probes the data store through Kong right then. The
+monitor probes all links concurrently on an interval instead, so the health endpoint and autostart can use the last
+result straight away. The results are also stored in Postgres next to the downstream service checks, when available.
+"""
+
+import asyncio
+import logging
+import uuid
+from contextlib import contextmanager, suppress
+from datetime import UTC, datetime, timedelta
+
+import peewee as pw
+from fastapi import HTTPException
+from playhouse.postgres_ext import DateTimeTZField
+
+from hub_adapter.conf import ServiceHealthSettings
+from hub_adapter.constants import ServiceTag
+from hub_adapter.database import get_node_database
+from hub_adapter.dependencies import get_settings
+from hub_adapter.middleware import log_event
+from hub_adapter.schemas.health import ServiceCheckStatus
+from hub_adapter.service_health import DEFAULT_RETENTION_DAYS, MESSAGE_MAX_LENGTH, PRUNE_INTERVAL
+from hub_adapter.user_settings import load_persistent_settings
+from hub_adapter.utils import parse_tags
+
+logger = logging.getLogger(__name__)
+
+
+class DataStoreLinkCheck(pw.Model):
+    """Database table schema for a single probe of a project's link to a data store.
+
+    Attributes
+    ----------
+    sweep_id : uuid.UUID
+        Groups every link probed in the same cycle.
+    project_id : str
+        UUID of the linked project.
+    datastore_id : str
+        Kong service ID of the linked data store.
+    route_id : str
+        Kong route linking the two, a link that was deleted and created again gets a new one.
+    checked_at : datetime
+        UTC timestamp of the sweep the probe belongs to.
+    status : str
+        Either "OK" or "ERROR".
+    status_code : int | None
+        HTTP status of the probe, i.e. of the error raised when it failed.
+    message : str | None
+        Error text, truncated to MESSAGE_MAX_LENGTH characters.
+    """
+
+    id = pw.BigAutoField()
+    sweep_id = pw.UUIDField()
+    project_id = pw.CharField(max_length=64)
+    datastore_id = pw.CharField(max_length=64)
+    route_id = pw.CharField(max_length=64)
+    checked_at = DateTimeTZField(index=True)
+    status = pw.CharField(max_length=16)
+    status_code = pw.IntegerField(null=True)
+    message = pw.TextField(null=True)
+
+    class Meta:
+        table_name = "datastore_link_check"
+        indexes = ((("project_id", "datastore_id", "checked_at"), False),)
+
+
+@contextmanager
+def bind_link_health(db: pw.Database):
+    """Bind the link check model to a database, creating the table if it does not exist yet."""
+    with db.bind_ctx((DataStoreLinkCheck,)):
+        db.create_tables((DataStoreLinkCheck,))
+        yield
+
+
+def record_link_sweep(db: pw.Database, results: list[dict]) -> uuid.UUID:
+    """Persist the results of one link probe cycle under a shared sweep ID."""
+    sweep_id = uuid.uuid4()
+    columns = ("project_id", "datastore_id", "route_id", "checked_at", "status", "status_code", "message")
+    rows = [{"sweep_id": sweep_id, **{column: result[column] for column in columns}} for result in results]
+
+    if rows:
+        with bind_link_health(db):
+            DataStoreLinkCheck.insert_many(rows).execute()
+
+    return sweep_id
+
+
+def prune_old_link_checks(db: pw.Database, retention_days: int) -> int:
+    """Delete link checks older than the retention window, returning the number of rows removed."""
+    cutoff = datetime.now(UTC) - timedelta(days=retention_days)
+
+    with bind_link_health(db):
+        return DataStoreLinkCheck.delete().where(DataStoreLinkCheck.checked_at < cutoff).execute()
+
+
+def _as_result(route, outcome: int | HTTPException, checked_at: datetime) -> dict:
+    """Turn the outcome of probe_links for one route into a stored result."""
+    tags = parse_tags(route.tags)
+    error = outcome if isinstance(outcome, HTTPException) else None
+    message = None
+
+    if error is not None:
+        message = error.detail.get("message") if isinstance(error.detail, dict) else error.detail
+        message = str(message)[:MESSAGE_MAX_LENGTH] if message is not None else None
+
+    return {
+        "project_id": tags.get("project"),
+        "datastore_id": tags.get("datastore") or (route.service.id if route.service else None),
+        "route_id": route.id,
+        "checked_at": checked_at,
+        "status": ServiceCheckStatus.ERROR if error is not None else ServiceCheckStatus.OK,
+        "status_code": error.status_code if error is not None else outcome,
+        "message": message,
+        "error": error,
+    }
+
+
+class LinkHealthMonitor:
+    """Manages the loop probing the Kong project-datastore links and holds the latest result of each."""
+
+    def __init__(self):
+        self._task: asyncio.Task | None = None
+        self._db: pw.PostgresqlDatabase | None = None
+        self._connection_attempted = False
+        self._last_prune: datetime | None = None
+        self._results: dict[str, dict] = {}  # by route ID
+        self._checked_at: datetime | None = None
+        self.interval: float = 0
+        self.retention_days: int = DEFAULT_RETENTION_DAYS
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the links are being probed in the background."""
+        return self._task is not None
+
+    def latest(self, route_id: str) -> dict | None:
+        """Latest result for the link with this route, or None if it was not probed in the last two intervals."""
+        if self._checked_at is None or datetime.now(UTC) - self._checked_at > timedelta(seconds=2 * self.interval):
+            return None
+
+        return self._results.get(route_id)
+
+    def unreachable_projects(self) -> set[str]:
+        """Projects whose every linked data store failed its latest probe."""
+        reachable, unreachable = set(), set()
+        for route_id in self._results:
+            result = self.latest(route_id)
+            if result is not None:
+                (reachable if result["status"] == ServiceCheckStatus.OK else unreachable).add(result["project_id"])
+
+        return unreachable - reachable
+
+    async def start(self) -> None:
+        """Start the monitoring loop, unless it is disabled by setting its interval to 0."""
+        settings = get_settings()
+        self.interval = settings.kong_link_health_interval
+        self.retention_days = (
+            load_persistent_settings().service_health or ServiceHealthSettings()
+        ).retention_days or DEFAULT_RETENTION_DAYS
+        await self._cancel_current_task()
+
+        if not self.interval or not settings.kong_proxy_service_url:
+            return
+
+        if not self._connection_attempted:
+            self._connection_attempted = True
+            self._db = self._connect()
+
+        log_event(
+            "link_health.started",
+            event_description=f"Probing the data store links every {self.interval}s"
+            + ("" if self._db is not None else ", the results are not stored since no database is available"),
+            level=logging.INFO,
+            service=ServiceTag.HEALTH,
+        )
+        self._task = asyncio.create_task(self._run_monitor())
+
+    @staticmethod
+    def _connect() -> pw.PostgresqlDatabase | None:
+        """Connect to Postgres and make sure the link check table exists."""
+        db = get_node_database()
+        if db is None:
+            return None
+
+        try:
+            with bind_link_health(db):  # creates the table if it is not there yet
+                pass
+
+        except pw.PeeweeException as db_err:
+            logger.warning(f"Unable to prepare the data store link check table: {db_err}")
+            return None
+
+        return db
+
+    async def _run_monitor(self) -> None:
+        """Probe the links on a loop and store the results."""
+        while True:
+            try:
+                await self.sweep()
+
+            except Exception as e:
+                log_event(
+                    "link_health.error",
+                    event_description=f"Error during data store link monitoring: {e}",
+                    level=logging.ERROR,
+                    service=ServiceTag.HEALTH,
+                )
+
+            await asyncio.sleep(self.interval)
+
+    async def sweep(self) -> list[dict]:
+        """Probe every link once, keep the results, persist them, and prune expired rows when due."""
+        from hub_adapter.routers.kong import list_projects, probe_links  # avoid a circular import
+
+        settings = get_settings()
+        routes = [
+            route
+            for route in (await list_projects(settings=settings, detailed=False)).data
+            if parse_tags(route.tags).get("project") and route.paths
+        ]
+
+        # No retries: a route Kong is still creating shows up healthy in the next sweep
+        outcomes = await probe_links(settings, routes, max_attempts=0)
+        checked_at = datetime.now(UTC)
+        results = [_as_result(route, outcome, checked_at) for route, outcome in zip(routes, outcomes, strict=True)]
+
+        self._log_status_changes(results)
+        self._results = {result["route_id"]: result for result in results}
+        self._checked_at = checked_at
+
+        if self._db is not None:
+            try:
+                record_link_sweep(self._db, results)
+                self._prune_if_due()
+
+            except pw.PeeweeException as db_err:
+                log_event(
+                    "link_health.write_error",
+                    event_description=f"Unable to store data store link results: {db_err}",
+                    level=logging.ERROR,
+                    service=ServiceTag.HEALTH,
+                )
+
+        return results
+
+    def _log_status_changes(self, results: list[dict]) -> None:
+        """Emit an event whenever a link flips between OK and ERROR."""
+        for result in results:
+            previous = self._results.get(result["route_id"])
+            current = result["status"]
+            if previous is not None and previous["status"] != current:
+                log_event(
+                    "link_health.status_change",
+                    event_description=f"Link of project {result['project_id']} to data store "
+                    f"{result['datastore_id']} went from {previous['status']} to {current}"
+                    + (f": {result['message']}" if result["message"] else ""),
+                    level=logging.WARNING if current == ServiceCheckStatus.ERROR else logging.INFO,
+                    status_code=result["status_code"],
+                    service=ServiceTag.HEALTH,
+                )
+
+    def _prune_if_due(self) -> None:
+        """Delete expired rows, at most once per PRUNE_INTERVAL."""
+        now = datetime.now(UTC)
+        if self._last_prune is not None and now - self._last_prune < PRUNE_INTERVAL:
+            return
+
+        prune_old_link_checks(self._db, self.retention_days)
+        self._last_prune = now
+
+    async def _cancel_current_task(self) -> None:
+        """Cancel and await the current task if one exists."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            with suppress(asyncio.CancelledError, RuntimeError):
+                await self._task
+
+        self._task = None
+
+    async def stop(self) -> None:
+        """Stop the monitoring task and forget the results, the endpoint probes live again afterwards."""
+        was_running = self._task is not None
+        await self._cancel_current_task()
+        self._results = {}
+        self._checked_at = None
+
+        if was_running:
+            log_event(
+                "link_health.stopped",
+                event_description="Stopping data store link monitoring",
+                level=logging.INFO,
+                service=ServiceTag.HEALTH,
+            )
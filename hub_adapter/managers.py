@@ -8,8 +8,14 @@ managers.
 
 from hub_adapter.autostart import AutostartManager
 from hub_adapter.kong_cleanup import KongCleanupManager
+from hub_adapter.kong_inventory import KongInventoryManager
+from hub_adapter.link_health import LinkHealthMonitor
+from hub_adapter.request_rollup import RequestRollupManager
 from hub_adapter.service_health import ServiceHealthMonitor
 
 autostart_manager = AutostartManager()
 kong_cleanup_manager = KongCleanupManager()
+kong_inventory_manager = KongInventoryManager()
 service_health_monitor = ServiceHealthMonitor()
+link_health_monitor = LinkHealthMonitor()
+request_rollup_manager = RequestRollupManager()
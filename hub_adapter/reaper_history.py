@@ -0,0 +1,153 @@
+"""Saving and loading the grace period history of the Kong consumer cleanup sweep.
+
+The sweep only deletes the consumer of a failed or stopped analysis once it has been terminal for a grace period, so
+it has to remember when it first saw that status. Kept in memory only, every restart reset those timers. Only the
+analyses with something to remember are stored, one row each, in Postgres with a JSON file as the fallback.
+"""
+
+import json
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+
+import peewee as pw
+from playhouse.postgres_ext import DateTimeTZField
+
+from hub_adapter import cache_dir
+from hub_adapter.database import get_node_database
+from hub_adapter.user_settings import with_db_fallback
+
+HISTORY_PATH = cache_dir.joinpath("kongCleanupHistory.json")
+
+logger = logging.getLogger(__name__)
+
+
+class KongCleanupHistory(pw.Model):
+    """Database table schema for the cleanup state of a single analysis.
+
+    Attributes
+    ----------
+    analysis_id : str
+        UUID of the analysis whose consumer is tracked.
+    seen_executing : bool
+        Whether the analysis was seen executing, which shortens its grace period.
+    terminal_since : datetime | None
+        When the analysis was first seen failed or stopped.
+    """
+
+    analysis_id = pw.CharField(max_length=64, primary_key=True)
+    seen_executing = pw.BooleanField(default=False)
+    terminal_since = DateTimeTZField(null=True)
+
+    class Meta:
+        table_name = "kong_cleanup_history"
+
+
+@contextmanager
+def bind_reaper_history(db: pw.Database):
+    """Bind the history model to a database, creating the table if it does not exist yet."""
+    with db.bind_ctx((KongCleanupHistory,)):
+        db.create_tables((KongCleanupHistory,))
+        yield
+
+
+def compact(history: dict[str, dict]) -> dict[str, dict]:
+    """Drop the entries that hold nothing beyond the defaults a new entry would get anyway."""
+    return {
+        analysis_id: entry
+        for analysis_id, entry in history.items()
+        if entry["seen_executing"] or entry["terminal_since"] is not None
+    }
+
+
+@with_db_fallback(fallback_value=None, log_message="Database unavailable, falling back to the cached cleanup history")
+def _load_from_database() -> dict[str, dict] | None:
+    """Load the history from the database, or None when there is no database."""
+    node_database = get_node_database()
+    if node_database is None:
+        return None
+
+    with bind_reaper_history(node_database):
+        return {
+            row["analysis_id"]: {"seen_executing": row["seen_executing"], "terminal_since": row["terminal_since"]}
+            for row in KongCleanupHistory.select().dicts()
+        }
+
+
+def _load_from_json() -> dict[str, dict]:
+    """Load the history from the JSON file."""
+    if not HISTORY_PATH.exists():
+        return {}
+
+    try:
+        saved = json.loads(HISTORY_PATH.read_text())
+        return {
+            analysis_id: {
+                "seen_executing": entry["seen_executing"],
+                "terminal_since": datetime.fromisoformat(entry["terminal_since"]) if entry["terminal_since"] else None,
+            }
+            for analysis_id, entry in saved.items()
+        }
+
+    except Exception as file_err:
+        logger.error(f"Failed to load the cleanup history from JSON file: {file_err}")
+        return {}
+
+
+@with_db_fallback(fallback_value=False, log_message="Failed to save the cleanup history to the database")
+def _save_to_database(changed: dict[str, dict], removed: set[str]) -> bool:
+    """Write the changed entries and delete the removed ones in a single transaction."""
+    node_database = get_node_database()
+    if node_database is None:
+        return False
+
+    with bind_reaper_history(node_database), node_database.atomic():
+        if removed:
+            KongCleanupHistory.delete().where(KongCleanupHistory.analysis_id.in_(list(removed))).execute()
+
+        if changed:
+            KongCleanupHistory.insert_many(
+                [{"analysis_id": analysis_id, **entry} for analysis_id, entry in changed.items()]
+            ).on_conflict(
+                conflict_target=[KongCleanupHistory.analysis_id],
+                preserve=[KongCleanupHistory.seen_executing, KongCleanupHistory.terminal_since],
+            ).execute()
+
+    return True
+
+
+def _save_to_json(history: dict[str, dict]) -> None:
+    """Save the whole history to the JSON file."""
+    try:
+        HISTORY_PATH.write_text(json.dumps(history, default=str))
+
+    except Exception as file_err:
+        logger.error(f"Failed to save the cleanup history to JSON file: {file_err}")
+
+
+def load_history() -> dict[str, dict]:
+    """Get the history from the database with fallback to the JSON file."""
+    history = _load_from_database()
+    return history if history is not None else _load_from_json()
+
+
+def save_history(history: dict[str, dict], persisted: dict[str, dict]) -> bool:
+    """Write what changed since the persisted snapshot to the database, or all of it to the JSON file without one.
+
+    Returns
+    -------
+    bool
+        Whether the database is up to date, i.e. history is the new snapshot to compare against.
+    """
+    history = compact(history)
+    changed = {analysis_id: entry for analysis_id, entry in history.items() if persisted.get(analysis_id) != entry}
+    removed = set(persisted) - set(history)
+
+    if not changed and not removed:
+        return True
+
+    if _save_to_database(changed, removed):
+        return True
+
+    _save_to_json(history)
+    return False
@@ -0,0 +1,476 @@
+"""Background routine that rolls the API access logs up into per-minute request counts stored in Postgres."""
+
+import asyncio
+import json
+import logging
+import re
+from collections.abc import Iterable
+from contextlib import contextmanager, suppress
+from datetime import UTC, datetime, timedelta
+
+import peewee as pw
+from fastapi.routing import iter_route_contexts
+from playhouse.postgres_ext import DateTimeTZField
+from starlette.routing import BaseRoute
+
+from hub_adapter.conf import RequestRollupSettings
+from hub_adapter.constants import ServiceTag
+from hub_adapter.database import get_node_database
+from hub_adapter.dependencies import get_proxy_client, get_settings
+from hub_adapter.middleware import log_event
+from hub_adapter.user_settings import load_persistent_settings
+
+logger = logging.getLogger(__name__)
+
+ACCESS_LOG_QUERY = r"""log.logger:"uvicorn.access" | extract '<_> "<method> <path> HTTP/<_>" <status>'"""
+ROLLUP_QUERY = f"{ACCESS_LOG_QUERY} | stats by (_time:1m, method, path) count() as requests"
+
+# Requests that don't resolve to a route of this app, e.g. scanners probing random paths, share one bucket so
+# they can't bloat the table with a row per distinct path
+UNMATCHED_ROUTE = "<unmatched>"
+UNMATCHED_ROUTE_NAME = "unmatched"
+
+METHOD_MAX_LENGTH = 16
+ROUTE_MAX_LENGTH = 255
+
+# Each sync recounts this far back, so access logs that reached VictoriaLogs late are not lost
+INGEST_OVERLAP = timedelta(minutes=5)
+# The initial backfill is split up so that no single stats query has to cover the whole retention window
+INGEST_CHUNK = timedelta(days=1)
+INSERT_BATCH_SIZE = 1000
+PRUNE_INTERVAL = timedelta(hours=1)
+
+DEFAULT_INTERVAL = 60
+DEFAULT_RETENTION_DAYS = 30
+
+
+def floor_minute(timestamp: datetime) -> datetime:
+    """Truncate a timestamp to the start of its minute."""
+    return timestamp.replace(second=0, microsecond=0)
+
+
+class RouteMatcher:
+    """Resolve raw request paths to the route template and name of the app route that serves them.
+
+    Paths carrying IDs, e.g. /kong/project/<uuid>, collapse onto their template so the rollup holds one row per
+    endpoint rather than one per resource.
+    """
+
+    def __init__(self, routes: Iterable[BaseRoute], root_path: str = ""):
+        # The routes of included routers are only listed with their prefix once flattened
+        self._routes = [
+            (route.path_regex, route.path, route.name, getattr(route, "methods", None))
+            for route in iter_route_contexts(list(routes))
+            if isinstance(getattr(route, "path_regex", None), re.Pattern)
+        ]
+        self._root_path = root_path.rstrip("/")
+        self._resolved: dict[tuple[str, str], tuple[str, str]] = {}
+
+    def _strip(self, path: str) -> str:
+        path = path.split("?")[0]
+        if self._root_path and path.startswith(self._root_path):
+            path = path[len(self._root_path) :] or "/"
+
+        return path
+
+    def match(self, method: str, path: str) -> tuple[str, str]:
+        """Return the (route template, route name) for a request, or the unmatched bucket."""
+        path = self._strip(path)
+        key = (method, path)
+        if key not in self._resolved:
+            self._resolved[key] = self._resolve(method, path)
+
+        return self._resolved[key]
+
+    def _resolve(self, method: str, path: str) -> tuple[str, str]:
+        """Prefer the route that also accepts the method, e.g. GET and DELETE on the same template."""
+        path_only_match = None
+        for regex, template, name, methods in self._routes:
+            if regex.match(path):
+                if not methods or method in methods:
+                    return template, name
+
+                path_only_match = path_only_match or (template, name)
+
+        return path_only_match or (UNMATCHED_ROUTE, UNMATCHED_ROUTE_NAME)
+
+    def template_prefix(self, prefix: str) -> str:
+        """Express a path prefix filter in route templates, which is what the request counts are keyed by.
+
+        A complete path such as /kong/project/<uuid> becomes the template of the route serving it, e.g.
+        /kong/project/{project_id}, any other prefix is kept as is.
+        """
+        path = self._strip(prefix)
+        return next((template for regex, template, _, _ in self._routes if regex.match(path)), path)
+
+
+class RequestRollup(pw.Model):
+    """Database table schema for the number of API requests per minute, method and route.
+
+    Attributes
+    ----------
+    minute : datetime
+        UTC start of the minute the requests were served in.
+    method : str
+        HTTP method, e.g. "GET".
+    route : str
+        Route template the requests resolved to, e.g. "/kong/project/{project_id}", or UNMATCHED_ROUTE.
+    route_name : str
+        Name of that route, e.g. "kong.project.get", or UNMATCHED_ROUTE_NAME.
+    requests : int
+        Number of requests served.
+    """
+
+    minute = DateTimeTZField()
+    method = pw.CharField(max_length=METHOD_MAX_LENGTH)
+    route = pw.CharField(max_length=ROUTE_MAX_LENGTH)
+    route_name = pw.CharField(max_length=ROUTE_MAX_LENGTH)
+    requests = pw.BigIntegerField()
+
+    class Meta:
+        table_name = "request_rollup"
+        primary_key = pw.CompositeKey("minute", "method", "route")
+
+
+@contextmanager
+def bind_request_rollup(db: pw.Database):
+    """Bind the rollup model to a database, the table is set up by prepare_request_rollup."""
+    with db.bind_ctx((RequestRollup,)):
+        yield
+
+
+def prepare_request_rollup(db: pw.Database) -> None:
+    """Create the rollup table if it does not exist yet."""
+    with bind_request_rollup(db):
+        db.create_tables((RequestRollup,))
+
+
+async def fetch_minute_counts(victoria_logs_url: str, start: datetime, end: datetime) -> list[dict]:
+    """Count the access log lines per minute, method and raw path within a time window."""
+    resp = await get_proxy_client().post(
+        f"{victoria_logs_url}/select/logsql/query",
+        data={"query": ROLLUP_QUERY, "start": start.isoformat(), "end": end.isoformat()},
+    )
+    resp.raise_for_status()
+
+    return [json.loads(line) for line in resp.text.strip().splitlines() if line]
+
+
+def aggregate_counts(entries: Iterable[dict], matcher: RouteMatcher) -> list[dict]:
+    """Fold the raw path counts onto route templates, giving one row per minute, method and route."""
+    counts: dict[tuple[datetime, str, str], dict] = {}
+
+    for entry in entries:
+        try:
+            minute = floor_minute(datetime.fromisoformat(entry["_time"]))
+
+        except (KeyError, TypeError, ValueError):
+            logger.warning(f"Skipping request count without a valid timestamp: {entry}")
+            continue
+
+        method = entry.get("method", "").upper()[:METHOD_MAX_LENGTH]
+        route, route_name = matcher.match(method, entry.get("path", ""))
+        route, route_name = route[:ROUTE_MAX_LENGTH], route_name[:ROUTE_MAX_LENGTH]
+
+        row = counts.setdefault(
+            (minute, method, route),
+            {"minute": minute, "method": method, "route": route, "route_name": route_name, "requests": 0},
+        )
+        row["requests"] += int(entry.get("requests") or 0)
+
+    return list(counts.values())
+
+
+def write_rollup(db: pw.Database, rows: list[dict]) -> None:
+    """Upsert the rolled up counts. A recounted minute replaces the stored count, so syncs can safely overlap."""
+    if not rows:
+        return
+
+    with bind_request_rollup(db), db.atomic():
+        for batch in pw.chunked(rows, INSERT_BATCH_SIZE):
+            RequestRollup.insert_many(batch).on_conflict(
+                conflict_target=(RequestRollup.minute, RequestRollup.method, RequestRollup.route),
+                preserve=(RequestRollup.route_name, RequestRollup.requests),
+            ).execute()
+
+
+def prune_old_rollups(db: pw.Database, retention_days: int) -> int:
+    """Delete counts older than the retention window, returning the number of rows removed."""
+    cutoff = datetime.now(UTC) - timedelta(days=retention_days)
+
+    with bind_request_rollup(db):
+        return RequestRollup.delete().where(RequestRollup.minute < cutoff).execute()
+
+
+def fetch_rollup_bounds(db: pw.Database) -> tuple[datetime | None, datetime | None]:
+    """Return the earliest and latest minute held in the rollup, or Nones when it is empty."""
+    with bind_request_rollup(db):
+        query = RequestRollup.select(
+            pw.fn.MIN(RequestRollup.minute).alias("earliest"),
+            pw.fn.MAX(RequestRollup.minute).alias("latest"),
+        )
+        row = query.dicts().get()
+
+    return row["earliest"], row["latest"]
+
+
+def summarize_requests(
+    db: pw.Database,
+    start: datetime | None,
+    end: datetime | None,
+    endpoint: str | None = None,
+    method: str | None = None,
+    group_by: str = "route",
+) -> dict[str, dict[str, int]]:
+    """Sum the stored counts per method for every route template, or route name, within the timeframe."""
+    key = RequestRollup.route_name if group_by == "route_name" else RequestRollup.route
+
+    clause = pw.Value(True)
+    if start:
+        clause &= RequestRollup.minute >= floor_minute(start)
+    if end:
+        clause &= RequestRollup.minute <= end
+    if endpoint:
+        clause &= RequestRollup.route.startswith(endpoint)
+    if method:
+        clause &= RequestRollup.method == method.upper()
+
+    with bind_request_rollup(db):
+        query = (
+            RequestRollup.select(
+                key.alias("key"),
+                RequestRollup.method,
+                pw.fn.SUM(RequestRollup.requests).alias("requests"),
+            )
+            .where(clause)
+            .group_by(key, RequestRollup.method)
+        )
+        rows = list(query.dicts())
+
+    counts: dict[str, dict[str, int]] = {}
+    for row in rows:
+        counts.setdefault(row["key"], {})[row["method"]] = int(row["requests"] or 0)
+
+    return counts
+
+
+class RequestRollupManager:
+    """Manages the loop rolling the API access logs up into per-minute request counts."""
+
+    def __init__(self):
+        self._task: asyncio.Task | None = None
+        self._db: pw.PostgresqlDatabase | None = None
+        self._connection_attempted = False
+        self._last_prune: datetime | None = None
+        self._unavailable_reason: str | None = None
+        self.matcher = RouteMatcher(())
+        self.disabled_reason: str | None = "Request rollup is disabled in the node settings"
+        self.interval: int = DEFAULT_INTERVAL
+        self.retention_days: int = DEFAULT_RETENTION_DAYS
+        self.covered_since: datetime | None = None
+        self.synced_through: datetime | None = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether request counts are being rolled up."""
+        return self._task is not None and self._db is not None
+
+    @property
+    def database(self) -> pw.PostgresqlDatabase | None:
+        """The database holding the rollup, or None when it is not available."""
+        return self._db
+
+    def covers(self, start: datetime | None, end: datetime | None = None) -> bool:
+        """Whether the rollup can answer for the timeframe from start to end.
+
+        None as start means all retained data, and None as end means up to now. The rollup holds every minute from
+        covered_since, which is only set once the first backfill completed, up to synced_through. An end within one
+        interval of synced_through still counts as covered, since the minutes in between are yet to be synced.
+        """
+        if not self.enabled or self.synced_through is None or self.covered_since is None:
+            return False
+
+        end = end.astimezone(UTC) if end else datetime.now(UTC)
+        if self.synced_through < floor_minute(end) - timedelta(seconds=self.interval):
+            return False
+
+        if start is None:
+            return True
+
+        coverage = max(self.covered_since, datetime.now(UTC) - timedelta(days=self.retention_days))
+        return start.astimezone(UTC) >= coverage
+
+    def _connect(self) -> pw.PostgresqlDatabase | None:
+        """Connect to Postgres, make sure the rollup table exists, and pick up where the last sync left off."""
+        db = get_node_database()
+
+        if db is None:
+            self._unavailable_reason = "Postgres is not available, API request counts are not being rolled up"
+            return None
+
+        try:
+            prepare_request_rollup(db)
+            self.covered_since, self.synced_through = fetch_rollup_bounds(db)
+
+        except pw.PeeweeException as db_err:
+            self._unavailable_reason = f"Unable to prepare the request rollup table: {db_err}"
+            return None
+
+        return db
+
+    async def start(self, routes: Iterable[BaseRoute] | None = None) -> None:
+        """Start the rollup loop, restarting it if it is already running.
+
+        Parameters
+        ----------
+        routes : Iterable[BaseRoute] | None
+            The app routes raw paths are resolved against. Only needs to be passed once, restarts reuse them.
+        """
+        if routes is not None:
+            self.matcher = RouteMatcher(routes, get_settings().api_root_path)
+
+        settings = load_persistent_settings()
+        config = settings.request_rollup or RequestRollupSettings()
+        self.interval = config.interval or DEFAULT_INTERVAL
+        self.retention_days = config.retention_days or DEFAULT_RETENTION_DAYS
+
+        restarting = self._task is not None
+        await self._cancel_current_task()
+
+        if not config.enabled:
+            self.disabled_reason = "Request rollup is disabled in the node settings"
+            if restarting:
+                self._log_stopped()
+            return
+
+        if not get_settings().victoria_logs_url:
+            self.disabled_reason = "VictoriaLogs is not configured, there are no access logs to roll up"
+
+        else:
+            if not self._connection_attempted:
+                self._connection_attempted = True
+                self._db = self._connect()
+
+            self.disabled_reason = self._unavailable_reason if self._db is None else None
+
+        if self.disabled_reason:
+            log_event(
+                "request_rollup.disabled",
+                event_description=self.disabled_reason,
+                level=logging.WARNING,
+                service=ServiceTag.LOGS,
+            )
+            return
+
+        log_event(
+            "request_rollup.restarted" if restarting else "request_rollup.started",
+            event_description=f"{'Restarting' if restarting else 'Starting'} the API request rollup "
+            f"with interval {self.interval}s and a {self.retention_days} day retention",
+            level=logging.INFO,
+            service=ServiceTag.LOGS,
+        )
+        self._task = asyncio.create_task(self._run_rollup())
+
+    async def _run_rollup(self) -> None:
+        """Sync the rollup with the access logs on a loop."""
+        while True:
+            try:
+                await self.sync()
+
+            except Exception as e:
+                log_event(
+                    "request_rollup.error",
+                    event_description=f"Error while rolling up API request counts: {e}",
+                    level=logging.ERROR,
+                    service=ServiceTag.LOGS,
+                )
+
+            await asyncio.sleep(self.interval)
+
+    async def sync(self) -> None:
+        """Roll up every complete minute since the last sync, backfilling the retention window on the first run."""
+        victoria_logs_url = get_settings().victoria_logs_url
+        until = floor_minute(datetime.now(UTC))
+
+        if self.synced_through is None:
+            start = until - timedelta(days=self.retention_days)
+
+        else:
+            start = self.synced_through - INGEST_OVERLAP
+
+        while start < until:
+            end = min(start + INGEST_CHUNK, until)
+            rows = aggregate_counts(await fetch_minute_counts(victoria_logs_url, start, end), self.matcher)
+
+            try:
+                write_rollup(self._db, rows)
+
+            except pw.PeeweeException as db_err:
+                # Leave the watermark alone so the same window is recounted next time
+                log_event(
+                    "request_rollup.write_error",
+                    event_description=f"Unable to store API request counts: {db_err}",
+                    level=logging.ERROR,
+                    service=ServiceTag.LOGS,
+                )
+                return
+
+            self.synced_through = end
+            start = end
+
+        # Only a completed backfill holds the whole retention window, a partial one is resumed by the next sync
+        if self.covered_since is None:
+            self.covered_since = until - timedelta(days=self.retention_days)
+
+        try:
+            self._prune_if_due()
+
+        except pw.PeeweeException as db_err:
+            log_event(
+                "request_rollup.write_error",
+                event_description=f"Unable to prune API request counts: {db_err}",
+                level=logging.ERROR,
+                service=ServiceTag.LOGS,
+            )
+
+    def _prune_if_due(self) -> None:
+        """Delete expired rows, at most once per PRUNE_INTERVAL."""
+        now = datetime.now(UTC)
+        if self._last_prune is not None and now - self._last_prune < PRUNE_INTERVAL:
+            return
+
+        deleted = prune_old_rollups(self._db, self.retention_days)
+        self._last_prune = now
+
+        if deleted:
+            log_event(
+                "request_rollup.pruned",
+                event_description=f"Deleted {deleted} API request counts older than {self.retention_days} days",
+                level=logging.DEBUG,
+                service=ServiceTag.LOGS,
+            )
+
+    async def _cancel_current_task(self) -> None:
+        """Cancel and await the current task if one exists."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            with suppress(asyncio.CancelledError, RuntimeError):
+                await self._task
+
+        self._task = None
+
+    def _log_stopped(self) -> None:
+        log_event(
+            "request_rollup.stopped",
+            event_description="Stopping the API request rollup",
+            level=logging.INFO,
+            service=ServiceTag.LOGS,
+        )
+
+    async def stop(self) -> None:
+        """Stop the rollup task."""
+        was_running = self._task is not None
+        await self._cancel_current_task()
+
+        if was_running:
+            self._log_stopped()
@@ -0,0 +1,108 @@
+"""Read-through cache with stale-while-revalidate for upstream responses that every user shares."""
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _CachedResponse:
+    value: Any
+    fetched_at: float  # time.monotonic() of when the fetch started
+
+
+def normalize_params(params: dict) -> str:
+    """Order independent representation of request params for use in a cache key."""
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+class ResponseCache:
+    """Bounded LRU of responses grouped by namespace, e.g. the Hub resource they came from.
+
+    An entry younger than ttl is returned as is. Up to stale_ttl past that, it is still returned straight away but
+    refreshed in the background, so only a miss or a long idle key waits on the upstream service. Invalidating a
+    namespace drops its entries and discards any refresh that was already in flight for it.
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+
+        self._entries: OrderedDict[tuple[str, Hashable], _CachedResponse] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._refreshing: dict[tuple[str, Hashable], asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, namespace: str, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached response for key, fetching it if missing or too old."""
+        cache_key = (namespace, key)
+        entry = self._entries.get(cache_key)
+
+        if entry is not None:
+            age = time.monotonic() - entry.fetched_at
+
+            if age < self.ttl + self.stale_ttl:
+                self._entries.move_to_end(cache_key)
+
+                if age >= self.ttl:
+                    self._schedule_refresh(cache_key, fetch)
+
+                return entry.value
+
+        return await self._fetch(cache_key, fetch)
+
+    def invalidate(self, *namespaces: str) -> None:
+        """Drop every entry in the given namespaces, e.g. after a write to that resource."""
+        for namespace in namespaces:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+        for cache_key in [k for k in self._entries if k[0] in namespaces]:
+            del self._entries[cache_key]
+
+    def clear(self) -> None:
+        for task in self._refreshing.values():
+            task.cancel()
+
+        self._refreshing.clear()
+        self._entries.clear()
+
+    async def _fetch(self, cache_key: tuple[str, Hashable], fetch: Callable[[], Awaitable[Any]]) -> Any:
+        generation = self._generations.get(cache_key[0], 0)
+        fetched_at = time.monotonic()
+        value = await fetch()
+
+        # A write since the fetch started means the response may predate it
+        if self._generations.get(cache_key[0], 0) == generation:
+            self._entries[cache_key] = _CachedResponse(value, fetched_at)
+            self._entries.move_to_end(cache_key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return value
+
+    def _schedule_refresh(self, cache_key: tuple[str, Hashable], fetch: Callable[[], Awaitable[Any]]) -> None:
+        if cache_key in self._refreshing:
+            return
+
+        async def refresh():
+            try:
+                await self._fetch(cache_key, fetch)
+
+            except Exception as e:  # keep serving the stale entry until it expires
+                logger.warning(f"Background refresh of {cache_key[0]} failed: {e}")
+
+            finally:
+                self._refreshing.pop(cache_key, None)
+
+        self._refreshing[cache_key] = asyncio.create_task(refresh())
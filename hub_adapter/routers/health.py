@@ -12,10 +12,14 @@ from starlette.concurrency import run_in_threadpool
 from hub_adapter.conf import Settings
 from hub_adapter.constants import ServiceTag
 from hub_adapter.dependencies import get_settings
+from hub_adapter.scheduler import scheduler
 from hub_adapter.schemas.health import (
+    CoalescingStats,
     DownstreamHealthCheck,
     HealthCheck,
     HealthStatus,
+    KongCleanupSweep,
+    ScheduledJobStats,
     ServiceCheckStatus,
     ServiceHealthBucket,
     ServiceHealthHistory,
@@ -31,6 +35,7 @@ from hub_adapter.service_health import (
     probe_all,
     summarize_range,
 )
+from hub_adapter.single_flight import downstream_reads, hub_reads
 
 health_router = APIRouter(
     tags=[ServiceTag.HEALTH],
@@ -114,6 +119,9 @@ async def get_health_downstream_services_history(
     at startup, monitoring_enabled is false and monitoring_detail explains why.
 
     Services with no URL configured on this node are reported as "disabled".
+
+    Summaries and slices are read from per minute, hour and day rollups kept alongside the checks, a resolution
+    that is a multiple of a day, an hour or a minute being served from the coarsest of those that fits.
     """
     from hub_adapter.managers import service_health_monitor  # avoid a circular import
 
@@ -222,6 +230,44 @@ async def get_health_downstream_services_history(
     return response
 
 
+@health_router.get(
+    "/health/coalescing",
+    summary="Count the upstream reads shared between identical concurrent requests",
+    status_code=status.HTTP_200_OK,
+    response_model=dict[str, CoalescingStats],
+    name="health.coalescing.get",
+)
+async def get_coalescing_stats():
+    """Return how many Hub and downstream reads were collapsed onto a request that was already in flight."""
+    return {"hub": hub_reads.stats(), "downstream": downstream_reads.stats()}
+
+
+@health_router.get(
+    "/health/kong-cleanup",
+    summary="Report the outcome of the latest Kong consumer cleanup sweep",
+    status_code=status.HTTP_200_OK,
+    response_model=KongCleanupSweep | None,
+    name="health.kong_cleanup.get",
+)
+async def get_kong_cleanup_stats():
+    """Return the consumers checked, deleted and failed by the latest cleanup sweep, or nothing before the first."""
+    from hub_adapter.managers import kong_cleanup_manager  # avoid a circular import
+
+    return kong_cleanup_manager.last_sweep
+
+
+@health_router.get(
+    "/health/scheduler",
+    summary="Report the runs and run durations of the periodic background jobs",
+    status_code=status.HTTP_200_OK,
+    response_model=dict[str, ScheduledJobStats],
+    name="health.scheduler.get",
+)
+async def get_scheduler_stats():
+    """Return the run counts and duration histogram of every background job scheduled since startup."""
+    return scheduler.stats()
+
+
 def _as_utc(timestamp: datetime | None) -> datetime | None:
     """Treat a naive timestamp as UTC so it can be compared against the stored values."""
     if timestamp is None:
@@ -5,7 +5,6 @@ import logging
 import uuid
 from typing import Annotated
 
-import flame_hub
 from fastapi import APIRouter, Body, Depends, Form, HTTPException, Path, Query, Security
 from flame_hub.models import (
     Analysis,
@@ -21,8 +20,16 @@ from starlette import status
 
 from hub_adapter.auth import jwtbearer, verify_idp_token
 from hub_adapter.constants import ServiceTag
-from hub_adapter.dependencies import compile_analysis_pod_data, get_core_client, get_node_id, get_node_type_cache
+from hub_adapter.dependencies import (
+    compile_analysis_pod_data,
+    get_core_client,
+    get_hub_cache,
+    get_node_id,
+    get_node_type_cache,
+)
 from hub_adapter.errors import catch_hub_errors
+from hub_adapter.hub_client import AsyncCoreClient
+from hub_adapter.response_cache import normalize_params
 from hub_adapter.schemas.hub import (
     AnalysisImageUrl,
     DetailedAnalysis,
@@ -78,6 +85,18 @@ def _parse_query_params(
     return formatted
 
 
+async def _cached_read(core_client: AsyncCoreClient, method: str, namespace: str, **params):
+    """Serve a Hub list call from the shared cache, keyed by the client method and its normalized params.
+
+    The namespace is the Hub resource being listed, which the update endpoints invalidate once their write succeeds.
+    """
+    return await get_hub_cache().get(
+        namespace,
+        (method, normalize_params(params)),
+        lambda: getattr(core_client, method)(**params),
+    )
+
+
 @hub_router.get(
     "/projects",
     summary="List all of the projects",
@@ -87,12 +106,12 @@ def _parse_query_params(
     response_model_by_alias=False,
 )
 @catch_hub_errors
-def list_all_projects(
+async def list_all_projects(
     query_params: Annotated[dict, Depends(_parse_query_params)],
-    core_client: Annotated[flame_hub.CoreClient, Depends(get_core_client)],
+    core_client: Annotated[AsyncCoreClient, Depends(get_core_client)],
 ):
     """List all projects."""
-    return core_client.find_projects(**query_params)
+    return await _cached_read(core_client, "find_projects", "projects", **query_params)
 
 
 @hub_router.get(
@@ -104,12 +123,12 @@ def list_all_projects(
     response_model_by_alias=False,
 )
 @catch_hub_errors
-def list_specific_project(
+async def list_specific_project(
     project_id: Annotated[uuid.UUID | str, Path(description="Project UUID.")],
-    core_client: Annotated[flame_hub.CoreClient, Depends(get_core_client)],
+    core_client: Annotated[AsyncCoreClient, Depends(get_core_client)],
 ):
     """List project for a given UUID."""
-    return core_client.get_project(project_id=project_id)
+    return await core_client.get_project(project_id=project_id)
 
 
 @hub_router.get(
@@ -121,17 +140,19 @@ def list_specific_project(
     response_model_by_alias=False,
 )
 @catch_hub_errors
-def list_project_proposals(
+async def list_project_proposals(
     node_id: Annotated[str, Depends(get_node_id)],
     query_params: Annotated[dict, Depends(_parse_query_params)],
-    core_client: Annotated[flame_hub.CoreClient, Depends(get_core_client)],
+    core_client: Annotated[AsyncCoreClient, Depends(get_core_client)],
 ):
     """List project proposals."""
     if node_id:
-        return core_client.find_project_nodes(filter={"nodeId": node_id}, **query_params)
+        return await _cached_read(
+            core_client, "find_project_nodes", "project-nodes", filter={"nodeId": node_id}, **query_params
+        )
 
     else:
-        return core_client.get_project_nodes(**query_params)
+        return await _cached_read(core_client, "get_project_nodes", "project-nodes", **query_params)
 
 
 @hub_router.get(
@@ -143,12 +164,12 @@ def list_project_proposals(
     response_model_by_alias=False,
 )
 @catch_hub_errors
-def list_project_proposal(
+async def list_project_proposal(
     project_node_id: Annotated[uuid.UUID | str, Path(description="Proposal object UUID.")],
-    core_client: Annotated[flame_hub.CoreClient, Depends(get_core_client)],
+    core_client: Annotated[AsyncCoreClient, Depends(get_core_client)],
 ):
     """Set the approval status of a project proposal."""
-    return core_client.get_project_node(project_node_id=project_node_id)
+    return await core_client.get_project_node(project_node_id=project_node_id)
 
 
 @hub_router.post(
@@ -160,16 +181,20 @@ def list_project_proposal(
     response_model_by_alias=False,
 )
 @catch_hub_errors
-def accept_reject_project_proposal(
+async def accept_reject_project_proposal(
     project_node_id: Annotated[uuid.UUID | str, Path(description="Proposal object UUID.")],
     approval_status: Annotated[
         ProjectNodeApprovalStatus,
         Form(description="Set the approval status of project for the node. Either 'rejected' or 'approved'"),
     ],
-    core_client: Annotated[flame_hub.CoreClient, Depends(get_core_client)],
+    core_client: Annotated[AsyncCoreClient, Depends(get_core_client)],
 ):
     """Set the approval status of a project proposal."""
-    return core_client.update_project_node(project_node_id=project_node_id, approval_status=approval_status)
+    project_node = await core_client.update_project_node(
+        project_node_id=project_node_id, approval_status=approval_status
+    )
+    get_hub_cache().invalidate("project-nodes")
+    return project_node
 
 
 @hub_router.get(
@@ -181,17 +206,19 @@ def accept_reject_project_proposal(
     response_model_by_alias=False,
 )
 @catch_hub_errors
-def list_analysis_nodes(
+async def list_analysis_nodes(
     node_id: Annotated[str, Depends(get_node_id)],
     query_params: Annotated[dict, Depends(_parse_query_params)],
-    core_client: Annotated[flame_hub.CoreClient, Depends(get_core_client)],
+    core_client: Annotated[AsyncCoreClient, Depends(get_core_client)],
 ):
     """List all analysis nodes for give node."""
     if node_id:
-        return core_client.find_analysis_nodes(filter={"nodeId": node_id}, **query_params)
+        return await _cached_read(
+            core_client, "find_analysis_nodes", "analysis-nodes", filter={"nodeId": node_id}, **query_params
+        )
 
     else:
-        return core_client.find_analysis_nodes(**query_params)
+        return await _cached_read(core_client, "find_analysis_nodes", "analysis-nodes", **query_params)
 
 
 @hub_router.get(
@@ -203,13 +230,13 @@ def list_analysis_nodes(
     response_model_by_alias=False,
 )
 @catch_hub_errors
-def list_specific_analysis_node(
+async def list_specific_analysis_node(
     analysis_node_id: Annotated[uuid.UUID | str, Path(description="Analysis Node UUID.")],
     query_params: Annotated[dict, Depends(_parse_query_params)],
-    core_client: Annotated[flame_hub.CoreClient, Depends(get_core_client)],
+    core_client: Annotated[AsyncCoreClient, Depends(get_core_client)],
 ):
     """List a specific analysis node."""
-    return core_client.get_analysis_node(analysis_node_id=analysis_node_id, **query_params)
+    return await core_client.get_analysis_node(analysis_node_id=analysis_node_id, **query_params)
 
 
 @hub_router.post(
@@ -221,16 +248,20 @@ def list_specific_analysis_node(
     response_model_by_alias=False,
 )
 @catch_hub_errors
-def accept_reject_analysis_node(
+async def accept_reject_analysis_node(
     analysis_node_id: Annotated[uuid.UUID | str, Path(description="Analysis Node UUID (not analysis_id).")],
     approval_status: Annotated[
         ProjectNodeApprovalStatus,  # same as AnalysisNodeApprovalStatus
         Form(description="Set the approval status of project for the node. Either 'rejected' or 'approved'"),
     ],
-    core_client: Annotated[flame_hub.CoreClient, Depends(get_core_client)],
+    core_client: Annotated[AsyncCoreClient, Depends(get_core_client)],
 ):
     """Set the approval status of an analysis proposal."""
-    return core_client.update_analysis_node(analysis_node_id=analysis_node_id, approval_status=approval_status)
+    analysis_node = await core_client.update_analysis_node(
+        analysis_node_id=analysis_node_id, approval_status=approval_status
+    )
+    get_hub_cache().invalidate("analysis-nodes")
+    return analysis_node
 
 
 @hub_router.get(
@@ -242,12 +273,12 @@ def accept_reject_analysis_node(
     response_model_by_alias=False,
 )
 @catch_hub_errors
-def list_all_analyses(
+async def list_all_analyses(
     query_params: Annotated[dict, Depends(_parse_query_params)],
-    core_client: Annotated[flame_hub.CoreClient, Depends(get_core_client)],
+    core_client: Annotated[AsyncCoreClient, Depends(get_core_client)],
 ):
     """List all registered analyses."""
-    return core_client.get_analyses(**query_params)
+    return await _cached_read(core_client, "get_analyses", "analyses", **query_params)
 
 
 @hub_router.get(
@@ -259,12 +290,12 @@ def list_all_analyses(
     response_model_by_alias=False,
 )
 @catch_hub_errors
-def list_specific_analysis(
+async def list_specific_analysis(
     analysis_id: Annotated[uuid.UUID | str, Path(description="Analysis UUID.")],
-    core_client: Annotated[flame_hub.CoreClient, Depends(get_core_client)],
+    core_client: Annotated[AsyncCoreClient, Depends(get_core_client)],
 ):
     """List a specific analysis."""
-    return core_client.get_analysis(analysis_id=analysis_id)
+    return await core_client.get_analysis(analysis_id=analysis_id)
 
 
 @hub_router.get(
@@ -276,12 +307,12 @@ def list_specific_analysis(
     response_model_by_alias=False,
 )
 @catch_hub_errors
-def list_all_nodes(
+async def list_all_nodes(
     query_params: Annotated[dict, Depends(_parse_query_params)],
-    core_client: Annotated[flame_hub.CoreClient, Depends(get_core_client)],
+    core_client: Annotated[AsyncCoreClient, Depends(get_core_client)],
 ):
     """List all nodes."""
-    return core_client.get_nodes(**query_params)
+    return await _cached_read(core_client, "get_nodes", "nodes", **query_params)
 
 
 @hub_router.get(
@@ -293,12 +324,12 @@ def list_all_nodes(
     response_model_by_alias=False,
 )
 @catch_hub_errors
-def list_specific_node(
+async def list_specific_node(
     node_id: Annotated[uuid.UUID | str, Path(description="Node UUID.")],
-    core_client: Annotated[flame_hub.CoreClient, Depends(get_core_client)],
+    core_client: Annotated[AsyncCoreClient, Depends(get_core_client)],
 ):
     """List a specific node."""
-    return core_client.get_node(node_id=node_id)
+    return await core_client.get_node(node_id=node_id)
 
 
 @hub_router.get(
@@ -310,7 +341,7 @@ def list_specific_node(
     response_model_by_alias=False,
 )
 @catch_hub_errors
-def get_node_type(node_type: Annotated[dict | None, Depends(get_node_type_cache)]):
+async def get_node_type(node_type: Annotated[dict | None, Depends(get_node_type_cache)]):
     """Return what type of node this API is deployed on."""
     return node_type
 
@@ -324,13 +355,15 @@ def get_node_type(node_type: Annotated[dict | None, Depends(get_node_type_cache)
     response_model_by_alias=False,
 )
 @catch_hub_errors
-def update_specific_analysis(
+async def update_specific_analysis(
     analysis_id: Annotated[uuid.UUID | str, Path(description="Analysis UUID.")],
     name: Annotated[str, Body(description="New analysis name.")],
-    core_client: Annotated[flame_hub.CoreClient, Depends(get_core_client)],
+    core_client: Annotated[AsyncCoreClient, Depends(get_core_client)],
 ):
     """Update analysis with a given UUID."""
-    return core_client.update_analysis(analysis_id=analysis_id, name=name)
+    analysis = await core_client.update_analysis(analysis_id=analysis_id, name=name)
+    get_hub_cache().invalidate("analyses", "analysis-nodes")  # analysis nodes embed their analysis
+    return analysis
 
 
 @hub_router.get(
@@ -341,20 +374,20 @@ def update_specific_analysis(
     response_model_by_alias=False,
 )
 @catch_hub_errors
-def get_registry_metadata_for_project(
+async def get_registry_metadata_for_project(
     registry_project_id: Annotated[uuid.UUID | str, Path(description="Registry project UUID.")],
-    core_client: Annotated[flame_hub.CoreClient, Depends(get_core_client)],
+    core_client: Annotated[AsyncCoreClient, Depends(get_core_client)],
 ):
     """List registry data for a project."""
 
-    return core_client.get_registry_project(registry_project_id=registry_project_id)
+    return await core_client.get_registry_project(registry_project_id=registry_project_id)
 
 
 @hub_router.post(
     "/analysis/image", response_model=AnalysisImageUrl, name="hub.analysis.image.get", response_model_by_alias=False
 )
 @catch_hub_errors
-def get_analysis_image_url(
+async def get_analysis_image_url(
     image_url_resp: Annotated[AnalysisImageUrl, Depends(compile_analysis_pod_data)],
 ):
     """Build an analysis image URL using its metadata from the Hub."""
@@ -370,12 +403,12 @@ def get_analysis_image_url(
     response_model_by_alias=False,
 )
 @catch_hub_errors
-def list_all_analysis_buckets(
+async def list_all_analysis_buckets(
     query_params: Annotated[dict, Depends(_parse_query_params)],
-    core_client: Annotated[flame_hub.CoreClient, Depends(get_core_client)],
+    core_client: Annotated[AsyncCoreClient, Depends(get_core_client)],
 ):
     """List all analysis buckets."""
-    return core_client.find_analysis_buckets(**query_params)
+    return await core_client.find_analysis_buckets(**query_params)
 
 
 @hub_router.get(
@@ -387,12 +420,12 @@ def list_all_analysis_buckets(
     response_model_by_alias=False,
 )
 @catch_hub_errors
-def list_specific_analysis_buckets(
+async def list_specific_analysis_buckets(
     analysis_bucket_id: Annotated[uuid.UUID | str, Path(description="Bucket UUID.")],
-    core_client: Annotated[flame_hub.CoreClient, Depends(get_core_client)],
+    core_client: Annotated[AsyncCoreClient, Depends(get_core_client)],
 ):
     """List a specific analysis bucket."""
-    return core_client.get_analysis_bucket(analysis_bucket_id=analysis_bucket_id)
+    return await core_client.get_analysis_bucket(analysis_bucket_id=analysis_bucket_id)
 
 
 @hub_router.get(
@@ -404,12 +437,12 @@ def list_specific_analysis_buckets(
     response_model_by_alias=False,
 )
 @catch_hub_errors
-def list_all_analysis_bucket_files(
+async def list_all_analysis_bucket_files(
     query_params: Annotated[dict, Depends(_parse_query_params)],
-    core_client: Annotated[flame_hub.CoreClient, Depends(get_core_client)],
+    core_client: Annotated[AsyncCoreClient, Depends(get_core_client)],
 ):
     """List partial analysis bucket files."""
-    return core_client.get_analysis_bucket_files(**query_params)
+    return await core_client.get_analysis_bucket_files(**query_params)
 
 
 @hub_router.get(
@@ -421,9 +454,9 @@ def list_all_analysis_bucket_files(
     response_model_by_alias=False,
 )
 @catch_hub_errors
-def list_specific_analysis_bucket_file(
+async def list_specific_analysis_bucket_file(
     analysis_bucket_file_id: Annotated[uuid.UUID | str, Path(description="Bucket file UUID.")],
-    core_client: Annotated[flame_hub.CoreClient, Depends(get_core_client)],
+    core_client: Annotated[AsyncCoreClient, Depends(get_core_client)],
 ):
     """List specific partial analysis bucket file."""
-    return core_client.get_analysis_bucket_file(analysis_bucket_file_id=analysis_bucket_file_id)
+    return await core_client.get_analysis_bucket_file(analysis_bucket_file_id=analysis_bucket_file_id)
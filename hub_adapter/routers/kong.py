@@ -1,19 +1,15 @@
 """EPs for the kong service."""
 
+import asyncio
 import functools
 import logging
-import time
 import uuid
-from contextlib import AbstractContextManager, nullcontext
-from functools import lru_cache
 from typing import Annotated
 from uuid import UUID
 
 import httpx2
-import kong_admin_client
 from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query, Security
 from kong_admin_client import (
-    ApiClient,
     ApiException,
     CreateAclForConsumerRequest,
     CreateConsumerRequest,
@@ -21,16 +17,18 @@ from kong_admin_client import (
     CreatePluginForConsumerRequest,
     CreateRouteRequest,
     CreateServiceRequest,
+    ListConsumer200Response,
+    ListRoute200Response,
     ListService200Response,
+    Route,
     Service,
 )
 from starlette import status
-from starlette.concurrency import run_in_threadpool
 
 from hub_adapter.auth import jwtbearer, require_steward_role, verify_idp_token
 from hub_adapter.conf import Settings
 from hub_adapter.constants import ServiceTag
-from hub_adapter.dependencies import get_settings, register_closer
+from hub_adapter.dependencies import get_kong_client, get_kong_proxy_client, get_settings
 from hub_adapter.errors import (
     BucketError,
     FhirEndpointError,
@@ -52,7 +50,14 @@ from hub_adapter.errors import (
     KongValidationError,
     catch_kong_errors,
 )
+from hub_adapter.kong_bulk import bulk_delete
+from hub_adapter.kong_client import AsyncKongAdmin
+from hub_adapter.kong_inventory import CONSUMERS, ROUTES, SERVICES, kong_inventory
+from hub_adapter.kong_paging import collect_pages
 from hub_adapter.schemas.kong import (
+    AnalysisRegistration,
+    AnalysisRegistrationResult,
+    BulkAnalysisRegistration,
     DataStoreType,
     HttpMethodCode,
     LinkDataStoreProject,
@@ -93,101 +98,106 @@ logger = logging.getLogger(__name__)
 DEFAULT_METHODS: list[HttpMethodCode] = [HttpMethodCode.GET]
 DEFAULT_PROTOCOLS: list[ProtocolCode] = [ProtocolCode.HTTP]
 
+# API key of each project's health consumer, by project ID
+_health_keys: dict[str, str] = {}
 
-def kong_config(settings: Settings) -> kong_admin_client.Configuration:
-    """Build the Kong admin client config, carrying the configured request timeout."""
-    configuration = kong_admin_client.Configuration(host=settings.kong_admin_service_url)
-    configuration.request_timeout = settings.kong_request_timeout
-    return configuration
 
+def _require_uuid_ids(**ids: str | uuid.UUID) -> None:
+    """Validate that the given ids are UUID-shaped before using them in Kong tags filters or ACL groups.
 
-@lru_cache(maxsize=1)
-def _build_kong_api_client(host: str, timeout: float | int | None) -> kong_admin_client.ApiClient:
-    """Build one shared Kong ApiClient."""
-    configuration = kong_admin_client.Configuration(host=host)
-    configuration.request_timeout = timeout
-    configuration.connection_pool_maxsize = get_settings().worker_thread_limit
-
-    api_client = kong_admin_client.ApiClient(configuration)
+    Kong treats ',' in a tags filter as an AND separator between whole tag values. An id containing a comma would
+    corrupt the filter built from it.
+    """
+    for name, value in ids.items():
+        if not is_uuid(value):
+            raise KongValidationError(f"{name} must be a valid UUID, got {value!r}")
 
-    if timeout:
-        rest_client = api_client.rest_client
-        req = rest_client.request
 
-        @functools.wraps(req)
-        def request(*args, _request_timeout=None, **kwargs):
-            return req(*args, _request_timeout=_request_timeout or timeout, **kwargs)
+async def _list_services(kong: AsyncKongAdmin, *tags: str, live: bool = False) -> ListService200Response:
+    """List the services carrying every given tag, from the Kong inventory unless live or it is out of date."""
+    services = None if live else kong_inventory.services(*tags)
+    if services is None:
+        services = await collect_pages(kong.list_service, get_settings().kong_page_size, tags=",".join(tags) or None)
 
-        rest_client.request = request
+    return ListService200Response(data=services)
 
-    # Clear client when done
-    register_closer(api_client.rest_client.pool_manager.clear)
-    register_closer(_build_kong_api_client.cache_clear)
-    return api_client
 
+async def _list_routes(kong: AsyncKongAdmin, *tags: str, live: bool = False) -> ListRoute200Response:
+    """List the routes carrying every given tag, from the Kong inventory unless live or it is out of date."""
+    routes = None if live else kong_inventory.routes(*tags)
+    if routes is None:
+        routes = await collect_pages(kong.list_route, get_settings().kong_page_size, tags=",".join(tags) or None)
 
-def kong_api_client(configuration: kong_admin_client.Configuration) -> AbstractContextManager[ApiClient]:
-    """Hand out the shared Kong client."""
-    # nullcontext is a context manager which returns the kong client when called, prevents changing call sites
-    return nullcontext(_build_kong_api_client(configuration.host, getattr(configuration, "request_timeout", None)))
+    return ListRoute200Response(data=routes)
 
 
-def _require_uuid_ids(**ids: str | uuid.UUID) -> None:
-    """Validate that the given ids are UUID-shaped before using them in Kong tags filters or ACL groups.
+async def _list_consumers(kong: AsyncKongAdmin, *tags: str, live: bool = False) -> ListConsumer200Response:
+    """List the consumers carrying every given tag, from the Kong inventory unless live or it is out of date."""
+    consumers = None if live else kong_inventory.consumers(*tags)
+    if consumers is None:
+        consumers = await collect_pages(kong.list_consumer, get_settings().kong_page_size, tags=",".join(tags) or None)
 
-    Kong treats ',' in a tags filter as an AND separator between whole tag values. An id containing a comma would
-    corrupt the filter built from it.
-    """
-    for name, value in ids.items():
-        if not is_uuid(value):
-            raise KongValidationError(f"{name} must be a valid UUID, got {value!r}")
+    return ListConsumer200Response(data=consumers)
 
 
-def _find_project_datastore_route(api_client, project_id: str | uuid.UUID, datastore_id: str | uuid.UUID):
+async def _find_project_datastore_route(
+    kong: AsyncKongAdmin, project_id: str | uuid.UUID, datastore_id: str | uuid.UUID
+):
     """List the link routes between a project and a data store via tags."""
-    route_api = kong_admin_client.RoutesApi(api_client)
-    return route_api.list_route(tags=f"{project_tag(project_id)},{datastore_tag(datastore_id)}")
+    return await _list_routes(kong, project_tag(project_id), datastore_tag(datastore_id))
 
 
-def _find_datastore_routes(api_client, datastore_id: str | uuid.UUID):
+async def _find_datastore_routes(kong: AsyncKongAdmin, datastore_id: str | uuid.UUID, live: bool = False):
     """List the link routes for a data store, across every project it's linked to."""
-    route_api = kong_admin_client.RoutesApi(api_client)
-    return route_api.list_route(tags=datastore_tag(datastore_id))
+    return await _list_routes(kong, datastore_tag(datastore_id), live=live)
 
 
-def _resolve_datastore_services(api_client, datastore_id_or_name: str) -> list[Service]:
+async def _resolve_datastore_services(kong: AsyncKongAdmin, datastore_id_or_name: str) -> list[Service]:
     """Resolve a path value to one or more Kong services.
 
     Tries a direct service id/name lookup first. For backwards compatibility, if that 404s and the value is a UUID,
     it's treated as a project id and resolved via the project's linked data stores instead
     """
-    svc_api = kong_admin_client.ServicesApi(api_client)
-
     try:
-        return [svc_api.get_service(service_id_or_name=datastore_id_or_name)]
+        return [await kong.get_service(service_id_or_name=datastore_id_or_name)]
 
     except ApiException as e:
         if e.status != status.HTTP_404_NOT_FOUND or not is_uuid(datastore_id_or_name):
             raise
 
-        route_api = kong_admin_client.RoutesApi(api_client)
-        routes = route_api.list_route(tags=project_tag(datastore_id_or_name))
+        routes = await _list_routes(kong, project_tag(datastore_id_or_name))
         linked_service_ids = {route.service.id for route in routes.data if route.service}
 
         if not linked_service_ids:
             raise KongDatastoreOrProjectNotFoundError(datastore_id_or_name) from e
 
-        return [svc_api.get_service(service_id_or_name=svc_id) for svc_id in linked_service_ids]
+        return list(
+            await asyncio.gather(*(kong.get_service(service_id_or_name=svc_id) for svc_id in linked_service_ids))
+        )
 
 
-def parse_project_info(services, client) -> dict:
-    """Get detailed information on project(s)."""
+async def _find_services_routes(kong: AsyncKongAdmin, service_ids: list) -> list:
+    """List the link routes of each of the given services by their datastore tag, concurrently."""
+    pages = await asyncio.gather(*(_find_datastore_routes(kong, svc_id) for svc_id in service_ids))
+    return [route for page in pages for route in page.data]
+
+
+async def parse_project_info(services, kong: AsyncKongAdmin, listed_by: tuple[str, ...] | None = None) -> dict:
+    """Get detailed information on project(s).
+
+    If the services are every data store carrying the listed_by tags, an empty tuple meaning all of them, their routes
+    are read with one listing filtered by the same tags, usually served by the Kong inventory. Otherwise only the
+    routes of the given services are looked up.
+    """
     service_dicts = [svc.to_dict() for svc in services.data]
-    route_api_instance = kong_admin_client.RoutesApi(client)
-    routes = route_api_instance.list_route()
+    if listed_by is not None:
+        routes = (await _list_routes(kong, *listed_by)).data
+
+    else:
+        routes = await _find_services_routes(kong, [svc.id for svc in services.data])
 
     route_dict = {}
-    for route in routes.data:
+    for route in routes:
         if route.service:
             svc_id = route.service.id
             if svc_id in route_dict:
@@ -206,23 +216,21 @@ def parse_project_info(services, client) -> dict:
     return {"data": service_dicts}
 
 
-def get_data_stores(
+async def get_data_stores(
     settings: Annotated[Settings, Depends(get_settings)],
     ds_type: DataStoreType | None = None,
     detailed: bool = False,
 ) -> ListService200Response | dict:
     """Get all data stores (services), optionally filtered by type."""
-    configuration = kong_config(settings)
-    tags = None if ds_type is None else type_tag(ds_type)
+    kong = get_kong_client(settings)
+    tags = () if ds_type is None else (type_tag(ds_type),)
 
-    with kong_api_client(configuration) as api_client:
-        service_api_instance = kong_admin_client.ServicesApi(api_client)
-        services = service_api_instance.list_service(tags=tags)
+    services = await _list_services(kong, *tags)
 
-        if detailed:
-            services = parse_project_info(services, api_client)
+    if detailed:
+        services = await parse_project_info(services, kong, listed_by=tags)
 
-        return services
+    return services
 
 
 @kong_router.get(
@@ -232,13 +240,13 @@ def get_data_stores(
     name="kong.datastore.get",
 )
 @catch_kong_errors
-def list_data_stores(
+async def list_data_stores(
     settings: Annotated[Settings, Depends(get_settings)],
     ds_type: Annotated[DataStoreType | None, Query(description="Filter by data store type")] = None,
     detailed: Annotated[bool, Query(description="Whether to include linked projects (routes)")] = False,
 ):
     """List all available data stores (referred to as services by kong)."""
-    return get_data_stores(settings, ds_type=ds_type, detailed=detailed)
+    return await get_data_stores(settings, ds_type=ds_type, detailed=detailed)
 
 
 @kong_router.get(
@@ -248,7 +256,7 @@ def list_data_stores(
     name="kong.datastore.get",
 )
 @catch_kong_errors
-def get_data_store(
+async def get_data_store(
     settings: Annotated[Settings, Depends(get_settings)],
     datastore_id_or_name: Annotated[str, Path(description="Kong service ID or display name of the data store.")],
     detailed: Annotated[bool, Query(description="Whether to include linked projects (routes)")] = False,
@@ -258,62 +266,70 @@ def get_data_store(
     For backwards compatibility, a project ID is also accepted. If no service matches directly,
     all data stores currently linked to that project are returned instead.
     """
-    configuration = kong_config(settings)
+    kong = get_kong_client(settings)
 
-    with kong_api_client(configuration) as api_client:
-        svcs = _resolve_datastore_services(api_client, datastore_id_or_name)
-        services = ListService200Response(data=svcs)
+    svcs = await _resolve_datastore_services(kong, datastore_id_or_name)
+    services = ListService200Response(data=svcs)
 
-        if detailed:
-            return parse_project_info(services, api_client)
+    if detailed:
+        return await parse_project_info(services, kong)
 
-        return services
+    return services
 
 
 @kong_router.delete(
     "/datastore/{datastore_id_or_name}",
     status_code=status.HTTP_200_OK,
     dependencies=[Depends(require_steward_role)],
+    response_model=UnlinkResponse,
     name="kong.datastore.delete",
 )
 @catch_kong_errors
-def delete_data_store(
+async def delete_data_store(
     settings: Annotated[Settings, Depends(get_settings)],
     datastore_id_or_name: Annotated[str, Path(description="Kong service ID or display name of the data store.")],
     cascade: Annotated[bool, Query(description="Also delete existing project links (routes)")] = False,
-):
+    dry_run: Annotated[bool, Query(description="Only list what would be deleted")] = False,
+) -> UnlinkResponse:
     """Delete a data store (service). Refused with 409 while projects link it, unless cascade=true.
 
-    Cascading removes the link routes only, consumers (analyses) belong to projects and are untouched.
+    Cascading removes the link routes only, consumers (analyses) belong to projects and are untouched. The data store
+    is kept if any of its links could not be removed, these are listed under "failed".
 
     For backwards compatibility, a project ID is also accepted in place of the data store id/name, but only if
     it resolves to exactly one linked data store, otherwise refused with 409 if the project is linked to more than 1
     """
-    configuration = kong_config(settings)
+    kong = get_kong_client(settings)
 
-    with kong_api_client(configuration) as api_client:
-        svc_api = kong_admin_client.ServicesApi(api_client)
-        route_api = kong_admin_client.RoutesApi(api_client)
+    svcs = await _resolve_datastore_services(kong, datastore_id_or_name)
+    if len(svcs) > 1:
+        raise KongAmbiguousProjectDatastoreError(datastore_id_or_name, [str(svc.id) for svc in svcs])
 
-        svcs = _resolve_datastore_services(api_client, datastore_id_or_name)
-        if len(svcs) > 1:
-            raise KongAmbiguousProjectDatastoreError(datastore_id_or_name, [str(svc.id) for svc in svcs])
+    svc = svcs[0]
+    routes = await _find_datastore_routes(kong, svc.id, live=True)  # nothing linked since a refresh is missed
 
-        svc = svcs[0]
-        routes = route_api.list_route(tags=datastore_tag(svc.id))
+    if routes.data and not cascade:
+        linked_projects = sorted({parse_tags(route.tags).get("project", "unknown") for route in routes.data})
+        raise KongDataStoreLinkedError(str(svc.name or svc.id), linked_projects)
+
+    if dry_run:
+        return UnlinkResponse(
+            removed_routes=routes.data, removed_services=[svc], dry_run=True, status=status.HTTP_200_OK
+        )
 
-        if routes.data and not cascade:
-            linked_projects = sorted({parse_tags(route.tags).get("project", "unknown") for route in routes.data})
-            raise KongDataStoreLinkedError(str(svc.name or svc.id), linked_projects)
+    removed_routes, failed = await bulk_delete(kong.delete_route, ROUTES, routes.data, settings.kong_bulk_concurrency)
+    if routes.data:
+        logger.info(f"Deleted {len(removed_routes)} link(s) (routes) for data store {svc.id}")
 
-        for route in routes.data:
-            route_api.delete_route(route.id)
-            logger.info(f"Deleted link (route) {route.id} for data store {svc.id}")
+    if failed:
+        logger.error(f"Data store {svc.id} kept, {len(failed)} of its link(s) could not be deleted")
+        return UnlinkResponse(removed_routes=removed_routes, failed=failed, status=status.HTTP_207_MULTI_STATUS)
 
-        svc_api.delete_service(service_id_or_name=svc.id)
-        logger.info(f"Data store {svc.id} deleted")
+    await kong.delete_service(service_id_or_name=svc.id)
+    kong_inventory.remove(SERVICES, svc.id)
+    logger.info(f"Data store {svc.id} deleted")
 
-        return status.HTTP_200_OK
+    return UnlinkResponse(removed_routes=removed_routes, removed_services=[svc], status=status.HTTP_200_OK)
 
 
 @kong_router.post(
@@ -324,7 +340,7 @@ def delete_data_store(
     name="kong.datastore.create",
 )
 @catch_kong_errors
-def create_data_store(
+async def create_data_store(
     settings: Annotated[Settings, Depends(get_settings)],
     datastore: Annotated[
         ServiceRequest,
@@ -347,84 +363,79 @@ def create_data_store(
     except ValueError as err:
         raise KongValidationError(str(err)) from err
 
-    configuration = kong_config(settings)
-
-    with kong_api_client(configuration) as api_client:
-        api_instance = kong_admin_client.ServicesApi(api_client)
-        create_service_request = CreateServiceRequest(
-            host=datastore.host,
-            path=datastore.path,
-            port=datastore.port,
-            protocol=datastore.protocol,
-            name=datastore.name,
-            enabled=datastore.enabled,
-            tls_verify=datastore.tls_verify,
-            tags=[type_tag(ds_type)],
+    kong = get_kong_client(settings)
+
+    create_service_request = CreateServiceRequest(
+        host=datastore.host,
+        path=datastore.path,
+        port=datastore.port,
+        protocol=datastore.protocol,
+        name=datastore.name,
+        enabled=datastore.enabled,
+        tls_verify=datastore.tls_verify,
+        tags=[type_tag(ds_type)],
+    )
+    service_create_response = await kong.create_service(create_service_request)
+    kong_inventory.put(SERVICES, service_create_response)
+
+    if s3_config:
+        create_s3_gateway_request = CreatePluginForConsumerRequest(  # Also works for services
+            name="minio-gateway",  # Still called minio gateway plugin
+            instance_name=f"{service_create_response.id}-s3-gateway",
+            # TODO change minio_* to s3_* once plugin is updated
+            config={  # Can't use .model_dump() because of SecretStr
+                "minio_access_key": s3_config.s3_access_key.get_secret_value(),
+                "minio_secret_key": s3_config.s3_secret_key.get_secret_value(),
+                "minio_region": s3_config.s3_region,
+                "bucket_name": s3_config.bucket_name,
+                "timeout": s3_config.timeout,
+                "strip_path_pattern": s3_config.strip_path_pattern,
+            },
+            enabled=True,
+            protocols=[datastore.protocol],
         )
-        service_create_response = api_instance.create_service(create_service_request)
-
-        plugin_api = kong_admin_client.PluginsApi(api_client)
-        if s3_config:
-            create_s3_gateway_request = CreatePluginForConsumerRequest(  # Also works for services
-                name="minio-gateway",  # Still called minio gateway plugin
-                instance_name=f"{service_create_response.id}-s3-gateway",
-                # TODO change minio_* to s3_* once plugin is updated
-                config={  # Can't use .model_dump() because of SecretStr
-                    "minio_access_key": s3_config.s3_access_key.get_secret_value(),
-                    "minio_secret_key": s3_config.s3_secret_key.get_secret_value(),
-                    "minio_region": s3_config.s3_region,
-                    "bucket_name": s3_config.bucket_name,
-                    "timeout": s3_config.timeout,
-                    "strip_path_pattern": s3_config.strip_path_pattern,
-                },
-                enabled=True,
-                protocols=[datastore.protocol],
-            )
-            try:
-                plugin_api.create_plugin_for_service(service_create_response.id, create_s3_gateway_request)
+        try:
+            await kong.create_plugin_for_service(service_create_response.id, create_s3_gateway_request)
 
-            except (HTTPException, ApiException) as error:  # Delete service if s3 fails
-                logger.error(f"Unable to create s3 gateway for {datastore.name}")
-                svc_api = kong_admin_client.ServicesApi(api_client)
-                svc_api.delete_service(service_id_or_name=service_create_response.id)
-                raise error
+        except (HTTPException, ApiException) as error:  # Delete service if s3 fails
+            logger.error(f"Unable to create s3 gateway for {datastore.name}")
+            await kong.delete_service(service_id_or_name=service_create_response.id)
+            kong_inventory.remove(SERVICES, service_create_response.id)
+            raise error
 
-        return service_create_response
+    return service_create_response
 
 
-def get_projects(
+async def get_projects(
     settings: Annotated[Settings, Depends(get_settings)],
     project_id: uuid.UUID | str | None = None,
     detailed: bool = False,
 ) -> ListRoutes | dict:
     """Get the link routes for all projects or a single one, via tags."""
-    configuration = kong_config(settings)
-    tags = None if project_id is None else project_tag(project_id)
+    kong = get_kong_client(settings)
+    tags = () if project_id is None else (project_tag(project_id),)
 
-    with kong_api_client(configuration) as api_client:
-        api_instance = kong_admin_client.RoutesApi(api_client)
-        api_response = api_instance.list_route(tags=tags)
+    api_response = await _list_routes(kong, *tags)
 
-        if len(api_response.data) == 0:
-            logger.debug("Kong: No routes (project links) found.")
+    if len(api_response.data) == 0:
+        logger.debug("Kong: No routes (project links) found.")
 
-        if detailed:
-            service_api_instance = kong_admin_client.ServicesApi(api_client)
-            services = service_api_instance.list_service()
-            service_dict = {str(svc.id): svc for svc in services.data}
+    if detailed:
+        services = await _list_services(kong)
+        service_dict = {str(svc.id): svc for svc in services.data}
 
-            annotated_routes = []
-            for route in api_response.data:
-                service_id = route.service.id
-                route_data = route.to_dict()
-                if service_id in service_dict:
-                    route_data["service"] = service_dict[service_id]
+        annotated_routes = []
+        for route in api_response.data:
+            service_id = route.service.id
+            route_data = route.to_dict()
+            if service_id in service_dict:
+                route_data["service"] = service_dict[service_id]
 
-                annotated_routes.append(route_data)
+            annotated_routes.append(route_data)
 
-            api_response = {"data": annotated_routes}
+        api_response = {"data": annotated_routes}
 
-        return api_response
+    return api_response
 
 
 @kong_router.get(
@@ -434,7 +445,7 @@ def get_projects(
     name="kong.project.get",
 )
 @catch_kong_errors
-def list_projects(
+async def list_projects(
     settings: Annotated[Settings, Depends(get_settings)],
     detailed: Annotated[
         bool,
@@ -445,7 +456,7 @@ def list_projects(
 
     Set "detailed" to True to include detailed information on the linked kong service.
     """
-    return get_projects(settings, project_id=None, detailed=detailed)
+    return await get_projects(settings, project_id=None, detailed=detailed)
 
 
 @kong_router.get(
@@ -455,7 +466,7 @@ def list_projects(
     name="kong.project.get",
 )
 @catch_kong_errors
-def list_specific_project(
+async def list_specific_project(
     settings: Annotated[Settings, Depends(get_settings)],
     project_id: Annotated[uuid.UUID | str, Path(description="UUID of the associated project.")],
     detailed: Annotated[
@@ -467,7 +478,7 @@ def list_specific_project(
 
     Set "detailed" to True to include detailed information on the linked kong service.
     """
-    return get_projects(settings, project_id=project_id, detailed=detailed)
+    return await get_projects(settings, project_id=project_id, detailed=detailed)
 
 
 @kong_router.post(
@@ -495,13 +506,12 @@ async def link_project_to_datastore(
     """
     _require_uuid_ids(project_id=project_id, datastore_id=datastore_id)
 
-    configuration = kong_config(settings)
+    kong = get_kong_client(settings)
     methods = [HttpMethodCode(m).value for m in (methods or DEFAULT_METHODS)]
     protocols = [ProtocolCode(p).value for p in (protocols or DEFAULT_PROTOCOLS)]
 
-    # This handler has to stay async for the probe below, so the blocking Kong work is offloaded
-    svc, route_response, keyauth_response, acl_response = await run_in_threadpool(
-        _create_link, configuration, project_id, datastore_id, methods, protocols
+    svc, route_response, keyauth_response, acl_response = await _create_link(
+        kong, project_id, datastore_id, methods, protocols
     )
 
     try:
@@ -509,90 +519,83 @@ async def link_project_to_datastore(
 
     except HTTPException as error:  # roll back the just-created link so no broken route lingers
         logger.error(f"Probe failed for new link {project_id} -> {svc.id}, deleting route")
-        await run_in_threadpool(_delete_route, configuration, route_response.id)
+        await _delete_route(kong, route_response.id)
         raise error
 
     return {"route": route_response, "keyauth": keyauth_response, "acl": acl_response}
 
 
-def _delete_route(configuration, route_id) -> None:
+async def _delete_route(kong: AsyncKongAdmin, route_id) -> None:
     """Remove a route, used to roll back a link whose probe failed."""
-    with kong_api_client(configuration) as api_client:
-        kong_admin_client.RoutesApi(api_client).delete_route(route_id)
-
-
-def _create_link(configuration, project_id, datastore_id, methods, protocols):
-    """Create the route and its auth plugins linking a project to a data store.
+    await kong.delete_route(route_id)
+    kong_inventory.remove(ROUTES, route_id)
 
-    Split out of link_project_to_datastore so the blocking Kong calls can run in a worker thread.
-    """
-    with kong_api_client(configuration) as api_client:
-        svc_api = kong_admin_client.ServicesApi(api_client)
-        route_api = kong_admin_client.RoutesApi(api_client)
-        plugin_api = kong_admin_client.PluginsApi(api_client)
-
-        svc = svc_api.get_service(service_id_or_name=str(datastore_id))
-        ds_type = parse_tags(svc.tags).get("type")
 
-        if ds_type is None:
-            raise KongDatastoreMissingTypeError(str(datastore_id))
+async def _create_link(kong: AsyncKongAdmin, project_id, datastore_id, methods, protocols):
+    """Create the route and its auth plugins linking a project to a data store."""
+    svc = await kong.get_service(service_id_or_name=str(datastore_id))
+    ds_type = parse_tags(svc.tags).get("type")
 
-        existing_routes = _find_datastore_routes(api_client, svc.id)
-        if existing_routes.data:
-            existing_project_ids = sorted(
-                {parse_tags(route.tags).get("project", "unknown") for route in existing_routes.data}
-            )
-            if str(project_id) in existing_project_ids:
-                raise KongProjectDatastoreLinkConflictError(str(project_id), str(svc.id))
+    if ds_type is None:
+        raise KongDatastoreMissingTypeError(str(datastore_id))
 
-            raise KongDatastoreLinkedToOtherProjectError(str(svc.id), existing_project_ids[0])
-
-        create_route_request = CreateRouteRequest(
-            name=f"{svc.name}-route",
-            protocols=protocols,
-            methods=methods,
-            paths=[f"/{svc.name}/{ds_type}"],
-            path_handling="v1",
-            https_redirect_status_code=426,
-            preserve_host=False,
-            request_buffering=True,
-            response_buffering=True,
-            tags=[project_tag(project_id), datastore_tag(svc.id), type_tag(ds_type)],
-        )
-        route_response = route_api.create_route_for_service(str(svc.id), create_route_request)
-
-        # Keyauth for authentication
-        create_keyauth_request = CreatePluginForConsumerRequest(
-            name="key-auth",
-            instance_name=f"{route_response.id}-keyauth",
-            config={
-                "hide_credentials": True,
-                "key_in_body": False,
-                "key_in_header": True,
-                "key_in_query": False,
-                "key_names": ["apikey"],
-                "run_on_preflight": True,
-            },
-            enabled=True,
-            protocols=protocols,
+    existing_routes = await _find_datastore_routes(kong, svc.id, live=True)
+    if existing_routes.data:
+        existing_project_ids = sorted(
+            {parse_tags(route.tags).get("project", "unknown") for route in existing_routes.data}
         )
+        if str(project_id) in existing_project_ids:
+            raise KongProjectDatastoreLinkConflictError(str(project_id), str(svc.id))
+
+        raise KongDatastoreLinkedToOtherProjectError(str(svc.id), existing_project_ids[0])
+
+    create_route_request = CreateRouteRequest(
+        name=f"{svc.name}-route",
+        protocols=protocols,
+        methods=methods,
+        paths=[f"/{svc.name}/{ds_type}"],
+        path_handling="v1",
+        https_redirect_status_code=426,
+        preserve_host=False,
+        request_buffering=True,
+        response_buffering=True,
+        tags=[project_tag(project_id), datastore_tag(svc.id), type_tag(ds_type)],
+    )
+    route_response = await kong.create_route_for_service(str(svc.id), create_route_request)
+    kong_inventory.put(ROUTES, route_response)
+
+    # Keyauth for authentication
+    create_keyauth_request = CreatePluginForConsumerRequest(
+        name="key-auth",
+        instance_name=f"{route_response.id}-keyauth",
+        config={
+            "hide_credentials": True,
+            "key_in_body": False,
+            "key_in_header": True,
+            "key_in_query": False,
+            "key_names": ["apikey"],
+            "run_on_preflight": True,
+        },
+        enabled=True,
+        protocols=protocols,
+    )
 
-        create_acl_request = CreatePluginForConsumerRequest(
-            name="acl",
-            instance_name=f"{route_response.id}-acl",
-            config={"allow": [str(project_id)], "hide_groups_header": True},
-            enabled=True,
-            protocols=protocols,
-        )
+    create_acl_request = CreatePluginForConsumerRequest(
+        name="acl",
+        instance_name=f"{route_response.id}-acl",
+        config={"allow": [str(project_id)], "hide_groups_header": True},
+        enabled=True,
+        protocols=protocols,
+    )
 
-        try:
-            keyauth_response = plugin_api.create_plugin_for_route(route_response.id, create_keyauth_request)
-            acl_response = plugin_api.create_plugin_for_route(route_response.id, create_acl_request)
+    try:
+        keyauth_response = await kong.create_plugin_for_route(route_response.id, create_keyauth_request)
+        acl_response = await kong.create_plugin_for_route(route_response.id, create_acl_request)
 
-        except (ApiException, HTTPException) as error:
-            logger.error(f"Plugin setup failed to link {project_id} to {svc.id}, deleting route")
-            route_api.delete_route(route_response.id)
-            raise error
+    except (ApiException, HTTPException) as error:
+        logger.error(f"Plugin setup failed to link {project_id} to {svc.id}, deleting route")
+        await _delete_route(kong, route_response.id)
+        raise error
 
     return svc, route_response, keyauth_response, acl_response
 
@@ -638,35 +641,53 @@ async def create_datastore_and_project_with_link(
     name="kong.project.delete",
 )
 @catch_kong_errors
-def delete_project(
+async def delete_project(
     settings: Annotated[Settings, Depends(get_settings)],
     project_id: Annotated[uuid.UUID | str, Path(description="UUID of the project")],
+    dry_run: Annotated[bool, Query(description="Only list what would be deleted")] = False,
 ) -> UnlinkResponse:
-    """Disconnect a project from all data stores and delete all its consumers (analyses + health)."""
-    configuration = kong_config(settings)
-    tags = project_tag(project_id)
+    """Disconnect a project from all data stores and delete all its consumers (analyses + health).
 
-    with kong_api_client(configuration) as api_client:
-        route_api = kong_admin_client.RoutesApi(api_client)
-        consumer_api = kong_admin_client.ConsumersApi(api_client)
+    The deletions are sent concurrently. Routes and consumers which could not be deleted are listed under "failed",
+    the others are still removed.
+    """
+    kong = get_kong_client(settings)
+    tags = project_tag(project_id)
 
-        routes = route_api.list_route(tags=tags)
-        consumers = consumer_api.list_consumer(tags=tags)
+    # Read from Kong itself so that nothing added since the last inventory refresh is left behind
+    routes, consumers = await asyncio.gather(
+        _list_routes(kong, tags, live=True), _list_consumers(kong, tags, live=True)
+    )
 
-        if not routes.data and not consumers.data:
-            raise KongProjectEmptyError(str(project_id))
+    if not routes.data and not consumers.data:
+        raise KongProjectEmptyError(str(project_id))
 
-        for route in routes.data:
-            route_api.delete_route(route.id)
+    if dry_run:
+        return UnlinkResponse(
+            removed_routes=routes.data, removed_consumers=consumers.data, dry_run=True, status=status.HTTP_200_OK
+        )
 
-        for consumer in consumers.data:
-            consumer_api.delete_consumer(consumer_username_or_id=consumer.id)
+    # Links first, so the project's data stores are no longer reachable while its consumers are being removed
+    removed_routes, failed_routes = await bulk_delete(
+        kong.delete_route, ROUTES, routes.data, settings.kong_bulk_concurrency
+    )
+    removed_consumers, failed_consumers = await bulk_delete(
+        kong.delete_consumer, CONSUMERS, consumers.data, settings.kong_bulk_concurrency
+    )
+    failed = failed_routes + failed_consumers
+    _health_keys.pop(str(project_id), None)
 
-        logger.info(
-            f"Project {project_id} deleted: {len(routes.data)} link(s), {len(consumers.data)} consumer(s) removed"
-        )
+    logger.info(
+        f"Project {project_id} deleted: {len(removed_routes)} link(s), {len(removed_consumers)} consumer(s) removed, "
+        f"{len(failed)} failed"
+    )
 
-        return UnlinkResponse(removed_routes=routes.data, removed_consumers=consumers.data, status=status.HTTP_200_OK)
+    return UnlinkResponse(
+        removed_routes=removed_routes,
+        removed_consumers=removed_consumers,
+        failed=failed,
+        status=status.HTTP_207_MULTI_STATUS if failed else status.HTTP_200_OK,
+    )
 
 
 @kong_router.delete(
@@ -677,7 +698,7 @@ def delete_project(
     name="kong.project.unlink",
 )
 @catch_kong_errors
-def unlink_project_from_datastore(
+async def unlink_project_from_datastore(
     settings: Annotated[Settings, Depends(get_settings)],
     project_id: Annotated[uuid.UUID | str, Path(description="UUID of the project")],
     datastore_id: Annotated[uuid.UUID | str, Path(description="Kong service ID of the data store")],
@@ -685,48 +706,44 @@ def unlink_project_from_datastore(
     """Unlink a single data store from a project. Consumers (analyses) are kept."""
     _require_uuid_ids(project_id=project_id, datastore_id=datastore_id)
 
-    configuration = kong_config(settings)
+    kong = get_kong_client(settings)
+    routes = await _find_project_datastore_route(kong, project_id, datastore_id)
 
-    with kong_api_client(configuration) as api_client:
-        route_api = kong_admin_client.RoutesApi(api_client)
-        routes = _find_project_datastore_route(api_client, project_id, datastore_id)
+    if not routes.data:
+        raise KongProjectDatastoreUnlinkedError(str(project_id), str(datastore_id))
 
-        if not routes.data:
-            raise KongProjectDatastoreUnlinkedError(str(project_id), str(datastore_id))
+    removed_routes, failed = await bulk_delete(kong.delete_route, ROUTES, routes.data, settings.kong_bulk_concurrency)
+    for route in removed_routes:
+        logger.info(f"Project {project_id} unlinked from data store {datastore_id} (route {route.id})")
 
-        for route in routes.data:
-            route_api.delete_route(route.id)
-            logger.info(f"Project {project_id} unlinked from data store {datastore_id} (route {route.id})")
-
-        return UnlinkResponse(removed_routes=routes.data, status=status.HTTP_200_OK)
+    return UnlinkResponse(
+        removed_routes=removed_routes,
+        failed=failed,
+        status=status.HTTP_207_MULTI_STATUS if failed else status.HTTP_200_OK,
+    )
 
 
-def _find_analysis_consumer(api_client, analysis_id: str | uuid.UUID):
+async def _find_analysis_consumer(kong: AsyncKongAdmin, analysis_id: str | uuid.UUID):
     """Resolve the Kong consumer for an analysis via its tag, or None."""
-    consumer_api = kong_admin_client.ConsumersApi(api_client)
-    consumers = consumer_api.list_consumer(tags=analysis_tag(analysis_id))
+    consumers = await _list_consumers(kong, analysis_tag(analysis_id))
     return consumers.data[0] if consumers.data else None
 
 
-def get_analyses(
+async def get_analyses(
     settings: Annotated[Settings, Depends(get_settings)],
     analysis_id: uuid.UUID | str | None = None,
     project_id: uuid.UUID | str | None = None,
 ) -> ListConsumers | dict:
     """Get consumers via tags. Health consumers are excluded — they are not analyses."""
-    configuration = kong_config(settings)
-
     tags = []
     if analysis_id:
         tags.append(analysis_tag(analysis_id))
     if project_id:
         tags.append(project_tag(project_id))
 
-    with kong_api_client(configuration) as api_client:
-        consumer_api = kong_admin_client.ConsumersApi(api_client)
-        api_response = consumer_api.list_consumer(tags=",".join(tags) if tags else None)
-        analyses = [c for c in api_response.data if HEALTH_TAG not in (c.tags or [])]
-        return {"data": analyses}
+    api_response = await _list_consumers(get_kong_client(settings), *tags)
+    analyses = [c for c in api_response.data if HEALTH_TAG not in (c.tags or [])]
+    return {"data": analyses}
 
 
 @kong_router.get(
@@ -736,7 +753,7 @@ def get_analyses(
     name="kong.analysis.get",
 )
 @catch_kong_errors
-def list_analyses(
+async def list_analyses(
     settings: Annotated[Settings, Depends(get_settings)],
     project_id: Annotated[
         str | None,
@@ -744,7 +761,7 @@ def list_analyses(
     ] = None,
 ):
     """List all analyses (referred to as consumers by kong) available. Can be filtered by project UUID."""
-    return get_analyses(settings, project_id=project_id)
+    return await get_analyses(settings, project_id=project_id)
 
 
 @kong_router.get(
@@ -754,7 +771,7 @@ def list_analyses(
     name="kong.analysis.get",
 )
 @catch_kong_errors
-def list_specific_analysis(
+async def list_specific_analysis(
     settings: Annotated[Settings, Depends(get_settings)],
     analysis_id: Annotated[uuid.UUID | str | None, Path(description="UUID of the analysis.")],
     project_id: Annotated[
@@ -763,24 +780,22 @@ def list_specific_analysis(
     ] = None,
 ):
     """List all analyses (referred to as consumers by kong) available."""
-    return get_analyses(settings, analysis_id=analysis_id, project_id=project_id)
+    return await get_analyses(settings, analysis_id=analysis_id, project_id=project_id)
 
 
-def get_analysis_keyauth(settings: Settings, analysis_id: str | uuid.UUID):
+async def get_analysis_keyauth(settings: Settings, analysis_id: str | uuid.UUID):
     """Return the existing key-auth credential for an analysis consumer, or None if absent/unreachable.
 
     Used to reuse an already registered consumer's credential instead of deleting and recreating it.
     """
-    configuration = kong_config(settings)
+    kong = get_kong_client(settings)
 
     try:
-        with kong_api_client(configuration) as api_client:
-            consumer = _find_analysis_consumer(api_client, analysis_id)
-            if consumer is None:
-                return None
+        consumer = await _find_analysis_consumer(kong, analysis_id)
+        if consumer is None:
+            return None
 
-            keyauth_api = kong_admin_client.KeyAuthsApi(api_client)
-            api_response = keyauth_api.list_key_auths_for_consumer(consumer.id)
+        api_response = await kong.list_key_auths_for_consumer(consumer.id)
 
     except ApiException as e:
         logger.warning(f"Unable to fetch existing key-auth for analysis {analysis_id}: {e}")
@@ -803,7 +818,7 @@ def get_analysis_keyauth(settings: Settings, analysis_id: str | uuid.UUID):
     name="kong.analysis.create",
 )
 @catch_kong_errors
-def create_and_connect_analysis_to_project(
+async def create_and_connect_analysis_to_project(
     settings: Annotated[Settings, Depends(get_settings)],
     project_id: Annotated[str | uuid.UUID, Body(description="UUID or name of the project")],
     analysis_id: Annotated[str | uuid.UUID, Body(description="UUID or name of the analysis")],
@@ -811,52 +826,124 @@ def create_and_connect_analysis_to_project(
     """Create a new analysis and link it to a project."""
     _require_uuid_ids(project_id=project_id, analysis_id=analysis_id)
 
-    proj_resp = get_projects(settings=settings, project_id=project_id, detailed=False)
+    proj_resp = await get_projects(settings=settings, project_id=project_id, detailed=False)
     if not proj_resp.data:
         raise KongProjectNotMappedError()
 
-    configuration = kong_config(settings)
-    response = {}
+    return await _register_analysis(get_kong_client(settings), project_id, analysis_id)
+
+
+async def _register_analysis(kong: AsyncKongAdmin, project_id: str | uuid.UUID, analysis_id: str | uuid.UUID) -> dict:
+    """Create the consumer of an analysis along with its project ACL group and key-auth credential.
+
+    The ACL and the credential only need the consumer, so they are created at the same time. If either fails, the
+    consumer is deleted again so that the analysis can be registered anew instead of conflicting with a leftover.
+    """
     username = analysis_username(analysis_id)
 
-    with kong_api_client(configuration) as api_client:
-        consumer_api = kong_admin_client.ConsumersApi(api_client)
-        api_response = consumer_api.create_consumer(
-            CreateConsumerRequest(
-                username=username,
-                custom_id=username,
-                tags=[project_tag(project_id), analysis_tag(analysis_id)],
-            )
+    consumer = await kong.create_consumer(
+        CreateConsumerRequest(
+            username=username,
+            custom_id=username,
+            tags=[project_tag(project_id), analysis_tag(analysis_id)],
         )
-        logger.info(f"Consumer added, id: {api_response.id}")
-
-        consumer_id = api_response.id
-        response["consumer"] = api_response
+    )
+    kong_inventory.put(CONSUMERS, consumer)
+    logger.info(f"Consumer added, id: {consumer.id}")
 
-        # Configure acl plugin for consumer
-        acl_api = kong_admin_client.ACLsApi(api_client)
-        api_response = acl_api.create_acl_for_consumer(
-            consumer_id,
+    acl, keyauth = await asyncio.gather(
+        kong.create_acl_for_consumer(
+            consumer.id,
             CreateAclForConsumerRequest(
                 group=project_id,
                 tags=[project_tag(project_id)],
             ),
-        )
-        logger.info(f"ACL plugin configured for consumer, group: {api_response.group}")
-        response["acl"] = api_response
-
-        # Configure key-auth plugin for consumer
-        keyauth_api = kong_admin_client.KeyAuthsApi(api_client)
-        api_response = keyauth_api.create_key_auth_for_consumer(
-            consumer_id,
+        ),
+        kong.create_key_auth_for_consumer(
+            consumer.id,
             CreateKeyAuthForConsumerRequest(
                 tags=[project_tag(project_id)],
             ),
+        ),
+        return_exceptions=True,
+    )
+
+    error = next((result for result in (acl, keyauth) if isinstance(result, BaseException)), None)
+    if error is not None:
+        logger.error(f"Unable to configure consumer {consumer.id} of analysis {analysis_id}, deleting it")
+        await kong.delete_consumer(consumer.id)
+        kong_inventory.remove(CONSUMERS, consumer.id)
+        raise error
+
+    logger.info(f"ACL plugin configured for consumer, group: {acl.group}")
+    logger.info(f"Key authentication plugin configured for consumer, api_key: {keyauth.key}")
+
+    return {"consumer": consumer, "acl": acl, "keyauth": keyauth}
+
+
+@kong_router.post(
+    "/analysis/bulk",
+    response_model=BulkAnalysisRegistration,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(require_steward_role)],
+    name="kong.analysis.bulk",
+)
+@catch_kong_errors
+async def create_and_connect_analyses_to_projects(
+    settings: Annotated[Settings, Depends(get_settings)],
+    analyses: Annotated[
+        list[AnalysisRegistration],
+        Body(description="Analyses to create, each with the UUID of the project it is linked to"),
+    ],
+) -> BulkAnalysisRegistration:
+    """Create many analyses at once and link each to its project.
+
+    The projects are checked against a single listing of the project links, then the analyses are created
+    concurrently. Every analysis gets its own result, one that fails does not stop the others.
+    """
+    kong = get_kong_client(settings)
+    linked_projects = {parse_tags(route.tags).get("project") for route in (await _list_routes(kong)).data}
+    semaphore = asyncio.Semaphore(settings.kong_bulk_concurrency)
+    requested = set()
+
+    async def register(analysis: AnalysisRegistration) -> AnalysisRegistrationResult:
+        result = functools.partial(
+            AnalysisRegistrationResult, project_id=analysis.project_id, analysis_id=analysis.analysis_id
         )
-        logger.info(f"Key authentication plugin configured for consumer, api_key: {api_response.key}")
-        response["keyauth"] = api_response
 
-    return response
+        try:
+            _require_uuid_ids(project_id=analysis.project_id, analysis_id=analysis.analysis_id)
+
+            if analysis.analysis_id in requested:
+                return result(status=status.HTTP_409_CONFLICT, message="Analysis is listed more than once")
+
+            requested.add(analysis.analysis_id)
+
+            if analysis.project_id not in linked_projects:
+                raise KongProjectNotMappedError()
+
+            async with semaphore:
+                registered = await _register_analysis(kong, analysis.project_id, analysis.analysis_id)
+
+        except HTTPException as e:
+            message = e.detail.get("message") if isinstance(e.detail, dict) else e.detail
+            return result(status=e.status_code, message=message)
+
+        except ApiException as e:
+            return result(status=e.status, message=e.reason)
+
+        except httpx2.TransportError as e:
+            return result(status=status.HTTP_503_SERVICE_UNAVAILABLE, message=str(e) or "Kong service unavailable")
+
+        return result(status=status.HTTP_201_CREATED, **registered)
+
+    results = await asyncio.gather(*(register(analysis) for analysis in analyses))
+    logger.info(
+        f"Bulk analysis registration: {sum(r.status == status.HTTP_201_CREATED for r in results)} of "
+        f"{len(results)} created"
+    )
+
+    return BulkAnalysisRegistration(results=results)
 
 
 @kong_router.delete(
@@ -866,63 +953,68 @@ def create_and_connect_analysis_to_project(
     name="kong.analysis.delete",
 )
 @catch_kong_errors
-def delete_analysis(
+async def delete_analysis(
     settings: Annotated[Settings, Depends(get_settings)],
     analysis_id: Annotated[str | UUID, Path(description="UUID of the analysis.")],
 ):
     """Delete the listed analysis (consumer), resolved via its tag."""
-    configuration = kong_config(settings)
+    kong = get_kong_client(settings)
 
-    with kong_api_client(configuration) as api_client:
-        consumer = _find_analysis_consumer(api_client, analysis_id)
-        if consumer is None:
-            raise KongAnalysisConsumerNotFoundError(str(analysis_id))
+    consumer = await _find_analysis_consumer(kong, analysis_id)
+    if consumer is None:
+        raise KongAnalysisConsumerNotFoundError(str(analysis_id))
 
-        consumer_api = kong_admin_client.ConsumersApi(api_client)
-        consumer_api.delete_consumer(consumer_username_or_id=consumer.id)
+    await kong.delete_consumer(consumer_username_or_id=consumer.id)
+    kong_inventory.remove(CONSUMERS, consumer.id)
 
-        logger.info(f"Analysis {analysis_id} deleted")
-        return status.HTTP_200_OK
+    logger.info(f"Analysis {analysis_id} deleted")
+    return status.HTTP_200_OK
 
 
-def ensure_health_consumer(settings: Settings, project_id: str | uuid.UUID) -> str:
+async def ensure_health_consumer(settings: Settings, project_id: str | uuid.UUID) -> str:
     """Return an apikey for the project's health consumer, creating consumer/ACL/key-auth on demand.
 
-    One health consumer exists per project, its project ACL group lets it probe every linked store.
+    One health consumer exists per project, its project ACL group lets it probe every linked store. The key is kept
+    once known, so repeated probes of a project do not go through the Kong admin API.
     """
-    configuration = kong_config(settings)
-    username = health_username(project_id)
+    if key := _health_keys.get(str(project_id)):
+        return key
 
-    with kong_api_client(configuration) as api_client:
-        consumer_api = kong_admin_client.ConsumersApi(api_client)
-        keyauth_api = kong_admin_client.KeyAuthsApi(api_client)
+    kong = get_kong_client(settings)
+    username = health_username(project_id)
 
-        consumers = consumer_api.list_consumer(tags=f"{HEALTH_TAG},{project_tag(project_id)}")
-        consumer = consumers.data[0] if consumers.data else None
+    consumers = await _list_consumers(kong, HEALTH_TAG, project_tag(project_id))
+    consumer = consumers.data[0] if consumers.data else None
 
-        if consumer is None:
-            logger.info(f"No health consumer found for project {project_id}, creating one now")
-            consumer = consumer_api.create_consumer(
-                CreateConsumerRequest(
-                    username=username,
-                    custom_id=username,
-                    tags=[HEALTH_TAG, project_tag(project_id)],
-                )
-            )
-            acl_api = kong_admin_client.ACLsApi(api_client)
-            acl_api.create_acl_for_consumer(
-                consumer.id,
-                CreateAclForConsumerRequest(group=str(project_id), tags=[project_tag(project_id)]),
+    if consumer is None:
+        logger.info(f"No health consumer found for project {project_id}, creating one now")
+        consumer = await kong.create_consumer(
+            CreateConsumerRequest(
+                username=username,
+                custom_id=username,
+                tags=[HEALTH_TAG, project_tag(project_id)],
             )
+        )
+        kong_inventory.put(CONSUMERS, consumer)
+        await kong.create_acl_for_consumer(
+            consumer.id,
+            CreateAclForConsumerRequest(group=str(project_id), tags=[project_tag(project_id)]),
+        )
 
-        keyauths = keyauth_api.list_key_auths_for_consumer(consumer.id)
-        if keyauths and keyauths.data:
-            return keyauths.data[0].key
+    keyauths = await kong.list_key_auths_for_consumer(consumer.id)
+    if keyauths and keyauths.data:
+        key = keyauths.data[0].key
 
-        keyauth = keyauth_api.create_key_auth_for_consumer(
+    else:
+        keyauth = await kong.create_key_auth_for_consumer(
             consumer.id, CreateKeyAuthForConsumerRequest(tags=[project_tag(project_id)])
         )
-        return keyauth.key
+        key = keyauth.key
+
+    if key:
+        _health_keys[str(project_id)] = key
+
+    return key
 
 
 @kong_router.get(
@@ -931,58 +1023,102 @@ def ensure_health_consumer(settings: Settings, project_id: str | uuid.UUID) -> s
     name="kong.probe",
 )
 @catch_kong_errors
-def probe_connection(
+async def probe_connection(
     settings: Annotated[Settings, Depends(get_settings)],
     project_id: Annotated[str | uuid.UUID, Path(description="UUID of the project.")],
     datastore_id: Annotated[str | uuid.UUID, Path(description="Kong service ID of the data store.")],
+    live: Annotated[bool, Query(description="Probe now instead of returning the latest background check")] = False,
 ):
     """Test whether Kong can read the given data store through the project's link.
 
-    Because we use the key-auth plugin, a consumer is required for pinging the data service.
+    Because we use the key-auth plugin, a consumer is required for pinging the data service. While the links are
+    monitored in the background, the latest result of this link is returned unless a live probe is requested.
     """
     _require_uuid_ids(project_id=project_id, datastore_id=datastore_id)
 
     if not settings.kong_proxy_service_url:
         raise KongProxyNotConfiguredError()
 
-    configuration = kong_config(settings)
+    routes = await _find_project_datastore_route(get_kong_client(settings), project_id, datastore_id)
 
-    with kong_api_client(configuration) as api_client:
-        routes = _find_project_datastore_route(api_client, project_id, datastore_id)
+    if not routes.data:
+        raise KongProjectDatastoreUnlinkedError(str(project_id), str(datastore_id))
 
-        if not routes.data:
-            raise KongProjectDatastoreUnlinkedError(str(project_id), str(datastore_id))
+    from hub_adapter.managers import link_health_monitor  # avoid a circular import
 
-        route = routes.data[0]
-        ds_type = parse_tags(route.tags).get("type")
-        route_path = route.paths[0]
+    latest = None if live else link_health_monitor.latest(routes.data[0].id)
+    if latest is not None:
+        if (error := latest["error"]) is not None:  # the stored error is shared, so raise a copy of it
+            raise HTTPException(status_code=error.status_code, detail=error.detail, headers=error.headers)
 
-    apikey = ensure_health_consumer(settings, project_id)
-    if not apikey:
-        raise KongConsumerApiKeyError()
+        return latest["status_code"]
+
+    return await _probe_link(settings, routes.data[0])
 
-    url = f"{settings.kong_proxy_service_url}{route_path}"
-    is_fhir = ds_type == DataStoreType.FHIR.value
 
+async def probe_links(settings: Settings, routes: list[Route], max_attempts: int = 5) -> list[int | HTTPException]:
+    """Probe the data store behind each project link route at the same time, bounded by kong_bulk_concurrency.
+
+    Each route gets either the 200 of a successful probe or the error it raised, in the order of the routes.
+    """
+    if not settings.kong_proxy_service_url:
+        raise KongProxyNotConfiguredError()
+
+    semaphore = asyncio.Semaphore(settings.kong_bulk_concurrency)
+
+    async def probe(route: Route) -> int | HTTPException:
+        async with semaphore:
+            try:
+                return await _probe_link(settings, route, max_attempts=max_attempts)
+
+            except HTTPException as e:
+                return e
+
+    return await asyncio.gather(*(probe(route) for route in routes))
+
+
+async def _probe_link(settings: Settings, route: Route, max_attempts: int = 5) -> int:
+    """Probe the data store behind a project link route with the project's health consumer key."""
+    tags = parse_tags(route.tags)
+    project_id = tags.get("project")
+    is_fhir = tags.get("type") == DataStoreType.FHIR.value
+
+    url = f"{settings.kong_proxy_service_url}{route.paths[0]}"
     if is_fhir:
         url = f"{url}/metadata"
 
-    return probe_data_service(url=url, apikey=apikey, is_fhir=is_fhir)
+    apikey = await ensure_health_consumer(settings, project_id)
+    if not apikey:
+        raise KongConsumerApiKeyError()
 
+    try:
+        return await probe_data_service(url=url, apikey=apikey, is_fhir=is_fhir, max_attempts=max_attempts)
 
-def probe_data_service(url: str, apikey: str, is_fhir: bool, attempt: int = 1, max_attempts: int = 5) -> int:
-    """Use httpx2 to probe the data service."""
-    svc_resp = httpx2.get(
-        url,
-        headers={"apikey": apikey},
-    )
+    except KongUpstreamError as e:
+        if e.status_code != status.HTTP_401_UNAUTHORIZED:
+            raise
+
+    # The known key was rejected, e.g. the health consumer was deleted and created anew in the meantime
+    _health_keys.pop(str(project_id), None)
+    apikey = await ensure_health_consumer(settings, project_id)
+    return await probe_data_service(url=url, apikey=apikey, is_fhir=is_fhir, max_attempts=max_attempts)
+
+
+async def probe_data_service(url: str, apikey: str, is_fhir: bool, max_attempts: int = 5) -> int:
+    """Use the shared Kong proxy client to probe the data service."""
+    client = get_kong_proxy_client(get_settings())
     svc = "FHIR" if is_fhir else "S3"
-    if svc_resp.status_code != 200:
-        # Sometimes it takes a bit for kong to finish creating a route/service
-        if svc_resp.status_code == status.HTTP_404_NOT_FOUND and attempt <= max_attempts:
-            time.sleep(attempt * 2)  # Wait a little longer each attempt
-            return probe_data_service(url=url, apikey=apikey, is_fhir=is_fhir, attempt=attempt + 1)
+    attempt = 1
+
+    svc_resp = await client.get(url, headers={"apikey": apikey})
 
+    # Sometimes it takes a bit for kong to finish creating a route/service
+    while svc_resp.status_code == status.HTTP_404_NOT_FOUND and attempt <= max_attempts:
+        await asyncio.sleep(attempt * 2)  # Wait a little longer each attempt
+        attempt += 1
+        svc_resp = await client.get(url, headers={"apikey": apikey})
+
+    if svc_resp.status_code != 200:
         if svc_resp.status_code == status.HTTP_403_FORBIDDEN and not is_fhir:
             raise BucketError()
 
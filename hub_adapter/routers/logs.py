@@ -1,20 +1,27 @@
 """EPs for retrieving logged events."""
 
+import base64
+import binascii
 import datetime
 import json
 import logging
 import re
+import time
 import uuid
-from typing import Annotated
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Annotated, Literal
 
 import httpx2
 from fastapi import APIRouter, Depends, HTTPException, Path, Query, Security
 from starlette import status
+from starlette.concurrency import run_in_threadpool
 
 from hub_adapter.auth import jwtbearer, require_admin_role, verify_idp_token
 from hub_adapter.constants import ServiceTag
 from hub_adapter.dependencies import get_proxy_client, get_settings, make_log_hook
 from hub_adapter.errors import require_victoria_logs
+from hub_adapter.request_rollup import ACCESS_LOG_QUERY, summarize_requests
 from hub_adapter.schemas.logs import (
     AnalysisLogHistoryResponse,
     AnalysisLogsResponse,
@@ -50,6 +57,96 @@ async def _query_victoria_logs(victoria_logs_url: str, query_data: dict) -> http
     return resp
 
 
+# Opaque cursor values are interpolated into LogsQL, so they are restricted to what VictoriaLogs emits
+_CURSOR_TIME_PATTERN = re.compile(r"^[0-9T:.+\-Z]+$")
+_CURSOR_STREAM_PATTERN = re.compile(r"^[0-9a-f]+$")
+# Quoted phrases may hold a literal "|", which does not start a pipe
+_QUOTED_PATTERN = re.compile(r""""(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'|`[^`]*`""")
+
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+        detail={
+            "message": "Invalid pagination cursor",
+            "service": ServiceTag.LOGS.value,
+            "status_code": status.HTTP_422_UNPROCESSABLE_CONTENT,
+        },
+    )
+
+
+def encode_cursor(entry: dict) -> str | None:
+    """Build an opaque cursor from the (_time, _stream_id) of a log entry, if both are present."""
+    log_time, stream_id = entry.get("_time"), entry.get("_stream_id")
+    if not log_time or not stream_id:
+        return None
+
+    raw = json.dumps({"t": log_time, "s": stream_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    """Return the (_time, _stream_id) pair held by a cursor, raising a 422 if it was tampered with."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        log_time, stream_id = payload["t"], payload["s"]
+
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise _invalid_cursor() from None
+
+    if not (
+        isinstance(log_time, str)
+        and isinstance(stream_id, str)
+        and _CURSOR_TIME_PATTERN.match(log_time)
+        and _CURSOR_STREAM_PATTERN.match(stream_id)
+    ):
+        raise _invalid_cursor()
+
+    return log_time, stream_id
+
+
+def paginate_query(query: str, limit: int, offset: int | None = None, after: str | None = None) -> str:
+    """Sort newest-first and page within the query, either by offset or by seeking past a cursor.
+
+    Seeking filters on the (_time, _stream_id) of the last entry already seen, so each page costs the
+    same no matter how deep it is, whereas an offset has VictoriaLogs sort and skip every earlier entry.
+    """
+    if after and offset:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail={
+                "message": "Use either offset or after for pagination, not both",
+                "service": ServiceTag.LOGS.value,
+                "status_code": status.HTTP_422_UNPROCESSABLE_CONTENT,
+            },
+        )
+
+    if after:
+        log_time, stream_id = decode_cursor(after)
+        same_time = f'_time:[{log_time}, {log_time}] AND _stream_id:string_range("", "{stream_id}")'
+        query += f" | filter (_time:<{log_time} OR ({same_time}))"
+
+    # HTTP `limit` and `offset` params don't sort first, so both go inside the query
+    query += " | sort by (_time desc, _stream_id desc)"
+    if offset:
+        query += f" offset {offset}"
+
+    return query + f" limit {limit}"
+
+
+def has_pipes(query: str) -> bool:
+    """Whether a LogsQL query pipes its results on, e.g. through its own sort or stats."""
+    return "|" in _QUOTED_PATTERN.sub("", query)
+
+
+def next_cursor(entries: list[dict], limit: int) -> str | None:
+    """Return the cursor for the page following a full page of entries, otherwise None."""
+    if not entries or len(entries) < limit:
+        return None
+
+    return encode_cursor(entries[-1])
+
+
 async def count_logs(query: str, params: dict | None = None) -> int:
     """Return the total number of logs matching a query, ignoring limit/offset."""
     settings = get_settings()
@@ -78,7 +175,7 @@ async def _execute_raw_query(query: str, params: dict | None = None) -> list[dic
 
 
 async def query_logs(query: str, params: dict | None = None):
-    """Retrieve a selection of logs."""
+    """Retrieve a selection of logs. The _time and _stream_id of each entry are kept to build cursors."""
     _fields = (
         "_msg",
         "kubernetes.container_image",
@@ -88,6 +185,8 @@ async def query_logs(query: str, params: dict | None = None):
         "log.timestamp",
         "log.user",
         "log.event_name",
+        "_time",
+        "_stream_id",
     )
     _rename = {
         "_msg": "message",
@@ -102,7 +201,7 @@ async def query_logs(query: str, params: dict | None = None):
 
     rename_clause = ", ".join(f"{src} as {dst}" for src, dst in _rename.items())
     logsql_query = f"{query} | fields {', '.join(_fields)} | rename {rename_clause}"
-    query_data = {"query": logsql_query, **params}
+    query_data = {"query": logsql_query, **(params or {})}
 
     _output_fields = {_rename.get(f, f) for f in _fields}
 
@@ -117,26 +216,73 @@ async def query_logs(query: str, params: dict | None = None):
     return logs
 
 
-async def _get_analysis_container_names(analysis_id_str: str) -> list[str]:
-    """Return all unique container names matching the analysis ID pattern."""
+# How long discovered container names are served without asking VictoriaLogs for newer runs
+CONTAINER_NAME_TTL = 30  # seconds
+# Incremental scans reach back this far before the last sync to pick up logs that were ingested late
+CONTAINER_NAME_OVERLAP = datetime.timedelta(minutes=5)
+CONTAINER_NAME_CACHE_SIZE = 256
+
+
+@dataclass
+class _ContainerNames:
+    """Container names known for an analysis and when VictoriaLogs was last scanned for them."""
+
+    names: set[str] = field(default_factory=set)
+    synced_at: datetime.datetime | None = None
+    checked_at: float = 0.0
+
+
+_container_name_cache: OrderedDict[str, _ContainerNames] = OrderedDict()
+
+
+async def _scan_container_names(analysis_id_str: str, start: datetime.datetime | None = None) -> set[str]:
+    """Return the unique container names matching the analysis ID pattern, optionally only from start onwards."""
     settings = get_settings()
     pattern = f"^(nginx-analysis|analysis)-{analysis_id_str}-[0-9]+$"
     query = f'kubernetes.container_name:~"{pattern}"'
-    query_data = {
-        "query": f"{query} | uniq by (kubernetes.container_name)",
-        "limit": 100,
-    }
+    query_data = {"query": f"{query} | uniq by (kubernetes.container_name)"}
+    if start:
+        query_data["start"] = start.isoformat()
+
     resp = await _query_victoria_logs(settings.victoria_logs_url, query_data)
 
-    names = []
+    names = set()
     for line in resp.text.strip().splitlines():
         if line:
             name = json.loads(line).get("kubernetes.container_name", "")
             if name:
-                names.append(name)
+                names.add(name)
     return names
 
 
+async def _get_analysis_container_names(analysis_id_str: str) -> list[str]:
+    """Return all unique container names matching the analysis ID pattern.
+
+    The regex scan over every log is the most expensive query sent to VictoriaLogs, so names are cached
+    per analysis. Once the TTL lapses only logs since the last scan are searched and any new runs are
+    merged in. Analyses with no containers yet are not cached so their first run shows up straight away.
+    """
+    entry = _container_name_cache.get(analysis_id_str)
+    if entry and time.monotonic() - entry.checked_at < CONTAINER_NAME_TTL:
+        _container_name_cache.move_to_end(analysis_id_str)
+        return sorted(entry.names)
+
+    synced_at = datetime.datetime.now(datetime.UTC)
+    start = entry.synced_at - CONTAINER_NAME_OVERLAP if entry else None
+    names = await _scan_container_names(analysis_id_str, start)
+
+    if entry:
+        names |= entry.names
+
+    if names:
+        _container_name_cache[analysis_id_str] = _ContainerNames(names, synced_at, time.monotonic())
+        _container_name_cache.move_to_end(analysis_id_str)
+        while len(_container_name_cache) > CONTAINER_NAME_CACHE_SIZE:
+            _container_name_cache.popitem(last=False)
+
+    return sorted(names)
+
+
 async def _query_pod_logs(
     container_name: str,
     start_date: datetime.datetime | None = None,
@@ -222,8 +368,15 @@ async def get_events(
         datetime.datetime | None,
         Query(description="Filter events by end date using ISO8601 format"),
     ] = None,
+    after: Annotated[
+        str | None,
+        Query(description="Cursor from meta.next_cursor of the previous page, used instead of offset"),
+    ] = None,
+    include_total: Annotated[
+        bool, Query(description="Count every matching event for meta.total, which costs an extra query")
+    ] = True,
 ):
-    """Retrieve a selection of logged events."""
+    """Retrieve a selection of logged events, newest first."""
     query_parts = ["log.event_name:*"]
 
     if service_tag:
@@ -233,7 +386,10 @@ async def get_events(
         query_parts.append(f'log.user:"{username}"')
 
     query = " AND ".join(query_parts)
-    params = {"limit": limit or 100, "offset": offset or 0}
+    limit = limit or 100
+    paged_query = paginate_query(query, limit, offset, after)
+    offset = None if after else offset or 0
+    params = {}
 
     if start_date:
         params["start"] = start_date.isoformat()
@@ -241,10 +397,17 @@ async def get_events(
     if end_date:
         params["end"] = end_date.isoformat()
 
-    data = await query_logs(query, params)
-    total = await count_logs(query, params)
+    data = await query_logs(paged_query, params)
+    total = await count_logs(query, params) if include_total else None
 
-    meta = {"total": total, "limit": params["limit"], "offset": params["offset"], "count": len(data)}
+    meta = {
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+        "count": len(data),
+        "after": after,
+        "next_cursor": next_cursor(data, limit),
+    }
 
     return {"data": data, "meta": meta}
 
@@ -443,17 +606,46 @@ async def get_netstats(
 )
 @require_victoria_logs
 async def raw_log_query(body: LogQLQueryRequest):
-    """Execute a raw LogQL query against VictoriaLogs. Admin only."""
-    params: dict = {"limit": body.limit, "offset": body.offset}
+    """Execute a raw LogQL query against VictoriaLogs. Admin only.
+
+    Plain filter queries are returned newest first and can be paged by cursor. Queries with pipes keep their own
+    ordering and output, so they are paged through the HTTP limit/offset params and don't accept a cursor.
+    """
+    params: dict = {}
     if body.start:
         params["start"] = body.start.isoformat()
     if body.end:
         params["end"] = body.end.isoformat()
 
-    data = await _execute_raw_query(body.query, params)
-    total = await count_logs(body.query, params)
+    if has_pipes(body.query):
+        if body.after:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                detail={
+                    "message": "Cursor pagination is only supported for queries without pipes, use offset instead",
+                    "service": ServiceTag.LOGS.value,
+                    "status_code": status.HTTP_422_UNPROCESSABLE_CONTENT,
+                },
+            )
+        offset = body.offset
+        data = await _execute_raw_query(body.query, {"limit": body.limit, "offset": body.offset, **params})
+        cursor = None
 
-    meta = {"total": total, "limit": body.limit, "offset": body.offset, "count": len(data)}
+    else:
+        offset = None if body.after else body.offset
+        data = await _execute_raw_query(paginate_query(body.query, body.limit, body.offset, body.after), params)
+        cursor = next_cursor(data, body.limit)
+
+    total = await count_logs(body.query, params) if body.include_total else None
+
+    meta = {
+        "total": total,
+        "limit": body.limit,
+        "offset": offset,
+        "count": len(data),
+        "after": body.after,
+        "next_cursor": cursor,
+    }
     return {"data": data, "meta": meta}
 
 
@@ -475,41 +667,78 @@ async def get_api_requests(
     ] = None,
     endpoint: Annotated[
         str | None,
-        Query(description="Filter breakdown to paths starting with this prefix"),
+        Query(
+            description="Filter breakdown to paths starting with this prefix. When grouping by route or route name, "
+            "route templates are filtered instead and a complete path, e.g. /kong/project/<uuid>, selects the route "
+            "serving it"
+        ),
     ] = None,
     method: Annotated[
         str | None,
         Query(description="Filter breakdown to a specific HTTP method (e.g. GET, POST, DELETE)"),
     ] = None,
+    group_by: Annotated[
+        Literal["path", "route", "route_name"],
+        Query(
+            description="Key the breakdown by raw request path, by the template of the route that served it, e.g. "
+            "/kong/project/{project_id}, or by the name of that route"
+        ),
+    ] = "path",
 ):
-    """Get total API request count and a per-endpoint breakdown grouped by HTTP method and path."""
-    logsql_query = r"""log.logger:"uvicorn.access" | extract '<_> "<method> <path> HTTP/<_>" <status>' | stats by (method, path) count() as requests"""
+    """Get total API request count and a per-endpoint breakdown grouped by HTTP method and path.
+
+    Raw paths are always aggregated from the access logs in VictoriaLogs. When grouping by route or route name and the
+    request rollup is enabled and holds the requested timeframe, the counts are read from Postgres instead. Otherwise,
+    the access logs are resolved to the same route templates.
+    """
+    from hub_adapter.managers import request_rollup_manager  # avoid a circular import
+
+    matcher = request_rollup_manager.matcher
+    method_filter = method.upper() if method else None
+    by_path = group_by == "path"
+    endpoint_prefix = endpoint if by_path or endpoint is None else matcher.template_prefix(endpoint)
+
+    if not by_path and request_rollup_manager.covers(start_date, end_date):
+        by_key = await run_in_threadpool(
+            summarize_requests,
+            request_rollup_manager.database,
+            start_date,
+            end_date,
+            endpoint_prefix,
+            method_filter,
+            group_by,
+        )
+        return _format_request_counts(by_key)
+
     params: dict = {}
     if start_date:
         params["start"] = start_date.isoformat()
     if end_date:
         params["end"] = end_date.isoformat()
 
-    raw = await _execute_raw_query(logsql_query, params)
-    method_filter = method.upper() if method else None
+    raw = await _execute_raw_query(f"{ACCESS_LOG_QUERY} | stats by (method, path) count() as requests", params)
 
-    by_path: dict[str, dict[str, int]] = {}
+    by_key: dict[str, dict[str, int]] = {}
     for entry in raw:
         req_method = entry.get("method", "")
-        base_path = entry.get("path", "").split("?")[0]
+        if by_path:
+            route = route_name = entry.get("path", "").split("?")[0]
+        else:
+            route, route_name = matcher.match(req_method, entry.get("path", ""))
+        if endpoint_prefix is not None and not route.startswith(endpoint_prefix):
+            continue
+        if method_filter is not None and req_method != method_filter:
+            continue
+
+        key = route_name if group_by == "route_name" else route
         count = int(entry.get("requests", 0))
-        by_path.setdefault(base_path, {})
-        by_path[base_path][req_method] = by_path[base_path].get(req_method, 0) + count
+        by_key.setdefault(key, {})
+        by_key[key][req_method] = by_key[key].get(req_method, 0) + count
+
+    return _format_request_counts(by_key)
 
-    data: dict[str, dict[str, int]] = {}
-    for path in sorted(by_path):
-        if endpoint is not None and not path.startswith(endpoint):
-            continue
-        methods = by_path[path]
-        if method_filter is not None:
-            if method_filter not in methods:
-                continue
-            methods = {method_filter: methods[method_filter]}
-        data[path] = {**methods, "total": sum(methods.values())}
 
+def _format_request_counts(by_key: dict[str, dict[str, int]]) -> dict:
+    """Add per-key and overall totals to the request counts."""
+    data = {key: {**by_key[key], "total": sum(by_key[key].values())} for key in sorted(by_key)}
     return {"total": sum(v["total"] for v in data.values()), "data": data}
@@ -1,15 +1,14 @@
 """Custom endpoints that combine other API endpoints for simplification."""
 
+import asyncio
 import logging
 import uuid
 from typing import Annotated
 
-import flame_hub
 import httpx2
-from fastapi import APIRouter, Depends, Form, HTTPException, Path, Security
+from fastapi import APIRouter, Depends, Form, HTTPException, Path, Query, Security
 from pydantic import BaseModel
 from starlette import status
-from starlette.concurrency import run_in_threadpool
 
 from hub_adapter.auth import (
     _add_internal_token_if_missing,
@@ -22,10 +21,14 @@ from hub_adapter.autostart import GoGoAnalysis
 from hub_adapter.conf import Settings
 from hub_adapter.constants import ServiceTag
 from hub_adapter.core import make_request
-from hub_adapter.dependencies import get_core_client, get_settings
-from hub_adapter.routers.kong import delete_analysis
+from hub_adapter.dependencies import get_core_client, get_node_id, get_settings
+from hub_adapter.errors import catch_hub_errors
+from hub_adapter.hub_client import AsyncCoreClient
+from hub_adapter.routers.hub import _cached_read
+from hub_adapter.routers.kong import delete_analysis, get_analyses, get_projects
+from hub_adapter.schemas.meta import Dashboard, DashboardAnalysis, DashboardSource
 from hub_adapter.schemas.podorc import StatusOnlyResponse
-from hub_adapter.utils import _check_data_required
+from hub_adapter.utils import _check_data_required, parse_tags
 
 meta_router = APIRouter(
     dependencies=[
@@ -54,16 +57,13 @@ class InitializeAnalysis(BaseModel):
 )
 async def initialize_analysis(
     analysis_params: Annotated[InitializeAnalysis, Form(description="Required information to start analysis")],
-    core_client: Annotated[flame_hub.CoreClient, Depends(get_core_client)],
+    core_client: Annotated[AsyncCoreClient, Depends(get_core_client)],
 ):
     """Perform the required checks to start an analysis and send information to the PO."""
     initiator = GoGoAnalysis()
     node_id, node_type = await initiator.describe_node()
 
-    # The Hub client is synchronous and this handler has to stay async, so the call is offloaded
-    analysis = await run_in_threadpool(
-        core_client.find_analysis_nodes, filter={"analysis_id": analysis_params.analysis_id}
-    )
+    analysis = await core_client.find_analysis_nodes(filter={"analysis_id": analysis_params.analysis_id})
     if not analysis:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -200,3 +200,109 @@ async def terminate_analysis(
         logger.info(f"Analysis {analysis_id} was terminated")
 
     return resp_data
+
+
+@catch_hub_errors
+async def _find_node_analyses(core_client: AsyncCoreClient, settings: Settings, limit: int, offset: int) -> list:
+    """A page of the analysis nodes of this node, most recently updated first, served from the Hub cache.
+
+    The node ID is resolved here rather than as a dependency, so the Hub being unreachable only fails this source.
+    """
+    params = {"sort": {"by": "updated_at", "order": "descending"}, "page": {"limit": limit, "offset": offset}}
+    if node_id := await get_node_id(core_client, settings):
+        params["filter"] = {"nodeId": node_id}
+
+    return await _cached_read(core_client, "find_analysis_nodes", "analysis-nodes", **params)
+
+
+async def _get_pod_statuses(settings: Settings) -> dict:
+    headers = await _get_internal_token(settings)
+    resp_data, _ = await make_request(
+        url=f"{settings.podorc_service_url}/po/status", method="get", headers=headers, request_name="meta.dashboard"
+    )
+    return resp_data or {}
+
+
+def _failure_message(error: BaseException) -> str:
+    if isinstance(error, HTTPException) and isinstance(error.detail, dict):
+        return error.detail.get("message") or str(error.detail)
+
+    return str(error) or type(error).__name__
+
+
+@meta_router.get(
+    "/analysis/dashboard",
+    response_model=Dashboard,
+    status_code=status.HTTP_200_OK,
+    name="meta.dashboard",
+)
+async def get_analysis_dashboard(
+    core_client: Annotated[AsyncCoreClient, Depends(get_core_client)],
+    settings: Annotated[Settings, Depends(get_settings)],
+    limit: Annotated[int, Query(ge=1, le=500, description="Number of Hub analysis nodes to include")] = 50,
+    offset: Annotated[int, Query(ge=0, description="Number of Hub analysis nodes to skip")] = 0,
+):
+    """Combine the Hub analysis nodes, Kong analyses and projects, and PO statuses into one view per analysis.
+
+    The four sources are read concurrently. A source that fails does not fail the request, it is marked as not ok
+    in "sources" and the fields it would have filled are left as None. The Hub analysis nodes are paged with limit and
+    offset, most recently updated first.
+    """
+    sources = {
+        "hub": _find_node_analyses(core_client, settings, limit, offset),
+        "kong_analyses": get_analyses(settings),
+        "kong_projects": get_projects(settings),
+        "po": _get_pod_statuses(settings),
+    }
+    results = dict(zip(sources, await asyncio.gather(*sources.values(), return_exceptions=True), strict=True))
+
+    source_status = {}
+    for name, result in results.items():
+        if isinstance(result, BaseException):
+            logger.warning(f"Dashboard source {name} unavailable: {result}")
+            source_status[name] = DashboardSource(ok=False, message=_failure_message(result))
+
+        else:
+            source_status[name] = DashboardSource(ok=True)
+
+    analyses: dict[str, DashboardAnalysis] = {}
+
+    def analysis(analysis_id) -> DashboardAnalysis:
+        return analyses.setdefault(str(analysis_id), DashboardAnalysis(analysis_id=analysis_id))
+
+    if source_status["hub"].ok:
+        for entry in results["hub"]:
+            hub_analysis = analysis(entry.analysis_id)
+            hub_analysis.analysis_node_id = entry.id
+            hub_analysis.approval_status = entry.approval_status
+            hub_analysis.execution_status = entry.execution_status
+            hub_analysis.execution_progress = entry.execution_progress
+            if entry.analysis:
+                hub_analysis.project_id = entry.analysis.project_id
+
+    if source_status["kong_analyses"].ok:
+        for consumer in results["kong_analyses"]["data"]:
+            tags = parse_tags(consumer.tags)
+            if "analysis" in tags:
+                kong_analysis = analysis(tags["analysis"])
+                kong_analysis.kong_consumer = True
+                kong_analysis.project_id = kong_analysis.project_id or tags.get("project")
+
+    if source_status["po"].ok:
+        for analysis_id, report in results["po"].items():
+            pod_analysis = analysis(analysis_id)
+            pod_analysis.pod_status = report.get("status")
+            pod_analysis.pod_progress = report.get("progress")
+
+    linked_projects = None
+    if source_status["kong_projects"].ok:
+        linked_projects = {parse_tags(route.tags).get("project") for route in results["kong_projects"].data or []}
+
+    for entry in analyses.values():
+        if source_status["kong_analyses"].ok and entry.kong_consumer is None:
+            entry.kong_consumer = False
+
+        if linked_projects is not None and entry.project_id is not None:
+            entry.project_linked = str(entry.project_id) in linked_projects
+
+    return Dashboard(sources=source_status, analyses=list(analyses.values()))
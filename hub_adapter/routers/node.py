@@ -64,6 +64,12 @@ async def update_node_settings(
 
             await service_health_monitor.start()
 
+        # Start, stop, or restart the API request rollup
+        if "request_rollup" in node_settings.model_fields_set:
+            from hub_adapter.managers import request_rollup_manager
+
+            await request_rollup_manager.start()
+
         return result
 
     except ValidationError as e:
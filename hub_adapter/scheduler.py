@@ -0,0 +1,237 @@
+"""Shared scheduler running the periodic background jobs.
+
+Every job runs as a single task that waits for one run to finish before it schedules the next, so runs of the same job
+can never pile up. Runs are planned at a fixed rate from the start of the previous one, with a random offset so that
+replicas started together do not all poll the Hub, Kong and the PO in lockstep, and a run that overruns its interval
+skips the missed slots instead of making up for them back to back.
+"""
+
+import asyncio
+import logging
+import math
+import random
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+
+from hub_adapter.constants import ServiceTag
+from hub_adapter.dependencies import get_settings
+from hub_adapter.leader_election import AdvisoryLockElector
+from hub_adapter.middleware import log_event
+
+# Fraction of the interval by which each run is moved randomly, in both directions
+DEFAULT_JITTER = 0.1
+
+# Upper bounds in seconds of the run duration histogram buckets
+DURATION_BUCKETS = (0.1, 0.5, 1, 5, 10, 30, 60, 300, math.inf)
+
+
+class Job:
+    """A periodic job along with the statistics of its runs.
+
+    The run callable may return a number of seconds to schedule the next run sooner or later than the interval. An
+    exception escaping it is logged as the "<name>.error" event, the label naming the job in its description. The
+    on_elected callable is called whenever this replica takes over a leader_only job, e.g. to drop state that another
+    replica may have changed in the meantime.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[], Awaitable[float | None]],
+        interval: float,
+        label: str,
+        timeout: float,
+        jitter: float,
+        leader_only: bool,
+        service: ServiceTag,
+        poll_interval: float = 0,
+        on_elected: Callable[[], None] | None = None,
+    ):
+        self.name = name
+        self.run = run
+        self.interval = interval
+        self.label = label
+        self.timeout = timeout
+        self.jitter = jitter
+        self.leader_only = leader_only
+        self.service = service
+        self.poll_interval = poll_interval
+        self.on_elected = on_elected
+
+        self.runs = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.skipped = 0
+        self.running = False
+        self.leader = False
+        self.last_started_at: datetime | None = None
+        self.last_duration_ms: float | None = None
+        self._bucket_counts = [0] * len(DURATION_BUCKETS)
+        self._duration_sum = 0.0
+
+    def observe(self, duration: float) -> None:
+        """Add the duration of a finished run in seconds to the histogram."""
+        self._bucket_counts[next(i for i, bound in enumerate(DURATION_BUCKETS) if duration <= bound)] += 1
+        self._duration_sum += duration
+        self.last_duration_ms = duration * 1000
+
+    def stats(self) -> dict:
+        """Run counts and the duration histogram, with cumulative bucket counts keyed by their upper bound."""
+        cumulative, buckets = 0, {}
+        for bound, count in zip(DURATION_BUCKETS, self._bucket_counts, strict=True):
+            cumulative += count
+            buckets["+Inf" if bound == math.inf else str(bound)] = cumulative
+
+        return {
+            "interval": self.interval,
+            "timeout": self.timeout,
+            "leader_only": self.leader_only,
+            "leader": self.leader if self.leader_only else None,
+            "running": self.running,
+            "runs": self.runs,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "skipped": self.skipped,
+            "last_started_at": self.last_started_at,
+            "last_duration_ms": self.last_duration_ms,
+            "duration_sum_ms": self._duration_sum * 1000,
+            "duration_buckets": buckets,
+        }
+
+
+class Scheduler:
+    """Runs each job on its own task and keeps the statistics of every job scheduled so far."""
+
+    def __init__(self):
+        self._jobs: dict[str, Job] = {}
+        self._elector: AdvisoryLockElector | None = None
+
+    def schedule(
+        self,
+        name: str,
+        run: Callable[[], Awaitable[float | None]],
+        interval: float,
+        *,
+        label: str | None = None,
+        timeout: float | None = None,
+        jitter: float = DEFAULT_JITTER,
+        leader_only: bool = False,
+        service: ServiceTag = ServiceTag.HUB_ADAPTER,
+        on_elected: Callable[[], None] | None = None,
+    ) -> asyncio.Task:
+        """Start running a job every interval seconds, returning its task for the caller to cancel.
+
+        The first run happens within a random fraction of the jitter of the interval. A run exceeding its timeout,
+        by default the scheduler_job_timeout setting, is cancelled. Jobs marked leader_only are skipped by every
+        replica but one when leader election is enabled, the others trying to take over every
+        scheduler_leader_poll_interval seconds. Cancelling the task releases the job to the other replicas.
+        """
+        settings = get_settings()
+        job = Job(
+            name,
+            run,
+            interval,
+            label=label or name,
+            timeout=timeout or settings.scheduler_job_timeout,
+            jitter=jitter,
+            leader_only=leader_only and settings.scheduler_leader_election,
+            service=service,
+            poll_interval=settings.scheduler_leader_poll_interval,
+            on_elected=on_elected,
+        )
+        self._jobs[name] = job
+
+        if job.leader_only and self._elector is None:
+            self._elector = AdvisoryLockElector()
+
+        return asyncio.create_task(self._run_job(job), name=f"scheduler.{name}")
+
+    async def _run_job(self, job: Job) -> None:
+        loop = asyncio.get_running_loop()
+        next_run = loop.time() + random.uniform(0, job.jitter * job.interval)
+
+        try:
+            while True:
+                await asyncio.sleep(max(0.0, next_run - loop.time()))
+                started = loop.time()
+
+                if job.leader_only and not await self._elect(job):
+                    # Check back soon rather than after a whole interval, to take over quickly when the leader is gone
+                    interval = min(job.interval, job.poll_interval)
+
+                else:
+                    interval = await self._execute(job) or job.interval
+
+                next_run = started + interval * (1 + random.uniform(-job.jitter, job.jitter))
+
+                now = loop.time()
+                if next_run < now and interval > 0:  # overran, skip the missed slots
+                    missed = math.ceil((now - next_run) / interval)
+                    job.skipped += missed
+                    next_run += missed * interval
+
+        finally:
+            if job.leader_only:
+                job.leader = False
+                self._elector.release(job.name)
+
+    async def _elect(self, job: Job) -> bool:
+        """Whether this replica is the one to run the job, logging when that changes."""
+        leader = await self._elector.is_leader(job.name)
+
+        if leader != job.leader:
+            job.leader = leader
+            log_event(
+                "scheduler.leader.elected" if leader else "scheduler.leader.lost",
+                event_description=f"{'Took over' if leader else 'Lost'} {job.label} "
+                f"{'from' if leader else 'to'} the other replicas",
+                level=logging.INFO if leader else logging.WARNING,
+                service=job.service,
+            )
+            if leader and job.on_elected is not None:
+                job.on_elected()
+
+        return leader
+
+    async def _execute(self, job: Job) -> float | None:
+        """Run the job once within its timeout, returning the interval it asked for."""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        job.running = True
+        job.last_started_at = datetime.now(UTC)
+        job.runs += 1
+
+        try:
+            return await asyncio.wait_for(job.run(), timeout=job.timeout)
+
+        except TimeoutError:
+            job.timeouts += 1
+            log_event(
+                "scheduler.job.timeout",
+                event_description=f"Cancelled {job.label} after it ran for {job.timeout}s",
+                level=logging.ERROR,
+                service=job.service,
+            )
+
+        except Exception as e:
+            job.failures += 1
+            log_event(
+                f"{job.name}.error",
+                event_description=f"Error during {job.label}: {e}",
+                level=logging.ERROR,
+                service=job.service,
+            )
+
+        finally:
+            job.running = False
+            job.observe(loop.time() - started)
+
+        return None
+
+    def stats(self) -> dict[str, dict]:
+        """Statistics of every job scheduled since startup, by name."""
+        return {name: job.stats() for name, job in self._jobs.items()}
+
+
+# Process wide scheduler shared by the background task managers
+scheduler = Scheduler()
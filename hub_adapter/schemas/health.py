@@ -52,6 +52,49 @@ class DownstreamHealthCheck(BaseModel):
     fhir: HealthCheck | None = None
 
 
+class CoalescingStats(BaseModel):
+    """Upstream reads shared between identical concurrent requests since startup."""
+
+    calls: int
+    upstream: int
+    collapsed: int
+    in_flight: int
+
+
+class KongCleanupSweep(BaseModel):
+    """Outcome of the latest Kong consumer cleanup sweep."""
+
+    started_at: datetime
+    duration_ms: float
+    candidates: int = Field(description="Kong analysis consumers checked against the Hub")
+    deleted: int
+    failed: int = Field(description="Consumers that were due for deletion but could not be deleted")
+    pending: int = Field(description="Consumers of finished analyses still within their grace period")
+    next_interval: int = Field(description="Seconds until the next sweep, shorter while consumers are pending")
+
+
+class ScheduledJobStats(BaseModel):
+    """Runs of a periodic background job since startup."""
+
+    interval: float = Field(description="Seconds between the starts of two runs, before jitter")
+    timeout: float
+    leader_only: bool = Field(description="Whether only the replica holding the job's advisory lock runs it")
+    leader: bool | None = Field(
+        default=None, description="Whether this replica holds the job's advisory lock, None for jobs every replica runs"
+    )
+    running: bool
+    runs: int
+    failures: int
+    timeouts: int
+    skipped: int = Field(description="Scheduled runs dropped because the previous run was still going")
+    last_started_at: datetime | None = None
+    last_duration_ms: float | None = None
+    duration_sum_ms: float
+    duration_buckets: dict[str, int] = Field(
+        description="Runs that finished within each upper bound in seconds, counted cumulatively"
+    )
+
+
 class ServiceHealthPoint(BaseModel):
     """A single recorded probe of a downstream service."""
 
@@ -77,6 +120,9 @@ class ServiceHealthBucket(BaseModel):
     failed: int
     max_latency_ms: float | None = None
     avg_latency_ms: float | None = None
+    p50_latency_ms: float | None = None
+    p95_latency_ms: float | None = None
+    p99_latency_ms: float | None = None
     worst_status: ServiceCheckStatus = Field(
         description="ERROR when any check in the slice failed, otherwise OK",
     )
@@ -102,6 +148,11 @@ class ServiceHealthSummary(BaseModel):
     min_latency_ms: float | None = None
     avg_latency_ms: float | None = None
     max_latency_ms: float | None = None
+    p50_latency_ms: float | None = Field(
+        default=None, description="Latency percentiles, estimated to the bounds of a histogram of the latencies"
+    )
+    p95_latency_ms: float | None = None
+    p99_latency_ms: float | None = None
 
     last_status: ServiceCheckStatus | None = None
     last_status_code: int | None = None
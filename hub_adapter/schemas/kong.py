@@ -109,6 +109,31 @@ class LinkProjectAnalysis(BaseModel):
     acl: ACL
 
 
+class AnalysisRegistration(BaseModel):
+    """An analysis to register with Kong, along with the project it belongs to."""
+
+    project_id: str
+    analysis_id: str
+
+
+class AnalysisRegistrationResult(BaseModel):
+    """Outcome of registering one analysis of a bulk request."""
+
+    project_id: str
+    analysis_id: str
+    status: int
+    message: str | None = None
+    consumer: Consumer | None = None
+    keyauth: KeyAuth | None = None
+    acl: ACL | None = None
+
+
+class BulkAnalysisRegistration(BaseModel):
+    """Response for registering many analyses at once, one result per analysis in the order requested."""
+
+    results: list[AnalysisRegistrationResult]
+
+
 class DetailedService(Service):
     """Custom route response model with associated services."""
 
@@ -139,9 +164,24 @@ class ListServices(ListService200Response):
     data: list[DetailedService] | None = None
 
 
+class KongDeleteFailure(BaseModel):
+    """A Kong entity which could not be deleted."""
+
+    id: str
+    kind: str
+    status: int | None = None
+    message: str | None = None
+
+
 class UnlinkResponse(BaseModel):
-    """Response for unlinking a data store from a project or deleting a whole project."""
+    """Response for unlinking a data store from a project or deleting a whole project or data store.
+
+    On a dry run, the entities listed as removed are the ones which would have been deleted.
+    """
 
     removed_routes: list[Route]
     removed_consumers: list[Consumer] = []
+    removed_services: list[Service] = []
+    failed: list[KongDeleteFailure] = []
+    dry_run: bool = False
     status: int | None = None
@@ -31,9 +31,11 @@ class Meta(BaseModel):
     """Event log metadata model."""
 
     count: int
-    total: int
+    total: int | None = None
     limit: int
     offset: int | None = None
+    after: str | None = None
+    next_cursor: str | None = None
 
 
 class EventLogResponse(BaseModel):
@@ -105,6 +107,8 @@ class LogQLQueryRequest(BaseModel):
     query: str
     limit: int = 50
     offset: int = 0
+    after: str | None = None
+    include_total: bool = True
     start: datetime.datetime | None = None
     end: datetime.datetime | None = None
 
@@ -119,7 +123,7 @@ class LogQLQueryResponse(BaseModel):
 class ApiRequestCountResponse(BaseModel):
     """Response for the API request count endpoint.
 
-    data maps endpoint path → {method: count, ..., "total": count}.
+    data maps endpoint path, route template or route name → {method: count, ..., "total": count}.
     """
 
     total: int
@@ -160,6 +164,7 @@ TRACKED_EVENTS = {
     "kong.project.delete": "A user sent a request to delete a project to Kong",
     "kong.analysis.get": "A user requested a list of analyses (consumers) from Kong",
     "kong.analysis.create": "A user sent a request to create a analysis to Kong",
+    "kong.analysis.bulk": "A user sent a request to create several analyses at once to Kong",
     "kong.analysis.delete": "A user sent a request to delete a analysis to Kong",
     "kong.initialize": "A user sent a request to create a datastore and link a project to it",
     "kong.probe": "A user requested the status of a datastore",
@@ -204,6 +209,7 @@ TRACKED_EVENTS = {
     "fhir.endpoint.not_found": "The requested FHIR endpoint was not found",
     # Dependency events
     "hub.http.response": "An HTTP response was received from the Hub",
+    "kong.http.response": "An HTTP response was received from the Kong admin API",
     # Autostart events
     "autostart.poll": "Autostart checked for new analyses to start",
     "autostart.error": "Autostart encountered an error during its main loop",
@@ -219,6 +225,7 @@ TRACKED_EVENTS = {
     "autostart.analysis.orphan_cleanup": "Autostart found no running pod and is cleaning up the orphaned Kong consumer",
     "autostart.analysis.max_retries": "Autostart failed to start an analysis after max attempts",
     "autostart.analysis.already_running": "Autostart found a pod already running for an analysis",
+    "autostart.analysis.locked": "Autostart left an analysis to the worker or replica still registering it",
     "autostart.token.error": "Autostart was unable to fetch the OIDC token",
     "autostart.analysis.starting": "Autostart is sending a start request for an analysis pod",
     "autostart.analysis.start_response": "Autostart received a response to an analysis start request",
@@ -228,6 +235,7 @@ TRACKED_EVENTS = {
     "autostart.analysis.no_token": "Autostart could not start analysis due to missing token",
     "autostart.analysis.status_error": "Autostart failed to fetch the status of an analysis pod",
     "autostart.kong.route_error": "Autostart failed to retrieve Kong routes",
+    "autostart.project.unreachable": "Autostart skipped projects whose data stores all failed the latest link check",
     "autostart.analysis.invalid_project": "Autostart skipped analysis due to an invalid or unapproved project",
     "autostart.analysis.ready": "Autostart found analyses ready to start",
     # Kong consumer cleanup events
@@ -240,6 +248,10 @@ TRACKED_EVENTS = {
     "kong_cleanup.hub_fetch_error": "Kong consumer cleanup failed to fetch analysis statuses from the Hub",
     "kong_cleanup.delete_error": "Kong consumer cleanup failed to delete a Kong analysis consumer",
     "kong_cleanup.consumer_deleted": "Kong consumer cleanup deleted a stale Kong analysis consumer",
+    # Kong inventory events
+    "kong_inventory.started": "Kong inventory refresh started",
+    "kong_inventory.stopped": "Kong inventory refresh stopped",
+    "kong_inventory.error": "Kong inventory refresh was unable to list the Kong entities",
     # Downstream service health monitoring events
     "service_health.started": "Service health monitoring started",
     "service_health.stopped": "Service health monitoring stopped",
@@ -247,6 +259,25 @@ TRACKED_EVENTS = {
     "service_health.disabled": "Service health monitoring is disabled because no database is available",
     "service_health.error": "Service health monitoring encountered an error during its main loop",
     "service_health.write_error": "Service health monitoring was unable to store its results",
+    "service_health.write_dropped": "Service health monitoring dropped results it could not store for too long",
     "service_health.status_change": "A downstream service changed between a healthy and an unhealthy state",
-    "service_health.pruned": "Service health monitoring deleted checks older than the retention window",
+    "service_health.pruned": "Service health monitoring dropped the daily partitions older than the retention window",
+    # Background scheduler events
+    "scheduler.job.timeout": "A periodic background job was cancelled for exceeding its timeout",
+    "scheduler.leader.elected": "This replica took over a background job from the other replicas",
+    "scheduler.leader.lost": "This replica is no longer the one running a background job",
+    # Data store link monitoring events
+    "link_health.started": "Data store link monitoring started",
+    "link_health.stopped": "Data store link monitoring stopped",
+    "link_health.error": "Data store link monitoring encountered an error during its main loop",
+    "link_health.write_error": "Data store link monitoring was unable to store its results",
+    "link_health.status_change": "A project's link to a data store changed between a healthy and an unhealthy state",
+    # API request rollup events
+    "request_rollup.started": "API request rollup started",
+    "request_rollup.stopped": "API request rollup stopped",
+    "request_rollup.restarted": "API request rollup restarted with new settings",
+    "request_rollup.disabled": "API request rollup is disabled or has no database or log service available",
+    "request_rollup.error": "API request rollup encountered an error during its main loop",
+    "request_rollup.write_error": "API request rollup was unable to store or prune its counts",
+    "request_rollup.pruned": "API request rollup deleted counts older than the retention window",
 }
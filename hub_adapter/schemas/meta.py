@@ -0,0 +1,43 @@
+import uuid
+
+from pydantic import BaseModel
+
+from hub_adapter.schemas.podorc import PodStatus
+
+
+class DashboardSource(BaseModel):
+    """Whether one of the sources of the dashboard could be read."""
+
+    ok: bool
+    message: str | None = None
+
+
+class DashboardSources(BaseModel):
+    """Read outcome of every source joined into the dashboard."""
+
+    hub: DashboardSource
+    kong_analyses: DashboardSource
+    kong_projects: DashboardSource
+    po: DashboardSource
+
+
+class DashboardAnalysis(BaseModel):
+    """Combined state of an analysis. Fields from a source that could not be read are None."""
+
+    analysis_id: uuid.UUID | str
+    project_id: uuid.UUID | str | None = None
+    analysis_node_id: uuid.UUID | None = None
+    approval_status: str | None = None
+    execution_status: str | None = None
+    execution_progress: int | None = None
+    kong_consumer: bool | None = None
+    project_linked: bool | None = None
+    pod_status: PodStatus | None = None
+    pod_progress: int | None = None
+
+
+class Dashboard(BaseModel):
+    """Response model for the analysis dashboard."""
+
+    sources: DashboardSources
+    analyses: list[DashboardAnalysis]
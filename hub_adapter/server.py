@@ -15,6 +15,9 @@ from hub_adapter.dependencies import close_resources, get_settings
 from hub_adapter.managers import (
     autostart_manager,
     kong_cleanup_manager,
+    kong_inventory_manager,
+    link_health_monitor,
+    request_rollup_manager,
     service_health_monitor,
 )
 from hub_adapter.middleware import RequestLoggingMiddleware
@@ -60,15 +63,21 @@ tags_metadata = [
 async def lifespan(app: FastAPI):
     anyio.to_thread.current_default_thread_limiter().total_tokens = settings.worker_thread_limit
 
+    await kong_inventory_manager.start()
     await autostart_manager.update()
     await kong_cleanup_manager.start()
     await service_health_monitor.start()
+    await link_health_monitor.start()
+    await request_rollup_manager.start(app.routes)
 
     yield
 
     await autostart_manager.stop()
     await kong_cleanup_manager.stop()
     await service_health_monitor.stop()
+    await link_health_monitor.stop()
+    await request_rollup_manager.stop()
+    await kong_inventory_manager.stop()
 
     # Release the shared clients
     await close_resources()
@@ -1,22 +1,28 @@
 """Background routine that probes the downstream microservices and stores the results in Postgres."""
 
 import asyncio
+import io
 import logging
+import math
 import uuid
+from bisect import bisect_left
+from collections import deque
 from collections.abc import Iterable
 from contextlib import contextmanager, suppress
-from datetime import UTC, datetime, timedelta
-from time import perf_counter
+from datetime import UTC, date, datetime, timedelta
+from time import monotonic, perf_counter
 
 import httpx2
 import peewee as pw
-from playhouse.postgres_ext import DateTimeTZField
+from playhouse.postgres_ext import ArrayField, DateTimeTZField
+from starlette.concurrency import run_in_threadpool
 
 from hub_adapter.conf import ServiceHealthSettings, Settings
 from hub_adapter.constants import ServiceTag
 from hub_adapter.database import get_node_database
 from hub_adapter.dependencies import get_proxy_client, get_settings
 from hub_adapter.middleware import log_event
+from hub_adapter.scheduler import scheduler
 from hub_adapter.schemas.health import ServiceCheckStatus
 from hub_adapter.user_settings import load_persistent_settings
 
@@ -26,9 +32,27 @@ PROBE_TIMEOUT = 10.0  # seconds
 MESSAGE_MAX_LENGTH = 500  # keep an upstream HTML error page from bloating the table
 PRUNE_INTERVAL = timedelta(hours=1)
 
+# Daily partitions created ahead of the current day, so writes never wait on one being created
+PARTITIONS_AHEAD = 3
+
 DEFAULT_INTERVAL = 60
 DEFAULT_RETENTION_DAYS = 30
 
+# Sweep rows are written once this many are waiting or the oldest has waited FLUSH_INTERVAL
+FLUSH_BATCH_ROWS = 500
+FLUSH_INTERVAL = 60.0  # seconds
+
+# Rows kept waiting while the database is unreachable, the oldest are dropped beyond this
+BUFFER_MAX_ROWS = 10_000
+
+# Upper bounds in milliseconds of the latency histogram kept by the rollups, from which percentiles are estimated
+LATENCY_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, math.inf)
+PERCENTILES = (50, 95, 99)
+
+COPY_COLUMNS = ("sweep_id", "service", "url", "checked_at", "status", "status_code", "latency_ms", "message")
+
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
 # Services that are only probed when the node has a URL for them
 OPTIONAL_SERVICES = ("victoria_logs", "message_broker", "s3", "fhir")
 
@@ -170,6 +194,8 @@ class ServiceHealthCheck(pw.Model):
         Round trip time in milliseconds.
     message : str | None
         Error text, truncated to MESSAGE_MAX_LENGTH characters.
+
+    The table is partitioned by day on checked_at, see prepare_service_health, so it is not created through peewee.
     """
 
     id = pw.BigAutoField()
@@ -187,20 +213,291 @@ class ServiceHealthCheck(pw.Model):
         indexes = ((("service", "checked_at"), False),)
 
 
+TABLE = ServiceHealthCheck._meta.table_name
+LEGACY_TABLE = f"{TABLE}_unpartitioned"
+
+# Mirrors ServiceHealthCheck, the primary key of a partitioned table has to include the partition key
+CREATE_TABLE = f"""
+CREATE TABLE IF NOT EXISTS "{TABLE}" (
+    "id" BIGSERIAL NOT NULL,
+    "sweep_id" UUID NOT NULL,
+    "service" VARCHAR(64) NOT NULL,
+    "url" TEXT NOT NULL,
+    "checked_at" TIMESTAMPTZ NOT NULL,
+    "status" VARCHAR(16) NOT NULL,
+    "status_code" INTEGER,
+    "latency_ms" DOUBLE PRECISION,
+    "message" TEXT,
+    PRIMARY KEY ("id", "checked_at")
+) PARTITION BY RANGE ("checked_at")
+"""
+INDEXES = {
+    "servicehealthcheck_checked_at": '"checked_at"',
+    "servicehealthcheck_service_checked_at": '"service", "checked_at"',
+}
+
+
 @contextmanager
 def bind_service_health(db: pw.Database):
-    """Bind the health check model to a database, creating the table if it does not exist yet."""
+    """Bind the health check model to a database, the table is set up by prepare_service_health."""
     with db.bind_ctx((ServiceHealthCheck,)):
-        db.create_tables((ServiceHealthCheck,))
         yield
 
 
-def record_sweep(db: pw.Database, results: dict[str, dict], checked_at: datetime | None = None) -> uuid.UUID:
-    """Persist the results of one probe cycle. Every row shares a sweep ID and timestamp."""
+class ServiceHealthRollup(pw.Model):
+    """Database table schema for the checks of a service aggregated over a fixed slice of time.
+
+    Every column can be merged with the same column of an adjacent slice, so the checks of a sweep are folded into the
+    rollups as they are written and a history query combines the rollups instead of the checks themselves.
+
+    Attributes
+    ----------
+    service : str
+        Name of the downstream service.
+    bucket : datetime
+        UTC start of the slice.
+    total : int
+        Number of checks in the slice.
+    successful : int
+        Number of checks with the status "OK".
+    latency_count : int
+        Number of checks with a latency, the others could not reach the service.
+    latency_sum : float
+        Sum of those latencies in milliseconds.
+    latency_min : float | None
+        Lowest latency in milliseconds.
+    latency_max : float | None
+        Highest latency in milliseconds.
+    latency_histogram : list[int]
+        Number of latencies falling into each of the LATENCY_BUCKETS.
+    first_failure_at : datetime | None
+        When the earliest failed check of the slice happened.
+    first_failure_message : str | None
+        Error text of that check.
+    """
+
+    service = pw.CharField(max_length=64)
+    bucket = DateTimeTZField(index=True)
+    total = pw.IntegerField()
+    successful = pw.IntegerField()
+    latency_count = pw.IntegerField()
+    latency_sum = pw.DoubleField()
+    latency_min = pw.DoubleField(null=True)
+    latency_max = pw.DoubleField(null=True)
+    latency_histogram = ArrayField(pw.IntegerField)
+    first_failure_at = DateTimeTZField(null=True)
+    first_failure_message = pw.TextField(null=True)
+
+    class Meta:
+        primary_key = pw.CompositeKey("service", "bucket")
+
+
+class MinuteRollup(ServiceHealthRollup):
+    class Meta:
+        table_name = "service_health_rollup_1m"
+
+
+class HourRollup(ServiceHealthRollup):
+    class Meta:
+        table_name = "service_health_rollup_1h"
+
+
+class DayRollup(ServiceHealthRollup):
+    class Meta:
+        table_name = "service_health_rollup_1d"
+
+
+# Rollup tables by the width of their slices in seconds, coarsest first
+ROLLUPS: dict[int, type[ServiceHealthRollup]] = {86400: DayRollup, 3600: HourRollup, 60: MinuteRollup}
+
+# The minute rollup holds about as many rows as the checks, so it is partitioned by day like them and not created
+# through peewee. The coarser rollups are small enough to be pruned row by row.
+MINUTE_ROLLUP_TABLE = MinuteRollup._meta.table_name
+CREATE_MINUTE_ROLLUP = f"""
+CREATE TABLE IF NOT EXISTS "{MINUTE_ROLLUP_TABLE}" (
+    "service" VARCHAR(64) NOT NULL,
+    "bucket" TIMESTAMPTZ NOT NULL,
+    "total" INTEGER NOT NULL,
+    "successful" INTEGER NOT NULL,
+    "latency_count" INTEGER NOT NULL,
+    "latency_sum" DOUBLE PRECISION NOT NULL,
+    "latency_min" DOUBLE PRECISION,
+    "latency_max" DOUBLE PRECISION,
+    "latency_histogram" INTEGER[] NOT NULL,
+    "first_failure_at" TIMESTAMPTZ,
+    "first_failure_message" TEXT,
+    PRIMARY KEY ("service", "bucket")
+) PARTITION BY RANGE ("bucket")
+"""
+MINUTE_ROLLUP_INDEX = f"{MINUTE_ROLLUP_TABLE}_bucket"
+
+# Tables partitioned by day, all of them get the same partitions
+PARTITIONED_TABLES = (TABLE, MINUTE_ROLLUP_TABLE)
+
+ROLLUP_COLUMNS = (
+    "service",
+    "bucket",
+    "total",
+    "successful",
+    "latency_count",
+    "latency_sum",
+    "latency_min",
+    "latency_max",
+    "latency_histogram",
+    "first_failure_at",
+    "first_failure_message",
+)
+
+
+def _histogram_sql() -> str:
+    """SQL counting the latencies of a group into the LATENCY_BUCKETS, the bounds being constants."""
+    counts = []
+    for lower, upper in zip((None, *LATENCY_BUCKETS), LATENCY_BUCKETS, strict=False):
+        conditions = []
+        if lower is not None:
+            conditions.append(f'"latency_ms" > {lower}')
+        if upper != math.inf:
+            conditions.append(f'"latency_ms" <= {upper}')
+        counts.append(f"COUNT(*) FILTER (WHERE {' AND '.join(conditions)})::integer")
+
+    return f"ARRAY[{', '.join(counts)}]::integer[]"
+
+
+def backfill_rollup(db: pw.Database, width: int) -> None:
+    """Fill a rollup table from the checks stored before it existed."""
+    columns = ", ".join(f'"{column}"' for column in ROLLUP_COLUMNS)
+    db.execute_sql(
+        f'INSERT INTO "{ROLLUPS[width]._meta.table_name}" ({columns}) '
+        f'SELECT "service", to_timestamp(FLOOR(EXTRACT(epoch FROM "checked_at") / %s) * %s), COUNT(*), '
+        f'COUNT(*) FILTER (WHERE "status" = %s), COUNT("latency_ms"), COALESCE(SUM("latency_ms"), 0), '
+        f'MIN("latency_ms"), MAX("latency_ms"), {_histogram_sql()}, '
+        f'MIN("checked_at") FILTER (WHERE "status" != %s), '
+        f'(array_agg("message" ORDER BY "checked_at") FILTER (WHERE "status" != %s))[1] '
+        f'FROM "{TABLE}" GROUP BY 1, 2',
+        (width, width, ServiceCheckStatus.OK, ServiceCheckStatus.OK, ServiceCheckStatus.OK),
+    )
+
+
+def _partition_name(table: str, day: date) -> str:
+    return f"{table}_p{day:%Y%m%d}"
+
+
+def _day_start(day: date) -> datetime:
+    return datetime(day.year, day.month, day.day, tzinfo=UTC)
+
+
+def create_partitions(
+    db: pw.Database, first_day: date, last_day: date, tables: Iterable[str] = PARTITIONED_TABLES
+) -> None:
+    """Create the daily partitions from first_day through last_day that do not exist yet."""
+    day = first_day
+    while day <= last_day:
+        for table in tables:
+            db.execute_sql(
+                f'CREATE TABLE IF NOT EXISTS "{_partition_name(table, day)}" PARTITION OF "{table}" '
+                "FOR VALUES FROM (%s) TO (%s)",
+                (_day_start(day).isoformat(), _day_start(day + timedelta(days=1)).isoformat()),
+            )
+        day += timedelta(days=1)
+
+
+def list_partitions(db: pw.Database, table: str = TABLE) -> dict[str, date]:
+    """The daily partitions of a table by name, along with the day each one holds."""
+    rows = db.execute_sql(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE pg_inherits.inhparent = to_regclass(%s)",
+        (table,),
+    ).fetchall()
+
+    partitions = {}
+    for (name,) in rows:
+        with suppress(ValueError):
+            partitions[name] = datetime.strptime(name.removeprefix(f"{table}_p"), "%Y%m%d").date()
+
+    return partitions
+
+
+def _relkind(db: pw.Database, table: str) -> str | None:
+    """The kind of a relation, "r" for a plain table and "p" for a partitioned one, or None if it does not exist."""
+    row = db.execute_sql("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", (table,)).fetchone()
+    return row[0] if row is not None else None
+
+
+def prepare_service_health(db: pw.Database, retention_days: int) -> None:
+    """Create the tables partitioned by day along with the partitions of the coming days, and the other rollup tables.
+
+    A table left unpartitioned by an earlier version is replaced, keeping the checks within the retention window, and
+    missing rollup tables are filled from the checks already stored.
+    """
+    today = datetime.now(UTC).date()
+
+    with db.atomic():
+        migrating = _relkind(db, TABLE) == "r"
+
+        if migrating:
+            db.execute_sql(f'ALTER TABLE "{TABLE}" RENAME TO "{LEGACY_TABLE}"')
+            for index in INDEXES:
+                db.execute_sql(f'DROP INDEX IF EXISTS "{index}"')
+
+        db.execute_sql(CREATE_TABLE)
+        for index, columns in INDEXES.items():
+            db.execute_sql(f'CREATE INDEX IF NOT EXISTS "{index}" ON "{TABLE}" ({columns})')
+
+        # An unpartitioned minute rollup is rebuilt from the checks, like a missing one
+        minute_rollup = _relkind(db, MINUTE_ROLLUP_TABLE)
+        if minute_rollup == "r":
+            db.execute_sql(f'DROP TABLE "{MINUTE_ROLLUP_TABLE}"')
+
+        db.execute_sql(CREATE_MINUTE_ROLLUP)
+        db.execute_sql(f'CREATE INDEX IF NOT EXISTS "{MINUTE_ROLLUP_INDEX}" ON "{MINUTE_ROLLUP_TABLE}" ("bucket")')
+
+        if migrating:
+            cutoff = _day_start(today - timedelta(days=retention_days))
+            first, last = db.execute_sql(
+                f'SELECT MIN("checked_at"), MAX("checked_at") FROM "{LEGACY_TABLE}" WHERE "checked_at" >= %s', (cutoff,)
+            ).fetchone()
+            if first is not None:
+                create_partitions(db, first.astimezone(UTC).date(), max(last.astimezone(UTC).date(), today))
+
+            columns = ", ".join(f'"{column}"' for column in ("id", *COPY_COLUMNS))
+            db.execute_sql(
+                f'INSERT INTO "{TABLE}" ({columns}) SELECT {columns} FROM "{LEGACY_TABLE}" WHERE "checked_at" >= %s',
+                (cutoff,),
+            )
+            db.execute_sql(
+                f'SELECT setval(pg_get_serial_sequence(%s, \'id\'), (SELECT MAX("id") FROM "{TABLE}"))',
+                (TABLE,),
+            )
+            db.execute_sql(f'DROP TABLE "{LEGACY_TABLE}"')
+
+        create_partitions(db, today - timedelta(days=1), today + timedelta(days=PARTITIONS_AHEAD))
+
+        coarser = [model for model in ROLLUPS.values() if model is not MinuteRollup]
+        with db.bind_ctx(coarser):
+            missing = [
+                width
+                for width, model in ROLLUPS.items()
+                if model in coarser and not db.table_exists(model._meta.table_name)
+            ]
+            db.create_tables(coarser)
+
+        if minute_rollup != "p":
+            # Every day holding checks needs its minute rollup partition before they are rolled up
+            for day in list_partitions(db).values():
+                create_partitions(db, day, day, tables=(MINUTE_ROLLUP_TABLE,))
+            missing.append(60)
+
+        for width in missing:
+            backfill_rollup(db, width)
+
+
+def sweep_rows(results: dict[str, dict], checked_at: datetime | None = None) -> list[dict]:
+    """Turn the results of one probe cycle into table rows. Every row shares a sweep ID and timestamp."""
     checked_at = checked_at or datetime.now(UTC)
     sweep_id = uuid.uuid4()
 
-    rows = [
+    return [
         {
             "sweep_id": sweep_id,
             "service": service,
@@ -214,18 +511,180 @@ def record_sweep(db: pw.Database, results: dict[str, dict], checked_at: datetime
         for service, result in results.items()
     ]
 
-    with bind_service_health(db):
-        ServiceHealthCheck.insert_many(rows).execute()
 
-    return sweep_id
+def _copy_field(value) -> str:
+    """Format a value for the text format of COPY."""
+    if value is None:
+        return "\\N"
+
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def copy_checks(db: pw.PostgresqlDatabase, rows: list[dict]) -> None:
+    """Bulk load rows into the health check table with a single COPY, the table has to exist already."""
+    data = io.StringIO("".join("\t".join(_copy_field(row[column]) for column in COPY_COLUMNS) + "\n" for row in rows))
+    columns = ", ".join(f'"{column}"' for column in COPY_COLUMNS)
+
+    with pw.__exception_wrapper__, db.atomic():
+        db.cursor().copy_expert(f'COPY "{ServiceHealthCheck._meta.table_name}" ({columns}) FROM STDIN', data)
+
+
+class HealthAggregate:
+    """Counts and latency statistics of a group of checks, built from the checks or from rollup rows alike."""
+
+    def __init__(self):
+        self.total = 0
+        self.successful = 0
+        self.latency_count = 0
+        self.latency_sum = 0.0
+        self.latency_min: float | None = None
+        self.latency_max: float | None = None
+        self.latency_histogram = [0] * len(LATENCY_BUCKETS)
+        self.first_failure_at: datetime | None = None
+        self.first_failure_message: str | None = None
+
+    def add_check(self, check: dict) -> None:
+        """Count a single check, a row of the health check table."""
+        self.total += 1
+        if check["status"] == ServiceCheckStatus.OK:
+            self.successful += 1
+        else:
+            self._failed(check["checked_at"], check["message"])
+
+        latency = check["latency_ms"]
+        if latency is not None:
+            self.latency_count += 1
+            self.latency_sum += latency
+            self.latency_min = latency if self.latency_min is None else min(self.latency_min, latency)
+            self.latency_max = latency if self.latency_max is None else max(self.latency_max, latency)
+            self.latency_histogram[bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+    def merge(self, row: dict) -> None:
+        """Add the checks of a rollup row."""
+        self.total += row["total"]
+        self.successful += row["successful"]
+        self.latency_count += row["latency_count"]
+        self.latency_sum += row["latency_sum"]
+        self.latency_min = min((v for v in (self.latency_min, row["latency_min"]) if v is not None), default=None)
+        self.latency_max = max((v for v in (self.latency_max, row["latency_max"]) if v is not None), default=None)
+        self.latency_histogram = [a + b for a, b in zip(self.latency_histogram, row["latency_histogram"], strict=True)]
+        if row["first_failure_at"] is not None:
+            self._failed(row["first_failure_at"], row["first_failure_message"])
+
+    def _failed(self, at: datetime, message: str | None) -> None:
+        if self.first_failure_at is None or at < self.first_failure_at:
+            self.first_failure_at, self.first_failure_message = at, message
+
+    def percentile(self, percent: float) -> float | None:
+        """Estimate a latency percentile as the upper bound of the histogram bucket it falls in."""
+        if not self.latency_count:
+            return None
+
+        rank, seen = math.ceil(self.latency_count * percent / 100), 0
+        for bound, count in zip(LATENCY_BUCKETS, self.latency_histogram, strict=True):
+            seen += count
+            if seen >= rank:
+                return max(self.latency_min, min(bound, self.latency_max))
+
+        return self.latency_max
+
+    def as_row(self) -> dict:
+        """The columns of a rollup row, apart from its service and slice."""
+        return {column: getattr(self, column) for column in ROLLUP_COLUMNS[2:]}
+
+    def stats(self) -> dict:
+        """Counts and latencies in the shape of the history aggregates."""
+        return {
+            "total": self.total,
+            "successful": self.successful,
+            "min_latency_ms": self.latency_min,
+            "avg_latency_ms": self.latency_sum / self.latency_count if self.latency_count else None,
+            "max_latency_ms": self.latency_max,
+            **{f"p{percent}_latency_ms": self.percentile(percent) for percent in PERCENTILES},
+            "message": self.first_failure_message,
+        }
+
+
+def _floor(moment: datetime, seconds: int) -> datetime:
+    """Start of the slice seconds wide, counted from the epoch, that moment falls in."""
+    width = timedelta(seconds=seconds)
+    return EPOCH + (moment - EPOCH) // width * width
+
+
+def rollup_rows(rows: list[dict], width: int) -> list[dict]:
+    """Aggregate health check rows into rollup rows, one per service and slice width seconds wide."""
+    aggregates: dict[tuple[str, datetime], HealthAggregate] = {}
+    for row in rows:
+        aggregates.setdefault((row["service"], _floor(row["checked_at"], width)), HealthAggregate()).add_check(row)
+
+    return [
+        {"service": service, "bucket": bucket, **aggregate.as_row()}
+        for (service, bucket), aggregate in aggregates.items()
+    ]
+
+
+def _rollup_merge(model: type[ServiceHealthRollup]) -> dict:
+    """ON CONFLICT update adding the incoming rollup row to the stored one."""
+    table = model._meta.table_name
+    earlier_failure = (pw.EXCLUDED.first_failure_at < model.first_failure_at) | model.first_failure_at.is_null()
+
+    return {
+        model.total: model.total + pw.EXCLUDED.total,
+        model.successful: model.successful + pw.EXCLUDED.successful,
+        model.latency_count: model.latency_count + pw.EXCLUDED.latency_count,
+        model.latency_sum: model.latency_sum + pw.EXCLUDED.latency_sum,
+        model.latency_min: pw.fn.LEAST(model.latency_min, pw.EXCLUDED.latency_min),
+        model.latency_max: pw.fn.GREATEST(model.latency_max, pw.EXCLUDED.latency_max),
+        model.latency_histogram: pw.SQL(
+            f'ARRAY(SELECT a + b FROM unnest("{table}"."latency_histogram", EXCLUDED."latency_histogram") '
+            "WITH ORDINALITY AS u(a, b, i) ORDER BY i)"
+        ),
+        model.first_failure_message: pw.Case(
+            None, [(earlier_failure, pw.EXCLUDED.first_failure_message)], model.first_failure_message
+        ),
+        model.first_failure_at: pw.fn.LEAST(model.first_failure_at, pw.EXCLUDED.first_failure_at),
+    }
+
+
+def upsert_rollups(db: pw.Database, rows: list[dict]) -> None:
+    """Fold health check rows into every rollup table."""
+    for width, model in ROLLUPS.items():
+        with db.bind_ctx((model,)):
+            model.insert_many(rollup_rows(rows, width)).on_conflict(
+                conflict_target=[model.service, model.bucket], update=_rollup_merge(model)
+            ).execute()
+
+
+def write_checks(db: pw.PostgresqlDatabase, rows: list[dict]) -> None:
+    """Store health check rows and fold them into the rollups, in one transaction so both stay in step."""
+    with db.atomic():
+        copy_checks(db, rows)
+        upsert_rollups(db, rows)
 
 
 def prune_old_checks(db: pw.Database, retention_days: int) -> int:
-    """Delete checks older than the retention window, returning the number of rows removed."""
+    """Drop the daily partitions lying entirely before the retention window, returning the number of days dropped.
+
+    The minute rollups of those days are dropped along with them, and the rows of the coarser rollups deleted.
+    """
     cutoff = datetime.now(UTC) - timedelta(days=retention_days)
+    for model in ROLLUPS.values():
+        if model is not MinuteRollup:
+            db.execute_sql(f'DELETE FROM "{model._meta.table_name}" WHERE "bucket" < %s', (_day_start(cutoff.date()),))
 
-    with bind_service_health(db):
-        return ServiceHealthCheck.delete().where(ServiceHealthCheck.checked_at < cutoff).execute()
+    def expired(table: str) -> list[str]:
+        return [
+            name for name, day in list_partitions(db, table).items() if _day_start(day + timedelta(days=1)) <= cutoff
+        ]
+
+    for name in expired(MINUTE_ROLLUP_TABLE):
+        db.execute_sql(f'DROP TABLE IF EXISTS "{name}"')
+
+    expired_checks = expired(TABLE)
+    for name in expired_checks:
+        db.execute_sql(f'DROP TABLE IF EXISTS "{name}"')
+
+    return len(expired_checks)
 
 
 def _range_filter(start: datetime, end: datetime, services: Iterable[str] | None):
@@ -287,6 +746,7 @@ def _rows_to_buckets(rows: list[dict], bucket_seconds: int) -> dict[str, list[di
                 "failed": failed,
                 "max_latency_ms": _as_float(row["max_latency_ms"]),
                 "avg_latency_ms": _as_float(row["avg_latency_ms"], ndigits=2),
+                **{f"p{percent}_latency_ms": _as_float(row.get(f"p{percent}_latency_ms")) for percent in PERCENTILES},
                 "worst_status": ServiceCheckStatus.ERROR if failed else ServiceCheckStatus.OK,
                 "message": row["message"] if failed else None,
             }
@@ -298,40 +758,93 @@ def _rows_to_buckets(rows: list[dict], bucket_seconds: int) -> dict[str, list[di
     return buckets
 
 
+def _ceil(moment: datetime, seconds: int) -> datetime:
+    floored = _floor(moment, seconds)
+    return floored if floored == moment else floored + timedelta(seconds=seconds)
+
+
+def _segments(start: datetime, stop: datetime, widths: list[int]) -> list[tuple[int | None, datetime, datetime]]:
+    """Split [start, stop) into the fewest slices covered by the given rollup widths, coarsest first.
+
+    What no rollup slice fits into entirely, i.e. the edges of the range, comes back with a width of None to be
+    aggregated from the checks themselves.
+    """
+    if start >= stop:
+        return []
+
+    if not widths:
+        return [(None, start, stop)]
+
+    width, finer = widths[0], widths[1:]
+    first, last = _ceil(start, width), _floor(stop, width)
+    if first >= last:
+        return _segments(start, stop, finer)
+
+    return [*_segments(start, first, finer), (width, first, last), *_segments(last, stop, finer)]
+
+
+def _aggregate_range(
+    db: pw.Database,
+    start: datetime,
+    end: datetime,
+    services: Iterable[str] | None,
+    widths: list[int],
+    bucket_seconds: int | None = None,
+) -> dict[tuple[str, datetime | None], HealthAggregate]:
+    """Aggregate the checks from start through end per service, and per slice when bucket_seconds is given.
+
+    The range is read from the coarsest rollups the widths allow, and only its edges from the checks themselves.
+    """
+    aggregates: dict[tuple[str, datetime | None], HealthAggregate] = {}
+
+    def aggregate(service: str, moment: datetime) -> HealthAggregate:
+        bucket = _floor(moment, bucket_seconds) if bucket_seconds else None
+        return aggregates.setdefault((service, bucket), HealthAggregate())
+
+    def within(model: type[pw.Model], column: pw.Field, first: datetime, last: datetime):
+        clause = (column >= first) & (column < last)
+        return clause & model.service.in_(list(services)) if services else clause
+
+    # The range includes end, the segments do not include their stop
+    for width, first, last in _segments(start, end + timedelta(microseconds=1), widths):
+        if width is None:
+            with bind_service_health(db):
+                query = ServiceHealthCheck.select(
+                    ServiceHealthCheck.service,
+                    ServiceHealthCheck.checked_at,
+                    ServiceHealthCheck.status,
+                    ServiceHealthCheck.latency_ms,
+                    ServiceHealthCheck.message,
+                ).where(within(ServiceHealthCheck, ServiceHealthCheck.checked_at, first, last))
+                for check in query.dicts():
+                    aggregate(check["service"], check["checked_at"]).add_check(check)
+
+        else:
+            model = ROLLUPS[width]
+            with db.bind_ctx((model,)):
+                for row in model.select().where(within(model, model.bucket, first, last)).dicts():
+                    aggregate(row["service"], row["bucket"]).merge(row)
+
+    return aggregates
+
+
 def summarize_range(
     db: pw.Database, start: datetime, end: datetime, services: Iterable[str] | None = None
 ) -> dict[str, dict]:
-    """Summarize results by time range."""
-    successes = pw.Case(None, [(ServiceHealthCheck.status == ServiceCheckStatus.OK, 1)], 0)
-
-    # The query has to be built inside the bind context, otherwise it is not bound to a database
-    with bind_service_health(db):
-        query = (
-            ServiceHealthCheck.select(
-                ServiceHealthCheck.service,
-                pw.fn.COUNT(ServiceHealthCheck.id).alias("total_checks"),
-                pw.fn.SUM(successes).alias("successful_checks"),
-                pw.fn.MIN(ServiceHealthCheck.latency_ms).alias("min_latency_ms"),
-                pw.fn.AVG(ServiceHealthCheck.latency_ms).alias("avg_latency_ms"),
-                pw.fn.MAX(ServiceHealthCheck.latency_ms).alias("max_latency_ms"),
-            )
-            .where(_range_filter(start, end, services))
-            .group_by(ServiceHealthCheck.service)
-        )
-        rows = list(query.dicts())
-
+    """Summarize results by time range, read from the rollups."""
     summaries = {}
-    for row in rows:
-        total = int(row["total_checks"] or 0)
-        successful = int(row["successful_checks"] or 0)
-        summaries[row["service"]] = {
+    for (service, _), aggregate in _aggregate_range(db, start, end, services, list(ROLLUPS)).items():
+        stats = aggregate.stats()
+        total, successful = stats["total"], stats["successful"]
+        summaries[service] = {
             "total_checks": total,
             "successful_checks": successful,
             "failed_checks": total - successful,
             "uptime_percentage": round(successful / total * 100, 2) if total else None,
-            "min_latency_ms": _as_float(row["min_latency_ms"]),
-            "avg_latency_ms": _as_float(row["avg_latency_ms"], ndigits=2),
-            "max_latency_ms": _as_float(row["max_latency_ms"]),
+            "min_latency_ms": _as_float(stats["min_latency_ms"]),
+            "avg_latency_ms": _as_float(stats["avg_latency_ms"], ndigits=2),
+            "max_latency_ms": _as_float(stats["max_latency_ms"]),
+            **{f"p{percent}_latency_ms": _as_float(stats[f"p{percent}_latency_ms"]) for percent in PERCENTILES},
         }
 
     return summaries
@@ -344,7 +857,43 @@ def bucket_range(
     services: Iterable[str] | None,
     bucket_seconds: int,
 ) -> dict[str, list[dict]]:
-    """Aggregate the stored checks per service into time slices."""
+    """Aggregate the stored checks per service into time slices.
+
+    Slices are assembled from the coarsest rollup whose width divides theirs. A width no rollup divides, e.g. 90
+    seconds, is aggregated from the checks themselves.
+    """
+    widths = [width for width in ROLLUPS if bucket_seconds % width == 0]
+    if not widths:
+        return _bucket_checks(db, start, end, services, bucket_seconds)
+
+    rows = [
+        {"service": service, "bucket": bucket, **aggregate.stats()}
+        for (service, bucket), aggregate in _aggregate_range(db, start, end, services, widths, bucket_seconds).items()
+    ]
+    return _rows_to_buckets(rows, bucket_seconds)
+
+
+def _histogram_percentiles(row: dict) -> dict:
+    """Estimate the latency percentiles of a group of checks from its histogram, the same way the rollups are.
+
+    Exact percentiles would not be comparable with those of a resolution read from the rollups.
+    """
+    aggregate = HealthAggregate()
+    aggregate.latency_count = row.get("latency_count") or 0
+    aggregate.latency_min, aggregate.latency_max = row.get("min_latency_ms"), row.get("max_latency_ms")
+    aggregate.latency_histogram = row.get("latency_histogram") or aggregate.latency_histogram
+
+    return {f"p{percent}_latency_ms": aggregate.percentile(percent) for percent in PERCENTILES}
+
+
+def _bucket_checks(
+    db: pw.Database,
+    start: datetime,
+    end: datetime,
+    services: Iterable[str] | None,
+    bucket_seconds: int,
+) -> dict[str, list[dict]]:
+    """Aggregate the checks themselves per service into time slices."""
     successes = pw.Case(None, [(ServiceHealthCheck.status == ServiceCheckStatus.OK, 1)], 0)
     bucket = _bucket_expression(bucket_seconds)
 
@@ -355,30 +904,38 @@ def bucket_range(
                 bucket,
                 pw.fn.COUNT(ServiceHealthCheck.id).alias("total"),
                 pw.fn.SUM(successes).alias("successful"),
+                pw.fn.MIN(ServiceHealthCheck.latency_ms).alias("min_latency_ms"),
                 pw.fn.MAX(ServiceHealthCheck.latency_ms).alias("max_latency_ms"),
                 pw.fn.AVG(ServiceHealthCheck.latency_ms).alias("avg_latency_ms"),
+                pw.fn.COUNT(ServiceHealthCheck.latency_ms).alias("latency_count"),
+                pw.SQL(_histogram_sql()).alias("latency_histogram"),
                 _earliest_failure_message(),
             )
             .where(_range_filter(start, end, services))
             .group_by(ServiceHealthCheck.service, pw.SQL("bucket"))
         )
-        rows = list(query.dicts())
+        rows = [{**row, **_histogram_percentiles(row)} for row in query.dicts()]
 
     return _rows_to_buckets(rows, bucket_seconds)
 
 
-def fetch_last_checks(
-    db: pw.Database, start: datetime, end: datetime, services: Iterable[str] | None = None
-) -> dict[str, dict]:
+def fetch_last_checks(db: pw.Database, start: datetime, end: datetime, services: Iterable[str]) -> dict[str, dict]:
     """Return the most recent check per service within the timeframe."""
+    last_checks = {}
+
+    # One index lookup per service, rather than DISTINCT ON reading every check in the range
     with bind_service_health(db):
-        query = (
-            ServiceHealthCheck.select()
-            .where(_range_filter(start, end, services))
-            .distinct([ServiceHealthCheck.service])
-            .order_by(ServiceHealthCheck.service, ServiceHealthCheck.checked_at.desc())
-        )
-        return {row["service"]: row for row in query.dicts()}
+        for service in services:
+            query = (
+                ServiceHealthCheck.select()
+                .where(_range_filter(start, end, (service,)))
+                .order_by(ServiceHealthCheck.checked_at.desc())
+                .limit(1)
+            )
+            if rows := list(query.dicts()):
+                last_checks[service] = rows[0]
+
+    return last_checks
 
 
 def fetch_checks(
@@ -404,6 +961,87 @@ def fetch_checks(
     return checks
 
 
+class HealthCheckWriter:
+    """Buffers the rows of the health sweeps and loads them into Postgres in batches.
+
+    Writing every sweep on its own cost one transaction each, on the event loop. The rows are collected instead and
+    copied in together off the event loop once FLUSH_BATCH_ROWS are waiting or the oldest has waited FLUSH_INTERVAL.
+    While the database is unreachable they stay queued for the next flush, up to BUFFER_MAX_ROWS, after which the
+    oldest are dropped.
+    """
+
+    def __init__(self, max_rows: int = BUFFER_MAX_ROWS):
+        self.db: pw.PostgresqlDatabase | None = None
+        self.dropped = 0
+        self._rows: deque[dict] = deque(maxlen=max_rows)
+        self._oldest: float | None = None  # monotonic time the oldest waiting row was added
+        self._flushing = asyncio.Lock()
+
+    @property
+    def pending(self) -> int:
+        """Rows waiting to be written."""
+        return len(self._rows)
+
+    def add(self, rows: list[dict]) -> None:
+        """Queue the rows of a sweep."""
+        self._keep(self._rows, rows)
+        if self._oldest is None and self._rows:
+            self._oldest = monotonic()
+
+    def due(self, horizon: float = 0) -> bool:
+        """Whether enough rows are waiting, or would be waiting too long horizon seconds from now, to be written."""
+        return bool(self._rows) and (
+            len(self._rows) >= FLUSH_BATCH_ROWS or monotonic() - self._oldest + horizon >= FLUSH_INTERVAL
+        )
+
+    async def flush_if_due(self, horizon: float = 0) -> int:
+        """Write the waiting rows if they are due, returning the number written."""
+        return await self.flush() if self.due(horizon) else 0
+
+    async def flush(self) -> int:
+        """Write every waiting row in one COPY, keeping them queued if that fails."""
+        async with self._flushing:
+            if not self._rows or self.db is None:
+                return 0
+
+            batch, oldest = self._rows, self._oldest
+            self._rows, self._oldest = deque(maxlen=batch.maxlen), None
+
+            try:
+                await run_in_threadpool(write_checks, self.db, list(batch))
+
+            except pw.PeeweeException as db_err:
+                # Requeue ahead of anything added meanwhile, to be retried on the next flush
+                waiting = self._rows
+                self._rows, self._oldest = batch, oldest
+                self._keep(self._rows, waiting)
+                log_event(
+                    "service_health.write_error",
+                    event_description=f"Unable to store service health results, {len(self._rows)} checks are "
+                    f"waiting to be written: {db_err}",
+                    level=logging.ERROR,
+                    service=ServiceTag.HEALTH,
+                )
+                return 0
+
+            return len(batch)
+
+    def _keep(self, buffer: deque, rows) -> None:
+        """Append rows to the buffer, counting the oldest ones pushed out by its bound."""
+        overflow = len(buffer) + len(rows) - buffer.maxlen
+        if overflow > 0:
+            self.dropped += overflow
+            log_event(
+                "service_health.write_dropped",
+                event_description=f"Dropped the {overflow} oldest service health checks, the database has been "
+                f"unavailable for longer than {buffer.maxlen} checks could be held back",
+                level=logging.WARNING,
+                service=ServiceTag.HEALTH,
+            )
+
+        buffer.extend(rows)
+
+
 class ServiceHealthMonitor:
     """Manages the downstream service health monitoring loop."""
 
@@ -413,6 +1051,7 @@ class ServiceHealthMonitor:
         self._connection_attempted = False
         self._last_prune: datetime | None = None
         self._last_status: dict[str, str] = {}
+        self._writer = HealthCheckWriter()
         self.disabled_reason: str | None = None
         self.interval: int = DEFAULT_INTERVAL
         self.retention_days: int = DEFAULT_RETENTION_DAYS
@@ -450,8 +1089,7 @@ class ServiceHealthMonitor:
             return None
 
         try:
-            with bind_service_health(db):  # creates the table if it is not there yet
-                pass
+            prepare_service_health(db, self.retention_days)
 
         except pw.PeeweeException as db_err:
             self.disabled_reason = (
@@ -492,38 +1130,36 @@ class ServiceHealthMonitor:
             level=logging.INFO,
             service=ServiceTag.HEALTH,
         )
-        self._task = asyncio.create_task(self._run_monitor())
+        self._task = scheduler.schedule(
+            "service_health",
+            self._run_monitor,
+            self.interval,
+            label="service health monitoring",
+            leader_only=True,
+            service=ServiceTag.HEALTH,
+        )
 
     async def _run_monitor(self) -> None:
-        """Probe the downstream services on a loop and store the results."""
-        while True:
-            try:
-                await self.sweep()
-
-            except Exception as e:
-                log_event(
-                    "service_health.error",
-                    event_description=f"Error during service health monitoring: {e}",
-                    level=logging.ERROR,
-                    service=ServiceTag.HEALTH,
-                )
-
-            await asyncio.sleep(self.interval)
+        """Probe the downstream services once and store the results."""
+        await self.sweep()
 
     async def sweep(self) -> dict[str, dict]:
-        """Run one probe cycle, persist it, and prune expired rows when due."""
+        """Run one probe cycle, queue it to be persisted, and write the queue and prune expired rows when due."""
         results = await probe_all(get_settings())
         self._log_status_changes(results)
 
+        self._writer.db = self._db
+        self._writer.add(sweep_rows(results))
+        await self._writer.flush_if_due(horizon=self.interval)  # rather now than after the next sweep
+
         try:
-            record_sweep(self._db, results)
-            self._prune_if_due()
+            await run_in_threadpool(self._prune_if_due)
 
         except pw.PeeweeException as db_err:
             # A transient database problem must not take monitoring down for good
             log_event(
                 "service_health.write_error",
-                event_description=f"Unable to store service health results: {db_err}",
+                event_description=f"Unable to prune service health results: {db_err}",
                 level=logging.ERROR,
                 service=ServiceTag.HEALTH,
             )
@@ -547,18 +1183,20 @@ class ServiceHealthMonitor:
             self._last_status[service] = current
 
     def _prune_if_due(self) -> None:
-        """Delete expired rows, at most once per PRUNE_INTERVAL."""
+        """Create the partitions of the coming days and drop the expired ones, at most once per PRUNE_INTERVAL."""
         now = datetime.now(UTC)
         if self._last_prune is not None and now - self._last_prune < PRUNE_INTERVAL:
             return
 
-        deleted = prune_old_checks(self._db, self.retention_days)
+        create_partitions(self._db, now.date(), now.date() + timedelta(days=PARTITIONS_AHEAD))
+        dropped = prune_old_checks(self._db, self.retention_days)
         self._last_prune = now
 
-        if deleted:
+        if dropped:
             log_event(
                 "service_health.pruned",
-                event_description=f"Deleted {deleted} service health checks older than {self.retention_days} days",
+                event_description=f"Dropped {dropped} days of service health checks older than "
+                f"{self.retention_days} days",
                 level=logging.DEBUG,
                 service=ServiceTag.HEALTH,
             )
@@ -576,6 +1214,7 @@ class ServiceHealthMonitor:
         """Stop the monitoring task."""
         was_running = self._task is not None
         await self._cancel_current_task()
+        await self._writer.flush()
 
         if was_running:
             log_event(
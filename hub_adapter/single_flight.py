@@ -0,0 +1,55 @@
+"""Coalescing of identical concurrent upstream reads into a single request."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+
+class SingleFlight:
+    """Shares one in-flight call between every concurrent caller asking for the same key.
+
+    The first caller for a key starts the call as a task and later callers await that same task until it finishes,
+    after which the next caller starts a fresh one. The task is shielded so a caller that is cancelled, e.g. because
+    its client disconnected, does not cancel the call for the others waiting on it.
+    """
+
+    def __init__(self):
+        self._in_flight: dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.collapsed = 0
+
+    async def do(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Await the in-flight call for key, starting it with fetch if there is none."""
+        self.calls += 1
+        task = self._in_flight.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+
+        else:
+            self.collapsed += 1
+
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+        if not task.cancelled():
+            task.exception()  # retrieved here so a failure nobody waited for is not reported as unhandled
+
+    def stats(self) -> dict[str, int]:
+        """Calls made, how many went upstream and how many were collapsed onto another caller's request."""
+        return {
+            "calls": self.calls,
+            "upstream": self.calls - self.collapsed,
+            "collapsed": self.collapsed,
+            "in_flight": len(self._in_flight),
+        }
+
+
+# Process wide registries, one per upstream
+hub_reads = SingleFlight()
+downstream_reads = SingleFlight()
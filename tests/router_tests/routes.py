@@ -5,6 +5,7 @@ from kong_admin_client import Service
 
 from hub_adapter.schemas.hub import AnalysisImageUrl, DetailedAnalysis, NodeTypeResponse
 from hub_adapter.schemas.kong import (
+    BulkAnalysisRegistration,
     LinkDataStoreProject,
     LinkProjectAnalysis,
     ListConsumers,
@@ -20,6 +21,7 @@ from hub_adapter.schemas.logs import (
     LogQLQueryResponse,
     NetStatResponse,
 )
+from hub_adapter.schemas.meta import Dashboard
 from hub_adapter.schemas.podorc import (
     CleanupPodResponse,
     LogResponse,
@@ -102,6 +104,13 @@ EXPECTED_META_ROUTE_CONFIG = (
         "response_model": StatusOnlyResponse,
         "status_code": 200,
     },
+    {
+        "name": "meta.dashboard",
+        "path": "/analysis/dashboard",
+        "methods": {"GET"},
+        "response_model": Dashboard,
+        "status_code": 200,
+    },
 )
 
 EXPECTED_STORAGE_ROUTE_CONFIG = (
@@ -133,7 +142,7 @@ EXPECTED_KONG_ROUTE_CONFIG = (
         "name": "kong.datastore.delete",
         "path": "/kong/datastore/{datastore_id_or_name}",
         "methods": {"DELETE"},
-        "response_model": None,
+        "response_model": UnlinkResponse,
         "status_code": 200,
     },
     {
@@ -206,6 +215,13 @@ EXPECTED_KONG_ROUTE_CONFIG = (
         "response_model": LinkProjectAnalysis,
         "status_code": 201,
     },
+    {
+        "name": "kong.analysis.bulk",
+        "path": "/kong/analysis/bulk",
+        "methods": {"POST"},
+        "response_model": BulkAnalysisRegistration,
+        "status_code": 200,
+    },
     {
         "name": "kong.analysis.delete",
         "path": "/kong/analysis/{analysis_id}",
@@ -7,7 +7,14 @@ from httpx2 import ConnectError
 from starlette import status
 
 from hub_adapter.routers.health import get_health, get_health_downstream_services, health_router
-from hub_adapter.schemas.health import DownstreamHealthCheck, HealthCheck, ServiceHealthHistory
+from hub_adapter.schemas.health import (
+    CoalescingStats,
+    DownstreamHealthCheck,
+    HealthCheck,
+    KongCleanupSweep,
+    ScheduledJobStats,
+    ServiceHealthHistory,
+)
 from tests.conftest import check_routes
 
 MANDATORY_SERVICES = ("po", "storage", "hub_core", "hub_auth", "kong", "idp")
@@ -67,6 +74,27 @@ EXPECTED_HEALTH_ROUTE_CONFIG = (
         "status_code": status.HTTP_200_OK,
         "response_model": ServiceHealthHistory,
     },
+    {
+        "path": "/health/coalescing",
+        "name": "health.coalescing.get",
+        "methods": {"GET"},
+        "status_code": status.HTTP_200_OK,
+        "response_model": dict[str, CoalescingStats],
+    },
+    {
+        "path": "/health/kong-cleanup",
+        "name": "health.kong_cleanup.get",
+        "methods": {"GET"},
+        "status_code": status.HTTP_200_OK,
+        "response_model": KongCleanupSweep | None,
+    },
+    {
+        "path": "/health/scheduler",
+        "name": "health.scheduler.get",
+        "methods": {"GET"},
+        "status_code": status.HTTP_200_OK,
+        "response_model": dict[str, ScheduledJobStats],
+    },
 )
 
 
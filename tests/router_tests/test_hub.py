@@ -1,10 +1,19 @@
 """Test the Hub eps."""
 
+from unittest.mock import AsyncMock, MagicMock
+
 import pytest
 from fastapi import HTTPException
 
-from hub_adapter.routers.hub import _parse_query_params, hub_router
+from hub_adapter.dependencies import get_hub_cache
+from hub_adapter.routers.hub import (
+    _parse_query_params,
+    accept_reject_analysis_node,
+    hub_router,
+    list_analysis_nodes,
+)
 from tests.conftest import check_routes
+from tests.constants import TEST_MOCK_ANALYSIS_ID, TEST_MOCK_NODE_ID
 from tests.router_tests.routes import EXPECTED_HUB_ROUTE_CONFIG
 
 
@@ -39,7 +48,44 @@ class TestHub:
 
     def test_parse_query_params_non_object_json_raises_422(self):
         """A valid JSON value that is not an object (array, string, number) must raise 422."""
-        for non_object in ('[1, 2, 3]', '"a string"', '42', 'true'):
+        for non_object in ("[1, 2, 3]", '"a string"', "42", "true"):
             with pytest.raises(HTTPException) as exc_info:
                 _parse_query_params(page=non_object)
             assert exc_info.value.status_code == 422, f"Expected 422 for page={non_object!r}"
+
+
+class TestHubCache:
+    """Hub list responses served from the shared cache."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_cache(self):
+        get_hub_cache.cache_clear()
+        yield
+        get_hub_cache.cache_clear()
+
+    @pytest.mark.asyncio
+    async def test_identical_list_calls_reach_the_hub_once(self):
+        core_client = MagicMock()
+        core_client.find_analysis_nodes = AsyncMock(return_value=["analysis-node"])
+
+        for _ in range(2):
+            result = await list_analysis_nodes(
+                node_id=TEST_MOCK_NODE_ID, query_params=_parse_query_params(sort="-updated_at"), core_client=core_client
+            )
+            assert result == ["analysis-node"]
+
+        core_client.find_analysis_nodes.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_approval_invalidates_the_cached_list(self):
+        core_client = MagicMock()
+        core_client.find_analysis_nodes = AsyncMock(return_value=["analysis-node"])
+        core_client.update_analysis_node = AsyncMock(return_value="approved")
+
+        await list_analysis_nodes(node_id=TEST_MOCK_NODE_ID, query_params={}, core_client=core_client)
+        await accept_reject_analysis_node(
+            analysis_node_id=TEST_MOCK_ANALYSIS_ID, approval_status="approved", core_client=core_client
+        )
+        await list_analysis_nodes(node_id=TEST_MOCK_NODE_ID, query_params={}, core_client=core_client)
+
+        assert core_client.find_analysis_nodes.await_count == 2
@@ -1,6 +1,6 @@
 """Unit tests for the kong endpoints."""
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi import HTTPException
@@ -18,6 +18,7 @@ from kong_admin_client import (
 )
 from starlette import status
 
+from hub_adapter.dependencies import get_settings
 from hub_adapter.errors import (
     BucketError,
     FhirEndpointError,
@@ -26,7 +27,15 @@ from hub_adapter.errors import (
     KongServiceError,
     KongUpstreamError,
 )
-from hub_adapter.routers.kong import kong_router, probe_connection, probe_data_service
+from hub_adapter.routers.kong import (
+    _health_keys,
+    get_data_store,
+    get_data_stores,
+    kong_router,
+    probe_connection,
+    probe_data_service,
+    probe_links,
+)
 from hub_adapter.schemas.kong import LinkDataStoreProject
 from tests.conftest import check_routes
 from tests.constants import (
@@ -39,11 +48,20 @@ from tests.constants import (
     TEST_KONG_DS_NAME,
     TEST_KONG_SERVICE_ID,
     TEST_MOCK_ANALYSIS_ID,
+    TEST_MOCK_NODE_ID,
     TEST_MOCK_PROJECT_ID,
 )
 from tests.pseudo_auth import BearerAuth
 from tests.router_tests.routes import EXPECTED_KONG_ROUTE_CONFIG
 
+KONG_PAGE_SIZE = get_settings().kong_page_size
+
+
+@pytest.fixture(autouse=True)
+def forget_health_keys():
+    """Start every test without any health consumer key kept from an earlier one."""
+    _health_keys.clear()
+
 
 class TestKong:
     """Kong EP tests."""
@@ -52,7 +70,7 @@ class TestKong:
         """Test end point configurations for the PodOrc gateway routes."""
         check_routes(kong_router, EXPECTED_KONG_ROUTE_CONFIG, test_client)
 
-    @patch("hub_adapter.routers.kong.kong_admin_client.ServicesApi.list_service")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_service")
     def test_get_data_stores(self, mock_svc, authorized_test_client):
         """GET /datastore lists all services, optionally filtered by type."""
         mock_svc.return_value = ListService200Response(data=[Service(**KONG_DS_SERVICE_DATA)])
@@ -60,12 +78,12 @@ class TestKong:
         all_resp = authorized_test_client.get("/kong/datastore", auth=BearerAuth(TEST_JWT))
         assert all_resp.status_code == status.HTTP_200_OK
         assert all_resp.json()["data"][0]["name"] == TEST_KONG_DS_NAME
-        mock_svc.assert_called_with(tags=None)
+        mock_svc.assert_called_with(size=KONG_PAGE_SIZE, tags=None)
 
         authorized_test_client.get("/kong/datastore", params={"ds_type": "fhir"}, auth=BearerAuth(TEST_JWT))
-        mock_svc.assert_called_with(tags="type:fhir")
+        mock_svc.assert_called_with(size=KONG_PAGE_SIZE, tags="type:fhir")
 
-    @patch("hub_adapter.routers.kong.kong_admin_client.ServicesApi.get_service")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.get_service")
     def test_get_single_data_store(self, mock_get_svc, authorized_test_client):
         """GET /datastore/{id_or_name} wraps the single service in a list response."""
         mock_get_svc.return_value = Service(**KONG_DS_SERVICE_DATA)
@@ -77,7 +95,7 @@ class TestKong:
         assert data[0]["id"] == TEST_KONG_SERVICE_ID
         mock_get_svc.assert_called_once_with(service_id_or_name=TEST_KONG_DS_NAME)
 
-    @patch("hub_adapter.routers.kong.kong_admin_client.ServicesApi.create_service")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.create_service")
     def test_create_data_store(self, mock_create_service, authorized_test_client):
         """POST /datastore creates a service with a type tag and no project coupling."""
         mock_create_service.return_value = Service(**KONG_DS_SERVICE_DATA)
@@ -92,9 +110,9 @@ class TestKong:
         assert request_arg.name == TEST_KONG_DS_NAME
         assert request_arg.tags == ["type:fhir"]
 
-    @patch("hub_adapter.routers.kong.kong_admin_client.ServicesApi.delete_service")
-    @patch("hub_adapter.routers.kong.kong_admin_client.PluginsApi.create_plugin_for_service")
-    @patch("hub_adapter.routers.kong.kong_admin_client.ServicesApi.create_service")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.delete_service")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.create_plugin_for_service")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.create_service")
     def test_create_data_store_rolls_back_on_s3_api_exception(
         self, mock_create_service, mock_create_plugin, mock_delete_service, authorized_test_client
     ):
@@ -124,8 +142,8 @@ class TestKong:
         resp = authorized_test_client.post("/kong/datastore", json=bad_request, auth=BearerAuth(TEST_JWT))
         assert resp.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
 
-    @patch("hub_adapter.routers.kong.kong_admin_client.RoutesApi.list_route")
-    @patch("hub_adapter.routers.kong.kong_admin_client.ServicesApi.get_service")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_route")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.get_service")
     def test_get_data_store_falls_back_to_project_id(self, mock_get_svc, mock_route, authorized_test_client):
         """GET /datastore/{id} treats a UUID as a project id if no service matches it directly."""
         mock_get_svc.side_effect = [
@@ -139,10 +157,10 @@ class TestKong:
         data = resp.json()["data"]
         assert len(data) == 1
         assert data[0]["id"] == TEST_KONG_SERVICE_ID
-        mock_route.assert_called_once_with(tags=f"project:{TEST_MOCK_PROJECT_ID}")
+        mock_route.assert_called_once_with(size=KONG_PAGE_SIZE, tags=f"project:{TEST_MOCK_PROJECT_ID}")
 
-    @patch("hub_adapter.routers.kong.kong_admin_client.RoutesApi.list_route")
-    @patch("hub_adapter.routers.kong.kong_admin_client.ServicesApi.get_service")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_route")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.get_service")
     def test_get_data_store_project_fallback_multiple_stores(self, mock_get_svc, mock_route, authorized_test_client):
         """GET /datastore/{project_id} returns every store linked to the project when there's more than one."""
         other_service_id = "d3bfa0be-e8ff-4c82-be50-734432dd4580"
@@ -160,8 +178,8 @@ class TestKong:
         returned_ids = {svc["id"] for svc in resp.json()["data"]}
         assert returned_ids == {TEST_KONG_SERVICE_ID, other_service_id}
 
-    @patch("hub_adapter.routers.kong.kong_admin_client.RoutesApi.list_route")
-    @patch("hub_adapter.routers.kong.kong_admin_client.ServicesApi.get_service")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_route")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.get_service")
     def test_get_data_store_neither_service_nor_project_found(self, mock_get_svc, mock_route, authorized_test_client):
         """GET /datastore/{id} 404s when a UUID matches no service and no project with linked stores."""
         mock_get_svc.side_effect = ApiException(status=status.HTTP_404_NOT_FOUND, reason="not found")
@@ -170,8 +188,8 @@ class TestKong:
         resp = authorized_test_client.get(f"/kong/datastore/{TEST_MOCK_PROJECT_ID}", auth=BearerAuth(TEST_JWT))
         assert resp.status_code == status.HTTP_404_NOT_FOUND
 
-    @patch("hub_adapter.routers.kong.kong_admin_client.RoutesApi.list_route")
-    @patch("hub_adapter.routers.kong.kong_admin_client.ServicesApi.get_service")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_route")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.get_service")
     def test_get_data_store_non_uuid_miss_skips_project_fallback(
         self, mock_get_svc, mock_route, authorized_test_client
     ):
@@ -182,10 +200,10 @@ class TestKong:
         assert resp.status_code == status.HTTP_404_NOT_FOUND
         mock_route.assert_not_called()
 
-    @patch("hub_adapter.routers.kong.kong_admin_client.RoutesApi.delete_route")
-    @patch("hub_adapter.routers.kong.kong_admin_client.RoutesApi.list_route")
-    @patch("hub_adapter.routers.kong.kong_admin_client.ServicesApi.delete_service")
-    @patch("hub_adapter.routers.kong.kong_admin_client.ServicesApi.get_service")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.delete_route")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_route")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.delete_service")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.get_service")
     def test_delete_data_store(
         self, mock_get_svc, mock_del_svc, mock_list_route, mock_del_route, authorized_test_client
     ):
@@ -214,10 +232,10 @@ class TestKong:
         assert resp.status_code == status.HTTP_200_OK
         mock_del_svc.assert_called_once_with(service_id_or_name=TEST_KONG_SERVICE_ID)
 
-    @patch("hub_adapter.routers.kong.kong_admin_client.RoutesApi.delete_route")
-    @patch("hub_adapter.routers.kong.kong_admin_client.RoutesApi.list_route")
-    @patch("hub_adapter.routers.kong.kong_admin_client.ServicesApi.delete_service")
-    @patch("hub_adapter.routers.kong.kong_admin_client.ServicesApi.get_service")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.delete_route")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_route")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.delete_service")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.get_service")
     def test_delete_data_store_project_fallback(
         self, mock_get_svc, mock_del_svc, mock_list_route, mock_del_route, authorized_test_client
     ):
@@ -235,10 +253,10 @@ class TestKong:
         mock_del_route.assert_called_once_with(KONG_LINK_ROUTE_DATA["id"])
         mock_del_svc.assert_called_once_with(service_id_or_name=TEST_KONG_SERVICE_ID)
 
-    @patch("hub_adapter.routers.kong.kong_admin_client.RoutesApi.delete_route")
-    @patch("hub_adapter.routers.kong.kong_admin_client.RoutesApi.list_route")
-    @patch("hub_adapter.routers.kong.kong_admin_client.ServicesApi.delete_service")
-    @patch("hub_adapter.routers.kong.kong_admin_client.ServicesApi.get_service")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.delete_route")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_route")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.delete_service")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.get_service")
     def test_delete_data_store_ambiguous_project_fallback(
         self, mock_get_svc, mock_del_svc, mock_list_route, mock_del_route, authorized_test_client
     ):
@@ -258,7 +276,33 @@ class TestKong:
         mock_del_route.assert_not_called()
         mock_del_svc.assert_not_called()
 
-    @patch("hub_adapter.routers.kong.kong_admin_client.RoutesApi.list_route")
+    @pytest.mark.asyncio
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_route")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.get_service")
+    async def test_detailed_data_store_only_lists_its_routes(self, mock_get_svc, mock_route, test_settings):
+        """A detailed lookup of one data store asks Kong for that store's routes, not for every route."""
+        mock_get_svc.return_value = Service(**KONG_DS_SERVICE_DATA)
+        mock_route.return_value = ListRoute200Response(data=[Route(**KONG_LINK_ROUTE_DATA)])
+
+        resp = await get_data_store(settings=test_settings, datastore_id_or_name=TEST_KONG_DS_NAME, detailed=True)
+
+        assert [route.id for route in resp["data"][0]["routes"]] == [KONG_LINK_ROUTE_DATA["id"]]
+        mock_route.assert_called_once_with(size=KONG_PAGE_SIZE, tags=f"datastore:{TEST_KONG_SERVICE_ID}")
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_route")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_service")
+    async def test_detailed_data_stores_list_routes_once(self, mock_svc, mock_route, test_settings):
+        """Listing data stores in detail reads their routes with one listing filtered like the stores."""
+        mock_svc.return_value = ListService200Response(data=[Service(**KONG_DS_SERVICE_DATA)])
+        mock_route.return_value = ListRoute200Response(data=[Route(**KONG_LINK_ROUTE_DATA)])
+
+        resp = await get_data_stores(test_settings, ds_type=DS_TYPE, detailed=True)
+
+        assert len(resp["data"][0]["routes"]) == 1
+        mock_route.assert_called_once_with(size=KONG_PAGE_SIZE, tags=f"type:{DS_TYPE}")
+
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_route")
     def test_get_projects(self, mock_route, authorized_test_client):
         """GET /project and /project/{id} filter routes by project tag."""
         mock_route.return_value = ListRoute200Response(data=[Route(**KONG_LINK_ROUTE_DATA)])
@@ -266,17 +310,17 @@ class TestKong:
         all_resp = authorized_test_client.get("/kong/project", auth=BearerAuth(TEST_JWT))
         assert all_resp.status_code == status.HTTP_200_OK
         assert all_resp.json()["data"][0]["paths"] == KONG_LINK_ROUTE_DATA["paths"]
-        mock_route.assert_called_with(tags=None)
+        mock_route.assert_called_with(size=KONG_PAGE_SIZE, tags=None)
 
         one_resp = authorized_test_client.get(f"/kong/project/{TEST_MOCK_PROJECT_ID}", auth=BearerAuth(TEST_JWT))
         assert one_resp.status_code == status.HTTP_200_OK
-        mock_route.assert_called_with(tags=f"project:{TEST_MOCK_PROJECT_ID}")
+        mock_route.assert_called_with(size=KONG_PAGE_SIZE, tags=f"project:{TEST_MOCK_PROJECT_ID}")
 
     @patch("hub_adapter.routers.kong.probe_connection")
-    @patch("hub_adapter.routers.kong.kong_admin_client.PluginsApi.create_plugin_for_route")
-    @patch("hub_adapter.routers.kong.kong_admin_client.RoutesApi.create_route_for_service")
-    @patch("hub_adapter.routers.kong.kong_admin_client.RoutesApi.list_route")
-    @patch("hub_adapter.routers.kong.kong_admin_client.ServicesApi.get_service")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.create_plugin_for_route")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.create_route_for_service")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_route")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.get_service")
     def test_link_project_to_datastore(
         self, mock_get_svc, mock_list_route, mock_create_route, mock_plugin, mock_probe, authorized_test_client
     ):
@@ -309,8 +353,8 @@ class TestKong:
         )
         assert dup_resp.status_code == status.HTTP_409_CONFLICT
 
-    @patch("hub_adapter.routers.kong.kong_admin_client.RoutesApi.list_route")
-    @patch("hub_adapter.routers.kong.kong_admin_client.ServicesApi.get_service")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_route")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.get_service")
     def test_link_project_to_datastore_rejects_other_project(
         self, mock_get_svc, mock_list_route, authorized_test_client
     ):
@@ -357,12 +401,12 @@ class TestKong:
         )
         assert resp.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
 
-    @patch("hub_adapter.routers.kong.kong_admin_client.RoutesApi.delete_route")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.delete_route")
     @patch("hub_adapter.routers.kong.probe_connection")
-    @patch("hub_adapter.routers.kong.kong_admin_client.PluginsApi.create_plugin_for_route")
-    @patch("hub_adapter.routers.kong.kong_admin_client.RoutesApi.create_route_for_service")
-    @patch("hub_adapter.routers.kong.kong_admin_client.RoutesApi.list_route")
-    @patch("hub_adapter.routers.kong.kong_admin_client.ServicesApi.get_service")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.create_plugin_for_route")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.create_route_for_service")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_route")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.get_service")
     def test_link_rolls_back_route_on_probe_failure(
         self,
         mock_get_svc,
@@ -389,7 +433,7 @@ class TestKong:
         mock_del_route.assert_called_once_with(KONG_LINK_ROUTE_DATA["id"])
 
     @patch("hub_adapter.routers.kong.link_project_to_datastore")
-    @patch("hub_adapter.routers.kong.kong_admin_client.ServicesApi.create_service")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.create_service")
     @patch("hub_adapter.routers.kong.delete_data_store")
     def test_create_datastore_and_project_with_link(
         self, mock_delete, mock_create_svc, mock_link, authorized_test_client
@@ -423,10 +467,10 @@ class TestKong:
         assert error_resp.status_code == status.HTTP_408_REQUEST_TIMEOUT
         mock_delete.assert_called_once()
 
-    @patch("hub_adapter.routers.kong.kong_admin_client.ConsumersApi.delete_consumer")
-    @patch("hub_adapter.routers.kong.kong_admin_client.ConsumersApi.list_consumer")
-    @patch("hub_adapter.routers.kong.kong_admin_client.RoutesApi.delete_route")
-    @patch("hub_adapter.routers.kong.kong_admin_client.RoutesApi.list_route")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.delete_consumer")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_consumer")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.delete_route")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_route")
     def test_delete_project(
         self, mock_list_route, mock_del_route, mock_list_consumer, mock_del_consumer, authorized_test_client
     ):
@@ -438,8 +482,8 @@ class TestKong:
         assert resp.status_code == status.HTTP_200_OK
         mock_del_route.assert_called_once_with(KONG_LINK_ROUTE_DATA["id"])
         mock_del_consumer.assert_called_once()
-        mock_list_route.assert_called_with(tags=f"project:{TEST_MOCK_PROJECT_ID}")
-        mock_list_consumer.assert_called_with(tags=f"project:{TEST_MOCK_PROJECT_ID}")
+        mock_list_route.assert_called_with(size=KONG_PAGE_SIZE, tags=f"project:{TEST_MOCK_PROJECT_ID}")
+        mock_list_consumer.assert_called_with(size=KONG_PAGE_SIZE, tags=f"project:{TEST_MOCK_PROJECT_ID}")
 
         # Nothing found (routes and consumers both empty) -> 404, nothing deleted
         mock_list_route.return_value = ListRoute200Response(data=[])
@@ -452,8 +496,56 @@ class TestKong:
         mock_del_route.assert_not_called()
         mock_del_consumer.assert_not_called()
 
-    @patch("hub_adapter.routers.kong.kong_admin_client.RoutesApi.delete_route")
-    @patch("hub_adapter.routers.kong.kong_admin_client.RoutesApi.list_route")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.delete_consumer")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_consumer")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.delete_route")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_route")
+    def test_delete_project_dry_run(
+        self, mock_list_route, mock_del_route, mock_list_consumer, mock_del_consumer, authorized_test_client
+    ):
+        """A dry run lists what DELETE /project/{pid} would remove without deleting anything."""
+        mock_list_route.return_value = ListRoute200Response(data=[Route(**KONG_LINK_ROUTE_DATA)])
+        mock_list_consumer.return_value = ListConsumer200Response(data=[Consumer(**KONG_ANALYSIS_CONSUMER_DATA)])
+
+        resp = authorized_test_client.delete(
+            f"/kong/project/{TEST_MOCK_PROJECT_ID}", params={"dry_run": True}, auth=BearerAuth(TEST_JWT)
+        )
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.json()["dry_run"] is True
+        assert [route["id"] for route in resp.json()["removed_routes"]] == [KONG_LINK_ROUTE_DATA["id"]]
+        assert [consumer["id"] for consumer in resp.json()["removed_consumers"]] == [KONG_ANALYSIS_CONSUMER_DATA["id"]]
+        mock_del_route.assert_not_called()
+        mock_del_consumer.assert_not_called()
+
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.delete_consumer")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_consumer")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.delete_route")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_route")
+    def test_delete_project_reports_failed_deletions(
+        self, mock_list_route, mock_del_route, mock_list_consumer, mock_del_consumer, authorized_test_client
+    ):
+        """Consumers Kong refuses to delete are listed as failed, the others are still removed."""
+        other_consumer = {**KONG_ANALYSIS_CONSUMER_DATA, "id": "other-consumer-id"}
+        mock_list_route.return_value = ListRoute200Response(data=[Route(**KONG_LINK_ROUTE_DATA)])
+        mock_list_consumer.return_value = ListConsumer200Response(
+            data=[Consumer(**KONG_ANALYSIS_CONSUMER_DATA), Consumer(**other_consumer)]
+        )
+        mock_del_consumer.side_effect = [
+            None,
+            ApiException(status=status.HTTP_500_INTERNAL_SERVER_ERROR, reason="Boom"),
+        ]
+
+        resp = authorized_test_client.delete(f"/kong/project/{TEST_MOCK_PROJECT_ID}", auth=BearerAuth(TEST_JWT))
+        body = resp.json()
+
+        assert resp.status_code == status.HTTP_200_OK
+        assert body["status"] == status.HTTP_207_MULTI_STATUS
+        assert [route["id"] for route in body["removed_routes"]] == [KONG_LINK_ROUTE_DATA["id"]]
+        assert len(body["removed_consumers"]) == 1
+        assert [(failure["kind"], failure["status"]) for failure in body["failed"]] == [("consumers", 500)]
+
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.delete_route")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_route")
     def test_unlink_project_from_datastore(self, mock_list_route, mock_del_route, authorized_test_client):
         """DELETE /project/{pid}/datastore/{dsid} removes only the link route, keeping consumers."""
         mock_list_route.return_value = ListRoute200Response(data=[Route(**KONG_LINK_ROUTE_DATA)])
@@ -480,7 +572,7 @@ class TestKong:
         )
         assert resp.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
 
-    @patch("hub_adapter.routers.kong.kong_admin_client.ConsumersApi.list_consumer")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_consumer")
     def test_get_analyses(self, mock_list_consumer, authorized_test_client):
         """GET /analysis[/{id}] resolves consumers via tags, filtering out health consumers."""
         health_consumer = {
@@ -497,21 +589,21 @@ class TestKong:
         usernames = [c["username"] for c in all_resp.json()["data"]]
         assert f"analysis-{TEST_MOCK_ANALYSIS_ID}" in usernames
         assert health_consumer["username"] not in usernames  # health consumers are not analyses
-        mock_list_consumer.assert_called_with(tags=None)
+        mock_list_consumer.assert_called_with(size=KONG_PAGE_SIZE, tags=None)
 
         authorized_test_client.get(
             "/kong/analysis", params={"project_id": TEST_MOCK_PROJECT_ID}, auth=BearerAuth(TEST_JWT)
         )
-        mock_list_consumer.assert_called_with(tags=f"project:{TEST_MOCK_PROJECT_ID}")
+        mock_list_consumer.assert_called_with(size=KONG_PAGE_SIZE, tags=f"project:{TEST_MOCK_PROJECT_ID}")
 
         one_resp = authorized_test_client.get(f"/kong/analysis/{TEST_MOCK_ANALYSIS_ID}", auth=BearerAuth(TEST_JWT))
         assert one_resp.status_code == status.HTTP_200_OK
-        mock_list_consumer.assert_called_with(tags=f"analysis:{TEST_MOCK_ANALYSIS_ID}")
+        mock_list_consumer.assert_called_with(size=KONG_PAGE_SIZE, tags=f"analysis:{TEST_MOCK_ANALYSIS_ID}")
 
     @patch("hub_adapter.routers.kong.logger")
-    @patch("hub_adapter.routers.kong.kong_admin_client.KeyAuthsApi.create_key_auth_for_consumer")
-    @patch("hub_adapter.routers.kong.kong_admin_client.ACLsApi.create_acl_for_consumer")
-    @patch("hub_adapter.routers.kong.kong_admin_client.ConsumersApi.create_consumer")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.create_key_auth_for_consumer")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.create_acl_for_consumer")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.create_consumer")
     @patch("hub_adapter.routers.kong.get_projects")
     def test_create_and_connect_analysis_to_project(
         self, mock_projects, mock_create_consumer, mock_acl, mock_keyauth, mock_logger, authorized_test_client
@@ -552,8 +644,65 @@ class TestKong:
 
         mock_projects.assert_not_called()
 
-    @patch("hub_adapter.routers.kong.kong_admin_client.ConsumersApi.delete_consumer")
-    @patch("hub_adapter.routers.kong.kong_admin_client.ConsumersApi.list_consumer")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.create_key_auth_for_consumer")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.create_acl_for_consumer")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.create_consumer")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_route")
+    def test_create_analyses_in_bulk(
+        self, mock_list_route, mock_create_consumer, mock_acl, mock_keyauth, authorized_test_client
+    ):
+        """POST /analysis/bulk creates every valid analysis and reports the others per item."""
+        mock_list_route.return_value = ListRoute200Response(data=[Route(**KONG_LINK_ROUTE_DATA)])
+        mock_create_consumer.return_value = Consumer(**KONG_ANALYSIS_CONSUMER_DATA)
+        mock_acl.return_value = ACL(group=TEST_MOCK_PROJECT_ID)
+        mock_keyauth.return_value = KeyAuth()
+
+        unlinked_project_id = "0c7dbd3c-5a6e-4d47-8a34-7f0c0e1e9c2b"
+        body_data = [
+            {"project_id": TEST_MOCK_PROJECT_ID, "analysis_id": TEST_MOCK_ANALYSIS_ID},
+            {"project_id": unlinked_project_id, "analysis_id": TEST_MOCK_NODE_ID},
+            {"project_id": TEST_MOCK_PROJECT_ID, "analysis_id": TEST_MOCK_ANALYSIS_ID},
+            {"project_id": TEST_MOCK_PROJECT_ID, "analysis_id": "not-a-uuid"},
+        ]
+        resp = authorized_test_client.post("/kong/analysis/bulk", json=body_data, auth=BearerAuth(TEST_JWT))
+        results = resp.json()["results"]
+
+        assert resp.status_code == status.HTTP_200_OK
+        assert [result["status"] for result in results] == [
+            status.HTTP_201_CREATED,
+            status.HTTP_404_NOT_FOUND,
+            status.HTTP_409_CONFLICT,
+            status.HTTP_422_UNPROCESSABLE_CONTENT,
+        ]
+        assert results[0]["consumer"]["id"] == KONG_ANALYSIS_CONSUMER_DATA["id"]
+        assert results[1]["consumer"] is None
+        mock_list_route.assert_called_once()  # projects are checked against a single listing
+        mock_create_consumer.assert_called_once()
+
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.delete_consumer")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.create_key_auth_for_consumer")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.create_acl_for_consumer")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.create_consumer")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_route")
+    def test_create_analyses_in_bulk_rolls_back_failed_items(
+        self, mock_list_route, mock_create_consumer, mock_acl, mock_keyauth, mock_del_consumer, authorized_test_client
+    ):
+        """A consumer whose key-auth cannot be created is deleted again and its Kong error is reported."""
+        mock_list_route.return_value = ListRoute200Response(data=[Route(**KONG_LINK_ROUTE_DATA)])
+        mock_create_consumer.return_value = Consumer(**KONG_ANALYSIS_CONSUMER_DATA)
+        mock_acl.return_value = ACL(group=TEST_MOCK_PROJECT_ID)
+        mock_keyauth.side_effect = ApiException(status=status.HTTP_500_INTERNAL_SERVER_ERROR, reason="Boom")
+
+        body_data = [{"project_id": TEST_MOCK_PROJECT_ID, "analysis_id": TEST_MOCK_ANALYSIS_ID}]
+        resp = authorized_test_client.post("/kong/analysis/bulk", json=body_data, auth=BearerAuth(TEST_JWT))
+        result = resp.json()["results"][0]
+
+        assert resp.status_code == status.HTTP_200_OK
+        assert (result["status"], result["message"]) == (status.HTTP_500_INTERNAL_SERVER_ERROR, "Boom")
+        mock_del_consumer.assert_called_once_with(KONG_ANALYSIS_CONSUMER_DATA["id"])
+
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.delete_consumer")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_consumer")
     def test_delete_analysis(self, mock_list_consumer, mock_delete, authorized_test_client):
         """DELETE /analysis/{id} resolves the consumer via tags and deletes by Kong ID."""
         mock_list_consumer.return_value = ListConsumer200Response(data=[Consumer(**KONG_ANALYSIS_CONSUMER_DATA)])
@@ -567,23 +716,25 @@ class TestKong:
         resp = authorized_test_client.delete(f"/kong/analysis/{TEST_MOCK_ANALYSIS_ID}", auth=BearerAuth(TEST_JWT))
         assert resp.status_code == status.HTTP_404_NOT_FOUND
 
-    @patch("hub_adapter.routers.kong.kong_admin_client.KeyAuthsApi.list_key_auths_for_consumer")
-    @patch("hub_adapter.routers.kong.kong_admin_client.ConsumersApi.list_consumer")
-    def test_get_analysis_keyauth_returns_existing(self, mock_list_consumer, mock_list_keyauths, test_settings):
+    @pytest.mark.asyncio
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_key_auths_for_consumer")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_consumer")
+    async def test_get_analysis_keyauth_returns_existing(self, mock_list_consumer, mock_list_keyauths, test_settings):
         """get_analysis_keyauth resolves the consumer via tags then returns its first credential."""
         from hub_adapter.routers.kong import get_analysis_keyauth
 
         mock_list_consumer.return_value = ListConsumer200Response(data=[Consumer(**KONG_ANALYSIS_CONSUMER_DATA)])
         mock_list_keyauths.return_value = ListKeyAuthsForConsumer200Response(data=[KeyAuth(key="existingKongKey")])
 
-        result = get_analysis_keyauth(settings=test_settings, analysis_id=TEST_MOCK_ANALYSIS_ID)
+        result = await get_analysis_keyauth(settings=test_settings, analysis_id=TEST_MOCK_ANALYSIS_ID)
 
         assert result.key == "existingKongKey"
         mock_list_keyauths.assert_called_once_with(KONG_ANALYSIS_CONSUMER_DATA["id"])
 
-    @patch("hub_adapter.routers.kong.kong_admin_client.KeyAuthsApi.list_key_auths_for_consumer")
-    @patch("hub_adapter.routers.kong.kong_admin_client.ConsumersApi.list_consumer")
-    def test_get_analysis_keyauth_returns_none_when_missing(
+    @pytest.mark.asyncio
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_key_auths_for_consumer")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_consumer")
+    async def test_get_analysis_keyauth_returns_none_when_missing(
         self, mock_list_consumer, mock_list_keyauths, test_settings
     ):
         """get_analysis_keyauth returns None when the consumer or its credential is absent."""
@@ -591,21 +742,22 @@ class TestKong:
 
         # No consumer at all
         mock_list_consumer.return_value = ListConsumer200Response(data=[])
-        assert get_analysis_keyauth(settings=test_settings, analysis_id=TEST_MOCK_ANALYSIS_ID) is None
+        assert await get_analysis_keyauth(settings=test_settings, analysis_id=TEST_MOCK_ANALYSIS_ID) is None
 
         # Consumer exists but has no credentials
         mock_list_consumer.return_value = ListConsumer200Response(data=[Consumer(**KONG_ANALYSIS_CONSUMER_DATA)])
         mock_list_keyauths.return_value = ListKeyAuthsForConsumer200Response(data=[])
-        assert get_analysis_keyauth(settings=test_settings, analysis_id=TEST_MOCK_ANALYSIS_ID) is None
+        assert await get_analysis_keyauth(settings=test_settings, analysis_id=TEST_MOCK_ANALYSIS_ID) is None
 
-    @patch("hub_adapter.routers.kong.kong_admin_client.ConsumersApi.list_consumer")
-    def test_get_analysis_keyauth_returns_none_on_api_error(self, mock_list_consumer, test_settings):
+    @pytest.mark.asyncio
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_consumer")
+    async def test_get_analysis_keyauth_returns_none_on_api_error(self, mock_list_consumer, test_settings):
         """get_analysis_keyauth swallows Kong 404s and returns None so the caller can fall back."""
         from hub_adapter.routers.kong import get_analysis_keyauth
 
         mock_list_consumer.side_effect = ApiException(status=status.HTTP_404_NOT_FOUND, reason="Not found")
 
-        assert get_analysis_keyauth(settings=test_settings, analysis_id=TEST_MOCK_ANALYSIS_ID) is None
+        assert await get_analysis_keyauth(settings=test_settings, analysis_id=TEST_MOCK_ANALYSIS_ID) is None
 
 
 class TestConnection:
@@ -640,7 +792,7 @@ class TestConnection:
     @pytest.mark.asyncio
     @patch("hub_adapter.routers.kong.probe_data_service")
     @patch("hub_adapter.routers.kong.ensure_health_consumer")
-    @patch("kong_admin_client.RoutesApi.list_route")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_route")
     async def test_probe_connection(self, mock_list_route, mock_ensure_health, mock_probe, test_settings):
         """probe_connection resolves the link route via tags and probes with the health consumer key."""
         mock_list_route.return_value = ListRoute200Response(data=[Route(**KONG_LINK_ROUTE_DATA)])
@@ -665,12 +817,13 @@ class TestConnection:
             )
         assert err.value.status_code == status.HTTP_404_NOT_FOUND
 
-    @patch("kong_admin_client.KeyAuthsApi.create_key_auth_for_consumer")
-    @patch("kong_admin_client.KeyAuthsApi.list_key_auths_for_consumer")
-    @patch("kong_admin_client.ACLsApi.create_acl_for_consumer")
-    @patch("kong_admin_client.ConsumersApi.create_consumer")
-    @patch("kong_admin_client.ConsumersApi.list_consumer")
-    def test_ensure_health_consumer_creates_when_missing(
+    @pytest.mark.asyncio
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.create_key_auth_for_consumer")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_key_auths_for_consumer")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.create_acl_for_consumer")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.create_consumer")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_consumer")
+    async def test_ensure_health_consumer_creates_when_missing(
         self, mock_list_consumer, mock_create, mock_acl, mock_list_keyauth, mock_create_keyauth, test_settings
     ):
         """ensure_health_consumer creates consumer + ACL + keyauth when none exists."""
@@ -683,17 +836,18 @@ class TestConnection:
         mock_list_keyauth.return_value = ListKeyAuthsForConsumer200Response(data=[])
         mock_create_keyauth.return_value = KeyAuth(key="freshKey")
 
-        key = ensure_health_consumer(settings=test_settings, project_id=TEST_MOCK_PROJECT_ID)
+        key = await ensure_health_consumer(settings=test_settings, project_id=TEST_MOCK_PROJECT_ID)
 
         assert key == "freshKey"
-        mock_list_consumer.assert_called_once_with(tags=f"health,project:{TEST_MOCK_PROJECT_ID}")
+        mock_list_consumer.assert_called_once_with(size=KONG_PAGE_SIZE, tags=f"health,project:{TEST_MOCK_PROJECT_ID}")
         consumer_request = mock_create.call_args.args[0]
         assert consumer_request.username == f"health-{TEST_MOCK_PROJECT_ID}"
         assert "health" in consumer_request.tags
 
-    @patch("kong_admin_client.KeyAuthsApi.list_key_auths_for_consumer")
-    @patch("kong_admin_client.ConsumersApi.list_consumer")
-    def test_ensure_health_consumer_reuses_existing(self, mock_list_consumer, mock_list_keyauth, test_settings):
+    @pytest.mark.asyncio
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_key_auths_for_consumer")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_consumer")
+    async def test_ensure_health_consumer_reuses_existing(self, mock_list_consumer, mock_list_keyauth, test_settings):
         """ensure_health_consumer resolves an existing consumer via tags and reuses its credential."""
         from hub_adapter.routers.kong import ensure_health_consumer
 
@@ -703,36 +857,89 @@ class TestConnection:
         )
         mock_list_keyauth.return_value = ListKeyAuthsForConsumer200Response(data=[KeyAuth(key="existingKey")])
 
-        assert ensure_health_consumer(settings=test_settings, project_id=TEST_MOCK_PROJECT_ID) == "existingKey"
-        mock_list_consumer.assert_called_once_with(tags=f"health,project:{TEST_MOCK_PROJECT_ID}")
+        assert await ensure_health_consumer(settings=test_settings, project_id=TEST_MOCK_PROJECT_ID) == "existingKey"
+        mock_list_consumer.assert_called_once_with(size=KONG_PAGE_SIZE, tags=f"health,project:{TEST_MOCK_PROJECT_ID}")
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_key_auths_for_consumer")
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_consumer")
+    async def test_ensure_health_consumer_keeps_the_key(self, mock_list_consumer, mock_list_keyauth, test_settings):
+        """The health consumer key of a project is looked up in Kong once and kept for later probes."""
+        from hub_adapter.routers.kong import ensure_health_consumer
+
+        mock_list_consumer.return_value = ListConsumer200Response(
+            data=[Consumer(id="bbbbbbbb-1111-2222-3333-444444444444", username=f"health-{TEST_MOCK_PROJECT_ID}")]
+        )
+        mock_list_keyauth.return_value = ListKeyAuthsForConsumer200Response(data=[KeyAuth(key="existingKey")])
+
+        for _ in range(3):
+            assert (
+                await ensure_health_consumer(settings=test_settings, project_id=TEST_MOCK_PROJECT_ID) == "existingKey"
+            )
+
+        mock_list_consumer.assert_called_once()
+        mock_list_keyauth.assert_called_once()
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.routers.kong.probe_data_service")
+    @patch("hub_adapter.routers.kong.ensure_health_consumer")
+    async def test_probe_links(self, mock_ensure_health, mock_probe, test_settings):
+        """Every link is probed and a failing one is reported as its error, in the order of the routes."""
+        other_route = {**KONG_LINK_ROUTE_DATA, "id": "other-route-id", "paths": ["/other/path"]}
+        mock_ensure_health.return_value = "healthApiKey"
+        mock_probe.side_effect = [status.HTTP_200_OK, KongGatewayError(server_type="FHIR")]
+
+        results = await probe_links(test_settings, [Route(**KONG_LINK_ROUTE_DATA), Route(**other_route)])
+
+        assert results[0] == status.HTTP_200_OK
+        assert isinstance(results[1], KongGatewayError)
+        assert mock_probe.call_count == 2
 
     @staticmethod
-    def probe_data_service_test(
+    async def probe_data_service_test(
         status_code: int, error_type: type[KongError] | type[HTTPException], is_fhir: bool = False
     ):
         """Template unit test for testing various expected errors raised by probe_data_service."""
         mock_response = MagicMock()
         mock_response.status_code = status_code
+        mock_client = MagicMock()
+        mock_client.get = AsyncMock(return_value=mock_response)
 
-        with patch("httpx2.get", return_value=mock_response), pytest.raises(error_type) as expected_error:
-            probe_data_service(url="fakeurl", apikey="fakekey", is_fhir=is_fhir, attempt=1, max_attempts=0)
+        with (
+            patch("hub_adapter.routers.kong.get_kong_proxy_client", return_value=mock_client),
+            pytest.raises(error_type) as expected_error,
+        ):
+            await probe_data_service(url="fakeurl", apikey="fakekey", is_fhir=is_fhir, max_attempts=0)
 
         assert expected_error.type is error_type
         assert expected_error.value.status_code == status_code
 
-    def test_probe_data_service(self):
+    @pytest.mark.asyncio
+    async def test_probe_data_service(self):
         """Actual unit test for probe_data_service. Checks all errors that should occur."""
         # Missing and private bucket
-        self.probe_data_service_test(status.HTTP_403_FORBIDDEN, BucketError)
+        await self.probe_data_service_test(status.HTTP_403_FORBIDDEN, BucketError)
 
         # Kong service unreachable
-        self.probe_data_service_test(status.HTTP_503_SERVICE_UNAVAILABLE, KongServiceError)
+        await self.probe_data_service_test(status.HTTP_503_SERVICE_UNAVAILABLE, KongServiceError)
 
         # Missing FHIR endpoint, bad path
-        self.probe_data_service_test(status.HTTP_404_NOT_FOUND, FhirEndpointError, is_fhir=True)
+        await self.probe_data_service_test(status.HTTP_404_NOT_FOUND, FhirEndpointError, is_fhir=True)
 
         # Unable to contact storage service
-        self.probe_data_service_test(status.HTTP_404_NOT_FOUND, KongUpstreamError)
+        await self.probe_data_service_test(status.HTTP_404_NOT_FOUND, KongUpstreamError)
 
         # Bad URL
-        self.probe_data_service_test(status.HTTP_502_BAD_GATEWAY, KongGatewayError)
+        await self.probe_data_service_test(status.HTTP_502_BAD_GATEWAY, KongGatewayError)
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.routers.kong.asyncio.sleep")
+    @patch("hub_adapter.routers.kong.get_kong_proxy_client")
+    async def test_probe_data_service_retries_missing_route(self, mock_proxy_client, mock_sleep):
+        """A route Kong is still setting up is retried, waiting on the event loop rather than a thread."""
+        mock_proxy_client.return_value.get = AsyncMock(
+            side_effect=[MagicMock(status_code=status.HTTP_404_NOT_FOUND), MagicMock(status_code=status.HTTP_200_OK)]
+        )
+
+        assert await probe_data_service(url="fakeurl", apikey="fakekey", is_fhir=False) == status.HTTP_200_OK
+        mock_sleep.assert_awaited_once_with(2)
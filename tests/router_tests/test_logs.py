@@ -2,19 +2,28 @@
 
 import datetime
 import uuid
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
 from fastapi import HTTPException
 from starlette import status
 
+from hub_adapter.routers import logs
 from hub_adapter.routers.logs import (
+    CONTAINER_NAME_OVERLAP,
+    CONTAINER_NAME_TTL,
+    _get_analysis_container_names,
     _group_by_run,
+    decode_cursor,
+    encode_cursor,
     get_analysis_log_history,
     get_analysis_logs,
     get_api_requests,
     get_events,
+    has_pipes,
     logs_router,
+    next_cursor,
+    paginate_query,
     raw_log_query,
 )
 from hub_adapter.schemas.logs import ApiRequestCountResponse, LogQLQueryRequest
@@ -73,6 +82,165 @@ class TestLogs:
         assert result["meta"]["offset"] == 0
         assert len(result["data"]) == 1
 
+    @pytest.mark.asyncio
+    @patch("hub_adapter.routers.logs.count_logs")
+    @patch("hub_adapter.routers.logs.query_logs")
+    @patch("hub_adapter.dependencies.get_settings")
+    async def test_get_events_pages_by_cursor(self, mock_get_settings, mock_query_logs, mock_count_logs):
+        """get_events seeks past the given cursor, skips the count if asked, and returns the next cursor."""
+        mock_get_settings.return_value.victoria_logs_url = "http://victoria:9428"
+        entry = {"event_name": "hub.project.get", "_time": "2026-01-01T00:00:00Z", "_stream_id": "abc123"}
+        mock_query_logs.return_value = [entry]
+        after = encode_cursor({"_time": "2026-01-02T00:00:00Z", "_stream_id": "def456"})
+
+        result = await get_events(limit=1, after=after, include_total=False)
+
+        paged_query = mock_query_logs.call_args.args[0]
+        assert "_time:<2026-01-02T00:00:00Z" in paged_query
+        mock_count_logs.assert_not_called()
+        assert result["meta"]["total"] is None
+        assert result["meta"]["offset"] is None
+        assert result["meta"]["after"] == after
+        assert decode_cursor(result["meta"]["next_cursor"]) == ("2026-01-01T00:00:00Z", "abc123")
+
+
+class TestCursorPagination:
+    """Tests for the (_time, _stream_id) cursor helpers."""
+
+    ENTRY = {"_time": "2026-01-02T03:04:05.123456789Z", "_stream_id": "0000000000000000abcdef"}
+
+    def test_cursor_round_trips(self):
+        """A cursor decodes back to the _time and _stream_id it was built from."""
+        cursor = encode_cursor(self.ENTRY)
+
+        assert decode_cursor(cursor) == (self.ENTRY["_time"], self.ENTRY["_stream_id"])
+
+    def test_encode_returns_none_without_cursor_fields(self):
+        """Entries lacking _time or _stream_id can't be seeked past."""
+        assert encode_cursor({"_time": self.ENTRY["_time"]}) is None
+
+    @pytest.mark.parametrize(
+        "cursor",
+        [
+            "not-a-cursor",
+            encode_cursor({"_time": '2026-01-01T00:00:00Z" OR *', "_stream_id": "abc"}),
+            encode_cursor({"_time": "2026-01-01T00:00:00Z", "_stream_id": "abc) OR (*"}),
+        ],
+    )
+    def test_decode_rejects_malformed_cursors(self, cursor):
+        """Garbage or injected cursor values are rejected with a 422."""
+        with pytest.raises(HTTPException) as exc_info:
+            decode_cursor(cursor)
+
+        assert exc_info.value.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+    def test_paginate_query_sorts_and_limits_inside_the_query(self):
+        """Offset pages sort newest-first before skipping."""
+        assert paginate_query("*", 10, 20) == "* | sort by (_time desc, _stream_id desc) offset 20 limit 10"
+
+    def test_paginate_query_seeks_past_cursor(self):
+        """Cursor pages filter past the last seen entry instead of skipping."""
+        query = paginate_query("*", 10, after=encode_cursor(self.ENTRY))
+
+        assert "offset" not in query
+        assert f"_time:<{self.ENTRY['_time']}" in query
+        assert f'_stream_id:string_range("", "{self.ENTRY["_stream_id"]}")' in query
+        assert query.endswith("| sort by (_time desc, _stream_id desc) limit 10")
+
+    def test_paginate_query_rejects_offset_with_cursor(self):
+        """Offset and cursor pagination can't be mixed."""
+        with pytest.raises(HTTPException) as exc_info:
+            paginate_query("*", 10, 5, encode_cursor(self.ENTRY))
+
+        assert exc_info.value.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+    @pytest.mark.parametrize(
+        "query,expected",
+        [
+            ("* | sort by (_time)", True),
+            ("error | stats count()", True),
+            ('_msg:"a|b" AND level:error', False),
+            ("_msg:'x | y'", False),
+        ],
+    )
+    def test_has_pipes_ignores_quoted_bars(self, query, expected):
+        """Only a bar outside of a quoted phrase starts a pipe."""
+        assert has_pipes(query) is expected
+
+    def test_next_cursor_only_for_full_pages(self):
+        """A short page is the last one, so there is no next cursor."""
+        assert next_cursor([self.ENTRY], 2) is None
+        assert decode_cursor(next_cursor([self.ENTRY, self.ENTRY], 2))[0] == self.ENTRY["_time"]
+
+
+class TestAnalysisContainerNameCache:
+    """Tests for the per-analysis container name cache."""
+
+    ANALYSIS_ID = "1e2a3b4c-0000-4000-8000-000000000001"
+
+    @pytest.fixture(autouse=True)
+    def _empty_cache(self):
+        """Start every test with nothing cached."""
+        logs._container_name_cache.clear()
+        yield
+        logs._container_name_cache.clear()
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.routers.logs.time.monotonic")
+    @patch("hub_adapter.routers.logs._scan_container_names", new_callable=AsyncMock)
+    async def test_serves_cached_names_within_ttl(self, mock_scan, mock_monotonic):
+        """A second lookup within the TTL doesn't query VictoriaLogs again."""
+        mock_scan.return_value = {f"analysis-{self.ANALYSIS_ID}-0"}
+        mock_monotonic.return_value = 1000.0
+
+        first = await _get_analysis_container_names(self.ANALYSIS_ID)
+        mock_monotonic.return_value += CONTAINER_NAME_TTL - 1
+        second = await _get_analysis_container_names(self.ANALYSIS_ID)
+
+        assert first == second == [f"analysis-{self.ANALYSIS_ID}-0"]
+        mock_scan.assert_awaited_once_with(self.ANALYSIS_ID, None)
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.routers.logs.time.monotonic")
+    @patch("hub_adapter.routers.logs._scan_container_names", new_callable=AsyncMock)
+    async def test_refresh_only_scans_since_last_sync(self, mock_scan, mock_monotonic):
+        """Once the TTL lapses, only newer logs are scanned and new runs are merged into the known ones."""
+        run_0, run_1 = f"analysis-{self.ANALYSIS_ID}-0", f"analysis-{self.ANALYSIS_ID}-1"
+        mock_scan.side_effect = [{run_0}, {run_1}]
+        mock_monotonic.return_value = 1000.0
+
+        await _get_analysis_container_names(self.ANALYSIS_ID)
+        synced_at = logs._container_name_cache[self.ANALYSIS_ID].synced_at
+        mock_monotonic.return_value += CONTAINER_NAME_TTL
+        names = await _get_analysis_container_names(self.ANALYSIS_ID)
+
+        assert names == [run_0, run_1]
+        assert mock_scan.await_args_list[1].args == (self.ANALYSIS_ID, synced_at - CONTAINER_NAME_OVERLAP)
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.routers.logs._scan_container_names", new_callable=AsyncMock)
+    async def test_does_not_cache_analyses_without_containers(self, mock_scan):
+        """An analysis with no logs yet is looked up again so its first run appears immediately."""
+        mock_scan.return_value = set()
+
+        assert await _get_analysis_container_names(self.ANALYSIS_ID) == []
+        assert self.ANALYSIS_ID not in logs._container_name_cache
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.routers.logs._query_victoria_logs")
+    @patch("hub_adapter.dependencies.get_settings")
+    async def test_scan_is_not_capped(self, mock_get_settings, mock_query):
+        """The discovery query no longer limits how many containers are returned."""
+        mock_get_settings.return_value.victoria_logs_url = "http://victoria:9428"
+        mock_query.return_value.text = "\n".join(
+            f'{{"kubernetes.container_name": "analysis-{self.ANALYSIS_ID}-{run}"}}' for run in range(150)
+        )
+
+        names = await _get_analysis_container_names(self.ANALYSIS_ID)
+
+        assert len(names) == 150
+        assert "limit" not in mock_query.call_args.args[1]
+
 
 class TestGroupByRun:
     """Tests for the _group_by_run helper."""
@@ -276,6 +444,56 @@ class TestRawLogQuery:
         assert result["meta"]["offset"] == 0
         assert len(result["data"]) == 1
         assert result["data"][0] == {"_msg": "hello", "level": "info"}
+        assert result["meta"]["next_cursor"] is None
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.routers.logs.count_logs")
+    @patch("hub_adapter.routers.logs._execute_raw_query")
+    @patch("hub_adapter.dependencies.get_settings")
+    async def test_pages_by_cursor(self, mock_get_settings, mock_execute, mock_count):
+        """raw_log_query pages within the query rather than through the HTTP limit/offset params."""
+        mock_get_settings.return_value.victoria_logs_url = "http://victoria:9428"
+        mock_execute.return_value = [{"_msg": "hello", "_time": "2026-01-01T00:00:00Z", "_stream_id": "abc123"}]
+
+        after = encode_cursor({"_time": "2026-01-02T00:00:00Z", "_stream_id": "def456"})
+        result = await raw_log_query(LogQLQueryRequest(query="*", limit=1, after=after, include_total=False))
+
+        paged_query, params = mock_execute.call_args.args
+        assert paged_query.startswith("* | filter (_time:<2026-01-02T00:00:00Z")
+        assert "limit" not in params and "offset" not in params
+        mock_count.assert_not_called()
+        assert result["meta"]["next_cursor"] is not None
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.routers.logs.count_logs")
+    @patch("hub_adapter.routers.logs._execute_raw_query")
+    @patch("hub_adapter.dependencies.get_settings")
+    async def test_pipe_queries_are_paged_through_http_params(self, mock_get_settings, mock_execute, mock_count):
+        """Queries with their own pipes are sent as written and paged through the HTTP limit/offset params."""
+        mock_get_settings.return_value.victoria_logs_url = "http://victoria:9428"
+        mock_execute.return_value = [{"level": "error", "logs": "3"}]
+        mock_count.return_value = 1
+
+        query = "* | stats by (level) count() logs | sort by (logs)"
+        result = await raw_log_query(LogQLQueryRequest(query=query, limit=5, offset=10))
+
+        mock_execute.assert_called_once_with(query, {"limit": 5, "offset": 10})
+        assert result["meta"]["offset"] == 10
+        assert result["meta"]["next_cursor"] is None
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.routers.logs._execute_raw_query")
+    @patch("hub_adapter.dependencies.get_settings")
+    async def test_pipe_queries_reject_cursor(self, mock_get_settings, mock_execute):
+        """A cursor can't seek within a query that sorts or aggregates on its own."""
+        mock_get_settings.return_value.victoria_logs_url = "http://victoria:9428"
+
+        after = encode_cursor({"_time": "2026-01-02T00:00:00Z", "_stream_id": "def456"})
+        with pytest.raises(HTTPException) as exc_info:
+            await raw_log_query(LogQLQueryRequest(query="* | sort by (level)", after=after))
+
+        assert exc_info.value.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+        mock_execute.assert_not_called()
 
 
 class TestGetApiRequests:
@@ -1,6 +1,8 @@
 """Collection of unit tests for testing the meta router module."""
 
-from unittest.mock import patch
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
 
 import pytest
 from fastapi import HTTPException
@@ -8,12 +10,21 @@ from httpx2 import ConnectError
 from starlette import status
 
 from hub_adapter.dependencies import get_core_client, get_flame_hub_auth_flow, get_ssl_context
-from hub_adapter.routers.meta import InitializeAnalysis, initialize_analysis, meta_router, terminate_analysis
+from hub_adapter.routers.meta import (
+    InitializeAnalysis,
+    _find_node_analyses,
+    get_analysis_dashboard,
+    initialize_analysis,
+    meta_router,
+    terminate_analysis,
+)
 from hub_adapter.schemas.podorc import StatusOnlyResponse
 from tests.conftest import check_routes
 from tests.constants import TEST_MOCK_ANALYSIS_ID, TEST_MOCK_NODE_ID, TEST_MOCK_PROJECT_ID
 from tests.router_tests.routes import EXPECTED_META_ROUTE_CONFIG
 
+OTHER_ANALYSIS_ID = "5b0b6c3a-6ad1-4a6e-9d64-6e0b8d2a1f3e"
+
 
 class TestMeta:
     """Collection of unit tests for testing the meta router module."""
@@ -26,7 +37,7 @@ class TestMeta:
     @patch("hub_adapter.routers.meta.GoGoAnalysis.register_and_start_analysis")
     @patch("hub_adapter.routers.meta.GoGoAnalysis.parse_analyses")
     @patch("hub_adapter.routers.meta.GoGoAnalysis.get_valid_projects")
-    @patch("flame_hub._core_client.CoreClient.find_analysis_nodes")
+    @patch("flame_hub._core_client.CoreClient.find_analysis_nodes", new_callable=AsyncMock)
     @patch("hub_adapter.routers.meta.GoGoAnalysis.describe_node")
     @patch("hub_adapter.routers.meta.GoGoAnalysis.gather_deps")
     async def test_initialize_analysis(
@@ -241,3 +252,133 @@ class TestMeta:
 
         assert error.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
         mock_po_request.assert_not_called()
+
+    @staticmethod
+    def _dashboard_sources():
+        hub_entry = SimpleNamespace(
+            id=uuid.uuid4(),
+            analysis_id=uuid.UUID(TEST_MOCK_ANALYSIS_ID),
+            approval_status="approved",
+            execution_status="executing",
+            execution_progress=40,
+            analysis=SimpleNamespace(project_id=uuid.UUID(TEST_MOCK_PROJECT_ID)),
+        )
+        consumers = {
+            "data": [
+                SimpleNamespace(tags=[f"project:{TEST_MOCK_PROJECT_ID}", f"analysis:{TEST_MOCK_ANALYSIS_ID}"]),
+                SimpleNamespace(tags=["project:other-project", f"analysis:{OTHER_ANALYSIS_ID}"]),
+            ]
+        }
+        routes = SimpleNamespace(data=[SimpleNamespace(tags=[f"project:{TEST_MOCK_PROJECT_ID}"])])
+        statuses = {TEST_MOCK_ANALYSIS_ID: {"status": "executing", "progress": 40}}
+        return [hub_entry], consumers, routes, statuses
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.routers.meta._get_pod_statuses")
+    @patch("hub_adapter.routers.meta.get_projects")
+    @patch("hub_adapter.routers.meta.get_analyses")
+    @patch("hub_adapter.routers.meta._find_node_analyses")
+    async def test_dashboard_joins_sources_by_analysis(
+        self, mock_hub, mock_kong_analyses, mock_kong_projects, mock_po, test_settings
+    ):
+        """Every source contributes its fields to the entry of the analysis it describes."""
+        (
+            mock_hub.return_value,
+            mock_kong_analyses.return_value,
+            mock_kong_projects.return_value,
+            mock_po.return_value,
+        ) = self._dashboard_sources()
+
+        dashboard = await get_analysis_dashboard(core_client=AsyncMock(), settings=test_settings)
+
+        assert all(source["ok"] for source in dashboard.sources.model_dump().values())
+        assert [str(entry.analysis_id) for entry in dashboard.analyses] == [TEST_MOCK_ANALYSIS_ID, OTHER_ANALYSIS_ID]
+
+        running, orphaned = dashboard.analyses
+        assert running.execution_status == "executing"
+        assert running.kong_consumer is True
+        assert running.project_linked is True
+        assert running.pod_status == "executing"
+        assert running.pod_progress == 40
+
+        # Only known to Kong, e.g. a consumer whose analysis was removed from the Hub
+        assert orphaned.analysis_node_id is None
+        assert orphaned.kong_consumer is True
+        assert orphaned.project_linked is False
+        assert orphaned.pod_status is None
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.routers.meta._get_pod_statuses")
+    @patch("hub_adapter.routers.meta.get_projects")
+    @patch("hub_adapter.routers.meta.get_analyses")
+    @patch("hub_adapter.routers.meta._find_node_analyses")
+    async def test_dashboard_marks_failed_sources(
+        self, mock_hub, mock_kong_analyses, mock_kong_projects, mock_po, test_settings
+    ):
+        """A failing source is reported in "sources" and leaves its fields empty instead of failing the request."""
+        mock_hub.return_value, _, mock_kong_projects.return_value, _ = self._dashboard_sources()
+        mock_kong_analyses.side_effect = RuntimeError("Kong is down")
+        mock_po.side_effect = HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={"message": "PO is currently unreachable", "service": "PO", "status_code": 503},
+        )
+
+        dashboard = await get_analysis_dashboard(core_client=AsyncMock(), settings=test_settings)
+
+        assert dashboard.sources.hub.ok and dashboard.sources.kong_projects.ok
+        assert dashboard.sources.kong_analyses.model_dump() == {"ok": False, "message": "Kong is down"}
+        assert dashboard.sources.po.model_dump() == {"ok": False, "message": "PO is currently unreachable"}
+
+        (entry,) = dashboard.analyses
+        assert entry.execution_status == "executing"
+        assert entry.kong_consumer is None  # unknown rather than missing
+        assert entry.project_linked is True
+        assert entry.pod_status is None
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.routers.meta._cached_read")
+    @patch("hub_adapter.routers.meta.get_node_id")
+    async def test_dashboard_reads_one_cached_page_of_analysis_nodes(
+        self, mock_node_id, mock_cached_read, test_settings
+    ):
+        """The Hub analysis nodes are read a page at a time through the shared Hub cache."""
+        core_client = AsyncMock()
+        mock_node_id.return_value = TEST_MOCK_NODE_ID
+        mock_cached_read.return_value = []
+
+        await _find_node_analyses(core_client, test_settings, limit=20, offset=40)
+
+        mock_cached_read.assert_awaited_once_with(
+            core_client,
+            "find_analysis_nodes",
+            "analysis-nodes",
+            sort={"by": "updated_at", "order": "descending"},
+            page={"limit": 20, "offset": 40},
+            filter={"nodeId": TEST_MOCK_NODE_ID},
+        )
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.routers.meta._get_pod_statuses")
+    @patch("hub_adapter.routers.meta.get_projects")
+    @patch("hub_adapter.routers.meta.get_analyses")
+    @patch("hub_adapter.routers.meta.get_node_id")
+    async def test_dashboard_survives_an_unresolved_node_id(
+        self, mock_node_id, mock_kong_analyses, mock_kong_projects, mock_po, test_settings
+    ):
+        """Failing to look up the node ID on a cold cache only marks the Hub source as not ok."""
+        _, mock_kong_analyses.return_value, mock_kong_projects.return_value, mock_po.return_value = (
+            self._dashboard_sources()
+        )
+        mock_node_id.side_effect = HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={"message": "Connection Error - Hub is currently unreachable", "service": "Hub", "status_code": 503},
+        )
+
+        dashboard = await get_analysis_dashboard(core_client=AsyncMock(), settings=test_settings)
+
+        assert dashboard.sources.hub.model_dump() == {
+            "ok": False,
+            "message": "Connection Error - Hub is currently unreachable",
+        }
+        assert dashboard.sources.kong_analyses.ok and dashboard.sources.po.ok
+        assert {str(entry.analysis_id) for entry in dashboard.analyses} == {TEST_MOCK_ANALYSIS_ID, OTHER_ANALYSIS_ID}
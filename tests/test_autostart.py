@@ -2,19 +2,23 @@
 
 import asyncio
 import logging
-from contextlib import suppress
-from unittest.mock import ANY, MagicMock, patch
+import threading
+from contextlib import asynccontextmanager
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
+import peewee as pw
 import pytest
 from fastapi import HTTPException
 from flame_hub.models import AnalysisNode
 from httpx2 import ConnectError, HTTPStatusError, RemoteProtocolError, Request, Response
 from kong_admin_client import ListRoute200Response, Route
+from psycopg2.errors import LockNotAvailable
 from starlette import status
 
 from hub_adapter.autostart import GoGoAnalysis
 from hub_adapter.conf import Settings
-from hub_adapter.errors import KongConflictError, KongConnectError
+from hub_adapter.constants import ServiceTag
+from hub_adapter.errors import AnalysisRegistrationLockedError, KongConflictError, KongConnectError
 from tests.constants import (
     ANALYSIS_NODES_RESP,
     KONG_ANALYSIS_SUCCESS_RESP,
@@ -389,6 +393,27 @@ class TestAutostart:
         assert build_status == "executed"
         assert execution_status is None
 
+    @patch("hub_adapter.autostart.log_event")
+    @patch("hub_adapter.autostart.iter_pages")
+    @pytest.mark.asyncio
+    async def test_find_ready_analyses_scans_every_page(self, mock_iter_pages, mock_log_event):
+        """Analyses ready to start on later pages are found and the summary is only logged once."""
+        formatted_analyses = [AnalysisNode(**analysis) for analysis in ANALYSIS_NODES_RESP]
+
+        async def fake_iter_pages(find, **params):
+            yield []
+            yield formatted_analyses
+
+        mock_iter_pages.side_effect = fake_iter_pages
+        self.analyzer.core_client = MagicMock()
+
+        ready_analyses = await self.analyzer.find_ready_analyses(TEST_MOCK_NODE_ID, {TEST_MOCK_PROJECT_ID}, True)
+
+        assert {analysis[0] for analysis in ready_analyses} == {TEST_MOCK_ANALYSIS_ID}
+        assert mock_iter_pages.call_args.kwargs["filter"] == {"nodeId": TEST_MOCK_NODE_ID}
+        ready_events = [c for c in mock_log_event.call_args_list if c.args[0] == "autostart.analysis.ready"]
+        assert len(ready_events) == 1
+
 
 class TestAutostartErrorAndEvents:
     """Additional unit tests for the autostart module to check expected errors and coverage."""
@@ -708,39 +733,36 @@ class TestAutostartManager:
 
         assert manager._enabled is False
 
-    @patch("hub_adapter.autostart.load_persistent_settings")
+    @patch("hub_adapter.scheduler.log_event")
     @patch("hub_adapter.autostart.log_event")
     @pytest.mark.asyncio
-    async def test_autostart_manager_run_autostart_error_handling(self, mock_log_event, mock_load_settings):
-        """Test _run_autostart error handling."""
+    async def test_autostart_manager_run_autostart_error_handling(self, _mock_log_event, mock_scheduler_log_event):
+        """Test that an error during a run is logged and the next run still happens."""
         from hub_adapter.autostart import AutostartManager
 
         manager = AutostartManager()
-        mock_settings = MagicMock()
-        mock_settings.autostart.enabled = True
-        mock_settings.autostart.interval = 1
-        mock_load_settings.return_value = mock_settings
 
         with patch("hub_adapter.autostart.GoGoAnalysis") as mock_gogos:
             mock_instance = MagicMock()
             mock_gogos.return_value = mock_instance
-            mock_instance.auto_start_analyses.side_effect = Exception("Test error")
-
-            task = asyncio.create_task(manager._run_autostart(interval=1))
+            mock_instance.auto_start_analyses = AsyncMock(side_effect=Exception("Test error"))
 
-            # Let it run for a short time
-            await asyncio.sleep(0.5)
-
-            task.cancel()
-            with suppress(asyncio.CancelledError):
-                await task
+            manager._task = manager._schedule(interval=0)
+            await asyncio.sleep(0.1)
+            await manager.stop()
 
-            # Should have logged the error
-            mock_log_event.assert_called()
+        assert mock_instance.auto_start_analyses.await_count > 1
+        mock_scheduler_log_event.assert_any_call(
+            "autostart.error",
+            event_description="Error during autostart: Test error",
+            level=logging.ERROR,
+            service=ServiceTag.AUTOSTART,
+        )
 
+    @patch("hub_adapter.scheduler.log_event")
     @patch("hub_adapter.autostart.log_event")
     @pytest.mark.asyncio
-    async def test_autostart_manager_retries_initiator_construction(self, mock_log_event):
+    async def test_autostart_manager_retries_initiator_construction(self, _mock_log_event, mock_scheduler_log_event):
         """A GoGoAnalysis that cannot gather its dependencies must not kill the loop for good.
 
         Its constructor reaches out for the settings, the Hub auth flow and the core client, so it
@@ -754,18 +776,15 @@ class TestAutostartManager:
         with patch("hub_adapter.autostart.GoGoAnalysis") as mock_gogos:
             mock_gogos.side_effect = Exception("Hub is not up yet")
 
-            task = asyncio.create_task(manager._run_autostart(interval=0))
+            manager._task = manager._schedule(interval=0)
             await asyncio.sleep(0.1)
 
-            still_running = not task.done()
-
-            task.cancel()
-            with suppress(asyncio.CancelledError):
-                await task
+            still_running = not manager._task.done()
+            await manager.stop()
 
         assert still_running, "the loop died on the first failed GoGoAnalysis construction"
         assert mock_gogos.call_count > 1, "construction was never retried"
-        mock_log_event.assert_any_call(
+        mock_scheduler_log_event.assert_any_call(
             "autostart.error",
             event_description=ANY,
             level=logging.ERROR,
@@ -929,3 +948,157 @@ class TestRegistrationLock:
 
         assert _registration_locks._locks == {}
         assert _registration_locks._refcounts == {}
+
+
+class TestAdvisoryRegistrationLock:
+    """Tests for the Postgres advisory lock keeping other workers and replicas out of a registration."""
+
+    @staticmethod
+    def _drain(locks) -> list[str]:
+        """Wait for the queued unlocks and return the statements sent to the database."""
+        for executor in locks._idle._queue:
+            executor.shutdown(wait=True)
+
+        return [call.args[0] for call in locks._db.execute_sql.call_args_list]
+
+    @staticmethod
+    def _locks(db: MagicMock | None = None):
+        from hub_adapter.autostart import _AdvisoryLocks
+
+        locks = _AdvisoryLocks(connections=2)
+        locks._db = db or MagicMock()
+        return locks
+
+    @pytest.mark.asyncio
+    async def test_lock_is_taken_and_released_on_one_connection(self):
+        from hub_adapter.leader_election import lock_key
+
+        locks = self._locks()
+        threads = set()
+        locks._db.execute_sql.side_effect = lambda *args: threads.add(threading.get_ident())
+
+        with patch("hub_adapter.autostart.get_node_database", return_value=locks._db):
+            async with locks.acquire(TEST_MOCK_ANALYSIS_ID):
+                pass
+            async with locks.acquire(TEST_MOCK_ANALYSIS_ID):
+                pass
+
+            statements = self._drain(locks)
+
+        assert statements == [
+            "SET lock_timeout = '60s'",
+            "SELECT pg_advisory_lock(%s)",
+            "SELECT pg_advisory_unlock(%s)",
+            "SELECT pg_advisory_lock(%s)",
+            "SELECT pg_advisory_unlock(%s)",
+        ]
+        assert locks._db.execute_sql.call_args_list[1].args[1] == (lock_key(f"analysis.{TEST_MOCK_ANALYSIS_ID}"),)
+        assert len(threads) == 1
+
+    @pytest.mark.asyncio
+    async def test_database_error_falls_back_to_the_process_lock(self):
+        locks = self._locks()
+        locks._db.execute_sql.side_effect = pw.OperationalError("server closed the connection unexpectedly")
+        entered = False
+
+        with patch("hub_adapter.autostart.get_node_database", return_value=locks._db):
+            async with locks.acquire(TEST_MOCK_ANALYSIS_ID):
+                entered = True
+
+            statements = self._drain(locks)
+
+        assert entered
+        assert "SELECT pg_advisory_unlock(%s)" not in statements
+        locks._db.manual_close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_lock_timeout_leaves_the_analysis_to_the_other_process(self):
+        locks = self._locks()
+
+        def execute_sql(statement, *args):
+            if "pg_advisory_lock" in statement:
+                raise pw.OperationalError(LockNotAvailable("canceling statement due to lock timeout"))
+
+        locks._db.execute_sql.side_effect = execute_sql
+        entered = False
+
+        with patch("hub_adapter.autostart.get_node_database", return_value=locks._db):
+            with pytest.raises(AnalysisRegistrationLockedError) as exc_info:
+                async with locks.acquire(TEST_MOCK_ANALYSIS_ID):
+                    entered = True
+
+            statements = self._drain(locks)
+
+        assert not entered
+        assert exc_info.value.status_code == status.HTTP_409_CONFLICT
+        assert "SELECT pg_advisory_unlock(%s)" not in statements
+        locks._db.manual_close.assert_not_called()
+        assert locks._idle.qsize() == 2, "the connection must go back to the pool"
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.autostart.log_event")
+    async def test_locked_analysis_is_skipped_with_a_conflict(self, mock_log_event):
+        @asynccontextmanager
+        async def locked(key):
+            raise AnalysisRegistrationLockedError(key)
+            yield
+
+        analysis = GoGoAnalysis()
+        with (
+            patch("hub_adapter.autostart._registration_locks", MagicMock(acquire=locked)),
+            patch.object(analysis, "register_analysis", new_callable=AsyncMock) as mock_register,
+        ):
+            resp, status_code = await analysis.register_and_start_analysis(
+                TEST_MOCK_ANALYSIS_ID, TEST_MOCK_PROJECT_ID, TEST_MOCK_NODE_ID, "default"
+            )
+
+        assert status_code == status.HTTP_409_CONFLICT
+        assert TEST_MOCK_ANALYSIS_ID in resp["message"]
+        mock_register.assert_not_called()
+        assert mock_log_event.call_args.args == ("autostart.analysis.locked",)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_releases_the_lock_once_granted(self):
+        locks = self._locks()
+        granted = threading.Event()
+        locks._db.execute_sql.side_effect = lambda statement, *args: (
+            granted.wait(1) if "pg_advisory_lock" in statement else None
+        )
+
+        with patch("hub_adapter.autostart.get_node_database", return_value=locks._db):
+            waiter = asyncio.create_task(locks.acquire(TEST_MOCK_ANALYSIS_ID).__aenter__())
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+
+            granted.set()
+            statements = self._drain(locks)
+
+        assert statements[-2:] == ["SELECT pg_advisory_lock(%s)", "SELECT pg_advisory_unlock(%s)"]
+
+    @pytest.mark.asyncio
+    async def test_only_one_coroutine_per_process_waits_on_the_database(self):
+        """Concurrent registrations of one analysis queue up in process and reach Postgres one after the other."""
+        from hub_adapter.autostart import _RegistrationLocks
+
+        in_database, most_in_database = 0, 0
+
+        @asynccontextmanager
+        async def advisory_lock(key):
+            nonlocal in_database, most_in_database
+            in_database += 1
+            most_in_database = max(most_in_database, in_database)
+            await asyncio.sleep(0.01)
+            yield
+            in_database -= 1
+
+        locks = _RegistrationLocks(advisory_locks=MagicMock(acquire=advisory_lock))
+
+        async def register():
+            async with locks.acquire(TEST_MOCK_ANALYSIS_ID):
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(register() for _ in range(3)))
+
+        assert most_in_database == 1
@@ -1,5 +1,8 @@
 """Test the key functions that govern the gateway."""
 
+import asyncio
+from unittest.mock import MagicMock, patch
+
 import httpx2
 import pytest
 from starlette.responses import FileResponse
@@ -46,6 +49,31 @@ class TestCore:
         assert working_code == 200
         assert isinstance(file_resp, FileResponse)
 
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_gets_share_one_request(self):
+        """Identical GETs from the same caller wait on one downstream request, other callers get their own."""
+        sent = []
+
+        async def fake_request(**kwargs):
+            sent.append(kwargs["headers"].get("Authorization"))
+            await asyncio.sleep(0.01)
+            return httpx2.Response(200, json={"foo": "bar"}, request=httpx2.Request("GET", kwargs["url"]))
+
+        client = MagicMock()
+        client.request = fake_request
+        ep = f"{TEST_URL}/po/status"
+
+        with patch("hub_adapter.core.get_proxy_client", return_value=client):
+            results = await asyncio.gather(
+                make_request(ep, method="get", headers={"Authorization": "Bearer a"}),
+                make_request(ep, method="get", headers={"Authorization": "Bearer a"}),
+                make_request(ep, method="get", headers={"Authorization": "Bearer b"}),
+            )
+
+        assert sent == ["Bearer a", "Bearer b"]
+        assert list(results) == [({"foo": "bar"}, 200)] * 3
+        assert results[0][0] is not results[1][0]  # each caller parses its own copy
+
     # TODO write unit tests for route decorator
     # def test_route_decorator(self, httpx2_mock):
     #     """Test the route decorator function."""
@@ -3,13 +3,11 @@
 import logging
 import uuid
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx2
 import pytest
 from fastapi import HTTPException
-from flame_hub import CoreClient
-from flame_hub._auth_flows import ClientAuth
 from pydantic import BaseModel
 from starlette import status
 
@@ -24,6 +22,7 @@ from hub_adapter.dependencies import (
     get_ssl_context,
 )
 from hub_adapter.errors import HubConnectError
+from hub_adapter.hub_client import AsyncClientAuth, AsyncCoreClient
 from tests.constants import TEST_MOCK_ANALYSIS_ID, TEST_MOCK_NODE, TEST_MOCK_PROJECT_ID
 
 
@@ -77,7 +76,7 @@ class TestDeps:
         """Test the get_flame_hub_auth_flow method."""
 
         working_auth = get_flame_hub_auth_flow(self.ctx, self.mock_settings)
-        assert isinstance(working_auth, ClientAuth)
+        assert isinstance(working_auth, AsyncClientAuth)
 
         # Missing HUB_ROBOT_USER should raise ValueError
         missing_node_client_user_settings = test_settings.model_copy(update={"hub_node_client_id": ""})
@@ -96,13 +95,13 @@ class TestDeps:
         """Test the get_core_client method."""
         auth = get_flame_hub_auth_flow(self.ctx, self.mock_settings)
         cc = get_core_client(auth, self.ctx, self.mock_settings)
-        assert isinstance(cc, CoreClient)
+        assert isinstance(cc, AsyncCoreClient)
 
     @pytest.mark.asyncio
     async def test_get_node_id(self):
         """Test the get_node_id method."""
         # Working test
-        with patch("flame_hub._core_client.CoreClient.find_nodes") as node_response:
+        with patch("flame_hub._core_client.CoreClient.find_nodes", new_callable=AsyncMock) as node_response:
             node_response.return_value = [TEST_MOCK_NODE]
             correct_node_id = await get_node_id(self.cc, self.mock_settings, force_refresh=True)
 
@@ -111,7 +110,9 @@ class TestDeps:
         # Test when Hub is down
         with (
             patch(
-                "flame_hub._core_client.CoreClient.find_nodes", side_effect=httpx2.ConnectError(message="Hub is dead")
+                "flame_hub._core_client.CoreClient.find_nodes",
+                new_callable=AsyncMock,
+                side_effect=httpx2.ConnectError(message="Hub is dead"),
             ),
             pytest.raises(HubConnectError) as hubError,
         ):
@@ -124,7 +125,7 @@ class TestDeps:
     async def test_get_node_type_cache(self, mock_node_id):
         """Test the get_node_type_cache method."""
         mock_node_id.return_value = TEST_MOCK_NODE.id
-        with patch("flame_hub._core_client.CoreClient.get_node") as cc_response:
+        with patch("flame_hub._core_client.CoreClient.get_node", new_callable=AsyncMock) as cc_response:
             cc_response.side_effect = httpx2.ConnectError(message="Hub is dead")
 
             with pytest.raises(HubConnectError) as hubError:
@@ -138,22 +139,24 @@ class TestDeps:
             good_cache = await get_node_type_cache(self.mock_settings, self.cc)
             assert good_cache["type"] == TEST_MOCK_NODE.type
 
-    @patch("flame_hub._core_client.CoreClient.get_node")
-    def test_get_node_metadata_for_url(self, mock_node):
+    @pytest.mark.asyncio
+    @patch("flame_hub._core_client.CoreClient.get_node", new_callable=AsyncMock)
+    async def test_get_node_metadata_for_url(self, mock_node):
         """Test the get_node_metadata_for_url method."""
         mock_node.return_value = TEST_MOCK_NODE
-        correct_metadata = get_node_metadata_for_url(TEST_MOCK_NODE.id, self.cc)
+        correct_metadata = await get_node_metadata_for_url(TEST_MOCK_NODE.id, self.cc)
         assert correct_metadata == TEST_MOCK_NODE
 
         # Raise error if needed info is missing
         mock_node.return_value.registry_project_id = None
         with pytest.raises(HTTPException) as err:
-            get_node_metadata_for_url(TEST_MOCK_NODE.id, self.cc)
+            await get_node_metadata_for_url(TEST_MOCK_NODE.id, self.cc)
 
             assert err.value.status_code == status.HTTP_400_BAD_REQUEST
 
-    @patch("flame_hub._core_client.CoreClient.get_registry_project")
-    def test_get_registry_metadata_for_url(self, mock_registry_project):
+    @pytest.mark.asyncio
+    @patch("flame_hub._core_client.CoreClient.get_registry_project", new_callable=AsyncMock)
+    async def test_get_registry_metadata_for_url(self, mock_registry_project):
         """Test the get_registry_metadata_for_url method."""
 
         account_name = "fakeName"
@@ -189,7 +192,7 @@ class TestDeps:
 
         # No external name for node found
         with pytest.raises(HTTPException) as err:
-            get_registry_metadata_for_url(TEST_MOCK_NODE, self.cc)
+            await get_registry_metadata_for_url(TEST_MOCK_NODE, self.cc)
 
             assert err.value.status_code == status.HTTP_400_BAD_REQUEST
             assert err.value.detail["message"] == "No external name for node found"
@@ -199,7 +202,7 @@ class TestDeps:
         # No account_name for node found
         mock_registry_project.return_value.account_name = None
         with pytest.raises(HTTPException) as err:
-            get_registry_metadata_for_url(TEST_MOCK_NODE, self.cc)
+            await get_registry_metadata_for_url(TEST_MOCK_NODE, self.cc)
 
             assert err.value.status_code == status.HTTP_404_NOT_FOUND
             assert err.value.detail["message"] == "Unable to retrieve node client ID or secret from the registry"
@@ -207,7 +210,7 @@ class TestDeps:
         # Missing registry_id
         mock_registry_project.return_value.account_name = account_name
         with pytest.raises(HTTPException) as err:
-            get_registry_metadata_for_url(TEST_MOCK_NODE, self.cc)
+            await get_registry_metadata_for_url(TEST_MOCK_NODE, self.cc)
 
             assert err.value.status_code == status.HTTP_400_BAD_REQUEST
             assert "No registry is associated with node " in err.value.detail["message"]
@@ -215,7 +218,7 @@ class TestDeps:
         mock_registry_project.return_value.registry_id = TEST_MOCK_NODE.id
 
         # Working response
-        assert get_registry_metadata_for_url(TEST_MOCK_NODE, self.cc) == (
+        assert await get_registry_metadata_for_url(TEST_MOCK_NODE, self.cc) == (
             host,
             account_name,
             account_name,
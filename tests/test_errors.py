@@ -224,16 +224,17 @@ class TestCatchKongErrorsLogging:
 
     @patch("hub_adapter.errors.log_event")
     @pytest.mark.asyncio
-    async def test_max_retry_error_logs(self, mock_log_event):
-        """catch_kong_errors logs kong.service.unavailable on MaxRetryError."""
-        from urllib3.exceptions import MaxRetryError
+    async def test_transport_error_logs(self, mock_log_event):
+        """catch_kong_errors logs kong.service.unavailable when Kong cannot be reached."""
 
         @catch_kong_errors
-        async def raise_max_retry():
-            raise MaxRetryError(pool=None, url="/", reason="exhausted")
+        async def raise_connect_error():
+            raise httpx2.ConnectError("All connection attempts failed")
 
-        with pytest.raises(Exception):
-            await raise_max_retry()
+        with pytest.raises(KongTimeoutError) as err:
+            await raise_connect_error()
+
+        assert err.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
 
         mock_log_event.assert_called_once_with(
             "kong.service.unavailable",
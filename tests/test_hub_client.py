@@ -0,0 +1,189 @@
+"""Collection of unit tests for the asyncio-native Hub client."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import httpx2
+import pytest
+from flame_hub import HubAPIError
+
+from hub_adapter.hub_client import AsyncClientAuth, AsyncCoreClient, iter_pages
+from tests.constants import TEST_MOCK_NODE, TEST_MOCK_NODE_ID
+
+NODE_BODY = TEST_MOCK_NODE.model_dump(mode="json")
+LIST_META = {"total": 1, "limit": 50, "offset": 0, "schema": {}}
+
+
+def _core_client(handler) -> AsyncCoreClient:
+    return AsyncCoreClient(client=httpx2.AsyncClient(base_url="http://hub", transport=httpx2.MockTransport(handler)))
+
+
+def _token_client(handler) -> httpx2.AsyncClient:
+    return httpx2.AsyncClient(base_url="http://auth", transport=httpx2.MockTransport(handler))
+
+
+class TestAsyncCoreClient:
+    """Awaiting the flame_hub resource methods."""
+
+    @pytest.mark.asyncio
+    async def test_find_builds_the_flame_hub_query(self):
+        requests = []
+
+        def handler(request: httpx2.Request) -> httpx2.Response:
+            requests.append(request)
+            return httpx2.Response(200, json={"data": [NODE_BODY], "meta": LIST_META})
+
+        nodes = await _core_client(handler).find_nodes(filter={"clientId": "foo"}, fields="id")
+
+        assert nodes[0].id == TEST_MOCK_NODE.id
+        assert requests[0].url.path == "/nodes"
+        assert requests[0].url.params["filter[clientId]"] == "foo"
+        assert requests[0].url.params["fields"] == "+id"
+
+    @pytest.mark.asyncio
+    async def test_missing_single_resource_is_none(self):
+        def handler(request: httpx2.Request) -> httpx2.Response:
+            return httpx2.Response(
+                404, json={"statusCode": 404, "code": "not_found", "message": "Not found", "issues": []}
+            )
+
+        assert await _core_client(handler).get_node(node_id=TEST_MOCK_NODE_ID) is None
+
+    @pytest.mark.asyncio
+    async def test_unexpected_status_raises_hub_api_error(self):
+        def handler(request: httpx2.Request) -> httpx2.Response:
+            return httpx2.Response(
+                500, json={"statusCode": 500, "code": "server_error", "message": "Boom", "issues": []}
+            )
+
+        with pytest.raises(HubAPIError):
+            await _core_client(handler).get_node(node_id=TEST_MOCK_NODE_ID)
+
+    @pytest.mark.asyncio
+    async def test_update_posts_only_the_set_fields(self):
+        bodies = []
+
+        def handler(request: httpx2.Request) -> httpx2.Response:
+            bodies.append(json.loads(request.content))
+            return httpx2.Response(202, json=NODE_BODY)
+
+        node = await _core_client(handler).update_node(TEST_MOCK_NODE_ID, hidden=True)
+
+        assert node.id == TEST_MOCK_NODE.id
+        assert bodies == [{"hidden": True}]
+
+    @pytest.mark.asyncio
+    async def test_identical_concurrent_reads_share_one_request(self):
+        requests = []
+
+        async def handler(request: httpx2.Request) -> httpx2.Response:
+            requests.append(request)
+            await asyncio.sleep(0.01)
+            return httpx2.Response(200, json={"data": [NODE_BODY], "meta": LIST_META})
+
+        client = _core_client(handler)
+        results = await asyncio.gather(*(client.find_nodes(filter={"clientId": "foo"}) for _ in range(3)))
+
+        assert len(requests) == 1
+        assert [nodes[0].id for nodes in results] == [TEST_MOCK_NODE.id] * 3
+        assert results[0] is not results[1]
+
+    def test_methods_that_drop_their_result_are_unsupported(self):
+        with pytest.raises(NotImplementedError):
+            _core_client(lambda request: httpx2.Response(202)).delete_node(TEST_MOCK_NODE_ID)
+
+
+class TestAsyncClientAuth:
+    """Fetching the robot token without blocking the event loop."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_token_fetch(self):
+        token_requests = []
+
+        async def token_handler(request: httpx2.Request) -> httpx2.Response:
+            token_requests.append(json.loads(request.content))
+            await asyncio.sleep(0.01)
+            return httpx2.Response(
+                200, json={"access_token": "robot", "expires_in": 3600, "token_type": "Bearer", "scope": ""}
+            )
+
+        def hub_handler(request: httpx2.Request) -> httpx2.Response:
+            assert request.headers["Authorization"] == "Bearer robot"
+            return httpx2.Response(200, json={"data": [], "meta": {**LIST_META, "total": 0}})
+
+        auth = AsyncClientAuth("client-id", "client-secret", client=_token_client(token_handler))
+        client = httpx2.AsyncClient(base_url="http://hub", auth=auth, transport=httpx2.MockTransport(hub_handler))
+
+        await asyncio.gather(*(client.get("nodes") for _ in range(5)))
+
+        assert token_requests == [
+            {"grant_type": "client_credentials", "client_id": "client-id", "client_secret": "client-secret"}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_expired_token_is_refreshed(self):
+        token_requests = []
+
+        def token_handler(request: httpx2.Request) -> httpx2.Response:
+            token_requests.append(request)
+            return httpx2.Response(
+                200, json={"access_token": "robot", "expires_in": 0, "token_type": "Bearer", "scope": ""}
+            )
+
+        auth = AsyncClientAuth("client-id", "client-secret", client=_token_client(token_handler))
+        client = httpx2.AsyncClient(auth=auth, transport=httpx2.MockTransport(lambda request: httpx2.Response(200)))
+
+        await client.get("http://hub/nodes")
+        await client.get("http://hub/nodes")
+
+        assert len(token_requests) == 2
+
+    def test_sync_clients_are_rejected(self):
+        auth = AsyncClientAuth("client-id", "client-secret", client=_token_client(lambda request: None))
+
+        with pytest.raises(RuntimeError):
+            httpx2.Client(auth=auth, transport=httpx2.MockTransport(lambda request: httpx2.Response(200))).get(
+                "http://hub/nodes"
+            )
+
+
+class TestIterPages:
+    """Scanning complete Hub result sets a page at a time."""
+
+    @staticmethod
+    def _find(total: int, calls: list):
+        async def find(page: dict, meta: bool, **params):
+            calls.append((page, params))
+            data = list(range(page["offset"], min(page["offset"] + page["limit"], total)))
+            return data, SimpleNamespace(total=total)
+
+        return find
+
+    @pytest.mark.asyncio
+    async def test_every_page_is_yielded_with_the_same_params(self):
+        calls = []
+
+        pages = [page async for page in iter_pages(self._find(5, calls), page_size=2, filter={"nodeId": "foo"})]
+
+        assert pages == [[0, 1], [2, 3], [4]]
+        assert [page["offset"] for page, _ in calls] == [0, 2, 4]
+        assert all(params == {"filter": {"nodeId": "foo"}} for _, params in calls)
+
+    @pytest.mark.asyncio
+    async def test_next_page_is_fetched_while_the_current_one_is_processed(self):
+        calls = []
+        pages = iter_pages(self._find(5, calls), page_size=2)
+
+        await anext(pages)
+        await asyncio.sleep(0)  # let the prefetch run
+
+        assert len(calls) == 2
+        await pages.aclose()
+
+    @pytest.mark.asyncio
+    async def test_empty_result_is_a_single_empty_page(self):
+        calls = []
+
+        assert [page async for page in iter_pages(self._find(0, calls))] == [[]]
+        assert len(calls) == 1
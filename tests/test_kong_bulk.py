@@ -0,0 +1,47 @@
+"""Collection of unit tests for deleting many Kong entities at once."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from kong_admin_client import ApiException
+
+from hub_adapter.kong_bulk import bulk_delete
+from hub_adapter.kong_inventory import CONSUMERS
+
+CONSUMERS_TO_DELETE = [SimpleNamespace(id=f"consumer-{i}", tags=[]) for i in range(6)]
+
+
+class TestBulkDelete:
+    """Concurrent deletions with per-entity results."""
+
+    @pytest.mark.asyncio
+    async def test_requests_in_flight_are_bounded(self):
+        in_flight, most_in_flight = 0, 0
+
+        async def delete(entity_id):
+            nonlocal in_flight, most_in_flight
+            in_flight += 1
+            most_in_flight = max(most_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        removed, failed = await bulk_delete(delete, CONSUMERS, CONSUMERS_TO_DELETE, limit=2)
+
+        assert removed == CONSUMERS_TO_DELETE
+        assert failed == []
+        assert most_in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_failures_are_reported_without_stopping_the_rest(self):
+        async def delete(entity_id):
+            if entity_id == "consumer-1":
+                raise ApiException(status=500, reason="Internal Server Error")
+
+            if entity_id == "consumer-2":  # already gone
+                raise ApiException(status=404, reason="Not Found")
+
+        removed, failed = await bulk_delete(delete, CONSUMERS, CONSUMERS_TO_DELETE, limit=3)
+
+        assert removed == [consumer for consumer in CONSUMERS_TO_DELETE if consumer.id != "consumer-1"]
+        assert [(failure.id, failure.kind, failure.status) for failure in failed] == [("consumer-1", CONSUMERS, 500)]
@@ -3,25 +3,37 @@
 import asyncio
 import logging
 import uuid
-from contextlib import suppress
 from datetime import UTC, datetime, timedelta
 from types import SimpleNamespace
 from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi import HTTPException
+from flame_hub._base_client import FilterOperator
 from kong_admin_client import ApiException, Consumer
 from starlette import status
 
 from hub_adapter.kong_cleanup import (
+    BACKLOG_INTERVAL,
     EXECUTED_AFTER_RUNNING_GRACE,
     NEVER_RAN_GRACE,
     KongCleanupManager,
     KongConsumerReaper,
 )
+from hub_adapter.scheduler import scheduler
 from tests.constants import TEST_MOCK_ANALYSIS_ID, TEST_MOCK_NODE_ID, TEST_MOCK_PROJECT_ID
 
 
+@pytest.fixture(autouse=True)
+def stored_history():
+    """Keep the sweeps from reading or writing the persisted cleanup history."""
+    with (
+        patch("hub_adapter.kong_cleanup.load_history", return_value={}) as mock_load,
+        patch("hub_adapter.kong_cleanup.save_history", return_value=True),
+    ):
+        yield mock_load
+
+
 def _consumer(analysis_id: str, project_id: str = TEST_MOCK_PROJECT_ID) -> Consumer:
     return Consumer(
         id=str(uuid.uuid4()),
@@ -30,8 +42,22 @@ def _consumer(analysis_id: str, project_id: str = TEST_MOCK_PROJECT_ID) -> Consu
     )
 
 
-def _analysis_node(analysis_id: str, execution_status: str | None):
-    return SimpleNamespace(analysis_id=uuid.UUID(analysis_id), execution_status=execution_status)
+def _analysis_node(analysis_id: str, execution_status: str | None, updated_at: datetime | None = None):
+    return SimpleNamespace(
+        analysis_id=uuid.UUID(analysis_id),
+        execution_status=execution_status,
+        updated_at=updated_at or datetime.now(UTC),
+    )
+
+
+def _pages(*pages: list):
+    """Stand in for iter_pages, yielding the given pages of analysis nodes."""
+
+    async def fake_iter_pages(find, **params):
+        for page in pages:
+            yield page
+
+    return fake_iter_pages
 
 
 class TestKongConsumerReaperProcess:
@@ -41,6 +67,7 @@ class TestKongConsumerReaperProcess:
         self.gather_deps_patcher = patch.object(KongConsumerReaper, "gather_deps")
         self.gather_deps_patcher.start()
         self.reaper = KongConsumerReaper()
+        self.reaper.core_client = MagicMock()
 
     def teardown_method(self):
         self.gather_deps_patcher.stop()
@@ -145,6 +172,7 @@ class TestKongConsumerReaperDelete:
         self.gather_deps_patcher = patch.object(KongConsumerReaper, "gather_deps")
         self.gather_deps_patcher.start()
         self.reaper = KongConsumerReaper()
+        self.reaper.core_client = MagicMock()
 
     def teardown_method(self):
         self.gather_deps_patcher.stop()
@@ -191,21 +219,22 @@ class TestKongConsumerReaperSweep:
         self.gather_deps_patcher = patch.object(KongConsumerReaper, "gather_deps")
         self.gather_deps_patcher.start()
         self.reaper = KongConsumerReaper()
+        self.reaper.core_client = MagicMock()
 
     def teardown_method(self):
         self.gather_deps_patcher.stop()
 
     @pytest.mark.asyncio
     @patch("hub_adapter.kong_cleanup.delete_analysis", new_callable=AsyncMock)
-    @patch("hub_adapter.kong_cleanup.list_analysis_nodes", new_callable=AsyncMock)
+    @patch("hub_adapter.kong_cleanup.iter_pages")
     @patch("hub_adapter.kong_cleanup.get_node_id", new_callable=AsyncMock)
     @patch("hub_adapter.kong_cleanup.get_analyses")
     async def test_sweep_deletes_executed_consumer(
-            self, mock_get_analyses, mock_get_node_id, mock_list_nodes, mock_delete_analysis
+            self, mock_get_analyses, mock_get_node_id, mock_iter_pages, mock_delete_analysis
     ):
         mock_get_analyses.return_value = {"data": [_consumer(TEST_MOCK_ANALYSIS_ID)]}
         mock_get_node_id.return_value = TEST_MOCK_NODE_ID
-        mock_list_nodes.return_value = [_analysis_node(TEST_MOCK_ANALYSIS_ID, "executed")]
+        mock_iter_pages.side_effect = _pages([_analysis_node(TEST_MOCK_ANALYSIS_ID, "executed")])
 
         deleted = await self.reaper.sweep()
 
@@ -214,15 +243,67 @@ class TestKongConsumerReaperSweep:
 
     @pytest.mark.asyncio
     @patch("hub_adapter.kong_cleanup.delete_analysis", new_callable=AsyncMock)
-    @patch("hub_adapter.kong_cleanup.list_analysis_nodes", new_callable=AsyncMock)
+    @patch("hub_adapter.kong_cleanup.iter_pages")
+    @patch("hub_adapter.kong_cleanup.get_node_id", new_callable=AsyncMock)
+    @patch("hub_adapter.kong_cleanup.get_analyses")
+    async def test_sweep_reads_statuses_past_the_first_page(
+            self, mock_get_analyses, mock_get_node_id, mock_iter_pages, mock_delete_analysis
+    ):
+        """An analysis beyond the first page must not look like it never ran."""
+        other_id = "00000000-0000-0000-0000-000000000999"
+        mock_get_analyses.return_value = {"data": [_consumer(TEST_MOCK_ANALYSIS_ID)]}
+        mock_get_node_id.return_value = TEST_MOCK_NODE_ID
+        mock_iter_pages.side_effect = _pages(
+            [_analysis_node(other_id, "executed")], [_analysis_node(TEST_MOCK_ANALYSIS_ID, "executing")]
+        )
+
+        deleted = await self.reaper.sweep()
+
+        assert deleted == set()
+        assert self.reaper._history[TEST_MOCK_ANALYSIS_ID]["seen_executing"] is True
+        assert mock_iter_pages.call_args.kwargs == {
+            "filter": {"nodeId": TEST_MOCK_NODE_ID, "analysisId": TEST_MOCK_ANALYSIS_ID}
+        }
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.kong_cleanup.STATUS_LOOKUP_CHUNK_SIZE", 2)
+    @patch("hub_adapter.kong_cleanup.iter_pages")
+    async def test_statuses_are_looked_up_in_chunks_and_reused(self, mock_iter_pages):
+        """Only the analyses with a consumer are asked for, and known ones only if updated since."""
+        analysis_ids = sorted(str(uuid.uuid4()) for _ in range(3))
+        updated_at = datetime(2026, 1, 1, tzinfo=UTC)
+        mock_iter_pages.side_effect = _pages(
+            [_analysis_node(analysis_id, "executing", updated_at) for analysis_id in analysis_ids]
+        )
+
+        statuses = await self.reaper._fetch_statuses(TEST_MOCK_NODE_ID, set(analysis_ids))
+
+        assert statuses == dict.fromkeys(analysis_ids, "executing")
+        assert sorted(call.kwargs["filter"]["analysisId"] for call in mock_iter_pages.call_args_list) == [
+            ",".join(analysis_ids[:2]),
+            analysis_ids[2],
+        ]
+
+        # Nothing changed on the Hub since: the earlier statuses are kept
+        mock_iter_pages.reset_mock()
+        mock_iter_pages.side_effect = _pages()
+        statuses = await self.reaper._fetch_statuses(TEST_MOCK_NODE_ID, set(analysis_ids[1:]))
+
+        assert statuses == dict.fromkeys(analysis_ids[1:], "executing")
+        assert mock_iter_pages.call_args.kwargs["filter"]["updatedAt"] == (FilterOperator.gt, updated_at.isoformat())
+        assert set(self.reaper._statuses) == set(analysis_ids[1:])
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.kong_cleanup.delete_analysis", new_callable=AsyncMock)
+    @patch("hub_adapter.kong_cleanup.iter_pages")
     @patch("hub_adapter.kong_cleanup.get_node_id", new_callable=AsyncMock)
     @patch("hub_adapter.kong_cleanup.get_analyses")
     async def test_sweep_leaves_running_consumer_alone(
-            self, mock_get_analyses, mock_get_node_id, mock_list_nodes, mock_delete_analysis
+            self, mock_get_analyses, mock_get_node_id, mock_iter_pages, mock_delete_analysis
     ):
         mock_get_analyses.return_value = {"data": [_consumer(TEST_MOCK_ANALYSIS_ID)]}
         mock_get_node_id.return_value = TEST_MOCK_NODE_ID
-        mock_list_nodes.return_value = [_analysis_node(TEST_MOCK_ANALYSIS_ID, "executing")]
+        mock_iter_pages.side_effect = _pages([_analysis_node(TEST_MOCK_ANALYSIS_ID, "executing")])
 
         deleted = await self.reaper.sweep()
 
@@ -232,23 +313,80 @@ class TestKongConsumerReaperSweep:
 
     @pytest.mark.asyncio
     @patch("hub_adapter.kong_cleanup.delete_analysis", new_callable=AsyncMock)
-    @patch("hub_adapter.kong_cleanup.list_analysis_nodes", new_callable=AsyncMock)
+    @patch("hub_adapter.kong_cleanup.iter_pages")
     @patch("hub_adapter.kong_cleanup.get_node_id", new_callable=AsyncMock)
     @patch("hub_adapter.kong_cleanup.get_analyses")
     async def test_sweep_prunes_history_for_gone_consumers(
-            self, mock_get_analyses, mock_get_node_id, mock_list_nodes, mock_delete_analysis
+            self, mock_get_analyses, mock_get_node_id, mock_iter_pages, mock_delete_analysis
     ):
         other_id = "00000000-0000-0000-0000-000000000999"
         self.reaper._history[other_id] = {"seen_executing": True, "terminal_since": None}
 
         mock_get_analyses.return_value = {"data": [_consumer(TEST_MOCK_ANALYSIS_ID)]}
         mock_get_node_id.return_value = TEST_MOCK_NODE_ID
-        mock_list_nodes.return_value = [_analysis_node(TEST_MOCK_ANALYSIS_ID, "starting")]
+        mock_iter_pages.side_effect = _pages([_analysis_node(TEST_MOCK_ANALYSIS_ID, "starting")])
 
         await self.reaper.sweep()
 
         assert other_id not in self.reaper._history
 
+    @pytest.mark.asyncio
+    @patch("hub_adapter.kong_cleanup.log_event")
+    @patch("hub_adapter.kong_cleanup.delete_analysis", new_callable=AsyncMock)
+    @patch("hub_adapter.kong_cleanup.iter_pages")
+    @patch("hub_adapter.kong_cleanup.get_node_id", new_callable=AsyncMock)
+    @patch("hub_adapter.kong_cleanup.get_analyses")
+    async def test_sweep_deletes_concurrently_and_records_metrics(
+            self, mock_get_analyses, mock_get_node_id, mock_iter_pages, mock_delete_analysis, _mock_log_event
+    ):
+        analysis_ids = [str(uuid.uuid4()) for _ in range(5)]
+        in_flight, most_in_flight = 0, 0
+
+        async def delete_analysis(settings, analysis_id):
+            nonlocal in_flight, most_in_flight
+            in_flight += 1
+            most_in_flight = max(most_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if analysis_id == analysis_ids[0]:
+                raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+        mock_get_analyses.return_value = {"data": [_consumer(analysis_id) for analysis_id in analysis_ids]}
+        mock_get_node_id.return_value = TEST_MOCK_NODE_ID
+        mock_iter_pages.side_effect = _pages([_analysis_node(analysis_id, "executed") for analysis_id in analysis_ids])
+        mock_delete_analysis.side_effect = delete_analysis
+
+        with patch("hub_adapter.kong_cleanup.get_settings") as mock_settings:
+            mock_settings.return_value.kong_bulk_concurrency = 2
+            deleted = await self.reaper.sweep()
+
+        assert deleted == set(analysis_ids[1:])
+        assert most_in_flight == 2
+        assert self.reaper.last_sweep["candidates"] == 5
+        assert (self.reaper.last_sweep["deleted"], self.reaper.last_sweep["failed"]) == (4, 1)
+        assert self.reaper.backlog
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.kong_cleanup.delete_analysis", new_callable=AsyncMock)
+    @patch("hub_adapter.kong_cleanup.iter_pages")
+    @patch("hub_adapter.kong_cleanup.get_node_id", new_callable=AsyncMock)
+    @patch("hub_adapter.kong_cleanup.get_analyses")
+    async def test_grace_period_survives_a_restart(
+            self, mock_get_analyses, mock_get_node_id, mock_iter_pages, mock_delete_analysis, stored_history
+    ):
+        """A consumer failed long enough ago according to the stored history is deleted on the first sweep."""
+        stored_history.return_value = {
+            TEST_MOCK_ANALYSIS_ID: {"seen_executing": False, "terminal_since": datetime.now(UTC) - NEVER_RAN_GRACE}
+        }
+        mock_get_analyses.return_value = {"data": [_consumer(TEST_MOCK_ANALYSIS_ID)]}
+        mock_get_node_id.return_value = TEST_MOCK_NODE_ID
+        mock_iter_pages.side_effect = _pages([_analysis_node(TEST_MOCK_ANALYSIS_ID, "failed")])
+
+        assert await self.reaper.sweep() == {TEST_MOCK_ANALYSIS_ID}
+
+        await self.reaper.sweep()
+        stored_history.assert_called_once()  # loaded on the first sweep only
+
     @pytest.mark.asyncio
     @patch("hub_adapter.kong_cleanup.log_event")
     @patch("hub_adapter.kong_cleanup.get_analyses")
@@ -296,18 +434,18 @@ class TestKongConsumerReaperSweep:
 
     @pytest.mark.asyncio
     @patch("hub_adapter.kong_cleanup.delete_analysis", new_callable=AsyncMock)
-    @patch("hub_adapter.kong_cleanup.list_analysis_nodes", new_callable=AsyncMock)
+    @patch("hub_adapter.kong_cleanup.iter_pages")
     @patch("hub_adapter.kong_cleanup.get_node_id", new_callable=AsyncMock)
     @patch("hub_adapter.kong_cleanup.get_analyses")
     async def test_sweep_ignores_consumer_without_analysis_tag(
-            self, mock_get_analyses, mock_get_node_id, mock_list_nodes, mock_delete_analysis
+            self, mock_get_analyses, mock_get_node_id, mock_iter_pages, mock_delete_analysis
     ):
         untagged = Consumer(
             id=str(uuid.uuid4()), username="health-x", tags=["health", f"project:{TEST_MOCK_PROJECT_ID}"]
         )
         mock_get_analyses.return_value = {"data": [untagged]}
         mock_get_node_id.return_value = TEST_MOCK_NODE_ID
-        mock_list_nodes.return_value = []
+        mock_iter_pages.side_effect = _pages()
 
         deleted = await self.reaper.sweep()
 
@@ -395,22 +533,61 @@ class TestKongCleanupManager:
         assert manager._task is None
 
     @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("interval", "backlog", "expected_interval"), [(120, False, 120), (120, True, 30), (40, True, BACKLOG_INTERVAL)]
+    )
     @patch("hub_adapter.kong_cleanup.log_event")
-    async def test_run_cleanup_error_handling(self, mock_log_event):
+    async def test_backlog_shortens_the_next_interval(self, _mock_log_event, interval, backlog, expected_interval):
         manager = KongCleanupManager()
+        manager.interval = interval
+
+        with patch("hub_adapter.kong_cleanup.KongConsumerReaper") as mock_reaper_cls:
+            mock_reaper_cls.return_value.sweep = AsyncMock()
+            mock_reaper_cls.return_value.backlog = backlog
+            mock_reaper_cls.return_value.last_sweep = {"deleted": 0}
+
+            assert await manager._run_cleanup() == expected_interval
+
+        assert manager.last_sweep == {"deleted": 0, "next_interval": expected_interval}
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.scheduler.log_event")
+    @patch("hub_adapter.kong_cleanup.log_event")
+    async def test_run_cleanup_error_handling(self, _mock_log_event, mock_scheduler_log_event):
+        manager = KongCleanupManager()
+        manager.interval = 0
 
         with patch("hub_adapter.kong_cleanup.KongConsumerReaper") as mock_reaper_cls:
             mock_instance = MagicMock()
             mock_reaper_cls.return_value = mock_instance
             mock_instance.sweep = AsyncMock(side_effect=Exception("Test error"))
 
-            task = asyncio.create_task(manager._run_cleanup(interval=1))
-            await asyncio.sleep(0.5)
+            manager._task = scheduler.schedule("kong_cleanup", manager._run_cleanup, manager.interval)
+            await asyncio.sleep(0.1)
+            await manager.stop()
+
+        mock_reaper_cls.assert_called_once()
+        assert mock_instance.sweep.await_count > 1
+        mock_scheduler_log_event.assert_any_call(
+            "kong_cleanup.error",
+            event_description=ANY,
+            level=logging.ERROR,
+            service=ANY,
+        )
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.kong_cleanup.log_event")
+    async def test_taking_over_from_another_replica_reloads_the_history(self, _mock_log_event):
+        manager = KongCleanupManager()
+
+        with patch("hub_adapter.kong_cleanup.KongConsumerReaper") as mock_reaper_cls:
+            mock_reaper_cls.return_value.sweep = AsyncMock()
+            mock_reaper_cls.return_value.backlog = False
+            mock_reaper_cls.return_value.last_sweep = {"deleted": 0}
 
-            task.cancel()
-            with suppress(asyncio.CancelledError):
-                await task
+            await manager._run_cleanup()
+            await manager._run_cleanup()
+            manager._forget_reaper()
+            await manager._run_cleanup()
 
-            mock_reaper_cls.assert_called()
-            mock_instance.sweep.assert_awaited()
-            mock_log_event.assert_called()
+        assert mock_reaper_cls.call_count == 2
@@ -0,0 +1,79 @@
+"""Collection of unit tests for the asyncio-native Kong admin client."""
+
+import json
+
+import httpx2
+import pytest
+from kong_admin_client import ApiException, CreateConsumerRequest
+
+from hub_adapter.kong_client import AsyncKongAdmin
+from tests.constants import KONG_ANALYSIS_CONSUMER_DATA, KONG_LINK_ROUTE_DATA
+
+
+def _kong(handler, timeout: float = 10) -> AsyncKongAdmin:
+    return AsyncKongAdmin(
+        httpx2.AsyncClient(base_url="http://kong", timeout=timeout, transport=httpx2.MockTransport(handler))
+    )
+
+
+class TestAsyncKongAdmin:
+    """Calling the Kong admin API with the kong_admin_client models."""
+
+    @pytest.mark.asyncio
+    async def test_list_sends_only_the_set_params(self):
+        requests = []
+
+        def handler(request: httpx2.Request) -> httpx2.Response:
+            requests.append(request)
+            return httpx2.Response(200, json={"data": [KONG_LINK_ROUTE_DATA], "next": None})
+
+        routes = await _kong(handler).list_route(size=100, tags="project:foo")
+
+        assert routes.data[0].id == KONG_LINK_ROUTE_DATA["id"]
+        assert requests[0].url.path == "/routes"
+        assert dict(requests[0].url.params) == {"size": "100", "tags": "project:foo"}
+
+    @pytest.mark.asyncio
+    async def test_create_posts_the_request_model(self):
+        bodies = []
+
+        def handler(request: httpx2.Request) -> httpx2.Response:
+            bodies.append((request.url.path, json.loads(request.content)))
+            return httpx2.Response(201, json=KONG_ANALYSIS_CONSUMER_DATA)
+
+        consumer = await _kong(handler).create_consumer(CreateConsumerRequest(username="foo", tags=["analysis:foo"]))
+
+        assert consumer.id == KONG_ANALYSIS_CONSUMER_DATA["id"]
+        assert bodies[0][0] == "/consumers"
+        assert bodies[0][1]["username"] == "foo"
+
+    @pytest.mark.asyncio
+    async def test_delete_without_content_returns_none(self):
+        assert await _kong(lambda request: httpx2.Response(204)).delete_route("route-1") is None
+
+    @pytest.mark.asyncio
+    async def test_error_status_raises_api_exception(self):
+        """catch_kong_errors maps the kong_admin_client ApiException, so the same error is raised here."""
+
+        def handler(request: httpx2.Request) -> httpx2.Response:
+            return httpx2.Response(404, json={"message": "Not found"})
+
+        with pytest.raises(ApiException) as err:
+            await _kong(handler).get_service(service_id_or_name="foo")
+
+        assert err.value.status == 404
+        assert "Not found" in err.value.body
+
+    @pytest.mark.asyncio
+    async def test_client_timeout_applies_unless_given_per_call(self):
+        timeouts = []
+
+        def handler(request: httpx2.Request) -> httpx2.Response:
+            timeouts.append(request.extensions["timeout"]["read"])
+            return httpx2.Response(204)
+
+        kong = _kong(handler, timeout=5)
+        await kong.delete_consumer("foo")
+        await kong.delete_consumer("foo", timeout=1)
+
+        assert timeouts == [5, 1]
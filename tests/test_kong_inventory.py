@@ -0,0 +1,126 @@
+"""Collection of unit tests for the Kong inventory."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from kong_admin_client import Consumer, Route
+
+from hub_adapter.kong_inventory import CONSUMERS, ROUTES, KongInventory
+from hub_adapter.routers.kong import get_analyses, get_projects
+from tests.constants import (
+    KONG_ANALYSIS_CONSUMER_DATA,
+    KONG_LINK_ROUTE_DATA,
+    TEST_MOCK_ANALYSIS_ID,
+    TEST_MOCK_PROJECT_ID,
+)
+
+PROJECT_TAG = f"project:{TEST_MOCK_PROJECT_ID}"
+ANALYSIS_TAG = f"analysis:{TEST_MOCK_ANALYSIS_ID}"
+
+LINK_ROUTE = SimpleNamespace(id="route-1", tags=[PROJECT_TAG, "datastore:svc-1", "type:fhir"])
+OTHER_ROUTE = SimpleNamespace(id="route-2", tags=["project:other", "datastore:svc-2", "type:s3"])
+ANALYSIS_CONSUMER = SimpleNamespace(id="consumer-1", tags=[PROJECT_TAG, ANALYSIS_TAG])
+HEALTH_CONSUMER = SimpleNamespace(id="consumer-2", tags=["health", PROJECT_TAG])
+
+
+def _kong(services=(), routes=(), consumers=()) -> AsyncMock:
+    """Stand-in for the AsyncKongAdmin client listing the given entities."""
+    kong = AsyncMock()
+    kong.list_service.return_value = SimpleNamespace(data=list(services))
+    kong.list_route.return_value = SimpleNamespace(data=list(routes))
+    kong.list_consumer.return_value = SimpleNamespace(data=list(consumers))
+    return kong
+
+
+async def _loaded_inventory(**entities) -> KongInventory:
+    inventory = KongInventory(max_age=60)
+    await inventory.refresh(_kong(**entities), page_size=100)
+
+    return inventory
+
+
+class TestKongInventory:
+    """Serving tag filtered reads from the snapshot."""
+
+    def test_reads_need_a_loaded_snapshot(self):
+        assert KongInventory(max_age=60).routes() is None
+
+    @pytest.mark.asyncio
+    async def test_tags_are_matched_like_a_kong_tags_filter(self):
+        """Every given tag has to be present, as with Kong's comma separated tags filter."""
+        inventory = await _loaded_inventory(
+            routes=[LINK_ROUTE, OTHER_ROUTE], consumers=[ANALYSIS_CONSUMER, HEALTH_CONSUMER]
+        )
+
+        assert inventory.routes() == [LINK_ROUTE, OTHER_ROUTE]
+        assert inventory.routes(PROJECT_TAG, "datastore:svc-1") == [LINK_ROUTE]
+        assert inventory.routes(PROJECT_TAG, "datastore:svc-2") == []
+        assert inventory.consumers(PROJECT_TAG) == [ANALYSIS_CONSUMER, HEALTH_CONSUMER]
+        assert inventory.consumers("health", PROJECT_TAG) == [HEALTH_CONSUMER]
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.kong_inventory.time.monotonic")
+    async def test_outdated_snapshot_is_not_served(self, mock_time):
+        mock_time.return_value = 100.0
+        inventory = await _loaded_inventory(routes=[LINK_ROUTE])
+
+        mock_time.return_value = 161.0
+        assert inventory.routes() is None
+
+    @pytest.mark.asyncio
+    async def test_writes_update_the_index(self):
+        inventory = await _loaded_inventory(routes=[LINK_ROUTE])
+
+        inventory.put(CONSUMERS, ANALYSIS_CONSUMER)
+        inventory.remove(ROUTES, LINK_ROUTE.id)
+
+        assert inventory.consumers(ANALYSIS_TAG) == [ANALYSIS_CONSUMER]
+        assert inventory.routes(PROJECT_TAG) == []
+
+    @pytest.mark.asyncio
+    async def test_writes_during_a_refresh_are_kept(self):
+        """A consumer created while Kong was being listed must not disappear when the older listing is loaded."""
+        inventory = KongInventory(max_age=60)
+        kong = _kong(routes=[LINK_ROUTE])
+
+        def list_consumer(**params):
+            inventory.put(CONSUMERS, ANALYSIS_CONSUMER)
+            return SimpleNamespace(data=[])
+
+        kong.list_consumer.side_effect = list_consumer
+
+        await inventory.refresh(kong, page_size=100)
+
+        assert inventory.consumers(ANALYSIS_TAG) == [ANALYSIS_CONSUMER]
+
+
+class TestKongReads:
+    """The Kong helpers reading from the inventory instead of the admin API."""
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.routers.kong.get_kong_client")
+    async def test_projects_are_listed_without_asking_kong(self, mock_kong, test_settings):
+        link_route = Route(**KONG_LINK_ROUTE_DATA)
+        other_route = Route(**{**KONG_LINK_ROUTE_DATA, "id": "route-2", "tags": OTHER_ROUTE.tags})
+
+        inventory = await _loaded_inventory(routes=[link_route, other_route])
+
+        with patch("hub_adapter.routers.kong.kong_inventory", inventory):
+            routes = await get_projects(test_settings, project_id=TEST_MOCK_PROJECT_ID)
+
+        assert [route.id for route in routes.data] == [link_route.id]
+        mock_kong.return_value.list_route.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.routers.kong.get_kong_client")
+    async def test_analyses_exclude_health_consumers(self, mock_kong, test_settings):
+        analysis_consumer = Consumer(**KONG_ANALYSIS_CONSUMER_DATA)
+        health_consumer = Consumer(id="consumer-2", username="health", tags=HEALTH_CONSUMER.tags)
+        inventory = await _loaded_inventory(consumers=[analysis_consumer, health_consumer])
+
+        with patch("hub_adapter.routers.kong.kong_inventory", inventory):
+            analyses = await get_analyses(test_settings, project_id=TEST_MOCK_PROJECT_ID)
+
+        assert analyses == {"data": [analysis_consumer]}
+        mock_kong.return_value.list_consumer.assert_not_called()
@@ -0,0 +1,57 @@
+"""Collection of unit tests for reading every page of the Kong admin list endpoints."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from hub_adapter.kong_paging import collect_pages, iter_pages, next_offset
+
+
+def _list_page(total: int, calls: list):
+    """Stand-in for an AsyncKongAdmin list method over `total` entities, using numeric offsets."""
+
+    async def list_page(size: int, offset: str | None = None, **params):
+        calls.append((offset, params))
+        start = int(offset or 0)
+        end = min(start + size, total)
+        more = end < total
+        return SimpleNamespace(
+            data=list(range(start, end)),
+            next=f"/consumers?offset={end}" if more else None,
+            offset=str(end) if more else None,
+        )
+
+    return list_page
+
+
+class TestKongPaging:
+    """Following Kong's offsets past the first page."""
+
+    def test_offset_is_read_from_the_next_url_if_missing(self):
+        page = SimpleNamespace(data=[], next="/routes?size=2&offset=WyJhYmMiXQ", offset=None)
+
+        assert next_offset(page) == "WyJhYmMiXQ"
+        assert next_offset(SimpleNamespace(data=[], next=None)) is None
+
+    @pytest.mark.asyncio
+    async def test_every_page_is_listed_with_the_same_params(self):
+        calls = []
+
+        assert await collect_pages(_list_page(5, calls), page_size=2, tags="project:foo") == [0, 1, 2, 3, 4]
+        assert calls == [
+            (None, {"tags": "project:foo"}),
+            ("2", {"tags": "project:foo"}),
+            ("4", {"tags": "project:foo"}),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_next_page_is_fetched_while_the_current_one_is_processed(self):
+        calls = []
+        pages = iter_pages(_list_page(5, calls), page_size=2)
+
+        assert await anext(pages) == [0, 1]
+        await asyncio.sleep(0)  # let the prefetch run
+
+        assert len(calls) == 2
+        await pages.aclose()
@@ -0,0 +1,116 @@
+"""Collection of unit tests for the background monitoring of the Kong project-datastore links."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import peewee as pw
+import pytest
+from fastapi import HTTPException
+from kong_admin_client import ListRoute200Response, Route
+from starlette import status
+
+from hub_adapter.errors import KongGatewayError
+from hub_adapter.link_health import LinkHealthMonitor
+from hub_adapter.routers.kong import probe_connection
+from hub_adapter.schemas.health import ServiceCheckStatus
+from tests.constants import KONG_LINK_ROUTE_DATA, TEST_KONG_SERVICE_ID, TEST_MOCK_PROJECT_ID
+
+OTHER_PROJECT_ID = "0c7dbd3c-5a6e-4d47-8a34-7f0c0e1e9c2b"
+OTHER_ROUTE_DATA = {
+    **KONG_LINK_ROUTE_DATA,
+    "id": "other-route-id",
+    "paths": [f"/{OTHER_PROJECT_ID}/{TEST_KONG_SERVICE_ID}"],
+    "tags": [f"project:{OTHER_PROJECT_ID}", f"datastore:{TEST_KONG_SERVICE_ID}", "type:fhir"],
+}
+
+
+def _monitor() -> LinkHealthMonitor:
+    monitor = LinkHealthMonitor()
+    monitor._db = MagicMock(spec=pw.PostgresqlDatabase)
+    monitor.interval = 60
+    return monitor
+
+
+class TestLinkHealthSweep:
+    """One probe cycle over every link."""
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.link_health.prune_old_link_checks", return_value=0)
+    @patch("hub_adapter.link_health.record_link_sweep")
+    @patch("hub_adapter.routers.kong.probe_links", new_callable=AsyncMock)
+    @patch("hub_adapter.routers.kong.list_projects", new_callable=AsyncMock)
+    async def test_results_are_kept_and_persisted(self, mock_list_projects, mock_probe, mock_record, _mock_prune):
+        mock_list_projects.return_value = ListRoute200Response(
+            data=[Route(**KONG_LINK_ROUTE_DATA), Route(**OTHER_ROUTE_DATA)]
+        )
+        mock_probe.return_value = [status.HTTP_200_OK, KongGatewayError(server_type="FHIR")]
+        monitor = _monitor()
+
+        results = await monitor.sweep()
+
+        assert [(result["project_id"], result["status"]) for result in results] == [
+            (TEST_MOCK_PROJECT_ID, ServiceCheckStatus.OK),
+            (OTHER_PROJECT_ID, ServiceCheckStatus.ERROR),
+        ]
+        assert results[1]["status_code"] == status.HTTP_502_BAD_GATEWAY
+        assert mock_probe.call_args.kwargs["max_attempts"] == 0
+        mock_record.assert_called_once_with(monitor._db, results)
+        assert monitor.latest(KONG_LINK_ROUTE_DATA["id"]) is results[0]
+        assert monitor.unreachable_projects() == {OTHER_PROJECT_ID}
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.link_health.record_link_sweep", side_effect=pw.OperationalError("gone"))
+    @patch("hub_adapter.routers.kong.probe_links", new_callable=AsyncMock)
+    @patch("hub_adapter.routers.kong.list_projects", new_callable=AsyncMock)
+    async def test_database_error_does_not_break_the_sweep(self, mock_list_projects, mock_probe, _mock_record):
+        mock_list_projects.return_value = ListRoute200Response(data=[Route(**KONG_LINK_ROUTE_DATA)])
+        mock_probe.return_value = [status.HTTP_200_OK]
+        monitor = _monitor()
+
+        await monitor.sweep()  # must not raise
+
+        assert monitor.latest(KONG_LINK_ROUTE_DATA["id"])["status"] == ServiceCheckStatus.OK
+
+    def test_outdated_results_are_not_served(self):
+        monitor = _monitor()
+        monitor._results = {"route": {"project_id": TEST_MOCK_PROJECT_ID, "status": ServiceCheckStatus.ERROR}}
+        monitor._checked_at = datetime.now(UTC) - timedelta(seconds=3 * monitor.interval)
+
+        assert monitor.latest("route") is None
+        assert monitor.unreachable_projects() == set()
+
+
+class TestProbeEndpoint:
+    """The link health endpoint answering from the latest background check."""
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.routers.kong._probe_link", new_callable=AsyncMock)
+    @patch("hub_adapter.kong_client.AsyncKongAdmin.list_route")
+    async def test_latest_result_is_served_unless_live(self, mock_list_route, mock_probe, test_settings):
+        mock_list_route.return_value = ListRoute200Response(data=[Route(**KONG_LINK_ROUTE_DATA)])
+        mock_probe.return_value = status.HTTP_200_OK
+        monitor = _monitor()
+        stored_error = KongGatewayError(server_type="FHIR")
+        monitor._results = {KONG_LINK_ROUTE_DATA["id"]: {"status_code": 502, "error": stored_error}}
+        monitor._checked_at = datetime.now(UTC)
+
+        with patch("hub_adapter.managers.link_health_monitor", monitor):
+            with pytest.raises(HTTPException) as exc_info:
+                await probe_connection(
+                    settings=test_settings, project_id=TEST_MOCK_PROJECT_ID, datastore_id=TEST_KONG_SERVICE_ID
+                )
+
+            # Each request gets its own exception, the stored one is never raised and so never gains a traceback
+            assert exc_info.value is not stored_error
+            assert exc_info.value.status_code == stored_error.status_code
+            assert exc_info.value.detail == stored_error.detail
+            assert stored_error.__traceback__ is None
+
+            mock_probe.assert_not_called()
+
+            resp = await probe_connection(
+                settings=test_settings, project_id=TEST_MOCK_PROJECT_ID, datastore_id=TEST_KONG_SERVICE_ID, live=True
+            )
+
+        assert resp == status.HTTP_200_OK
+        mock_probe.assert_called_once()
@@ -3,7 +3,7 @@
 import importlib.util
 import sys
 
-MANAGERS = ("autostart_manager", "kong_cleanup_manager", "service_health_monitor")
+MANAGERS = ("autostart_manager", "kong_cleanup_manager", "service_health_monitor", "request_rollup_manager")
 
 
 def _load_server_as_script(name: str = "__main_simulated__"):
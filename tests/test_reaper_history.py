@@ -0,0 +1,59 @@
+"""Collection of unit tests for persisting the Kong consumer cleanup history."""
+
+from datetime import UTC, datetime
+from unittest.mock import patch
+
+import pytest
+
+from hub_adapter.reaper_history import compact, load_history, save_history
+
+TERMINAL_SINCE = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+@pytest.fixture
+def history_path(tmp_path):
+    path = tmp_path.joinpath("kongCleanupHistory.json")
+    with patch("hub_adapter.reaper_history.HISTORY_PATH", path):
+        yield path
+
+
+class TestReaperHistory:
+    """Only changed entries are written, the JSON file stands in when there is no database."""
+
+    def test_default_entries_are_not_stored(self):
+        history = {
+            "a": {"seen_executing": False, "terminal_since": None},
+            "b": {"seen_executing": True, "terminal_since": None},
+            "c": {"seen_executing": False, "terminal_since": TERMINAL_SINCE},
+        }
+
+        assert set(compact(history)) == {"b", "c"}
+
+    @patch("hub_adapter.reaper_history._save_to_database", return_value=True)
+    def test_only_the_difference_is_written(self, mock_save_db):
+        persisted = {
+            "kept": {"seen_executing": True, "terminal_since": None},
+            "gone": {"seen_executing": True, "terminal_since": None},
+        }
+        history = {
+            "kept": {"seen_executing": True, "terminal_since": None},
+            "new": {"seen_executing": False, "terminal_since": TERMINAL_SINCE},
+        }
+
+        assert save_history(history, persisted) is True
+        mock_save_db.assert_called_once_with({"new": history["new"]}, {"gone"})
+
+    @patch("hub_adapter.reaper_history._save_to_database")
+    def test_unchanged_history_is_not_written(self, mock_save_db):
+        history = {"kept": {"seen_executing": True, "terminal_since": None}}
+
+        assert save_history(history, dict(history)) is True
+        mock_save_db.assert_not_called()
+
+    @patch("hub_adapter.reaper_history._load_from_database", return_value=None)
+    @patch("hub_adapter.reaper_history._save_to_database", return_value=False)
+    def test_json_file_is_used_without_a_database(self, _mock_save_db, _mock_load_db, history_path):
+        history = {"a": {"seen_executing": False, "terminal_since": TERMINAL_SINCE}}
+
+        assert save_history(history, {}) is False  # the database still needs these entries
+        assert load_history() == history
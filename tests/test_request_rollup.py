@@ -0,0 +1,378 @@
+"""Collection of unit tests for the API request rollup."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import peewee as pw
+import pytest
+from fastapi import APIRouter, FastAPI
+
+from hub_adapter.conf import RequestRollupSettings, UserSettings
+from hub_adapter.request_rollup import (
+    INGEST_CHUNK,
+    INGEST_OVERLAP,
+    UNMATCHED_ROUTE,
+    UNMATCHED_ROUTE_NAME,
+    RequestRollup,
+    RequestRollupManager,
+    RouteMatcher,
+    aggregate_counts,
+    floor_minute,
+    prepare_request_rollup,
+    write_rollup,
+)
+from hub_adapter.routers.logs import get_api_requests
+
+PROJECT_ID = "2f7b0a4e-6c1d-4a8e-9f3b-5d2c1e0a9b87"
+
+
+def _routes():
+    router = APIRouter(prefix="/kong")
+
+    @router.get("/project", name="kong.project.list")
+    def list_projects(): ...
+
+    @router.get("/project/{project_id}", name="kong.project.get")
+    def get_project(project_id: str): ...
+
+    @router.delete("/project/{project_id}", name="kong.project.delete")
+    def delete_project(project_id: str): ...
+
+    return router.routes
+
+
+def _enabled_settings(**kwargs) -> UserSettings:
+    return UserSettings(request_rollup=RequestRollupSettings(enabled=True, **kwargs))
+
+
+class TestRouteMatcher:
+    """Resolving raw request paths to route templates."""
+
+    def test_ids_collapse_onto_the_route_template(self):
+        matcher = RouteMatcher(_routes())
+
+        assert matcher.match("GET", f"/kong/project/{PROJECT_ID}") == ("/kong/project/{project_id}", "kong.project.get")
+        assert matcher.match("GET", "/kong/project?detailed=true") == ("/kong/project", "kong.project.list")
+
+    def test_method_picks_between_routes_sharing_a_template(self):
+        matcher = RouteMatcher(_routes())
+
+        assert matcher.match("DELETE", f"/kong/project/{PROJECT_ID}")[1] == "kong.project.delete"
+
+    def test_unknown_paths_share_one_bucket(self):
+        matcher = RouteMatcher(_routes())
+
+        assert matcher.match("GET", "/wp-admin/setup.php") == (UNMATCHED_ROUTE, UNMATCHED_ROUTE_NAME)
+
+    def test_root_path_is_stripped(self):
+        matcher = RouteMatcher(_routes(), root_path="/api/")
+
+        assert matcher.match("GET", "/api/kong/project")[1] == "kong.project.list"
+
+    def test_routes_of_included_routers_are_matched(self):
+        app = FastAPI()
+        router = APIRouter()
+        router.routes.extend(_routes())
+        app.include_router(router)
+
+        matcher = RouteMatcher(app.routes)
+
+        assert matcher.match("GET", f"/kong/project/{PROJECT_ID}")[1] == "kong.project.get"
+
+    def test_complete_paths_are_expressed_as_their_template(self):
+        matcher = RouteMatcher(_routes(), root_path="/api")
+
+        assert matcher.template_prefix(f"/api/kong/project/{PROJECT_ID}") == "/kong/project/{project_id}"
+        assert matcher.template_prefix("/kong/proj") == "/kong/proj"
+
+
+class TestAggregation:
+    """Folding the VictoriaLogs stats onto rollup rows."""
+
+    def test_raw_paths_are_summed_per_minute_method_and_route(self):
+        entries = [
+            {"_time": "2026-07-30T12:00:00Z", "method": "GET", "path": f"/kong/project/{PROJECT_ID}", "requests": "3"},
+            {"_time": "2026-07-30T12:00:00Z", "method": "GET", "path": "/kong/project/other", "requests": "2"},
+            {"_time": "2026-07-30T12:01:00Z", "method": "GET", "path": "/kong/project/other", "requests": "1"},
+        ]
+
+        rows = aggregate_counts(entries, RouteMatcher(_routes()))
+
+        assert rows == [
+            {
+                "minute": datetime(2026, 7, 30, 12, 0, tzinfo=UTC),
+                "method": "GET",
+                "route": "/kong/project/{project_id}",
+                "route_name": "kong.project.get",
+                "requests": 5,
+            },
+            {
+                "minute": datetime(2026, 7, 30, 12, 1, tzinfo=UTC),
+                "method": "GET",
+                "route": "/kong/project/{project_id}",
+                "route_name": "kong.project.get",
+                "requests": 1,
+            },
+        ]
+
+    def test_entries_without_a_timestamp_are_skipped(self):
+        rows = aggregate_counts([{"method": "GET", "path": "/kong/project", "requests": "1"}], RouteMatcher(_routes()))
+
+        assert rows == []
+
+    def test_upsert_replaces_recounted_minutes(self):
+        """Overlapping syncs recount whole minutes, so a conflicting row takes the new count instead of adding."""
+        db = pw.PostgresqlDatabase("unused")
+        row = {"minute": datetime(2026, 7, 30, 12, tzinfo=UTC), "method": "GET", "route": "/", "route_name": "root"}
+
+        with (
+            patch("hub_adapter.request_rollup.bind_request_rollup"),
+            patch.object(db, "atomic"),
+            patch.object(db, "execute") as mock_execute,
+            db.bind_ctx((RequestRollup,)),
+        ):
+            write_rollup(db, [{**row, "requests": 7}])
+            sql, _ = mock_execute.call_args.args[0].sql()
+
+        assert 'ON CONFLICT ("minute", "method", "route") DO UPDATE' in sql
+        assert '"requests" = EXCLUDED."requests"' in sql
+
+
+class TestManagerLifecycle:
+    """Starting, stopping and degrading the rollup loop."""
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.request_rollup.load_persistent_settings", return_value=UserSettings())
+    @patch("hub_adapter.request_rollup.get_node_database")
+    async def test_disabled_by_default(self, mock_db, _mock_settings):
+        manager = RequestRollupManager()
+        await manager.start()
+
+        assert manager.enabled is False
+        assert "disabled in the node settings" in manager.disabled_reason
+        mock_db.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.request_rollup.load_persistent_settings", return_value=_enabled_settings())
+    @patch("hub_adapter.request_rollup.get_node_database", return_value=None)
+    async def test_missing_database_leaves_rollup_disabled(self, _mock_db, _mock_settings):
+        manager = RequestRollupManager()
+
+        with patch("hub_adapter.request_rollup.get_settings") as mock_settings:
+            mock_settings.return_value.victoria_logs_url = "http://victoria:9428"
+            await manager.start()
+
+        assert manager.enabled is False
+        assert "Postgres is not available" in manager.disabled_reason
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.request_rollup.load_persistent_settings", return_value=_enabled_settings(interval=5))
+    @patch("hub_adapter.request_rollup.prepare_request_rollup")
+    @patch("hub_adapter.request_rollup.fetch_rollup_bounds")
+    @patch("hub_adapter.request_rollup.get_node_database")
+    async def test_resumes_from_the_stored_rollup(self, mock_db, mock_bounds, mock_prepare, _mock_settings):
+        earliest, latest = datetime(2026, 7, 1, tzinfo=UTC), datetime(2026, 7, 30, 12, tzinfo=UTC)
+        mock_db.return_value = MagicMock(spec=pw.PostgresqlDatabase)
+        mock_bounds.return_value = (earliest, latest)
+        manager = RequestRollupManager()
+
+        with (
+            patch("hub_adapter.request_rollup.get_settings") as mock_settings,
+            patch.object(RequestRollupManager, "sync", new_callable=AsyncMock),
+        ):
+            mock_settings.return_value.victoria_logs_url = "http://victoria:9428"
+            mock_settings.return_value.api_root_path = ""
+            await manager.start(_routes())
+
+            assert manager.enabled is True
+            assert manager.interval == 5
+            assert (manager.covered_since, manager.synced_through) == (earliest, latest)
+            mock_prepare.assert_called_once_with(mock_db.return_value)
+            assert manager.matcher.match("GET", "/kong/project")[1] == "kong.project.list"
+
+            await manager.stop()
+
+        assert manager._task is None
+
+
+class TestManagerSync:
+    """One sync of the rollup with the access logs."""
+
+    def _manager(self, synced_through: datetime | None = None) -> RequestRollupManager:
+        manager = RequestRollupManager()
+        manager._db = MagicMock(spec=pw.PostgresqlDatabase)
+        manager._last_prune = datetime.now(UTC)
+        manager.synced_through = synced_through
+        manager.retention_days = 3
+        return manager
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.request_rollup.get_settings")
+    @patch("hub_adapter.request_rollup.write_rollup")
+    @patch("hub_adapter.request_rollup.fetch_minute_counts", new_callable=AsyncMock, return_value=[])
+    async def test_first_sync_backfills_the_retention_window_in_chunks(self, mock_fetch, _mock_write, _mock_settings):
+        manager = self._manager()
+        await manager.sync()
+
+        windows = [call.args[1:] for call in mock_fetch.await_args_list]
+        assert len(windows) == 3
+        assert all(end - start <= INGEST_CHUNK for start, end in windows)
+        assert windows[-1][1] == manager.synced_through == floor_minute(datetime.now(UTC))
+        assert manager.covered_since == windows[0][0]
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.request_rollup.get_settings")
+    @patch("hub_adapter.request_rollup.write_rollup")
+    @patch("hub_adapter.request_rollup.fetch_minute_counts", new_callable=AsyncMock, return_value=[])
+    async def test_later_syncs_recount_the_overlap(self, mock_fetch, _mock_write, _mock_settings):
+        synced_through = floor_minute(datetime.now(UTC)) - timedelta(minutes=1)
+        manager = self._manager(synced_through)
+        await manager.sync()
+
+        assert mock_fetch.await_args.args[1] == synced_through - INGEST_OVERLAP
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.request_rollup.get_settings")
+    @patch("hub_adapter.request_rollup.write_rollup", side_effect=pw.OperationalError("gone"))
+    @patch("hub_adapter.request_rollup.fetch_minute_counts", new_callable=AsyncMock, return_value=[])
+    async def test_database_error_keeps_the_watermark(self, _mock_fetch, _mock_write, _mock_settings):
+        synced_through = floor_minute(datetime.now(UTC)) - timedelta(minutes=10)
+        manager = self._manager(synced_through)
+        await manager.sync()  # must not raise
+
+        assert manager.synced_through == synced_through
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.request_rollup.get_settings")
+    @patch("hub_adapter.request_rollup.write_rollup")
+    @patch("hub_adapter.request_rollup.fetch_minute_counts", new_callable=AsyncMock, return_value=[])
+    async def test_interrupted_backfill_covers_nothing(self, _mock_fetch, mock_write, _mock_settings):
+        manager = self._manager()
+        manager._task = MagicMock()
+        mock_write.side_effect = [None, pw.OperationalError("gone")]
+        await manager.sync()
+
+        assert manager.synced_through is not None
+        assert manager.covered_since is None
+        assert manager.covers(datetime.now(UTC) - timedelta(hours=1)) is False
+
+        mock_write.side_effect = None
+        await manager.sync()
+
+        assert manager.covers(datetime.now(UTC) - timedelta(hours=1)) is True
+
+    def test_only_covers_synced_timeframes_within_retention(self):
+        manager = self._manager(floor_minute(datetime.now(UTC)))
+        manager._task = MagicMock()
+        manager.covered_since = datetime.now(UTC) - timedelta(days=1)
+
+        assert manager.covers(None) is True
+        assert manager.covers(datetime.now(UTC) - timedelta(hours=1)) is True
+        assert manager.covers(datetime.now(UTC) - timedelta(days=2)) is False
+
+        manager._task = None
+        assert manager.covers(None) is False
+
+    def test_does_not_cover_minutes_the_sync_has_yet_to_reach(self):
+        """While catching up, e.g. mid-backfill or after being re-enabled, only the synced minutes are covered."""
+        now = datetime.now(UTC)
+        manager = self._manager(floor_minute(now) - timedelta(days=2))
+        manager._task = MagicMock()
+        manager.covered_since = now - timedelta(days=3)
+
+        assert manager.covers(now - timedelta(hours=1)) is False
+        assert manager.covers(None) is False
+        assert manager.covers(now - timedelta(days=2, hours=12), now - timedelta(days=2, hours=1)) is True
+
+
+class TestApiRequestsFromRollup:
+    """GET /requests answering from the rollup."""
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.routers.logs._execute_raw_query")
+    @patch("hub_adapter.routers.logs.summarize_requests")
+    @patch("hub_adapter.managers.request_rollup_manager")
+    @patch("hub_adapter.dependencies.get_settings")
+    async def test_rollup_answers_when_it_covers_the_timeframe(
+        self, mock_get_settings, mock_manager, mock_summarize, mock_execute
+    ):
+        mock_get_settings.return_value.victoria_logs_url = "http://victoria:9428"
+        mock_manager.covers.return_value = True
+        mock_summarize.return_value = {"kong.project.get": {"GET": 5, "DELETE": 1}}
+
+        result = await get_api_requests(method="get", group_by="route_name")
+
+        mock_execute.assert_not_called()
+        mock_summarize.assert_called_once_with(mock_manager.database, None, None, None, "GET", "route_name")
+        assert result == {"total": 6, "data": {"kong.project.get": {"GET": 5, "DELETE": 1, "total": 6}}}
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.routers.logs._execute_raw_query")
+    @patch("hub_adapter.routers.logs.summarize_requests")
+    @patch("hub_adapter.managers.request_rollup_manager")
+    @patch("hub_adapter.dependencies.get_settings")
+    async def test_raw_paths_are_always_counted_from_the_logs(
+        self, mock_get_settings, mock_manager, mock_summarize, mock_execute
+    ):
+        mock_get_settings.return_value.victoria_logs_url = "http://victoria:9428"
+        mock_manager.covers.return_value = True
+        mock_manager.matcher = RouteMatcher(_routes())
+        mock_execute.return_value = [{"method": "GET", "path": f"/kong/project/{PROJECT_ID}?x=1", "requests": "2"}]
+
+        result = await get_api_requests(endpoint="/kong/project/2f7b")
+
+        mock_summarize.assert_not_called()
+        assert result == {"total": 2, "data": {f"/kong/project/{PROJECT_ID}": {"GET": 2, "total": 2}}}
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.routers.logs._execute_raw_query")
+    @patch("hub_adapter.managers.request_rollup_manager")
+    @patch("hub_adapter.dependencies.get_settings")
+    async def test_logs_can_be_grouped_by_route_name_without_the_rollup(
+        self, mock_get_settings, mock_manager, mock_execute
+    ):
+        mock_get_settings.return_value.victoria_logs_url = "http://victoria:9428"
+        mock_manager.covers.return_value = False
+        mock_manager.matcher = RouteMatcher(_routes())
+        mock_execute.return_value = [
+            {"method": "GET", "path": f"/kong/project/{PROJECT_ID}", "requests": "2"},
+            {"method": "GET", "path": "/kong/project/other", "requests": "3"},
+        ]
+
+        result = await get_api_requests(group_by="route_name")
+
+        assert result == {"total": 5, "data": {"kong.project.get": {"GET": 5, "total": 5}}}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("endpoint", [f"/kong/project/{PROJECT_ID}", "/kong/project", None])
+    @patch("hub_adapter.routers.logs._execute_raw_query")
+    @patch("hub_adapter.managers.request_rollup_manager")
+    @patch("hub_adapter.dependencies.get_settings")
+    async def test_rollup_and_logs_report_the_same_keys(
+        self, mock_get_settings, mock_manager, mock_execute, endpoint, tmp_path
+    ):
+        mock_get_settings.return_value.victoria_logs_url = "http://victoria:9428"
+        mock_manager.matcher = RouteMatcher(_routes(), root_path="/api")
+        entries = [
+            {"method": "GET", "path": f"/api/kong/project/{PROJECT_ID}?verbose=true", "requests": "2"},
+            {"method": "DELETE", "path": "/api/kong/project/other", "requests": "1"},
+            {"method": "GET", "path": "/api/kong/project", "requests": "4"},
+            {"method": "GET", "path": "/api/wp-login.php", "requests": "7"},
+        ]
+        mock_execute.return_value = entries
+
+        # The rollup branch queries from a worker thread, which would not see an in-memory database
+        db = pw.SqliteDatabase(tmp_path / "rollup.db")
+        minutes = [{**entry, "_time": "2026-07-30T12:00:30Z"} for entry in entries]
+        prepare_request_rollup(db)
+        write_rollup(db, aggregate_counts(minutes, mock_manager.matcher))
+        mock_manager.database = db
+
+        mock_manager.covers.return_value = True
+        from_rollup = await get_api_requests(endpoint=endpoint, group_by="route")
+        mock_manager.covers.return_value = False
+        from_logs = await get_api_requests(endpoint=endpoint, group_by="route")
+
+        mock_execute.assert_called_once()
+        assert from_rollup == from_logs
+        assert "/kong/project/{project_id}" in from_logs["data"]
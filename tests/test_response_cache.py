@@ -0,0 +1,94 @@
+"""Collection of unit tests for the read-through response cache."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from hub_adapter.response_cache import ResponseCache, normalize_params
+
+
+def _cache(**kwargs) -> ResponseCache:
+    return ResponseCache(**{"ttl": 10, "stale_ttl": 30, "max_entries": 8} | kwargs)
+
+
+class TestResponseCache:
+    """Serving, refreshing and dropping cached responses."""
+
+    def test_params_are_keyed_independently_of_their_order(self):
+        assert normalize_params({"page": {"limit": 5}, "sort": "id"}) == normalize_params(
+            {"sort": "id", "page": {"limit": 5}}
+        )
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.response_cache.time.monotonic", return_value=100.0)
+    async def test_fresh_entries_skip_the_upstream_call(self, _mock_time):
+        cache = _cache()
+        fetch = AsyncMock(return_value=["project"])
+
+        assert await cache.get("projects", "key", fetch) == ["project"]
+        assert await cache.get("projects", "key", fetch) == ["project"]
+        fetch.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.response_cache.time.monotonic")
+    async def test_stale_entries_are_served_while_refreshed(self, mock_time):
+        cache = _cache()
+        mock_time.return_value = 100.0
+        await cache.get("projects", "key", AsyncMock(return_value="old"))
+
+        mock_time.return_value = 115.0  # past the ttl, within the stale window
+        refresh = AsyncMock(return_value="new")
+
+        assert await cache.get("projects", "key", refresh) == "old"
+        await asyncio.sleep(0)  # let the background refresh run
+
+        refresh.assert_awaited_once()
+        assert await cache.get("projects", "key", refresh) == "new"
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.response_cache.time.monotonic")
+    async def test_expired_entries_are_fetched_again(self, mock_time):
+        cache = _cache()
+        mock_time.return_value = 100.0
+        await cache.get("projects", "key", AsyncMock(return_value="old"))
+
+        mock_time.return_value = 200.0
+        assert await cache.get("projects", "key", AsyncMock(return_value="new")) == "new"
+
+    @pytest.mark.asyncio
+    async def test_invalidation_drops_only_its_namespace(self):
+        cache = _cache()
+        await cache.get("projects", "key", AsyncMock(return_value="project"))
+        await cache.get("nodes", "key", AsyncMock(return_value="node"))
+
+        cache.invalidate("projects")
+
+        assert await cache.get("projects", "key", AsyncMock(return_value="updated")) == "updated"
+        assert await cache.get("nodes", "key", AsyncMock(return_value="unused")) == "node"
+
+    @pytest.mark.asyncio
+    async def test_fetch_racing_a_write_is_not_stored(self):
+        """A response fetched before the write landed must not repopulate the cache afterwards."""
+        cache = _cache()
+
+        async def fetch_then_write():
+            cache.invalidate("analysis-nodes")
+            return "pre-write"
+
+        assert await cache.get("analysis-nodes", "key", fetch_then_write) == "pre-write"
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_entries_are_evicted(self):
+        cache = _cache(max_entries=2)
+        for key in ("a", "b"):
+            await cache.get("projects", key, AsyncMock(return_value=key))
+
+        await cache.get("projects", "a", AsyncMock())  # touch "a" so "b" is the oldest
+        await cache.get("projects", "c", AsyncMock(return_value="c"))
+
+        untouched = AsyncMock()
+        assert await cache.get("projects", "a", untouched) == "a"
+        untouched.assert_not_awaited()
+        assert await cache.get("projects", "b", AsyncMock(return_value="b again")) == "b again"
@@ -0,0 +1,243 @@
+"""Collection of unit tests for the scheduler of the periodic background jobs and its leader election."""
+
+import asyncio
+import logging
+import threading
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
+
+import peewee as pw
+import pytest
+
+from hub_adapter.constants import ServiceTag
+from hub_adapter.leader_election import SESSION_KEEPALIVES, AdvisoryLockElector, lock_key
+from hub_adapter.scheduler import Job, Scheduler
+
+
+@pytest.fixture
+def electing(test_settings):
+    """Enable leader election with a poll interval short enough for the tests."""
+    settings = test_settings.model_copy(
+        update={"scheduler_leader_election": True, "scheduler_leader_poll_interval": 0.01}
+    )
+    with patch("hub_adapter.scheduler.get_settings", return_value=settings):
+        yield settings
+
+
+async def _run_for(task: asyncio.Task, seconds: float) -> None:
+    await asyncio.sleep(seconds)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+class TestScheduler:
+    """Fixed-rate runs without overlap, within a timeout."""
+
+    @pytest.mark.asyncio
+    async def test_runs_never_overlap_and_missed_slots_are_skipped(self):
+        scheduler, running, most_running = Scheduler(), 0, 0
+
+        async def run():
+            nonlocal running, most_running
+            running += 1
+            most_running = max(most_running, running)
+            await asyncio.sleep(0.05)
+            running -= 1
+
+        await _run_for(scheduler.schedule("slow", run, 0.02, jitter=0), 0.2)
+        stats = scheduler.stats()["slow"]
+
+        assert most_running == 1
+        assert 2 <= stats["runs"] <= 5
+        assert stats["skipped"] >= stats["runs"] - 1
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.scheduler.log_event")
+    async def test_run_exceeding_its_timeout_is_cancelled(self, mock_log_event):
+        scheduler = Scheduler()
+
+        async def run():
+            await asyncio.sleep(10)
+
+        await _run_for(scheduler.schedule("stuck", run, 0.05, timeout=0.01, jitter=0), 0.08)
+        stats = scheduler.stats()["stuck"]
+
+        assert stats["timeouts"] == stats["runs"] == 2
+        assert stats["running"] is False
+        mock_log_event.assert_any_call("scheduler.job.timeout", event_description=ANY, level=logging.ERROR, service=ANY)
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.scheduler.log_event")
+    async def test_errors_are_logged_under_the_job_name(self, mock_log_event):
+        scheduler = Scheduler()
+        run = AsyncMock(side_effect=Exception("boom"))
+
+        await _run_for(scheduler.schedule("autostart", run, 10, label="autostart", jitter=0), 0.01)
+
+        assert scheduler.stats()["autostart"]["failures"] == 1
+        mock_log_event.assert_called_once_with(
+            "autostart.error", event_description="Error during autostart: boom", level=logging.ERROR, service=ANY
+        )
+
+    @pytest.mark.asyncio
+    async def test_returned_interval_replaces_the_configured_one(self):
+        scheduler = Scheduler()
+        run = AsyncMock(return_value=0.01)
+
+        await _run_for(scheduler.schedule("backlog", run, 10, jitter=0), 0.05)
+
+        assert run.await_count > 2
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.scheduler.random.uniform", return_value=0.02)
+    async def test_first_run_is_offset_by_the_jitter(self, mock_uniform):
+        scheduler = Scheduler()
+        run = AsyncMock(return_value=None)
+
+        task = scheduler.schedule("offset", run, 1, jitter=0.5)
+        await asyncio.sleep(0.01)
+        run.assert_not_awaited()
+
+        await _run_for(task, 0.02)
+        run.assert_awaited_once()
+        mock_uniform.assert_any_call(0, 0.5)
+
+    def test_duration_histogram_is_cumulative(self):
+        job = Job("job", AsyncMock(), 60, label="job", timeout=60, jitter=0, leader_only=False, service=ServiceTag.HUB)
+        for duration in (0.05, 0.3, 2, 400):
+            job.observe(duration)
+
+        stats = job.stats()
+        assert stats["duration_buckets"]["0.1"] == 1
+        assert stats["duration_buckets"]["1"] == 2
+        assert stats["duration_buckets"]["300"] == 3
+        assert stats["duration_buckets"]["+Inf"] == 4
+        assert stats["duration_sum_ms"] == pytest.approx(402_350)
+        assert stats["last_duration_ms"] == 400_000
+
+    @pytest.mark.asyncio
+    async def test_only_the_leader_runs_leader_only_jobs(self, electing):
+        scheduler, run = Scheduler(), AsyncMock()
+
+        with patch.object(AdvisoryLockElector, "is_leader", return_value=False) as mock_is_leader:
+            await _run_for(scheduler.schedule("single", run, 0.01, leader_only=True, jitter=0), 0.05)
+
+        mock_is_leader.assert_awaited_with("single")
+        run.assert_not_awaited()
+        assert scheduler.stats()["single"]["leader"] is False
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.scheduler.log_event")
+    async def test_follower_takes_over_within_the_poll_interval(self, mock_log_event, electing):
+        scheduler, run, on_elected = Scheduler(), AsyncMock(return_value=None), MagicMock()
+
+        with patch.object(AdvisoryLockElector, "is_leader", side_effect=[False, False, True, True]):
+            task = scheduler.schedule("single", run, 60, leader_only=True, jitter=0, on_elected=on_elected)
+            await asyncio.sleep(0.05)
+
+            run.assert_awaited_once()
+            on_elected.assert_called_once()
+            assert scheduler.stats()["single"]["leader"] is True
+            mock_log_event.assert_called_once_with(
+                "scheduler.leader.elected", event_description=ANY, level=logging.INFO, service=ANY
+            )
+
+            with patch.object(AdvisoryLockElector, "release") as mock_release:
+                await _run_for(task, 0)
+
+        mock_release.assert_called_once_with("single")
+        assert scheduler.stats()["single"]["leader"] is False
+
+    @pytest.mark.asyncio
+    async def test_leader_election_is_off_by_default(self):
+        scheduler, run = Scheduler(), AsyncMock(return_value=None)
+
+        await _run_for(scheduler.schedule("single", run, 10, leader_only=True, jitter=0), 0.01)
+
+        assert scheduler._elector is None
+        assert scheduler.stats()["single"]["leader_only"] is False
+        run.assert_awaited_once()
+
+
+class TestAdvisoryLockElector:
+    """Holding a session level advisory lock per job."""
+
+    def test_lock_key_is_stable_and_fits_a_bigint(self):
+        assert lock_key("autostart") == lock_key("autostart")
+        assert lock_key("autostart") != lock_key("kong_cleanup")
+        assert -(2**63) <= lock_key("autostart") < 2**63
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.leader_election.get_node_database")
+    async def test_lock_is_taken_once_and_then_only_checked(self, mock_db):
+        db = mock_db.return_value
+        db.execute_sql.return_value.fetchone.return_value = (True,)
+        elector = AdvisoryLockElector()
+
+        assert await elector.is_leader("autostart") is True
+        assert await elector.is_leader("autostart") is True
+
+        assert [call.args for call in db.execute_sql.call_args_list] == [
+            *((statement,) for statement in SESSION_KEEPALIVES),
+            ("SELECT pg_try_advisory_lock(%s)", (lock_key("autostart"),)),
+            ("SELECT 1",),
+        ]
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.leader_election.get_node_database")
+    async def test_released_lock_is_unlocked_and_taken_again_later(self, mock_db):
+        db = mock_db.return_value
+        db.execute_sql.return_value.fetchone.return_value = (True,)
+        elector = AdvisoryLockElector()
+        await elector.is_leader("autostart")
+
+        elector.release("autostart")
+        elector.release("autostart")  # nothing left to unlock
+        await elector.is_leader("autostart")
+
+        statements = [call.args for call in db.execute_sql.call_args_list[len(SESSION_KEEPALIVES) :]]
+        assert statements == [
+            ("SELECT pg_try_advisory_lock(%s)", (lock_key("autostart"),)),
+            ("SELECT pg_advisory_unlock(%s)", (lock_key("autostart"),)),
+            ("SELECT pg_try_advisory_lock(%s)", (lock_key("autostart"),)),
+        ]
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.leader_election.get_node_database")
+    async def test_lock_held_elsewhere_is_not_taken(self, mock_db):
+        mock_db.return_value.execute_sql.return_value.fetchone.return_value = (False,)
+
+        assert await AdvisoryLockElector().is_leader("autostart") is False
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.leader_election.get_node_database")
+    async def test_lost_connection_gives_up_leadership(self, mock_db):
+        db = mock_db.return_value
+        db.execute_sql.return_value.fetchone.return_value = (True,)
+        elector = AdvisoryLockElector()
+        await elector.is_leader("autostart")
+
+        db.execute_sql.side_effect = pw.OperationalError("server closed the connection")
+
+        assert await elector.is_leader("autostart") is False
+        assert elector._held == set()
+        db.manual_close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_queries_run_on_one_thread(self):
+        """Advisory locks belong to a connection, and peewee hands every thread its own."""
+        elector, threads = AdvisoryLockElector(), set()
+
+        def acquire(name):
+            threads.add(threading.get_ident())
+            return True
+
+        with patch.object(elector, "_acquire", side_effect=acquire):
+            await asyncio.gather(*(elector.is_leader(name) for name in ("a", "b", "c", "d")))
+
+        assert len(threads) == 1
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.leader_election.get_node_database", return_value=None)
+    async def test_without_a_database_every_replica_runs_the_jobs(self, _mock_db):
+        assert await AdvisoryLockElector().is_leader("autostart") is True
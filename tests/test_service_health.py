@@ -3,6 +3,7 @@
 import uuid
 import warnings
 from datetime import UTC, datetime, timedelta
+from time import monotonic
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx2
@@ -18,19 +19,35 @@ from hub_adapter.schemas.health import (
     ServiceMonitoringStatus,
 )
 from hub_adapter.service_health import (
+    FLUSH_INTERVAL,
+    LATENCY_BUCKETS,
     MESSAGE_MAX_LENGTH,
     PRUNE_INTERVAL,
+    HealthAggregate,
+    HealthCheckWriter,
+    MinuteRollup,
     ServiceHealthCheck,
     ServiceHealthMonitor,
     _bucket_expression,
     _earliest_failure_message,
+    _rollup_merge,
     _rows_to_buckets,
+    _segments,
     bucket_range,
     build_probe_targets,
+    copy_checks,
+    prepare_service_health,
     probe_all,
     probe_service,
+    prune_old_checks,
+    rollup_rows,
+    summarize_range,
+    sweep_rows,
+    write_checks,
 )
 
+KONG_RESULT = {"status": "OK", "status_code": 200, "message": None, "latency_ms": 1.0, "url": "u"}
+
 
 def _mock_response(status_code: int = 200, text: str = "", json_body: dict | None = None):
     resp = MagicMock(spec=httpx2.Response)
@@ -241,9 +258,9 @@ class TestMonitorLifecycle:
 
     @pytest.mark.asyncio
     @patch("hub_adapter.service_health.load_persistent_settings", return_value=UserSettings())
-    @patch("hub_adapter.service_health.bind_service_health")
+    @patch("hub_adapter.service_health.prepare_service_health")
     @patch("hub_adapter.service_health.get_node_database")
-    async def test_available_database_starts_the_loop(self, mock_db, _mock_bind, _mock_settings):
+    async def test_available_database_starts_the_loop(self, mock_db, _mock_prepare, _mock_settings):
         mock_db.return_value = MagicMock(spec=pw.PostgresqlDatabase)
         monitor = ServiceHealthMonitor()
 
@@ -260,9 +277,9 @@ class TestMonitorLifecycle:
 
     @pytest.mark.asyncio
     @patch("hub_adapter.service_health.load_persistent_settings", return_value=UserSettings())
-    @patch("hub_adapter.service_health.bind_service_health", side_effect=pw.OperationalError("dead"))
+    @patch("hub_adapter.service_health.prepare_service_health", side_effect=pw.OperationalError("dead"))
     @patch("hub_adapter.service_health.get_node_database")
-    async def test_table_creation_failure_disables_monitoring(self, mock_db, _mock_bind, _mock_settings):
+    async def test_table_creation_failure_disables_monitoring(self, mock_db, _mock_prepare, _mock_settings):
         mock_db.return_value = MagicMock(spec=pw.PostgresqlDatabase)
         monitor = ServiceHealthMonitor()
         await monitor.start()
@@ -282,29 +299,51 @@ class TestMonitorSweep:
     @pytest.mark.asyncio
     @patch("hub_adapter.service_health.get_settings")
     @patch("hub_adapter.service_health.prune_old_checks", return_value=0)
-    @patch("hub_adapter.service_health.record_sweep")
+    @patch("hub_adapter.service_health.write_checks")
     @patch("hub_adapter.service_health.probe_all", new_callable=AsyncMock)
-    async def test_results_are_persisted(self, mock_probe, mock_record, _mock_prune, _mock_settings):
-        mock_probe.return_value = {
-            "kong": {"status": "OK", "status_code": 200, "message": None, "latency_ms": 1.0, "url": "u"}
-        }
+    async def test_results_are_persisted(self, mock_probe, mock_write, _mock_prune, _mock_settings):
+        mock_probe.return_value = {"kong": KONG_RESULT}
         monitor = self._monitor()
         await monitor.sweep()
 
-        mock_record.assert_called_once_with(monitor._db, mock_probe.return_value)
+        mock_write.assert_called_once()
+        db, rows = mock_write.call_args.args
+        assert db is monitor._db
+        assert [(row["service"], row["status"]) for row in rows] == [("kong", "OK")]
 
     @pytest.mark.asyncio
     @patch("hub_adapter.service_health.get_settings")
-    @patch("hub_adapter.service_health.record_sweep", side_effect=pw.OperationalError("gone"))
+    @patch("hub_adapter.service_health.prune_old_checks", return_value=0)
+    @patch("hub_adapter.service_health.write_checks")
     @patch("hub_adapter.service_health.probe_all", new_callable=AsyncMock)
-    async def test_database_error_does_not_break_the_sweep(self, mock_probe, _mock_record, _mock_settings):
-        mock_probe.return_value = {
-            "kong": {"status": "OK", "status_code": 200, "message": None, "latency_ms": 1.0, "url": "u"}
-        }
+    async def test_short_intervals_are_written_in_batches(self, mock_probe, mock_write, _mock_prune, _mock_settings):
+        mock_probe.return_value = {"kong": KONG_RESULT}
+        monitor = self._monitor()
+        monitor.interval = 5
+
+        for _ in range(3):
+            await monitor.sweep()
+        mock_write.assert_not_called()
+
+        with patch("hub_adapter.service_health.monotonic", return_value=monotonic() + FLUSH_INTERVAL):
+            await monitor.sweep()
+
+        mock_write.assert_called_once()
+        assert len(mock_write.call_args.args[1]) == 4
+        assert monitor._writer.pending == 0
+
+    @pytest.mark.asyncio
+    @patch("hub_adapter.service_health.get_settings")
+    @patch("hub_adapter.service_health.write_checks", side_effect=pw.OperationalError("gone"))
+    @patch("hub_adapter.service_health.probe_all", new_callable=AsyncMock)
+    async def test_database_error_does_not_break_the_sweep(self, mock_probe, _mock_write, _mock_settings):
+        mock_probe.return_value = {"kong": KONG_RESULT}
+        monitor = self._monitor()
 
-        results = await self._monitor().sweep()  # must not raise
+        results = await monitor.sweep()  # must not raise
 
         assert results == mock_probe.return_value
+        assert monitor._writer.pending == 1, "the checks must be kept for the next attempt"
 
     @patch("hub_adapter.service_health.log_event")
     def test_status_change_is_logged_once_per_transition(self, mock_log):
@@ -337,6 +376,163 @@ class TestMonitorSweep:
         assert mock_prune.call_count == 2
 
 
+def _partition_db(
+    relkind: str | None = None,
+    legacy_range: tuple = (None, None),
+    partitions: tuple = (),
+    rollup_relkind: str | None = "p",
+):
+    """A database answering the catalog queries of the partition maintenance, recording every statement."""
+    db = MagicMock(spec=pw.PostgresqlDatabase)
+    db.statements = []
+
+    def execute_sql(sql, params=None):
+        db.statements.append(" ".join(sql.split()))
+        cursor = MagicMock()
+        kind = rollup_relkind if params == ("service_health_rollup_1m",) else relkind
+        cursor.fetchone.return_value = (
+            ((kind,) if kind else None) if "relkind" in sql else legacy_range if "MIN" in sql else None
+        )
+        cursor.fetchall.return_value = [(name,) for name in partitions]
+        return cursor
+
+    db.execute_sql.side_effect = execute_sql
+    return db
+
+
+class TestPartitions:
+    """Daily range partitions of the health check table."""
+
+    @patch("hub_adapter.service_health.datetime", wraps=datetime)
+    def test_new_table_is_partitioned_with_the_coming_days(self, mock_datetime):
+        mock_datetime.now.return_value = datetime(2026, 3, 10, 12, tzinfo=UTC)
+        db = _partition_db(rollup_relkind=None)
+
+        prepare_service_health(db, retention_days=30)
+
+        assert db.statements[1].startswith('CREATE TABLE IF NOT EXISTS "service_health_check" (')
+        assert db.statements[1].endswith('PARTITION BY RANGE ("checked_at")')
+        assert any(
+            statement.startswith('CREATE TABLE IF NOT EXISTS "service_health_rollup_1m" (')
+            and statement.endswith('PARTITION BY RANGE ("bucket")')
+            for statement in db.statements
+        )
+        partitions = [statement.split('"')[1] for statement in db.statements if "PARTITION OF" in statement]
+        assert partitions == [
+            f"{table}_p202603{day:02}"
+            for day in range(9, 14)
+            for table in ("service_health_check", "service_health_rollup_1m")
+        ]
+        assert not any("RENAME" in statement for statement in db.statements)
+
+    @patch("hub_adapter.service_health.datetime", wraps=datetime)
+    def test_unpartitioned_minute_rollup_is_rebuilt(self, mock_datetime):
+        mock_datetime.now.return_value = datetime(2026, 3, 10, 12, tzinfo=UTC)
+        db = _partition_db(relkind="p", partitions=("service_health_check_p20260301",), rollup_relkind="r")
+
+        prepare_service_health(db, retention_days=30)
+
+        drop = db.statements.index('DROP TABLE "service_health_rollup_1m"')
+        assert db.statements[drop + 1].startswith('CREATE TABLE IF NOT EXISTS "service_health_rollup_1m" (')
+        assert any('"service_health_rollup_1m_p20260301" PARTITION OF' in statement for statement in db.statements)
+        assert db.statements[-1].startswith('INSERT INTO "service_health_rollup_1m"')
+
+    @patch("hub_adapter.service_health.datetime", wraps=datetime)
+    def test_unpartitioned_table_is_migrated(self, mock_datetime):
+        mock_datetime.now.return_value = datetime(2026, 3, 10, 12, tzinfo=UTC)
+        db = _partition_db(
+            relkind="r", legacy_range=(datetime(2026, 3, 8, 5, tzinfo=UTC), datetime(2026, 3, 10, 11, tzinfo=UTC))
+        )
+
+        prepare_service_health(db, retention_days=30)
+
+        assert db.statements[1] == 'ALTER TABLE "service_health_check" RENAME TO "service_health_check_unpartitioned"'
+        partitions = [statement.split('"')[1] for statement in db.statements if "PARTITION OF" in statement]
+        assert partitions[:6:2] == [f"service_health_check_p202603{day:02}" for day in (8, 9, 10)]
+        copy = next(statement for statement in db.statements if statement.startswith("INSERT"))
+        assert 'FROM "service_health_check_unpartitioned" WHERE "checked_at" >= %s' in copy
+        assert db.statements.index(copy) < db.statements.index('DROP TABLE "service_health_check_unpartitioned"')
+
+    @patch("hub_adapter.service_health.datetime", wraps=datetime)
+    def test_only_fully_expired_days_are_dropped(self, mock_datetime):
+        mock_datetime.now.return_value = datetime(2026, 3, 10, 12, tzinfo=UTC)
+        db = _partition_db(
+            partitions=(
+                "service_health_check_p20260307",
+                "service_health_check_p20260308",
+                "service_health_rollup_1m_p20260307",
+                "something_else",
+            )
+        )
+
+        assert prune_old_checks(db, retention_days=2) == 1
+        assert [statement for statement in db.statements if statement.startswith("DROP")] == [
+            'DROP TABLE IF EXISTS "service_health_rollup_1m_p20260307"',
+            'DROP TABLE IF EXISTS "service_health_check_p20260307"',
+        ]
+        # The minute rollup is dropped by the day, only the small coarser rollups are deleted from
+        assert [statement.split('"')[1] for statement in db.statements if statement.startswith("DELETE")] == [
+            "service_health_rollup_1d",
+            "service_health_rollup_1h",
+        ]
+
+
+class TestHealthCheckWriter:
+    """Buffering the sweep rows and loading them in batches."""
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_the_rows_in_order(self):
+        writer = HealthCheckWriter()
+        writer.db = MagicMock(spec=pw.PostgresqlDatabase)
+        writer.add([{"n": 1}, {"n": 2}])
+
+        with patch("hub_adapter.service_health.write_checks", side_effect=pw.OperationalError("gone")):
+            assert await writer.flush() == 0
+
+        writer.add([{"n": 3}])
+
+        with patch("hub_adapter.service_health.write_checks") as mock_write:
+            assert await writer.flush() == 3
+
+        assert mock_write.call_args.args[1] == [{"n": 1}, {"n": 2}, {"n": 3}]
+        assert writer.pending == 0
+
+    @patch("hub_adapter.service_health.log_event")
+    def test_oldest_rows_are_dropped_beyond_the_bound(self, mock_log_event):
+        writer = HealthCheckWriter(max_rows=3)
+        writer.add([{"n": 1}, {"n": 2}])
+        writer.add([{"n": 3}, {"n": 4}])
+
+        assert list(writer._rows) == [{"n": 2}, {"n": 3}, {"n": 4}]
+        assert writer.dropped == 1
+        assert mock_log_event.call_args.args == ("service_health.write_dropped",)
+
+    def test_rows_are_copied_in_the_text_format(self):
+        db = MagicMock(spec=pw.PostgresqlDatabase)
+        checked_at = datetime(2026, 1, 1, tzinfo=UTC)
+        rows = sweep_rows(
+            {"po": {**KONG_RESULT, "status": "ERROR", "status_code": 503, "message": "a\tb\nc\\d"}}, checked_at
+        )
+
+        copy_checks(db, rows)
+
+        statement, data = db.cursor.return_value.copy_expert.call_args.args
+        assert statement == (
+            'COPY "service_health_check" ("sweep_id", "service", "url", "checked_at", "status", "status_code", '
+            '"latency_ms", "message") FROM STDIN'
+        )
+        assert data.getvalue() == (
+            f"{rows[0]['sweep_id']}\tpo\tu\t2026-01-01 00:00:00+00:00\tERROR\t503\t1.0\ta\\tb\\nc\\\\d\n"
+        )
+
+    def test_missing_values_are_copied_as_null(self):
+        db = MagicMock(spec=pw.PostgresqlDatabase)
+
+        copy_checks(db, sweep_rows({"kong": KONG_RESULT}))
+
+        assert db.cursor.return_value.copy_expert.call_args.args[1].getvalue().endswith("\t\\N\n")
+
+
 class TestHistoryEndpoint:
     """The endpoint serving the recorded health history."""
 
@@ -744,7 +940,7 @@ class TestBucketRange:
             patch("hub_adapter.service_health.ServiceHealthCheck") as mock_model,
         ):
             mock_model.select.return_value.where.return_value.group_by.return_value.dicts.return_value = []
-            bucket_range(db, start, end, ["kong"], 300)
+            bucket_range(db, start, end, ["kong"], 90)
 
         mock_message.assert_called_once_with()
         assert mock_message.return_value in mock_model.select.call_args.args
@@ -769,13 +965,46 @@ class TestBucketRange:
             patch("hub_adapter.service_health._range_filter") as mock_range_filter,
         ):
             mock_model.select.return_value.where.return_value.group_by.return_value.dicts.return_value = rows
-            result = bucket_range(db, start, end, ["kong"], 300)
+            result = bucket_range(db, start, end, ["kong"], 90)
 
         mock_range_filter.assert_called_once_with(start, end, ["kong"])
         assert result["kong"][0]["failed"] == 1
         assert result["kong"][0]["worst_status"] == ServiceCheckStatus.ERROR
         assert result["kong"][0]["message"] == "boom"
 
+    def test_percentiles_of_the_checks_are_estimated_like_the_rollups(self):
+        """A resolution no rollup divides must report percentiles comparable with one read from the rollups."""
+        moment = datetime(2026, 7, 30, 12, 0, tzinfo=UTC)
+        aggregate = HealthAggregate()
+        for latency in (3.0, 40.0, 42.0, 700.0):
+            aggregate.add_check(_check(moment, latency_ms=latency))
+
+        row = {
+            "service": "kong",
+            "bucket": moment,
+            "total": 4,
+            "successful": 4,
+            "min_latency_ms": 3.0,
+            "max_latency_ms": 700.0,
+            "avg_latency_ms": 196.25,
+            "latency_count": 4,
+            "latency_histogram": aggregate.latency_histogram,
+            "message": None,
+        }
+        db = MagicMock(spec=pw.PostgresqlDatabase)
+
+        with (
+            patch("hub_adapter.service_health.bind_service_health"),
+            patch("hub_adapter.service_health.ServiceHealthCheck") as mock_model,
+            patch("hub_adapter.service_health._range_filter"),
+        ):
+            mock_model.select.return_value.where.return_value.group_by.return_value.dicts.return_value = [row]
+            result = bucket_range(db, moment, moment + timedelta(hours=1), ["kong"], 90)
+
+        assert [result["kong"][0][f"p{percent}_latency_ms"] for percent in (50, 95, 99)] == [
+            aggregate.percentile(percent) for percent in (50, 95, 99)
+        ]
+
     def test_bucket_range_with_no_rows_returns_empty(self):
         db = MagicMock(spec=pw.PostgresqlDatabase)
         start = datetime(2026, 7, 30, 12, 0, tzinfo=UTC)
@@ -787,7 +1016,157 @@ class TestBucketRange:
             patch("hub_adapter.service_health._range_filter") as mock_range_filter,
         ):
             mock_model.select.return_value.where.return_value.group_by.return_value.dicts.return_value = []
-            result = bucket_range(db, start, end, ["kong"], 300)
+            result = bucket_range(db, start, end, ["kong"], 90)
 
         mock_range_filter.assert_called_once_with(start, end, ["kong"])
         assert result == {}
+
+
+def _check(moment: datetime, status: str = "OK", latency_ms: float | None = 20.0, message: str | None = None):
+    return {
+        "service": "kong",
+        "checked_at": moment,
+        "status": status,
+        "latency_ms": latency_ms,
+        "message": message,
+    }
+
+
+class TestRollups:
+    """The per minute, hour and day aggregates the history is read from."""
+
+    def test_checks_fold_into_one_row_per_service_and_slice(self):
+        noon = datetime(2026, 7, 30, 12, 0, tzinfo=UTC)
+        checks = [
+            _check(noon + timedelta(seconds=5), latency_ms=3.0),
+            _check(noon + timedelta(seconds=40), status="ERROR", latency_ms=None, message="second"),
+            _check(noon + timedelta(seconds=20), status="ERROR", latency_ms=700.0, message="first"),
+            _check(noon + timedelta(minutes=1)),
+        ]
+
+        first, second = rollup_rows(checks, 60)
+
+        assert first["bucket"] == noon
+        assert (first["total"], first["successful"], first["latency_count"]) == (3, 1, 2)
+        assert (first["latency_min"], first["latency_max"], first["latency_sum"]) == (3.0, 700.0, 703.0)
+        assert first["latency_histogram"][0] == first["latency_histogram"][LATENCY_BUCKETS.index(1000)] == 1
+        assert first["first_failure_message"] == "first"
+        assert second["bucket"] == noon + timedelta(minutes=1)
+        assert rollup_rows(checks, 3600)[0]["total"] == 4
+
+    def test_merged_rollups_match_the_checks(self):
+        noon = datetime(2026, 7, 30, 12, 0, tzinfo=UTC)
+        checks = [
+            _check(
+                noon + timedelta(seconds=30 * n),
+                status="ERROR" if n % 7 == 3 else "OK",
+                latency_ms=None if n % 11 == 0 else float(n * 13 % 900),
+                message=f"n{n}",
+            )
+            for n in range(200)
+        ]
+        from_checks, from_rollups = HealthAggregate(), HealthAggregate()
+
+        for check in checks:
+            from_checks.add_check(check)
+        for row in reversed(rollup_rows(checks, 60)):
+            from_rollups.merge(row)
+
+        assert from_rollups.stats() == from_checks.stats()
+        assert from_rollups.stats()["message"] == "n3"
+
+    def test_percentile_is_the_bound_of_its_histogram_bucket(self):
+        aggregate = HealthAggregate()
+        for latency in (4.0, 7.0, 8.0, 9.0, 1800.0):
+            aggregate.add_check(_check(datetime(2026, 7, 30, tzinfo=UTC), latency_ms=latency))
+
+        assert aggregate.percentile(50) == 10
+        assert aggregate.percentile(99) == 1800.0, "never beyond the highest latency seen"
+        assert HealthAggregate().percentile(50) is None
+
+    def test_range_is_read_from_the_coarsest_rollups_inside_it(self):
+        start = datetime(2026, 3, 1, 23, 59, 30, tzinfo=UTC)
+        stop = datetime(2026, 3, 4, 1, 2, 10, tzinfo=UTC)
+
+        assert _segments(start, stop, [86400, 3600, 60]) == [
+            (None, start, datetime(2026, 3, 2, tzinfo=UTC)),
+            (86400, datetime(2026, 3, 2, tzinfo=UTC), datetime(2026, 3, 4, tzinfo=UTC)),
+            (3600, datetime(2026, 3, 4, tzinfo=UTC), datetime(2026, 3, 4, 1, tzinfo=UTC)),
+            (60, datetime(2026, 3, 4, 1, tzinfo=UTC), datetime(2026, 3, 4, 1, 2, tzinfo=UTC)),
+            (None, datetime(2026, 3, 4, 1, 2, tzinfo=UTC), stop),
+        ]
+        assert _segments(start, start + timedelta(seconds=20), [86400, 3600, 60]) == [
+            (None, start, start + timedelta(seconds=20))
+        ]
+
+    @pytest.mark.parametrize(
+        "resolution, widths", [(86400, [86400, 3600, 60]), (7200, [3600, 60]), (300, [60]), (90, None)]
+    )
+    def test_resolution_picks_the_rollups_dividing_it(self, resolution, widths):
+        start = datetime(2026, 7, 30, tzinfo=UTC)
+
+        with (
+            patch("hub_adapter.service_health._aggregate_range", return_value={}) as mock_aggregate,
+            patch("hub_adapter.service_health._bucket_checks", return_value={}) as mock_checks,
+        ):
+            bucket_range(MagicMock(), start, start + timedelta(days=1), ["kong"], resolution)
+
+        if widths is None:
+            mock_checks.assert_called_once()
+            mock_aggregate.assert_not_called()
+        else:
+            assert mock_aggregate.call_args.args[4:] == (widths, resolution)
+
+    def test_summary_is_read_from_every_rollup(self):
+        aggregate = HealthAggregate()
+        aggregate.add_check(_check(datetime(2026, 7, 30, tzinfo=UTC), latency_ms=40.0))
+        aggregate.add_check(_check(datetime(2026, 7, 30, tzinfo=UTC), status="ERROR", latency_ms=None))
+
+        start, end = datetime(2026, 7, 29, tzinfo=UTC), datetime(2026, 7, 30, tzinfo=UTC)
+
+        with patch("hub_adapter.service_health._aggregate_range") as mock_aggregate:
+            mock_aggregate.return_value = {("kong", None): aggregate}
+            summary = summarize_range(MagicMock(), start, end)
+
+        assert mock_aggregate.call_args.args[4] == [86400, 3600, 60]
+        assert summary["kong"]["uptime_percentage"] == 50.0
+        assert summary["kong"]["p95_latency_ms"] == 40.0
+
+    def test_stored_rollup_is_added_to_on_conflict(self):
+        db = pw.PostgresqlDatabase("unused")
+        rows = rollup_rows([_check(datetime(2026, 7, 30, tzinfo=UTC))], 60)
+
+        with db.bind_ctx((MinuteRollup,)):
+            query = MinuteRollup.insert_many(rows).on_conflict(
+                conflict_target=[MinuteRollup.service, MinuteRollup.bucket], update=_rollup_merge(MinuteRollup)
+            )
+            sql, _ = query.sql()
+
+        assert 'ON CONFLICT ("service", "bucket") DO UPDATE' in sql
+        assert '"total" = ("service_health_rollup_1m"."total" + EXCLUDED."total")' in sql
+        assert 'unnest("service_health_rollup_1m"."latency_histogram", EXCLUDED."latency_histogram")' in sql
+
+    @patch("hub_adapter.service_health.upsert_rollups")
+    @patch("hub_adapter.service_health.copy_checks")
+    def test_checks_and_rollups_are_written_together(self, mock_copy, mock_upsert):
+        db = MagicMock(spec=pw.PostgresqlDatabase)
+        rows = sweep_rows({"kong": KONG_RESULT})
+
+        write_checks(db, rows)
+
+        db.atomic.assert_called_once()
+        mock_copy.assert_called_once_with(db, rows)
+        mock_upsert.assert_called_once_with(db, rows)
+
+    @patch("hub_adapter.service_health.datetime", wraps=datetime)
+    def test_missing_rollups_are_filled_from_the_stored_checks(self, mock_datetime):
+        mock_datetime.now.return_value = datetime(2026, 3, 10, 12, tzinfo=UTC)
+        db = _partition_db()
+        db.table_exists.side_effect = lambda table: table != "service_health_rollup_1h"
+
+        prepare_service_health(db, retention_days=30)
+
+        backfills = [statement for statement in db.statements if statement.startswith("INSERT")]
+        assert len(backfills) == 1
+        assert backfills[0].startswith('INSERT INTO "service_health_rollup_1h"')
+        assert backfills[0].endswith('FROM "service_health_check" GROUP BY 1, 2')
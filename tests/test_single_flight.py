@@ -0,0 +1,66 @@
+"""Collection of unit tests for coalescing identical concurrent reads."""
+
+import asyncio
+
+import pytest
+
+from hub_adapter.single_flight import SingleFlight
+
+
+def _slow_fetch(calls: list, result="result", error: Exception | None = None):
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        if error:
+            raise error
+        return result
+
+    return fetch
+
+
+class TestSingleFlight:
+    """Sharing one upstream call between identical concurrent callers."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_call(self):
+        flight, calls = SingleFlight(), []
+
+        results = await asyncio.gather(*(flight.do("key", _slow_fetch(calls)) for _ in range(4)))
+
+        assert results == ["result"] * 4
+        assert len(calls) == 1
+        assert flight.stats() == {"calls": 4, "upstream": 1, "collapsed": 3, "in_flight": 0}
+
+    @pytest.mark.asyncio
+    async def test_different_keys_and_later_calls_are_not_collapsed(self):
+        flight, calls = SingleFlight(), []
+
+        await asyncio.gather(flight.do("a", _slow_fetch(calls)), flight.do("b", _slow_fetch(calls)))
+        await flight.do("a", _slow_fetch(calls))
+
+        assert len(calls) == 3
+        assert flight.collapsed == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_waiting_caller(self):
+        flight, calls = SingleFlight(), []
+
+        results = await asyncio.gather(
+            *(flight.do("key", _slow_fetch(calls, error=ValueError("upstream down"))) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+        assert len(calls) == 1
+        assert all(isinstance(result, ValueError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_the_others(self):
+        flight, calls = SingleFlight(), []
+
+        first = asyncio.create_task(flight.do("key", _slow_fetch(calls)))
+        second = asyncio.create_task(flight.do("key", _slow_fetch(calls)))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == "result"
+        assert len(calls) == 1